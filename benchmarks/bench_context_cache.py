@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+コンテキストキャッシュ（--context-cache）の送信トークン数の比較
+
+data/transcripts/ の書き起こし（無い場合は合成データ）について、fake バックエンドで
+要約・サブタイトル・詳細説明文を生成し、キャッシュの有無で入力トークン数を比較する。
+トークン数は estimate_tokens による概算（UTF-8で4バイト = 1トークン）。
+
+入力トークンの合計はプロンプト・キャッシュ作成・キャッシュ参照の合計。料金の比較では、キャッシュ参照を
+通常の入力の --cache-read-rate 倍（デフォルト0.25。Gemini のコンテキストキャッシュの割引を想定）として換算する。
+キャッシュの保存料金（時間あたり）は含めない。
+
+使い方:
+    python benchmarks/bench_context_cache.py
+    python benchmarks/bench_context_cache.py --limit 20 --structured
+    python benchmarks/bench_context_cache.py --cache-read-rate 0.1
+"""
+
+import argparse
+import io
+import json
+import random
+import sys
+import time
+from contextlib import redirect_stdout
+from pathlib import Path
+from typing import Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+import synthetic  # noqa: E402
+from transcribe_podcast import (  # noqa: E402
+    generate_detailed_description, generate_episode_fields, generate_summary, generate_title
+)
+from transcription_backends import ContextCache, FakeBackend  # noqa: E402
+from utils import TRANSCRIPTS_DIR  # noqa: E402
+
+
+def load_transcripts(limit: int) -> List[str]:
+    """比較に使う文字起こしを読み込む（無い場合は合成する）"""
+    texts = []
+    for path in sorted(TRANSCRIPTS_DIR.glob("*.json"))[:limit]:
+        with open(path, 'r', encoding='utf-8') as f:
+            text = json.load(f).get("transcript", "")
+        if text:
+            texts.append(text)
+    if not texts:
+        rng = random.Random(0)
+        texts = [synthetic.make_transcript(rng, synthetic.make_episode_number(i))["transcript"] for i in range(limit)]
+    return texts
+
+
+def run_generation(transcripts: List[str], use_cache: bool, structured: bool) -> Dict[str, float]:
+    """
+    fake バックエンドで生成して送信トークン数と所要時間を集計
+
+    Args:
+        transcripts: 文字起こしのリスト
+        use_cache: 文字起こし全文をキャッシュして参照するか
+        structured: 構造化出力で1回にまとめて生成するか
+
+    Returns:
+        {"prompt", "cache_write", "cached", "seconds"}
+    """
+    backend = FakeBackend()
+    start = time.perf_counter()
+    with redirect_stdout(io.StringIO()):
+        for transcript in transcripts:
+            context: Optional[ContextCache] = backend.create_context_cache(text=transcript) if use_cache else None
+            if structured:
+                generate_episode_fields(transcript, backend, context=context)
+            else:
+                summary = generate_summary(transcript, backend, context=context)
+                sub_title = generate_title(transcript, backend, context=context)
+                generate_detailed_description(transcript, sub_title, summary, backend, context=context)
+            if context is not None:
+                backend.delete_context_cache(context)
+    return {**backend.sent_tokens, "seconds": time.perf_counter() - start}
+
+
+def main() -> None:
+    """メイン処理"""
+    parser = argparse.ArgumentParser(description='コンテキストキャッシュの送信トークン数の比較')
+    parser.add_argument('--limit', type=int, default=50, help='比較する書き起こしの件数（デフォルト: 50）')
+    parser.add_argument('--structured', action='store_true', help='構造化出力（--structured）で生成する')
+    parser.add_argument('--cache-read-rate', type=float, default=0.25,
+                        help='キャッシュ参照の料金（通常の入力に対する倍率、デフォルト: 0.25）')
+    args = parser.parse_args()
+
+    transcripts = load_transcripts(args.limit)
+    chars = sum(len(text) for text in transcripts)
+    print(f"[INFO] 書き起こし: {len(transcripts)}件（平均 {chars // max(len(transcripts), 1)}文字）\n")
+
+    without = run_generation(transcripts, False, args.structured)
+    with_cache = run_generation(transcripts, True, args.structured)
+
+    for result in (without, with_cache):
+        result["total"] = result["prompt"] + result["cache_write"] + result["cached"]
+        result["billed"] = result["prompt"] + result["cache_write"] + result["cached"] * args.cache_read_rate
+
+    print(f"  {'':<16} {'プロンプト':>12} {'キャッシュ作成':>14} {'キャッシュ参照':>14} {'入力の合計':>12} {'料金換算':>12}")
+    for label, result in (("キャッシュなし", without), ("キャッシュあり", with_cache)):
+        print(f"  {label:<16} {result['prompt']:12d} {result['cache_write']:14d} {result['cached']:14d} "
+              f"{result['total']:12d} {result['billed']:12.0f}")
+
+    def change(before: float, after: float) -> str:
+        """増減の割合"""
+        if not before:
+            return "-"
+        ratio = after / before - 1
+        return f"{-ratio:.0%} 削減" if ratio <= 0 else f"{ratio:.0%} 増加"
+
+    print(f"\n[INFO] 入力トークンの合計（プロンプト + キャッシュ作成 + キャッシュ参照）: "
+          f"{without['total']} → {with_cache['total']}（{change(without['total'], with_cache['total'])}）")
+    print(f"[INFO] 料金換算（キャッシュ参照を通常の入力の {args.cache_read_rate:g} 倍として計算、保存料金は含めない）: "
+          f"{without['billed']:.0f} → {with_cache['billed']:.0f}（{change(without['billed'], with_cache['billed'])}）")
+    print("[INFO] キャッシュありでは文字起こし全文（抜粋ではなく）をキャッシュ作成時に1回だけ送信し、"
+          "各プロンプトはそれを参照します")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+書き起こし全体の検索・置換のベンチマーク
+
+実データ（data/transcripts/）を使って、全ファイル検索を
+逐次（JSON解析あり）・逐次（事前フィルタあり）・並列で比較し、
+一時フォルダへのコピーに対する置換の適用時間も計測する。
+
+使い方:
+    python benchmarks/bench_corpus_replace.py
+    python benchmarks/bench_corpus_replace.py --pattern 井戸端 --repeat 5
+"""
+
+import argparse
+import json
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+import corpus_replace  # noqa: E402
+from corpus_replace import compile_pattern, replace_in_corpus, search_corpus  # noqa: E402
+from utils import TRANSCRIPTS_DIR  # noqa: E402
+
+
+def best_of(repeat: int, func: Callable[[], Any]) -> float:
+    """repeat回実行して最短時間を返す"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def naive_search(pattern: str) -> int:
+    """全ファイルをJSONとして読み込んでから検索する（比較用）"""
+    compiled = compile_pattern(pattern)
+    count = 0
+    for path in TRANSCRIPTS_DIR.glob("*.json"):
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        for field in corpus_replace.SEARCH_FIELDS:
+            count += len(compiled.findall(data.get(field) or ""))
+    return count
+
+
+def main() -> None:
+    """メイン処理"""
+    parser = argparse.ArgumentParser(description='書き起こし全体の検索・置換のベンチマーク')
+    parser.add_argument('--pattern', type=str, default='井戸端', help='検索文字列（デフォルト: 井戸端）')
+    parser.add_argument('--rare-pattern', type=str, default='存在しない話者名',
+                        help='ほとんどヒットしない検索文字列（事前フィルタの効果確認用）')
+    parser.add_argument('--repeat', type=int, default=5, help='繰り返し回数（デフォルト: 5）')
+    args = parser.parse_args()
+
+    file_count = len(list(TRANSCRIPTS_DIR.glob("*.json")))
+    print(f"[INFO] 書き起こし: {file_count}件")
+
+    for label, pattern in (("よくある語", args.pattern), ("まれな語", args.rare_pattern)):
+        hits = search_corpus(pattern, workers=1)
+        print(f"\n[検索: {label}「{pattern}」 {len(hits)}件]")
+        print(f"  {'全件JSON解析（逐次）':<24} {best_of(args.repeat, lambda: naive_search(pattern)) * 1000:9.2f} ms")
+        print(f"  {'事前フィルタ（逐次）':<24} {best_of(args.repeat, lambda: search_corpus(pattern, workers=1)) * 1000:9.2f} ms")
+        print(f"  {'事前フィルタ（並列）':<24} {best_of(args.repeat, lambda: search_corpus(pattern)) * 1000:9.2f} ms")
+
+    print("\n[置換の適用（一時フォルダのコピー）]")
+    with tempfile.TemporaryDirectory() as tmp:
+        work_dir = Path(tmp) / "transcripts"
+        backup_dir = Path(tmp) / "backup"
+        shutil.copytree(TRANSCRIPTS_DIR, work_dir)
+        hits = search_corpus(args.pattern, work_dir, workers=1)
+        start = time.perf_counter()
+        counts = replace_in_corpus(hits, args.pattern, args.pattern + "*", work_dir, backup_dir=backup_dir)
+        elapsed = time.perf_counter() - start
+        print(f"  {len(counts)}ファイル・{sum(counts.values())}箇所: {elapsed * 1000:9.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
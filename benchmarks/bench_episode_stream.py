@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+episodes.json のストリーミング読み書きのベンチマーク
+
+合成した大規模カタログ（デフォルト10万件）で、json.load による一括読み込みと
+ストリーミング読み込み・Episodeモデル・ストリーミングマージの時間とピークメモリを比較する。
+
+使い方:
+    python benchmarks/bench_episode_stream.py
+    python benchmarks/bench_episode_stream.py --episodes 20000
+"""
+
+import argparse
+import copy
+import io
+import json
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import redirect_stdout
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+from episode_stream import iter_episodes, iter_episode_records, write_episodes  # noqa: E402
+import update_episodes  # noqa: E402
+
+
+def make_episode(index: int) -> Dict[str, Any]:
+    """合成エピソードを1件作成"""
+    major, minor, patch = index // 10000, (index // 100) % 100, index % 100
+    number = f"{major}.{minor}.{patch}"
+    return {
+        "number": number,
+        "title": f"ep{number} 合成エピソード{index}",
+        "date": (date(2000, 1, 1) + timedelta(days=index // 3)).isoformat(),
+        "duration": "23:45",
+        "description": "シビックテックとオープンデータについて話します。" * 4,
+        "thumbnail": "img/logo.png",
+        "spotifyUrl": f"https://podcasters.spotify.com/pod/show/civictechcast/episodes/ep{index}",
+        "tags": ["シビックテック", "データ"],
+        "transcript": "",
+        "links": [{"title": "関連リンク", "url": f"https://example.com/{index}"}],
+        "id": index + 1,
+        "has_transcript": False,
+    }
+
+
+def generate_catalog(path: Path, count: int) -> None:
+    """合成カタログを書き出す"""
+    write_episodes(path, (make_episode(i) for i in range(count)))
+
+
+def measure(label: str, func: Callable[[], Any]) -> Tuple[float, float]:
+    """
+    関数の実行時間とピークメモリを計測して表示
+
+    tracemalloc は実行を遅くするため、時間とピークメモリは別々の実行で計測する。
+    """
+    with redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+
+        tracemalloc.start()
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    print(f"  {label:<36} {elapsed:8.3f}s  peak {peak / 1024 / 1024:8.1f} MiB")
+    return elapsed, peak
+
+
+def main() -> None:
+    """メイン処理"""
+    parser = argparse.ArgumentParser(description='episodes.json ストリーミング処理のベンチマーク')
+    parser.add_argument('--episodes', type=int, default=100_000, help='合成エピソード数（デフォルト: 100000）')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        catalog = Path(tmp) / "episodes.json"
+        output = Path(tmp) / "episodes.out.json"
+        generate_catalog(catalog, args.episodes)
+        size_mb = catalog.stat().st_size / 1024 / 1024
+        print(f"[INFO] 合成カタログ: {args.episodes}件（{size_mb:.1f} MiB）")
+
+        # RSSから取得した想定の20件（既存10件＋新規10件）
+        new_episodes: List[Dict[str, Any]] = [make_episode(i) for i in range(args.episodes - 10, args.episodes + 10)]
+        for ep in new_episodes:
+            ep.pop("id")
+
+        # 書き起こしフラグの確認先を空のフォルダにする
+        update_episodes.TRANSCRIPTS_DIR = Path(tmp) / "transcripts"
+
+        print("\n[読み込み]")
+        measure("json.load（辞書リスト）", lambda: json.load(open(catalog, encoding='utf-8')))
+        measure("iter_episodes（1件ずつ）", lambda: sum(1 for _ in iter_episodes(catalog)))
+        measure("iter_episode_records → list", lambda: list(iter_episode_records(catalog)))
+
+        print("\n[マージ]")
+
+        def merge_in_memory() -> None:
+            existing = update_episodes.load_existing_episodes(catalog)
+            merged, *_ = update_episodes.merge_episodes(existing, copy.deepcopy(new_episodes))
+            update_episodes.save_episodes(merged, output)
+
+        measure("merge_episodes + save_episodes", merge_in_memory)
+        measure("merge_episodes_streaming",
+                lambda: update_episodes.merge_episodes_streaming(catalog, copy.deepcopy(new_episodes), output))
+
+        print("\n[ID振り直し]")
+
+        def reindex_in_memory() -> None:
+            episodes = update_episodes.load_existing_episodes(catalog)
+            update_episodes.save_episodes(update_episodes.reindex_episodes(episodes), output)
+
+        measure("reindex_episodes + save_episodes", reindex_in_memory)
+        measure("reindex_episodes_streaming",
+                lambda: update_episodes.reindex_episodes_streaming(catalog, output))
+
+
+if __name__ == "__main__":
+    main()
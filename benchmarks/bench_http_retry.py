@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+HTTPリトライの待機時間の確認（スタブサーバー）
+
+ローカルのスタブサーバーに対して http_session.request_with_retry を実行し、応答ごとの待機時間を確かめる。
+待機は実際には行わず、待機秒数を記録する。期待どおりでない場合は終了コード1で終了する。
+
+- 503 + x-rate-limit-reset（はるか先の時刻）: レート制限のヘッダは使わず、指数バックオフでリトライする
+- 429 + x-rate-limit-reset（数秒後）: リセット時刻まで待ってリトライする
+- 429 + Retry-After: 指定の秒数待ってリトライする
+- 429 + x-rate-limit-reset（上限を超える先）: リトライせずに 429 を返す
+- リクエストを受けた後の切断: リトライし、サーバーに届いた可能性あり（ambiguous）とする
+- 接続できないポート: サーバーに届いていない（ambiguous にしない）
+
+使い方:
+    python benchmarks/bench_http_retry.py
+"""
+
+import socket
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+import requests  # noqa: E402
+from http_session import create_session, may_have_reached_server, request_with_retry  # noqa: E402
+
+# パス → 失敗として返す応答（ステータス, ヘッダ）。この回数だけ返した後は 200 を返す
+# ステータスが0の場合は、リクエストを読んだ後に応答せずに切断する
+Script = List[Tuple[int, Dict[str, str]]]
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """パスごとに決めた応答を順に返すスタブ"""
+
+    scripts: Dict[str, Script] = {}
+    counts: Dict[str, int] = {}
+
+    def do_GET(self) -> None:
+        index = self.counts.get(self.path, 0)
+        self.counts[self.path] = index + 1
+        script = self.scripts.get(self.path, [])
+        status, headers = script[index] if index < len(script) else (200, {})
+        if status == 0:
+            self.close_connection = True
+            return
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+
+def run_case(
+    base_url: str,
+    path: str,
+    script: Script,
+    max_wait: float = 300.0
+) -> Tuple[int, List[float], int, bool]:
+    """
+    1ケースを実行
+
+    Returns:
+        (最後の応答のステータス, 待機秒数のリスト, サーバーが受けたリクエスト数, ambiguous)
+    """
+    StubHandler.scripts[path] = script
+    waits: List[float] = []
+    session = create_session(pool_maxsize=2)
+    response, ambiguous = request_with_retry(
+        session, "GET", base_url + path, max_attempts=4, backoff=2.0, max_wait=max_wait,
+        sleep=waits.append, timeout=5
+    )
+    session.close()
+    return response.status_code, waits, StubHandler.counts.get(path, 0), ambiguous
+
+
+def check(name: str, ok: bool, detail: str, errors: List[str]) -> None:
+    """結果を表示し、失敗を記録"""
+    print(f"  [{'OK' if ok else 'NG'}] {name}: {detail}")
+    if not ok:
+        errors.append(name)
+
+
+def main() -> None:
+    """メイン処理"""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    now = time.time()
+    errors: List[str] = []
+    far_reset = str(int(now) + 10 ** 10)
+
+    print("[INFO] スタブサーバーでリトライの待機時間を確認します\n")
+
+    status, waits, requests_made, ambiguous = run_case(base_url, "/503-reset", [
+        (503, {"x-rate-limit-reset": far_reset}),
+        (503, {"x-rate-limit-reset": far_reset}),
+    ])
+    check(
+        "503 + x-rate-limit-reset", status == 200 and requests_made == 3 and len(waits) == 2
+        and all(wait <= 10 for wait in waits),
+        f"ステータス {status}、リクエスト {requests_made}回、待機 {', '.join(f'{wait:.1f}秒' for wait in waits)}",
+        errors
+    )
+
+    status, waits, requests_made, ambiguous = run_case(base_url, "/429-reset", [
+        (429, {"x-rate-limit-reset": str(int(time.time()) + 3)}),
+    ])
+    check(
+        "429 + x-rate-limit-reset", status == 200 and len(waits) == 1 and 2.0 <= waits[0] <= 5.0,
+        f"ステータス {status}、待機 {', '.join(f'{wait:.1f}秒' for wait in waits)}",
+        errors
+    )
+
+    status, waits, requests_made, ambiguous = run_case(base_url, "/429-retry-after", [(429, {"Retry-After": "7"})])
+    check(
+        "429 + Retry-After", status == 200 and waits == [7.0],
+        f"ステータス {status}、待機 {', '.join(f'{wait:.1f}秒' for wait in waits)}",
+        errors
+    )
+
+    status, waits, requests_made, ambiguous = run_case(base_url, "/429-too-long", [
+        (429, {"x-rate-limit-reset": far_reset}),
+    ])
+    check(
+        "429 + 上限を超える x-rate-limit-reset", status == 429 and not waits and requests_made == 1,
+        f"ステータス {status}、リクエスト {requests_made}回（リトライせずに返す）",
+        errors
+    )
+
+    status, waits, requests_made, ambiguous = run_case(base_url, "/reset", [(0, {})])
+    check(
+        "受信後の切断", status == 200 and requests_made == 2 and ambiguous,
+        f"ステータス {status}、リクエスト {requests_made}回、ambiguous={ambiguous}",
+        errors
+    )
+
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        closed_port = sock.getsockname()[1]
+    try:
+        create_session().get(f"http://127.0.0.1:{closed_port}/", timeout=5)
+        reached = True
+    except requests.RequestException as e:
+        reached = may_have_reached_server(e)
+    check("接続できないポート", not reached, f"サーバーに届いた可能性={reached}", errors)
+
+    server.shutdown()
+    if errors:
+        print(f"\n[ERROR] {len(errors)}件のケースが期待どおりではありません: {', '.join(errors)}")
+        sys.exit(1)
+    print("\n[OK] すべてのケースが期待どおりです")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+関連リンクのチェックの確認（スタブサーバー）
+
+ローカルのスタブサーバーに対して enrich_links.enrich_episode_links を実行し、次を確かめる。
+期待どおりでない場合は終了コード1で終了する。
+
+- 同じホストへのリクエストは --host-interval 秒以上空き、別のホストへのリクエストは待たされない
+- 同時実行数が1で別のホストの遅い応答を待たされた場合も、同じホストへのリクエストは続けて送らない
+- 404・410 はリンク切れ、接続できないURLは接続不可として数える
+- --prune で削除されるのはリンク切れだけで、接続不可のリンクは残る
+- 2回目はキャッシュが有効なURLをチェックしない。失敗したURLは短い有効期限が切れたら再チェックする
+
+使い方:
+    python benchmarks/bench_link_check.py
+    python benchmarks/bench_link_check.py --host-interval 0.5
+"""
+
+import argparse
+import json
+import socket
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+import enrich_links  # noqa: E402
+from enrich_links import GENERIC_LINK_TITLE, enrich_episode_links  # noqa: E402
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """パスに応じた応答を返し、リクエストの時刻をホストごとに記録するスタブ"""
+
+    requests_by_host: Dict[str, List[Tuple[float, str]]] = {}
+    lock = threading.Lock()
+    slow_seconds = 1.0
+
+    def do_GET(self) -> None:
+        with self.lock:
+            self.requests_by_host.setdefault(self.headers.get("Host", ""), []).append(
+                (time.monotonic(), self.path)
+            )
+        if self.path.startswith("/slow"):
+            time.sleep(self.slow_seconds)
+        if self.path.startswith(("/page", "/slow")):
+            body = f"<html><head><title>ページ {self.path}</title></head></html>".encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        if self.path.startswith("/moved"):
+            self.send_response(301)
+            self.send_header("Location", "/page-moved")
+        else:
+            self.send_response(410 if self.path.startswith("/gone") else 404)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+
+def closed_port() -> int:
+    """接続できないポート番号（一度開いてすぐに閉じる）"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def request_count() -> int:
+    """スタブサーバーが受けたリクエスト数"""
+    return sum(len(entries) for entries in StubHandler.requests_by_host.values())
+
+
+def min_host_gap(host: str, since: int = 0) -> float:
+    """同じホストへのリクエスト間隔の最小（since 件目以降のリクエスト、/page-moved は除く）"""
+    times = sorted(at for at, path in StubHandler.requests_by_host.get(host, [])[since:] if path != "/page-moved")
+    return min((later - earlier for earlier, later in zip(times, times[1:])), default=float("inf"))
+
+
+def check(name: str, ok: bool, detail: str, errors: List[str]) -> None:
+    """結果を表示し、失敗を記録"""
+    print(f"  [{'OK' if ok else 'NG'}] {name}: {detail}")
+    if not ok:
+        errors.append(name)
+
+
+def main() -> None:
+    """メイン処理"""
+    parser = argparse.ArgumentParser(description='関連リンクのチェックの確認（スタブサーバー）')
+    parser.add_argument('--host-interval', type=float, default=0.3,
+                        help='同じホストへのリクエスト間隔（秒、デフォルト: 0.3）')
+    parser.add_argument('--pages', type=int, default=4, help='ホストごとの正常なページ数（デフォルト: 4）')
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    port = server.server_address[1]
+    # 同じサーバーを2つのホスト名で参照し、ホストごとの間隔を確かめる
+    hosts = [f"127.0.0.1:{port}", f"localhost:{port}"]
+    unreachable_url = f"http://127.0.0.1:{closed_port()}/page"
+
+    links = [
+        {"url": f"http://{host}/page{index}", "title": GENERIC_LINK_TITLE}
+        for host in hosts for index in range(args.pages)
+    ]
+    links += [
+        {"url": f"http://{hosts[0]}/missing", "title": "消えたページ"},
+        {"url": f"http://{hosts[1]}/gone", "title": "削除されたページ"},
+        {"url": f"http://{hosts[0]}/moved", "title": "移動したページ"},
+        {"url": unreachable_url, "title": "接続できないページ"},
+    ]
+    errors: List[str] = []
+
+    print(f"[INFO] リンク: {len(links)}件（ホスト {len(hosts)}個 + 接続できないURL）、"
+          f"ホストごとの間隔: {args.host_interval:g}秒\n")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_path = Path(tmp) / "link_check.json"
+        episodes = [{"number": "1", "links": [dict(link) for link in links]}]
+
+        stats = enrich_episode_links(
+            episodes, cache_path=cache_path, concurrency=8, host_interval=args.host_interval, prune=True
+        )
+        print()
+
+        # /moved のリダイレクト先は同じリクエストの中でたどるため、間隔の対象外
+        min_gap = min(min_host_gap(host) for host in hosts)
+        check(
+            "ホストごとの間隔", args.host_interval * 0.9 <= min_gap < float("inf"),
+            f"同じホストへのリクエスト間隔の最小 {min_gap:.2f}秒", errors
+        )
+
+        starts = [min(at for at, _ in StubHandler.requests_by_host[host]) for host in hosts]
+        check(
+            "別ホストは並列",
+            abs(starts[0] - starts[1]) < args.host_interval,
+            f"最初のリクエストの差 {abs(starts[0] - starts[1]):.2f}秒",
+            errors
+        )
+
+        kept_urls = [link["url"] for link in episodes[0]["links"]]
+        titled = sum(1 for link in episodes[0]["links"] if link["title"].startswith("ページ"))
+        check(
+            "リンク切れと接続不可",
+            stats["dead"] == 2 and stats["unreachable"] == 1 and stats["pruned"] == 2,
+            f"リンク切れ {stats['dead']}件、接続不可 {stats['unreachable']}件、削除 {stats['pruned']}件",
+            errors
+        )
+        check(
+            "--prune で接続不可のリンクを残す",
+            unreachable_url in kept_urls and not any(url.endswith(("/missing", "/gone")) for url in kept_urls),
+            f"残ったリンク {len(kept_urls)}件",
+            errors
+        )
+        check(
+            "タイトル補完とURL正規化",
+            titled == len(hosts) * args.pages and stats["redirected"] == 1
+            and f"http://{hosts[0]}/page-moved" in kept_urls,
+            f"タイトル補完 {titled}件、URL正規化 {stats['redirected']}件",
+            errors
+        )
+        first_requests = request_count()
+        check(
+            "1回目のリクエスト数", first_requests == len(links),
+            f"{first_requests}回（リンク {len(links)}件 + リダイレクト先1件 - 接続不可1件）",
+            errors
+        )
+
+        print()
+        stats = enrich_episode_links(
+            [{"number": "1", "links": [dict(link) for link in links]}],
+            cache_path=cache_path, host_interval=args.host_interval
+        )
+        check(
+            "2回目はキャッシュを使う",
+            stats["checked"] == 0 and request_count() == first_requests,
+            f"チェック {stats['checked']}件、追加のリクエスト {request_count() - first_requests}回",
+            errors
+        )
+
+        # 失敗したURL（接続不可・404・410）の有効期限（1日）が切れた状態にする
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+        for entry in cache["urls"].values():
+            entry["checked_at"] -= enrich_links.FAILED_CACHE_TTL_SECONDS + 60
+        with open(cache_path, 'w', encoding='utf-8') as f:
+            json.dump(cache, f)
+
+        print()
+        stats = enrich_episode_links(
+            [{"number": "1", "links": [dict(link) for link in links]}],
+            cache_path=cache_path, host_interval=args.host_interval
+        )
+        check(
+            "失敗したURLだけ再チェック",
+            stats["checked"] == 3,
+            f"チェック {stats['checked']}件（404・410・接続不可。到達できたURLは7日間有効）",
+            errors
+        )
+
+        # 同時実行数1: 別ホストの遅い応答の間に、同じホストへのチェックが順番待ちになる
+        StubHandler.slow_seconds = args.host_interval * 3
+        since = len(StubHandler.requests_by_host.get(hosts[0], []))
+        queued = [{"url": f"http://{hosts[1]}/slow", "title": "遅いページ"}]
+        queued += [{"url": f"http://{hosts[0]}/page-queued{index}", "title": "順番待ち"} for index in range(3)]
+        print()
+        enrich_episode_links(
+            [{"number": "2", "links": queued}],
+            cache_path=Path(tmp) / "link_check_queued.json", concurrency=1, host_interval=args.host_interval
+        )
+        queued_gap = min_host_gap(hosts[0], since)
+        check(
+            "順番待ちの後も間隔を空ける", args.host_interval * 0.9 <= queued_gap < float("inf"),
+            f"同じホストへのリクエスト間隔の最小 {queued_gap:.2f}秒（同時実行数1）", errors
+        )
+
+    server.shutdown()
+    if errors:
+        print(f"\n[ERROR] {len(errors)}件のケースが期待どおりではありません: {', '.join(errors)}")
+        sys.exit(1)
+    print("\n[OK] すべてのケースが期待どおりです")
+
+
+if __name__ == "__main__":
+    main()
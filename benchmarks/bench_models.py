@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+辞書とデータモデル（Episode / Transcript）のマイクロベンチマーク
+
+実データ（data/episodes.json と data/transcripts/）を使って、
+読み込み・マージ（コピーと比較）・保存の処理時間を辞書とモデルで比較する。
+
+使い方:
+    python benchmarks/bench_models.py
+    python benchmarks/bench_models.py --repeat 20
+"""
+
+import argparse
+import copy
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+from models import Episode, Transcript  # noqa: E402
+from utils import EPISODES_JSON_PATH, TRANSCRIPTS_DIR  # noqa: E402
+
+
+def best_of(repeat: int, func: Callable[[], Any]) -> float:
+    """repeat回実行して最短時間を返す"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def report(label: str, dict_time: float, model_time: float) -> None:
+    """辞書とモデルの比較結果を表示"""
+    ratio = dict_time / model_time if model_time else float("inf")
+    print(f"  {label:<28} dict {dict_time * 1000:9.2f} ms  model {model_time * 1000:9.2f} ms  ({ratio:4.2f}x)")
+
+
+def main() -> None:
+    """メイン処理"""
+    parser = argparse.ArgumentParser(description='辞書とデータモデルのマイクロベンチマーク')
+    parser.add_argument('--repeat', type=int, default=10, help='繰り返し回数（デフォルト: 10）')
+    args = parser.parse_args()
+
+    episodes_text = EPISODES_JSON_PATH.read_text(encoding='utf-8')
+    transcript_texts = [path.read_text(encoding='utf-8') for path in sorted(TRANSCRIPTS_DIR.glob("*.json"))]
+    print(f"[INFO] エピソード: {len(json.loads(episodes_text)['episodes'])}件、書き起こし: {len(transcript_texts)}件")
+
+    episode_dicts: List[Dict[str, Any]] = json.loads(episodes_text)['episodes']
+    episode_models = [Episode.from_dict(ep) for ep in episode_dicts]
+    transcript_dicts = [json.loads(text) for text in transcript_texts]
+    transcript_models = [Transcript.from_dict(data) for data in transcript_dicts]
+
+    print("\n[読み込み]")
+    report(
+        "episodes.json",
+        best_of(args.repeat, lambda: json.loads(episodes_text)['episodes']),
+        best_of(args.repeat, lambda: [Episode.from_dict(ep) for ep in json.loads(episodes_text)['episodes']]),
+    )
+    report(
+        "transcripts/*.json",
+        best_of(args.repeat, lambda: [json.loads(text) for text in transcript_texts]),
+        best_of(args.repeat, lambda: [Transcript.from_json(text) for text in transcript_texts]),
+    )
+
+    print("\n[マージ（コピーと比較）]")
+    report(
+        "episodes コピー",
+        best_of(args.repeat, lambda: copy.deepcopy(episode_dicts)),
+        best_of(args.repeat, lambda: [ep.copy() for ep in episode_models]),
+    )
+    dict_copies = copy.deepcopy(episode_dicts)
+    model_copies = [ep.copy() for ep in episode_models]
+    report(
+        "episodes 比較",
+        best_of(args.repeat, lambda: sum(a == b for a, b in zip(episode_dicts, dict_copies))),
+        best_of(args.repeat, lambda: sum(a == b for a, b in zip(episode_models, model_copies))),
+    )
+
+    print("\n[保存]")
+    report(
+        "episodes.json",
+        best_of(args.repeat, lambda: json.dumps({"episodes": episode_dicts}, indent=2, ensure_ascii=False)),
+        best_of(args.repeat, lambda: json.dumps(
+            {"episodes": [ep.to_dict() for ep in episode_models]}, indent=2, ensure_ascii=False
+        )),
+    )
+    report(
+        "transcripts/*.json",
+        best_of(args.repeat, lambda: [json.dumps(d, ensure_ascii=False, indent=2) for d in transcript_dicts]),
+        best_of(args.repeat, lambda: [t.to_json() for t in transcript_models]),
+    )
+
+
+if __name__ == "__main__":
+    main()
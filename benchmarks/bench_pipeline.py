@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+データ処理の主要経路のベンチマークスイート
+
+シードを固定した合成データ（benchmarks/synthetic.py）と、data/transcripts/ を
+--scale 倍（デフォルト10倍）に複製したコーパスを使って、以下を計測する。
+
+- テキスト処理: generate_tags, extract_urls_from_text, clean_description, clean_ai_output, pack_transcript
+- カタログ処理: merge_episodes, reindex_episodes, save_episodes
+- 書き起こしの読み込み: json.load, Transcript.load
+
+結果はJSONで保存でき（--output）、保存済みの結果（--baseline）と比較して、
+許容範囲（--tolerance）を超えて遅くなったケースがあれば終了コード1で終了する。
+
+使い方:
+    python benchmarks/bench_pipeline.py --output .cache/benchmarks/baseline.json
+    python benchmarks/bench_pipeline.py --baseline .cache/benchmarks/baseline.json
+    python benchmarks/bench_pipeline.py --filter text. --repeat 10
+"""
+
+import argparse
+import copy
+import io
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+import synthetic  # noqa: E402
+from models import Transcript  # noqa: E402
+from token_budget import pack_transcript  # noqa: E402
+from transcribe_podcast import TRANSCRIPT_TOKEN_BUDGET, clean_ai_output  # noqa: E402
+from update_episodes import (  # noqa: E402
+    clean_description, extract_urls_from_text, generate_tags, merge_episodes, reindex_episodes, save_episodes
+)
+from utils import TRANSCRIPTS_DIR  # noqa: E402
+
+# 結果ファイルの形式バージョン（ケースの内容を変えたら上げる）
+RESULTS_VERSION = 1
+
+# 現在のカタログの件数（--scale 倍した件数で計測する）
+CATALOG_EPISODES = 600
+
+# テキスト処理ケースの入力件数（--scale 倍する）
+TEXT_ITEMS = 600
+
+# pack_transcript ケースの入力件数（1件が長いため少なめ、--scale 倍する）
+PACK_ITEMS = 20
+
+# 遅くなったとみなす割合のデフォルト（0.25 = 25%以上遅い）
+DEFAULT_TOLERANCE = 0.25
+
+
+@dataclass
+class BenchCase:
+    """ベンチマークの1ケース"""
+
+    name: str
+    # 計測ごとに入力を作る関数（計測時間に含めない）
+    setup: Callable[[], Any]
+    # 計測する関数（setup の戻り値を受け取る）
+    func: Callable[[Any], Any]
+    # 1回の処理で扱う件数（スループットの計算用）
+    items: int
+    # ケースごとの許容範囲の下限（ディスクI/Oを含むケースはぶれが大きいため広めにする）
+    tolerance: Optional[float] = None
+
+
+def quiet(func: Callable[..., Any]) -> Callable[..., Any]:
+    """標準出力への表示を捨てて実行するラッパー（[INFO] 表示の時間を計測に含めない）"""
+    def wrapper(*args: Any) -> Any:
+        with redirect_stdout(io.StringIO()):
+            return func(*args)
+    return wrapper
+
+
+def measure(case: BenchCase, repeat: int) -> Dict[str, Any]:
+    """
+    ケースを1回空実行してから repeat 回計測
+
+    Args:
+        case: ベンチマークケース
+        repeat: 計測回数
+
+    Returns:
+        {"min_ms", "median_ms", "repeat", "items", "items_per_sec"}
+    """
+    case.func(case.setup())
+    times = []
+    for _ in range(repeat):
+        data = case.setup()
+        start = time.perf_counter()
+        case.func(data)
+        times.append(time.perf_counter() - start)
+    best = min(times)
+    return {
+        "min_ms": round(best * 1000, 4),
+        "median_ms": round(statistics.median(times) * 1000, 4),
+        "repeat": repeat,
+        "items": case.items,
+        "items_per_sec": round(case.items / best, 1) if best else None,
+    }
+
+
+def build_cases(scale: int, seed: int, work_dir: Path) -> Tuple[List[BenchCase], Dict[str, int]]:
+    """
+    合成データを作成してケースの一覧を組み立てる
+
+    Args:
+        scale: データ量の倍率
+        seed: 乱数のシード
+        work_dir: 一時ファイルの作成先
+
+    Returns:
+        (ケースのリスト, 書き起こしコーパスの情報)
+    """
+    rng = random.Random(seed)
+    text_items = TEXT_ITEMS * scale
+    titles = [synthetic.make_title(rng, synthetic.make_episode_number(i)) for i in range(text_items)]
+    descriptions = [synthetic.make_description(rng) for _ in range(text_items)]
+    plain_descriptions = [clean_description(text) for text in descriptions]
+    ai_outputs = [synthetic.make_ai_output(rng) for _ in range(text_items)]
+
+    episode_count = CATALOG_EPISODES * scale
+    catalog = synthetic.make_catalog(rng, episode_count)
+    # RSSから取得した想定の新規エピソード（既存の最新10件の更新と、新しい20件）
+    feed = [dict(ep, links=[{"title": "関連リンク", "url": synthetic.make_url(rng)}]) for ep in catalog[-10:]]
+    feed += [synthetic.make_episode(rng, episode_count + i) for i in range(20)]
+    shuffled = catalog[:]
+    rng.shuffle(shuffled)
+
+    catalog_path = work_dir / "episodes.json"
+    corpus_dir = work_dir / "transcripts"
+    corpus = synthetic.build_scaled_corpus(corpus_dir, scale, TRANSCRIPTS_DIR, rng)
+    corpus_paths = sorted(corpus_dir.glob("*.json"))
+    # 既存のケースの合成データが変わらないように、乱数は最後に使う
+    pack_items = PACK_ITEMS * scale
+    long_transcripts = [
+        synthetic.make_transcript(rng, synthetic.make_episode_number(i))["transcript"] for i in range(pack_items)
+    ]
+
+    def load_json_all(paths: List[Path]) -> None:
+        for path in paths:
+            with open(path, 'r', encoding='utf-8') as f:
+                json.load(f)
+
+    def load_models_all(paths: List[Path]) -> None:
+        for path in paths:
+            Transcript.load(path)
+
+    return [
+        BenchCase("text.generate_tags", lambda: list(zip(titles, plain_descriptions)),
+                  lambda pairs: [generate_tags(title, text) for title, text in pairs], text_items),
+        BenchCase("text.extract_urls_from_text", lambda: plain_descriptions,
+                  lambda texts: [extract_urls_from_text(text) for text in texts], text_items),
+        BenchCase("text.clean_description", lambda: descriptions,
+                  lambda texts: [clean_description(text) for text in texts], text_items),
+        BenchCase("text.clean_ai_output", lambda: ai_outputs,
+                  lambda texts: [clean_ai_output(text, synthetic.AI_PREFIXES) for text in texts], text_items),
+        BenchCase("text.pack_transcript", lambda: long_transcripts,
+                  lambda texts: [pack_transcript(text, TRANSCRIPT_TOKEN_BUDGET) for text in texts], pack_items),
+        BenchCase("catalog.merge_episodes", lambda: (copy.deepcopy(catalog), copy.deepcopy(feed)),
+                  quiet(lambda data: merge_episodes(*data)), episode_count),
+        BenchCase("catalog.reindex_episodes", lambda: copy.deepcopy(shuffled),
+                  quiet(lambda episodes: reindex_episodes(episodes)), episode_count),
+        BenchCase("catalog.save_episodes", lambda: catalog,
+                  quiet(lambda episodes: save_episodes(episodes, catalog_path)), episode_count, tolerance=0.5),
+        BenchCase("transcripts.json_load", lambda: corpus_paths,
+                  load_json_all, corpus["files"], tolerance=0.5),
+        BenchCase("transcripts.model_load", lambda: corpus_paths,
+                  load_models_all, corpus["files"], tolerance=0.5),
+    ], corpus
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float,
+            tolerances: Dict[str, Optional[float]]) -> List[str]:
+    """
+    ベースラインと比較して結果を表示
+
+    Args:
+        results: 今回の結果
+        baseline: ベースラインの結果
+        tolerance: デフォルトの許容範囲
+        tolerances: ケース名 → ケースごとの許容範囲
+
+    Returns:
+        許容範囲を超えて遅くなったケース名のリスト
+    """
+    if baseline.get("version") != RESULTS_VERSION or baseline.get("scale") != results["scale"]:
+        print("[WARNING] ベースラインの形式またはデータ量（--scale）が異なるため、比較できません")
+        return []
+
+    regressions = []
+    print(f"\n  {'ケース':<30} {'基準':>10} {'今回':>10} {'変化':>8}")
+    for name, current in results["cases"].items():
+        base = baseline["cases"].get(name)
+        if not base or base.get("items") != current["items"] or not base.get("min_ms"):
+            print(f"  {name:<30} {'-':>10} {current['min_ms']:8.2f}ms {'新規':>8}")
+            continue
+        change = current["min_ms"] / base["min_ms"] - 1
+        limit = max(tolerances.get(name) or 0.0, tolerance)
+        mark = ""
+        if change > limit:
+            regressions.append(name)
+            mark = f"  [REGRESSION] 許容 +{limit:.0%}"
+        print(f"  {name:<30} {base['min_ms']:8.2f}ms {current['min_ms']:8.2f}ms {change:+7.1%}{mark}")
+    return regressions
+
+
+def main() -> None:
+    """メイン処理"""
+    parser = argparse.ArgumentParser(description='データ処理の主要経路のベンチマークスイート')
+    parser.add_argument('--scale', type=int, default=10,
+                        help='データ量の倍率（現在のカタログ・書き起こしに対する倍率、デフォルト: 10）')
+    parser.add_argument('--seed', type=int, default=0, help='合成データの乱数シード（デフォルト: 0）')
+    parser.add_argument('--repeat', type=int, default=5, help='各ケースの計測回数（デフォルト: 5）')
+    parser.add_argument('--filter', type=str, default=None, help='ケース名にこの文字列を含むものだけ実行')
+    parser.add_argument('--output', type=str, default=None, help='結果を保存するJSONファイル')
+    parser.add_argument('--baseline', type=str, default=None, help='比較するベースラインの結果JSON')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help=f'遅くなったとみなす割合（デフォルト: {DEFAULT_TOLERANCE}、I/Oを含むケースは0.5）')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"[INFO] 合成データを作成中（倍率: {args.scale}、シード: {args.seed}）")
+        cases, corpus = build_cases(args.scale, args.seed, Path(tmp))
+        if args.filter:
+            cases = [case for case in cases if args.filter in case.name]
+        print(f"[INFO] 書き起こしコーパス: {corpus['files']}件（元: {corpus['source_files']}件、"
+              f"{corpus['bytes'] / 1024 / 1024:.1f} MB）\n")
+
+        results: Dict[str, Any] = {
+            "version": RESULTS_VERSION,
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "scale": args.scale,
+            "seed": args.seed,
+            "corpus": corpus,
+            "cases": {},
+        }
+        print(f"  {'ケース':<30} {'最短':>10} {'中央値':>10} {'件数':>8} {'件/秒':>12}")
+        for case in cases:
+            measured = measure(case, args.repeat)
+            results["cases"][case.name] = measured
+            print(f"  {case.name:<30} {measured['min_ms']:8.2f}ms {measured['median_ms']:8.2f}ms "
+                  f"{measured['items']:8d} {measured['items_per_sec'] or 0:12.0f}")
+
+    if args.output:
+        output_path = Path(args.output)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        output_path.write_text(json.dumps(results, ensure_ascii=False, indent=2) + "\n", encoding='utf-8')
+        print(f"\n[OK] 結果を保存しました: {output_path}")
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance, {case.name: case.tolerance for case in cases})
+        if regressions:
+            print(f"\n[ERROR] 許容範囲を超えて遅くなったケース: {', '.join(regressions)}")
+            sys.exit(1)
+        print("\n[OK] 許容範囲を超えて遅くなったケースはありません")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+X投稿の再実行で投稿キューが詰まらないかの確認（スタブサーバー）
+
+ローカルのスタブサーバーを X API の代わりにして post_to_x.run を2回実行し、次を確かめる。
+期待どおりでない場合は終了コード1で終了する。
+
+- 1回目: スタブはツイートを作成したうえで応答せずに切断する（投稿されたが応答を受け取れなかった状態）
+- 2回目: 同じツイートに「重複したツイート」(403) が返るが、状態ファイルの送信中の記録（in_flight）から
+  投稿済みと判断してキューから外し、残りのエピソードも投稿してキューが空になる
+- 参考: in_flight の記録を消した状態ファイルでは、従来どおり先頭が失敗してキューが残る
+
+使い方:
+    python benchmarks/bench_post_state.py
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Set
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+# 認証情報はモジュールの読み込み時に環境変数から取得される
+for name in ("X_API_KEY", "X_API_SECRET", "X_ACCESS_TOKEN", "X_ACCESS_TOKEN_SECRET"):
+    os.environ.setdefault(name, "dummy")
+
+import post_to_x  # noqa: E402
+
+RSS = """<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0"><channel><title>stub</title>
+<item><title>ep9.9.1 一つ目</title><link>https://example.com/ep9.9.1</link>
+<pubDate>Mon, 01 Jan 2024 00:00:00 +0000</pubDate></item>
+<item><title>ep9.9.2 二つ目</title><link>https://example.com/ep9.9.2</link>
+<pubDate>Tue, 02 Jan 2024 00:00:00 +0000</pubDate></item>
+</channel></rss>
+"""
+
+
+class StubXHandler(BaseHTTPRequestHandler):
+    """POST /2/tweets のスタブ（同じ本文の2回目は重複エラー）"""
+
+    created: List[str] = []
+    drop_responses = False
+
+    def do_POST(self) -> None:
+        length = int(self.headers.get("Content-Length", "0"))
+        text = json.loads(self.rfile.read(length))["text"]
+        if text in self.created:
+            body = json.dumps({"detail": "You are not allowed to create a Tweet with duplicate content."})
+            self.send_response(403)
+        else:
+            self.created.append(text)
+            if self.drop_responses:
+                # 作成したが応答を返さない
+                self.close_connection = True
+                return
+            body = json.dumps({"data": {"id": str(len(self.created)), "text": text}})
+            self.send_response(201)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body.encode("utf-8"))
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+
+def run_once(feed_path: Path) -> int:
+    """別プロセスでの実行と同じように、プロセス内の記録を消してから run を実行し、終了コードを返す"""
+    post_to_x._posted_texts.clear()
+    post_to_x._http_session = None
+    args = argparse.Namespace(dry_run=False, feed=str(feed_path), max_posts=3, interval=0)
+    try:
+        post_to_x.run(args)
+    except SystemExit as e:
+        return e.code or 0
+    return 0
+
+
+def read_state(state_path: Path) -> Dict:
+    """状態ファイルを読む"""
+    with open(state_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def check(name: str, ok: bool, detail: str, errors: List[str]) -> None:
+    """結果を表示し、失敗を記録"""
+    print(f"  [{'OK' if ok else 'NG'}] {name}: {detail}")
+    if not ok:
+        errors.append(name)
+
+
+def scenario(work: Path, keep_in_flight: bool) -> Dict:
+    """
+    応答を失った実行の後に再実行する
+
+    Args:
+        work: 作業ディレクトリ
+        keep_in_flight: False の場合は1回目の後に状態ファイルから in_flight を消す（従来の状態ファイル）
+
+    Returns:
+        {"first": 1回目の終了コード, "second": 2回目の終了コード, "state": 2回目の後の状態, "created": 作成されたツイート}
+    """
+    feed_path = work / "feed.xml"
+    feed_path.write_text(RSS, encoding="utf-8")
+    state_path = work / "state.json"
+    state_path.write_text(json.dumps({"posted_episodes": [], "queue": []}), encoding="utf-8")
+    post_to_x.STATE_FILE = state_path
+    StubXHandler.created = []
+
+    StubXHandler.drop_responses = True
+    first = run_once(feed_path)
+    if not keep_in_flight:
+        state = read_state(state_path)
+        state.pop("in_flight", None)
+        state_path.write_text(json.dumps(state), encoding="utf-8")
+
+    StubXHandler.drop_responses = False
+    second = run_once(feed_path)
+    return {"first": first, "second": second, "state": read_state(state_path), "created": list(StubXHandler.created)}
+
+
+def main() -> None:
+    """メイン処理"""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubXHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    post_to_x.X_API_V2_POST_URL = f"http://127.0.0.1:{server.server_address[1]}/2/tweets"
+    # 1回目の実行でバックオフの待機をしない（すべての試行が応答を失った場合と同じ結果になる）
+    post_to_x.POST_MAX_ATTEMPTS = 1
+    errors: List[str] = []
+
+    with tempfile.TemporaryDirectory() as tmp:
+        print("[INFO] in_flight の記録あり\n")
+        result = scenario(Path(tmp), keep_in_flight=True)
+        state = result["state"]
+        posted: Set[str] = set(state.get("posted_episodes", []))
+        print()
+        check("1回目は失敗として終了", result["first"] == 1, f"終了コード {result['first']}", errors)
+        check(
+            "2回目でキューが空になる",
+            result["second"] == 0 and not state.get("queue") and posted == {"9.9.1", "9.9.2"},
+            f"終了コード {result['second']}、キュー {len(state.get('queue', []))}件、投稿済み {sorted(posted)}",
+            errors
+        )
+        check(
+            "二重投稿しない", len(result["created"]) == len(set(result["created"])) == 2,
+            f"作成されたツイート {len(result['created'])}件", errors
+        )
+        check("in_flight の記録を消す", state.get("in_flight") is None, f"in_flight={state.get('in_flight')}", errors)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        print("\n[INFO] 参考: in_flight の記録なし（従来の状態ファイル）\n")
+        result = scenario(Path(tmp), keep_in_flight=False)
+        print()
+        check(
+            "記録が無ければ先頭が詰まる",
+            result["second"] == 1 and len(result["state"].get("queue", [])) == 2,
+            f"終了コード {result['second']}、キュー {len(result['state'].get('queue', []))}件",
+            errors
+        )
+
+    server.shutdown()
+    if errors:
+        print(f"\n[ERROR] {len(errors)}件のケースが期待どおりではありません: {', '.join(errors)}")
+        sys.exit(1)
+    print("\n[OK] すべてのケースが期待どおりです")
+
+
+if __name__ == "__main__":
+    main()
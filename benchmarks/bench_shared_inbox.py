@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+複数のワーカーで1つの入力フォルダを分担できるかの確認
+
+無音の wav を --episodes 件作り、transcribe_podcast.py --watch（fake バックエンド、文字起こしに --delay 秒かかる）を
+--workers 個同時に起動する。--kill を指定した場合は、最初のワーカーを処理の途中で強制終了（SIGKILL 相当）する。
+ワーカーごとにジョブのデータベースと台帳を分ける（別々のマシンを想定）。
+
+すべての音声ファイルがバックアップに移動したら残りのワーカーを停止し、次を確かめる。
+満たさない場合は終了コード1で終了する。
+
+- すべての音声ファイルがちょうど1回ずつ完了している
+- 入力フォルダと processing/ に音声ファイルが残っていない（強制終了しない場合は processing/ 自体も残らない）
+- 2回処理を開始したファイルは、強制終了したワーカーが取得していたものだけ
+
+使い方:
+    python benchmarks/bench_shared_inbox.py
+    python benchmarks/bench_shared_inbox.py --workers 4 --episodes 20 --kill
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+import wave
+from collections import Counter
+from pathlib import Path
+from typing import List
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent / "scripts"
+
+# fake バックエンドの文字起こしに時間がかかるようにして transcribe_podcast.py を実行する
+WORKER_CODE = """
+import sys, time
+sys.path.insert(0, {scripts!r})
+import transcription_backends
+delay = float(sys.argv[1])
+original = transcription_backends.FakeBackend.transcribe
+def transcribe(self, audio_path, prompt):
+    time.sleep(delay)
+    return original(self, audio_path, prompt)
+transcription_backends.FakeBackend.transcribe = transcribe
+import transcribe_podcast
+sys.argv = ["transcribe_podcast.py"] + sys.argv[2:]
+transcribe_podcast.main()
+"""
+
+STARTED_PATTERN = re.compile(r'^\[INFO\] 処理を開始します: ([^\s（]+)', re.MULTILINE)
+COMPLETED_PATTERN = re.compile(r'^\[OK\] (\S+) の処理が完了しました', re.MULTILINE)
+
+
+def write_silence(path: Path, seconds: int) -> None:
+    """無音の wav を作成（更新時刻を過去にして、すぐに処理できるものとする）"""
+    with wave.open(str(path), 'wb') as f:
+        f.setnchannels(1)
+        f.setsampwidth(1)
+        f.setframerate(1000)
+        f.writeframes(b"\x80" * 1000 * seconds)
+    past = time.time() - 3600
+    os.utime(path, (past, past))
+
+
+def main() -> None:
+    """メイン処理"""
+    parser = argparse.ArgumentParser(description='複数のワーカーで1つの入力フォルダを分担できるかの確認')
+    parser.add_argument('--workers', type=int, default=3, help='ワーカーの数（デフォルト: 3）')
+    parser.add_argument('--episodes', type=int, default=12, help='音声ファイルの件数（デフォルト: 12）')
+    parser.add_argument('--delay', type=float, default=1.0, help='1件の文字起こしにかかる秒数（デフォルト: 1.0）')
+    parser.add_argument('--kill', action='store_true', help='最初のワーカーを処理の途中で強制終了する')
+    parser.add_argument('--timeout', type=float, default=300, help='全件が終わるまで待つ最大の秒数（デフォルト: 300）')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        work = Path(tmp)
+        input_dir = work / "input"
+        backup_dir = work / "backup"
+        input_dir.mkdir()
+        names = [f"ep9.8.{index}.wav" for index in range(1, args.episodes + 1)]
+        for name in names:
+            write_silence(input_dir / name, 60)
+        env = dict(
+            os.environ, PODCAST_INPUT_DIR=str(input_dir), PODCAST_OUTPUT_DIR=str(work / "output"),
+            PODCAST_BACKUP_DIR=str(backup_dir), PYTHONDONTWRITEBYTECODE="1", PYTHONUNBUFFERED="1"
+        )
+        code = WORKER_CODE.format(scripts=str(SCRIPTS_DIR))
+
+        print(f"[INFO] ワーカー: {args.workers}、音声ファイル: {args.episodes}件、文字起こし: {args.delay:g}秒/件")
+        start = time.perf_counter()
+        workers: List[subprocess.Popen] = []
+        logs: List[Path] = []
+        for index in range(args.workers):
+            log_path = work / f"worker{index}.log"
+            logs.append(log_path)
+            with open(log_path, 'w', encoding='utf-8') as log:
+                workers.append(subprocess.Popen(
+                    [sys.executable, "-c", code, str(args.delay), "--backend", "fake", "--watch",
+                     "--concurrency", "1", "--settle-seconds", "0.5", "--poll-interval", "0.5",
+                     "--worker-id", f"worker{index}", "--lease-seconds", "5",
+                     "--jobs", str(work / f"jobs{index}.db"), "--ledger", str(work / f"ledger{index}.jsonl")],
+                    cwd=SCRIPTS_DIR, env=env, stdout=log, stderr=subprocess.STDOUT
+                ))
+
+        killed = None
+        if args.kill:
+            # 最初のワーカーが処理を始めたら強制終了する
+            deadline = time.monotonic() + args.timeout
+            while time.monotonic() < deadline and not STARTED_PATTERN.search(logs[0].read_text(encoding='utf-8')):
+                time.sleep(0.1)
+            time.sleep(args.delay / 2)
+            workers[0].kill()
+            workers[0].wait()
+            killed = 0
+            print("[INFO] worker0 を強制終了しました")
+
+        deadline = time.monotonic() + args.timeout
+        while time.monotonic() < deadline:
+            if backup_dir.is_dir() and len(list(backup_dir.glob("*.wav"))) >= len(names):
+                break
+            time.sleep(0.2)
+        elapsed = time.perf_counter() - start
+        for index, worker in enumerate(workers):
+            if index != killed:
+                worker.terminate()
+        for worker in workers:
+            worker.wait()
+
+        started: Counter = Counter()
+        completed: Counter = Counter()
+        killed_started = set()
+        print(f"\n  {'ワーカー':<10} {'開始':>6} {'完了':>6}")
+        for index, log_path in enumerate(logs):
+            text = log_path.read_text(encoding='utf-8')
+            worker_started = STARTED_PATTERN.findall(text)
+            worker_completed = COMPLETED_PATTERN.findall(text)
+            started.update(worker_started)
+            completed.update(worker_completed)
+            if index == killed:
+                killed_started.update(worker_started)
+            suffix = "（強制終了）" if index == killed else ""
+            print(f"  worker{index:<4} {len(worker_started):6d} {len(worker_completed):6d}{suffix}")
+
+        errors = []
+        not_once = sorted(name for name in names if completed[name] != 1)
+        if not_once:
+            errors.append(f"完了が1回でないファイル: {', '.join(f'{name}({completed[name]})' for name in not_once)}")
+        left = sorted(path.name for path in input_dir.rglob("*.wav"))
+        if left:
+            errors.append(f"入力フォルダに残ったファイル: {', '.join(left)}")
+        if killed is None and (input_dir / "processing").exists():
+            errors.append("停止したワーカーが processing/ を片付けていません")
+        duplicated = sorted(name for name, count in started.items() if count > 1)
+        unexpected = [name for name in duplicated if name not in killed_started]
+        if unexpected:
+            errors.append(f"二重に処理を開始したファイル: {', '.join(unexpected)}")
+
+        print(f"\n[INFO] 所要時間: {elapsed:.1f}秒（1ワーカーで順に処理した場合の文字起こし時間 "
+              f"{args.delay * len(names):.1f}秒）")
+        if duplicated:
+            print(f"[INFO] 強制終了したワーカーから回収して処理し直したファイル: {', '.join(duplicated)}")
+        if errors:
+            for error in errors:
+                print(f"[ERROR] {error}")
+            sys.exit(1)
+        print(f"[OK] {len(names)}件をワーカー間で重複なく処理しました")
+
+
+if __name__ == "__main__":
+    main()
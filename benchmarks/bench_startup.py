@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+スクリプトの起動時間ベンチマーク
+
+scripts/ の各モジュールについて、python -X importtime で計測した読み込み時間と
+`--help` の実行時間を表示する。--max-import-ms を指定すると、上限を超えたモジュールがあれば
+終了コード1で終了するため、重いインポートがトップレベルに戻った場合に気付ける。
+
+使い方:
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --max-import-ms 100
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent / "scripts"
+
+# `--help` を持つ（argparseを使う）スクリプト
+CLI_SCRIPTS = [
+    "update_episodes", "post_to_x", "check_data", "episode_store", "enrich_links",
+    "corpus_replace", "transcribe_podcast", "transcript_metadata", "usage_ledger",
+    "transcription_jobs",
+]
+
+IMPORTTIME_PATTERN = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)$')
+
+
+def run_python(args: List[str]) -> subprocess.CompletedProcess:
+    """scripts/ をカレントディレクトリにしてPythonを実行"""
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="1")
+    return subprocess.run(
+        [sys.executable, *args], cwd=SCRIPTS_DIR, env=env,
+        capture_output=True, text=True, encoding='utf-8'
+    )
+
+
+def measure_import(module: str) -> Optional[Dict[str, float]]:
+    """
+    モジュールの読み込み時間を計測
+
+    Args:
+        module: モジュール名
+
+    Returns:
+        {"total_ms": 累積時間, "top": [(モジュール名, 累積ms)]}（読み込みに失敗した場合はNone）
+    """
+    result = run_python(["-X", "importtime", "-c", f"import {module}"])
+    if result.returncode != 0:
+        return None
+
+    entries = []
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_PATTERN.match(line)
+        if match:
+            entries.append((match.group(4), len(match.group(3)), int(match.group(2)) / 1000))
+
+    # importtime は子モジュールを親より先に出力するため、対象モジュールの行から遡って子を集める
+    total = 0.0
+    children = []
+    for index in range(len(entries) - 1, -1, -1):
+        name, indent, cumulative = entries[index]
+        if name == module and indent == 1:
+            total = cumulative
+            for child_name, child_indent, child_cumulative in reversed(entries[:index]):
+                if child_indent <= 1:
+                    break
+                if child_indent == 3:
+                    children.append((child_name, child_cumulative))
+            break
+    children.sort(key=lambda item: item[1], reverse=True)
+    return {"total_ms": total, "top": children[:3]}
+
+
+def measure_help(module: str, repeat: int) -> float:
+    """`python スクリプト --help` の実行時間（最短、ミリ秒）"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run_python([f"{module}.py", "--help"])
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main() -> None:
+    """メイン処理"""
+    parser = argparse.ArgumentParser(description='スクリプトの起動時間ベンチマーク')
+    parser.add_argument('--repeat', type=int, default=3, help='--help の計測回数（デフォルト: 3）')
+    parser.add_argument('--max-import-ms', type=float, default=None,
+                        help='モジュールの読み込み時間の上限（ミリ秒、超えた場合は終了コード1）')
+    args = parser.parse_args()
+
+    baseline = float("inf")
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        run_python(["-c", "pass"])
+        baseline = min(baseline, (time.perf_counter() - start) * 1000)
+    print(f"[INFO] Python自体の起動: {baseline:.1f} ms\n")
+    print(f"  {'モジュール':<24} {'import':>10} {'--help':>10}  主な読み込み")
+
+    over_limit = []
+    modules = sorted(path.stem for path in SCRIPTS_DIR.glob("*.py"))
+    for module in modules:
+        measured = measure_import(module)
+        if measured is None:
+            print(f"  {module:<24} {'失敗':>10}")
+            continue
+        help_ms = f"{measure_help(module, args.repeat):8.1f}ms" if module in CLI_SCRIPTS else ""
+        top = ", ".join(f"{name} {ms:.0f}ms" for name, ms in measured["top"] if ms >= 1)
+        print(f"  {module:<24} {measured['total_ms']:8.1f}ms {help_ms:>10}  {top}")
+        if args.max_import_ms is not None and measured["total_ms"] > args.max_import_ms:
+            over_limit.append(module)
+
+    if over_limit:
+        print(f"\n[ERROR] 読み込み時間が上限（{args.max_import_ms} ms）を超えました: {', '.join(over_limit)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+文字起こしバックエンドの比較ベンチマーク
+
+同じ音声ファイルを複数のバックエンドで文字起こしし、処理時間・文字数・タイムスタンプ数を比較する。
+gemini はAPIキー、whisper は faster-whisper が必要（使えないバックエンドはスキップする）。
+
+使い方:
+    python benchmarks/bench_transcription_backends.py data_voice/ep1.0.1.mp3
+    python benchmarks/bench_transcription_backends.py sample.mp3 --backends fake,whisper --whisper-model tiny
+"""
+
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+from transcribe_podcast import transcribe_audio  # noqa: E402
+from transcription_backends import BACKENDS, WHISPER_MODEL_SIZE, BackendError, create_backend  # noqa: E402
+
+TIMESTAMP_PATTERN = re.compile(r'^\[\d+(?::\d{2}){1,2}\]', re.MULTILINE)
+
+
+def main() -> None:
+    """メイン処理"""
+    parser = argparse.ArgumentParser(description='文字起こしバックエンドの比較ベンチマーク')
+    parser.add_argument('audio', type=str, help='音声ファイルのパス')
+    parser.add_argument('--backends', type=str, default=','.join(BACKENDS),
+                        help=f'比較するバックエンド（カンマ区切り、デフォルト: {",".join(BACKENDS)}）')
+    parser.add_argument('--whisper-model', type=str, default=WHISPER_MODEL_SIZE,
+                        help=f'whisperのモデルサイズ（デフォルト: {WHISPER_MODEL_SIZE}）')
+    parser.add_argument('--output-dir', type=str, default=None,
+                        help='各バックエンドの文字起こし結果を保存するフォルダ')
+    args = parser.parse_args()
+
+    audio_path = Path(args.audio)
+    size_mb = audio_path.stat().st_size / 1024 / 1024
+    print(f"[INFO] 音声ファイル: {audio_path.name}（{size_mb:.1f} MB）\n")
+
+    for name in args.backends.split(','):
+        options = {"model_size": args.whisper_model} if name == "whisper" else {}
+        try:
+            start = time.perf_counter()
+            backend = create_backend(name, **options)
+            setup_time = time.perf_counter() - start
+        except BackendError as e:
+            print(f"  {name:<8} スキップ: {str(e).splitlines()[0]}")
+            continue
+
+        try:
+            start = time.perf_counter()
+            text = transcribe_audio(audio_path, backend)
+            elapsed = time.perf_counter() - start
+        finally:
+            backend.close()
+
+        timestamps = len(TIMESTAMP_PATTERN.findall(text))
+        print(f"  {name:<8} 初期化 {setup_time:7.2f} s  文字起こし {elapsed:8.2f} s  "
+              f"{len(text):7d}文字  タイムスタンプ {timestamps:5d}個")
+
+        if args.output_dir:
+            output_dir = Path(args.output_dir)
+            output_dir.mkdir(parents=True, exist_ok=True)
+            (output_dir / f"{audio_path.stem}.{name}.txt").write_text(text, encoding='utf-8')
+
+
+if __name__ == "__main__":
+    main()
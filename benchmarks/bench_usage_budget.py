@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+1日の予算（--daily-tokens）に収まるかの確認
+
+data/episodes.json の再生時間（無い場合は乱数）で無音の wav を作り、fake バックエンドで
+transcribe_podcast.py を同じ日に --runs 回実行する。台帳に記録された今日の使用量が予算を超えた場合は
+終了コード1で終了する。実行ごとの見積もりと実績、予算超過で次回に回した件数を表示する。
+
+使い方:
+    python benchmarks/bench_usage_budget.py
+    python benchmarks/bench_usage_budget.py --episodes 20 --daily-tokens 300000 --runs 3
+"""
+
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import wave
+from pathlib import Path
+from typing import List
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent / "scripts"
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+from usage_ledger import UsageLedger, billed_tokens  # noqa: E402
+from utils import EPISODES_JSON_PATH  # noqa: E402
+
+# 作成する wav のサンプリングレート（長さだけが意味を持つため小さくする）
+SAMPLE_RATE = 1000
+
+
+def load_durations(count: int, seed: int) -> List[int]:
+    """
+    エピソードの再生時間（秒）を取得（カタログが無い場合は乱数）
+
+    Args:
+        count: 件数
+        seed: 乱数のシード
+
+    Returns:
+        再生時間のリスト
+    """
+    rng = random.Random(seed)
+    durations = []
+    if EPISODES_JSON_PATH.exists():
+        with open(EPISODES_JSON_PATH, 'r', encoding='utf-8') as f:
+            for episode in json.load(f).get("episodes", []):
+                seconds = 0
+                for part in (episode.get("duration") or "").split(":"):
+                    seconds = seconds * 60 + int(part) if part.isdigit() else 0
+                if seconds:
+                    durations.append(seconds)
+    if not durations:
+        durations = [rng.randint(300, 2400) for _ in range(count)]
+    return [rng.choice(durations) for _ in range(count)]
+
+
+def write_silence(path: Path, seconds: int) -> None:
+    """無音の wav を作成"""
+    with wave.open(str(path), 'wb') as f:
+        f.setnchannels(1)
+        f.setsampwidth(1)
+        f.setframerate(SAMPLE_RATE)
+        f.writeframes(b"\x80" * SAMPLE_RATE * seconds)
+
+
+def main() -> None:
+    """メイン処理"""
+    parser = argparse.ArgumentParser(description='1日の予算に収まるかの確認（fake バックエンド）')
+    parser.add_argument('--episodes', type=int, default=10, help='音声ファイルの件数（デフォルト: 10）')
+    parser.add_argument('--daily-tokens', type=int, default=200000, help='1日のトークン数の上限（デフォルト: 200000）')
+    parser.add_argument('--runs', type=int, default=2, help='同じ日に実行する回数（デフォルト: 2）')
+    parser.add_argument('--seed', type=int, default=0, help='乱数のシード（デフォルト: 0）')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        work = Path(tmp)
+        input_dir = work / "input"
+        input_dir.mkdir()
+        for index, seconds in enumerate(load_durations(args.episodes, args.seed), 1):
+            write_silence(input_dir / f"ep9.9.{index}.wav", seconds)
+        ledger_path = work / "usage_ledger.jsonl"
+        env = dict(
+            os.environ, PODCAST_INPUT_DIR=str(input_dir), PODCAST_OUTPUT_DIR=str(work / "output"),
+            PODCAST_BACKUP_DIR=str(work / "backup"), PYTHONDONTWRITEBYTECODE="1"
+        )
+
+        print(f"[INFO] 音声ファイル: {args.episodes}件、1日の予算: {args.daily_tokens:,}トークン\n")
+        print(f"  {'実行':>4} {'処理':>6} {'残り':>6} {'見積もり':>12} {'実績':>12} {'今日の合計':>12}")
+        for run in range(1, args.runs + 1):
+            start = len(UsageLedger(ledger_path).records)
+            result = subprocess.run(
+                [sys.executable, str(SCRIPTS_DIR / "transcribe_podcast.py"), "--backend", "fake",
+                 "--daily-tokens", str(args.daily_tokens), "--ledger", str(ledger_path),
+                 "--jobs", str(work / "transcription_jobs.db")],
+                env=env, capture_output=True, text=True, encoding='utf-8'
+            )
+            if result.returncode != 0:
+                print(result.stdout[-2000:], result.stderr[-2000:])
+                print(f"[ERROR] transcribe_podcast.py が終了コード {result.returncode} で終了しました")
+                sys.exit(1)
+            ledger = UsageLedger(ledger_path)
+            episodes = [record for record in ledger.records[start:] if record.get("type") == "episode"]
+            projected = sum(billed_tokens(record["projected"]) for record in episodes)
+            actual = sum(billed_tokens(record["actual"]) for record in episodes)
+            remaining = len(list(input_dir.glob("*.wav")))
+            print(f"  {run:4d} {len(episodes):6d} {remaining:6d} {projected:12,d} {actual:12,d} "
+                  f"{billed_tokens(ledger.today()):12,d}")
+
+        used = billed_tokens(UsageLedger(ledger_path).today())
+        if used > args.daily_tokens:
+            print(f"\n[ERROR] 今日の使用量 {used:,} が予算 {args.daily_tokens:,} を超えました")
+            sys.exit(1)
+        print(f"\n[OK] 今日の使用量 {used:,} は予算 {args.daily_tokens:,} に収まっています")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+ベンチマーク用の合成データ生成
+
+乱数のシードを固定して、エピソード・RSSの説明文・AI出力・書き起こしJSONを生成する。
+同じシードと件数なら毎回同じデータになるため、ベンチマークの結果を実行間で比較できる。
+
+実データの書き起こし（data/transcripts/）を何倍にも複製したコーパスの作成もここで行う。
+"""
+
+import json
+import random
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# 文章の材料（タグ判定のキーワードを含む語と含まない語を混ぜる）
+WORDS = [
+    "シビックテック", "オープンデータ", "コミュニティ", "ハッカソン", "行政", "地域", "富山", "長崎", "金沢",
+    "ゲスト", "イベント", "ふりかえり", "生成AI", "ChatGPT", "GitHub", "アプリ", "開発", "データ", "API",
+    "日本酒", "グルメ", "猫", "歴史", "教育", "雑談", "ポッドキャスト", "収録", "リスナー", "お便り",
+    "今回は", "について", "話しました", "紹介します", "という", "ことで", "みんなで", "考える",
+]
+
+SPEAKERS = ["石井", "小俣", "太田", "高木"]
+
+URL_HOSTS = [
+    "https://example.com", "https://www.code4japan.org", "https://github.com/example",
+    "https://podcasters.spotify.com/pod/show/civictechcast", "https://anchor.fm/civictechcast",
+    "https://d3ctxlq1ktw2nl.cloudfront.net/staging",
+]
+
+AI_PREFIXES = ["要約", "まとめ", "サブタイトル", "説明", "Summary"]
+
+
+def make_sentence(rng: random.Random, words: int = 12) -> str:
+    """単語を並べた1文を生成"""
+    return "".join(rng.choice(WORDS) for _ in range(words)) + "。"
+
+
+def make_url(rng: random.Random) -> str:
+    """説明文に含めるURLを生成"""
+    return f"{rng.choice(URL_HOSTS)}/{rng.randrange(10 ** 6)}"
+
+
+def make_description(rng: random.Random, sentences: int = 6, urls: int = 3) -> str:
+    """
+    RSSの説明文（HTMLタグとURLを含む）を生成
+
+    Args:
+        rng: 乱数生成器
+        sentences: 文の数
+        urls: URLの数
+
+    Returns:
+        HTMLの説明文
+    """
+    parts = [f"<p>{make_sentence(rng)}</p>" for _ in range(sentences)]
+    for _ in range(urls):
+        parts.insert(rng.randrange(len(parts) + 1), f'<a href="{make_url(rng)}">{make_url(rng)}</a><br/>')
+    return "\n".join(parts)
+
+
+def make_title(rng: random.Random, number: str) -> str:
+    """エピソードタイトルを生成"""
+    return f"ep{number} {make_sentence(rng, 5)}"
+
+
+def make_episode_number(index: int) -> str:
+    """通し番号からエピソード番号（例: 1.2.3）を生成"""
+    return f"{index // 100}.{index // 10 % 10}.{index % 10 + 1}"
+
+
+def make_episode(rng: random.Random, index: int) -> Dict[str, Any]:
+    """
+    episodes.json のエピソード1件を生成
+
+    Args:
+        rng: 乱数生成器
+        index: 通し番号（配信日・エピソード番号の元になる）
+
+    Returns:
+        エピソード情報の辞書
+    """
+    number = make_episode_number(index)
+    return {
+        "number": number,
+        "title": make_title(rng, number),
+        "date": f"{2015 + index // 360:04d}-{index // 30 % 12 + 1:02d}-{index % 30 + 1:02d}",
+        "duration": f"{rng.randrange(5, 90)}:{rng.randrange(60):02d}",
+        "description": " ".join(make_sentence(rng) for _ in range(4)),
+        "thumbnail": "img/logo.png",
+        "spotifyUrl": f"https://podcasters.spotify.com/pod/show/civictechcast/episodes/ep{index}",
+        "tags": rng.sample(["シビックテック", "データ", "地域", "技術", "雑談"], 2),
+        "transcript": "",
+        "links": [{"title": "関連リンク", "url": make_url(rng)} for _ in range(rng.randrange(3))],
+        "id": index + 1,
+        "has_transcript": False,
+    }
+
+
+def make_catalog(rng: random.Random, count: int) -> List[Dict[str, Any]]:
+    """配信日順に並んだエピソードを count 件生成"""
+    return [make_episode(rng, index) for index in range(count)]
+
+
+def make_ai_output(rng: random.Random, paragraphs: int = 3) -> str:
+    """
+    AIの生成結果（見出し・太字・前置き・クォート付き）を生成
+
+    Args:
+        rng: 乱数生成器
+        paragraphs: 段落の数
+
+    Returns:
+        clean_ai_output の入力になるテキスト
+    """
+    lines = [f"## {rng.choice(AI_PREFIXES)}", "==="]
+    body = [make_sentence(rng, 20) for _ in range(paragraphs)]
+    body[0] = f"{rng.choice(AI_PREFIXES)}：**{body[0]}**"
+    lines.extend(body)
+    lines.append("---")
+    lines.append(f"*{make_sentence(rng, 4)}*")
+    return "\n".join(lines)
+
+
+def make_transcript(rng: random.Random, number: str, lines: int = 400) -> Dict[str, Any]:
+    """
+    書き起こしJSONを1件生成
+
+    Args:
+        rng: 乱数生成器
+        number: エピソード番号
+        lines: 文字起こしの行数
+
+    Returns:
+        書き起こしJSONの辞書
+    """
+    transcript = "\n".join(
+        f"[{i // 2}:{i % 2 * 30:02d}] {rng.choice(SPEAKERS)}：{make_sentence(rng, rng.randrange(6, 30))}"
+        for i in range(lines)
+    )
+    return {
+        "episode_number": number,
+        "file_name": f"ep{number}.m4a",
+        "sub_title": make_sentence(rng, 6),
+        "detailed_description": "\n".join(make_sentence(rng, 20) for _ in range(5)),
+        "summary": "\n".join(make_sentence(rng, 20) for _ in range(3)),
+        "transcript": transcript,
+    }
+
+
+def build_scaled_corpus(
+    dest_dir: Path,
+    factor: int,
+    source_dir: Optional[Path] = None,
+    rng: Optional[random.Random] = None,
+    synthetic_count: int = 60
+) -> Dict[str, int]:
+    """
+    書き起こしコーパスを factor 倍に複製して作成
+
+    source_dir の各ファイルを、エピソード番号の先頭の数字をずらして factor 回ずつ書き出す
+    （例: ep1.0.1 → ep1.0.1, ep101.0.1, ep201.0.1 ...）。
+    source_dir が無い・空の場合は合成した書き起こし synthetic_count 件を元にする。
+
+    Args:
+        dest_dir: 出力先のフォルダ
+        factor: 倍率
+        source_dir: 元にする書き起こしフォルダ
+        rng: 合成データ用の乱数生成器
+        synthetic_count: 合成する場合の元の件数
+
+    Returns:
+        {"source_files", "files", "bytes"}
+    """
+    sources: List[Dict[str, Any]] = []
+    if source_dir is not None and source_dir.is_dir():
+        for path in sorted(source_dir.glob("*.json")):
+            with open(path, 'r', encoding='utf-8') as f:
+                sources.append(json.load(f))
+    if not sources:
+        rng = rng or random.Random(0)
+        sources = [make_transcript(rng, make_episode_number(i)) for i in range(synthetic_count)]
+
+    dest_dir.mkdir(parents=True, exist_ok=True)
+    files = 0
+    total_bytes = 0
+    for copy_index in range(factor):
+        for data in sources:
+            number = str(data.get("episode_number") or "0.0.0")
+            major, _, rest = number.partition(".")
+            if copy_index and major.isdigit():
+                number = f"{int(major) + 100 * copy_index}.{rest}"
+            elif copy_index:
+                number = f"{number}-{copy_index}"
+            text = json.dumps({**data, "episode_number": number}, ensure_ascii=False, indent=2)
+            path = dest_dir / f"ep{number}.json"
+            path.write_text(text, encoding='utf-8')
+            files += 1
+            total_bytes += len(text.encode('utf-8'))
+
+    return {"source_files": len(sources), "files": files, "bytes": total_bytes}
@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+data/ フォルダの整合性チェックスクリプト
+
+data/transcripts/ の書き起こしJSONと data/episodes.json を並列に検証し、
+スキーマエラー・ファイル名との不一致・書き起こしフラグの不一致・孤立ファイル・
+タイムスタンプの逆行を報告する。検証結果はファイルのハッシュ単位でキャッシュし、
+2回目以降は変更されたファイルだけを再検証する。
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+# 共通ユーティリティのインポート
+from utils import natural_sort_key, validate_episode_number, PROJECT_ROOT, TRANSCRIPTS_DIR, EPISODES_JSON_PATH
+import metrics
+
+# キャッシュファイル
+CACHE_PATH = PROJECT_ROOT / ".cache" / "check_data.json"
+
+# キャッシュの形式バージョン（検証ルールを変えたら上げる）
+CACHE_VERSION = 3
+
+# 書き起こしJSONの必須フィールド（models.Transcript で常に出力するキー）
+TRANSCRIPT_REQUIRED_FIELDS = ["episode_number", "file_name", "sub_title", "summary", "transcript"]
+
+# 書き起こしJSONの任意フィールド（detailed_description: 古い書き起こしには無い、
+# artifacts: 生成したフィールドの記録、transcript_metadata.py を参照）
+TRANSCRIPT_OPTIONAL_FIELDS = ["detailed_description", "artifacts"]
+
+# episodes.json の必須フィールド
+EPISODE_REQUIRED_FIELDS = ["number", "title", "date", "duration", "description", "spotifyUrl", "tags", "links", "id"]
+
+# 書き起こし内のタイムスタンプ（例: [1:23]、[1:02:03]）
+TIMESTAMP_PATTERN = re.compile(r'^\[(\d+(?::\d{2}){1,2})\]', re.MULTILINE)
+
+# 並列処理に切り替えるファイル数の下限（少数ならプロセス起動のほうが高くつく）
+PARALLEL_THRESHOLD = 32
+
+# 問題の種類: (レベル, ファイル名, メッセージ)
+Issue = Tuple[str, str, str]
+
+
+def timestamp_to_seconds(timestamp: str) -> int:
+    """
+    タイムスタンプを秒に変換
+
+    Args:
+        timestamp: "分:秒" または "時:分:秒" 形式の文字列
+
+    Returns:
+        秒数
+    """
+    seconds = 0
+    for part in timestamp.split(':'):
+        seconds = seconds * 60 + int(part)
+    return seconds
+
+
+def check_transcript_file(path_str: str) -> Dict[str, Any]:
+    """
+    書き起こしJSONファイル1件を検証（ワーカープロセスで実行）
+
+    Args:
+        path_str: 書き起こしJSONのパス
+
+    Returns:
+        {"episode_number": エピソード番号またはNone, "issues": [(レベル, ファイル名, メッセージ)]}
+    """
+    path = Path(path_str)
+    name = path.name
+    issues: List[Issue] = []
+
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, UnicodeDecodeError, json.JSONDecodeError) as e:
+        return {"episode_number": None, "issues": [("ERROR", name, f"JSONとして読み込めません: {e}")]}
+
+    if not isinstance(data, dict):
+        return {"episode_number": None, "issues": [("ERROR", name, "トップレベルがオブジェクトではありません")]}
+
+    # スキーマ
+    for key in TRANSCRIPT_REQUIRED_FIELDS:
+        if key not in data:
+            issues.append(("ERROR", name, f"必須フィールド '{key}' がありません"))
+        elif not isinstance(data[key], str):
+            issues.append(("ERROR", name, f"フィールド '{key}' が文字列ではありません"))
+    if data.get("detailed_description") is not None and not isinstance(data["detailed_description"], str):
+        issues.append(("ERROR", name, "フィールド 'detailed_description' が文字列ではありません"))
+    for key in data:
+        if key not in TRANSCRIPT_REQUIRED_FIELDS and key not in TRANSCRIPT_OPTIONAL_FIELDS:
+            issues.append(("WARNING", name, f"未知のフィールド '{key}' があります"))
+    artifacts = data.get("artifacts", {})
+    if not isinstance(artifacts, dict) or not all(isinstance(value, dict) for value in artifacts.values()):
+        issues.append(("ERROR", name, "フィールド 'artifacts' の形式が不正です"))
+
+    # エピソード番号とファイル名
+    episode_number = data.get("episode_number")
+    if isinstance(episode_number, str):
+        if not validate_episode_number(episode_number):
+            issues.append(("ERROR", name, f"episode_number の形式が不正です: {episode_number!r}"))
+        elif name != f"ep{episode_number}.json":
+            issues.append(("ERROR", name, f"episode_number ({episode_number}) とファイル名が一致しません"))
+    else:
+        episode_number = None
+
+    # タイムスタンプの単調性
+    transcript = data.get("transcript")
+    if isinstance(transcript, str):
+        previous = -1
+        for match in TIMESTAMP_PATTERN.finditer(transcript):
+            seconds = timestamp_to_seconds(match.group(1))
+            if seconds < previous:
+                line_number = transcript.count('\n', 0, match.start()) + 1
+                issues.append(("WARNING", name, f"{line_number}行目のタイムスタンプ [{match.group(1)}] が前より戻っています"))
+            previous = seconds
+
+    return {"episode_number": episode_number, "issues": issues}
+
+
+def check_catalog(episodes: List[Dict[str, Any]], transcript_numbers: Dict[str, str]) -> List[Issue]:
+    """
+    episodes.json の内容と書き起こしファイルとの対応を検証
+
+    Args:
+        episodes: episodes.json のエピソードリスト
+        transcript_numbers: 書き起こしのエピソード番号 → ファイル名
+
+    Returns:
+        問題のリスト
+    """
+    name = EPISODES_JSON_PATH.name
+    issues: List[Issue] = []
+    seen_numbers: Dict[str, int] = {}
+    ids = []
+
+    for index, ep in enumerate(episodes):
+        if not isinstance(ep, dict):
+            issues.append(("ERROR", name, f"{index}番目の要素がオブジェクトではありません"))
+            continue
+
+        number = ep.get("number")
+        label = number or f"{index}番目"
+        for key in EPISODE_REQUIRED_FIELDS:
+            if key not in ep:
+                issues.append(("ERROR", name, f"{label}: 必須フィールド '{key}' がありません"))
+
+        if not isinstance(number, str) or not validate_episode_number(number):
+            issues.append(("ERROR", name, f"{label}: number の形式が不正です"))
+            continue
+
+        if number in seen_numbers:
+            issues.append(("ERROR", name, f"{number}: エピソード番号が重複しています"))
+        seen_numbers[number] = index
+
+        if isinstance(ep.get("id"), int):
+            ids.append(ep["id"])
+
+        # 書き起こしフラグとディスクの一致
+        on_disk = number in transcript_numbers
+        if ep.get("has_transcript") is None:
+            issues.append(("WARNING", name, f"{number}: has_transcript がありません（ディスク: {on_disk}）"))
+        elif ep["has_transcript"] != on_disk:
+            issues.append(("ERROR", name, f"{number}: has_transcript={ep['has_transcript']} ですが、書き起こしファイルは{'あります' if on_disk else 'ありません'}"))
+
+    if sorted(ids) != list(range(1, len(ids) + 1)):
+        issues.append(("WARNING", name, "id が1からの連番になっていません（--reindex で振り直せます）"))
+
+    # RSSにまだ無いエピソードの書き起こし（配信前なら正常）
+    for number, file_name in transcript_numbers.items():
+        if number not in seen_numbers:
+            issues.append(("WARNING", file_name, f"episodes.json に {number} がありません（孤立した書き起こし）"))
+
+    return issues
+
+
+def file_hash(path: Path) -> str:
+    """ファイル内容のハッシュ値を計算"""
+    return hashlib.blake2b(path.read_bytes(), digest_size=16).hexdigest()
+
+
+def load_cache(cache_path: Path) -> Dict[str, Any]:
+    """検証結果のキャッシュを読み込む"""
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+        if cache.get("version") == CACHE_VERSION:
+            return cache.get("files", {})
+    except (OSError, json.JSONDecodeError):
+        pass
+    return {}
+
+
+def save_cache(cache_path: Path, files: Dict[str, Any]) -> None:
+    """検証結果のキャッシュを保存"""
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = cache_path.with_suffix('.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({"version": CACHE_VERSION, "files": files}, f, ensure_ascii=False)
+    tmp_path.replace(cache_path)
+
+
+def check_transcripts(
+    transcripts_dir: Path,
+    cache: Dict[str, Any],
+    workers: int = 0
+) -> Tuple[Dict[str, Any], int]:
+    """
+    書き起こしフォルダ全体を検証（キャッシュに無いファイルだけ並列に再検証）
+
+    Args:
+        transcripts_dir: 書き起こしJSONのフォルダ
+        cache: ファイル名 → {"hash", "episode_number", "issues"} のキャッシュ
+        workers: ワーカープロセス数（0の場合はCPU数）
+
+    Returns:
+        (新しいキャッシュ, 再検証したファイル数)
+    """
+    paths = sorted(transcripts_dir.glob("*.json"), key=lambda p: natural_sort_key(p.name))
+    results: Dict[str, Any] = {}
+    pending: List[Tuple[Path, str]] = []
+
+    for path in paths:
+        digest = file_hash(path)
+        cached = cache.get(path.name)
+        if cached and cached.get("hash") == digest:
+            results[path.name] = cached
+        else:
+            pending.append((path, digest))
+
+    if len(pending) >= PARALLEL_THRESHOLD and workers != 1:
+        with ProcessPoolExecutor(max_workers=workers or None) as executor:
+            checked = list(executor.map(check_transcript_file, [str(p) for p, _ in pending], chunksize=16))
+    else:
+        checked = [check_transcript_file(str(p)) for p, _ in pending]
+
+    for (path, digest), result in zip(pending, checked):
+        results[path.name] = {"hash": digest, **result}
+
+    return results, len(pending)
+
+
+def run(args: argparse.Namespace) -> None:
+    """
+    書き起こしとepisodes.jsonを検証して結果を表示
+
+    Args:
+        args: コマンドライン引数
+    """
+    cache = {} if args.no_cache else load_cache(CACHE_PATH)
+    with metrics.timer("check_transcripts"):
+        results, checked_count = check_transcripts(Path(args.transcripts), cache, args.workers)
+    metrics.count("transcripts", len(results))
+    metrics.count("transcripts_rechecked", checked_count)
+    if not args.no_cache:
+        save_cache(CACHE_PATH, results)
+
+    issues: List[Issue] = []
+    transcript_numbers: Dict[str, str] = {}
+    for file_name, result in results.items():
+        issues.extend(tuple(issue) for issue in result["issues"])
+        if result.get("episode_number"):
+            transcript_numbers[result["episode_number"]] = file_name
+
+    episodes_path = Path(args.episodes)
+    try:
+        with open(episodes_path, 'r', encoding='utf-8') as f:
+            catalog = json.load(f)
+        episodes = catalog.get("episodes") if isinstance(catalog, dict) else None
+        if not isinstance(episodes, list):
+            issues.append(("ERROR", episodes_path.name, "\"episodes\" 配列がありません"))
+        else:
+            with metrics.timer("check_catalog"):
+                issues.extend(check_catalog(episodes, transcript_numbers))
+    except (OSError, json.JSONDecodeError) as e:
+        issues.append(("ERROR", episodes_path.name, f"読み込めません: {e}"))
+
+    for level, file_name, message in issues:
+        print(f"[{level}] {file_name}: {message}")
+
+    error_count = sum(1 for level, _, _ in issues if level == "ERROR")
+    warning_count = len(issues) - error_count
+    metrics.count("errors", error_count)
+    metrics.count("warnings", warning_count)
+    print(f"\n[INFO] 書き起こし: {len(results)}件（再検証: {checked_count}件）")
+    print(f"[INFO] エラー: {error_count}件、警告: {warning_count}件")
+
+    if error_count or (args.strict and warning_count):
+        sys.exit(1)
+    print("[OK] 問題は見つかりませんでした" if not issues else "[OK] エラーはありません")
+
+
+def main() -> None:
+    """メイン処理"""
+    parser = argparse.ArgumentParser(description='data/ フォルダの書き起こしJSONとepisodes.jsonの整合性をチェック')
+    parser.add_argument('--transcripts', type=str, default=str(TRANSCRIPTS_DIR),
+                        help=f'書き起こしJSONのフォルダ（デフォルト: {TRANSCRIPTS_DIR}）')
+    parser.add_argument('--episodes', type=str, default=str(EPISODES_JSON_PATH),
+                        help=f'episodes.jsonのパス（デフォルト: {EPISODES_JSON_PATH}）')
+    parser.add_argument('--workers', type=int, default=0,
+                        help='ワーカープロセス数（デフォルト: CPU数、1で並列処理なし）')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='キャッシュを使わずに全ファイルを検証')
+    parser.add_argument('--strict', action='store_true',
+                        help='警告もエラーとして扱う（終了コード1）')
+    metrics.add_metrics_argument(parser)
+    args = parser.parse_args()
+
+    with metrics.report_metrics(args.metrics_out, "check_data"):
+        run(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+書き起こし全体の検索・一括置換スクリプト
+
+data/transcripts/ のすべての書き起こしJSONを並列に検索し、ヒット箇所を前後の文脈付きで表示する。
+--apply を指定すると置換を適用する。変更するファイルはそれぞれ1回だけバックアップし、
+すべての一時ファイルを書き終えてから置き換えるため、途中で失敗しても一部だけが変更されることはない。
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Pattern, Sequence
+
+# 共通ユーティリティのインポート
+from utils import natural_sort_key, create_backup, PROJECT_ROOT, TRANSCRIPTS_DIR
+from models import Transcript
+
+# バックアップディレクトリ（エディタと共通）
+BACKUP_DIR = PROJECT_ROOT / 'data' / 'transcripts_backup'
+
+# 検索対象のフィールド
+SEARCH_FIELDS = ["sub_title", "detailed_description", "summary", "transcript"]
+
+# プレビューに表示する前後の文字数
+CONTEXT_CHARS = 30
+
+# 並列処理に切り替えるファイル数の下限
+PARALLEL_THRESHOLD = 32
+
+
+@dataclass
+class CorpusHit:
+    """検索のヒット1件"""
+
+    file_name: str
+    field: str
+    start: int
+    line: int
+    before: str
+    match: str
+    after: str
+
+    def preview(self) -> str:
+        """1行のプレビュー文字列"""
+        text = f"{self.before}[{self.match}]{self.after}"
+        return text.replace('\n', '↵')
+
+
+def compile_pattern(needle: str, case_sensitive: bool = False, regex: bool = False) -> Pattern[str]:
+    """
+    検索パターンをコンパイル
+
+    Args:
+        needle: 検索文字列
+        case_sensitive: 大文字小文字を区別するか
+        regex: 検索文字列を正規表現として扱うか
+
+    Returns:
+        コンパイル済みパターン
+    """
+    if regex:
+        return re.compile(needle, 0 if case_sensitive else re.IGNORECASE)
+    # 大文字小文字のない文字だけなら IGNORECASE は不要（日本語の検索が速くなる）
+    ignore_case = not case_sensitive and needle.lower() != needle.upper()
+    return re.compile(re.escape(needle), re.IGNORECASE if ignore_case else 0)
+
+
+def _may_contain(raw: str, needle: str, case_sensitive: bool) -> bool:
+    """JSONを解析する前に、ファイルの生テキストに検索文字列が含まれうるかを判定"""
+    escaped = json.dumps(needle, ensure_ascii=False)[1:-1]
+    # 大文字小文字のない文字（日本語など）だけなら、小文字化せずに比較できる
+    if case_sensitive or escaped.lower() == escaped.upper():
+        return escaped in raw
+    return escaped.lower() in raw.lower()
+
+
+def search_file(
+    path_str: str,
+    needle: str,
+    case_sensitive: bool = False,
+    regex: bool = False,
+    fields: Sequence[str] = SEARCH_FIELDS,
+    context: int = CONTEXT_CHARS
+) -> List[CorpusHit]:
+    """
+    書き起こしJSONファイル1件を検索（ワーカープロセスで実行）
+
+    Args:
+        path_str: 書き起こしJSONのパス
+        needle: 検索文字列
+        case_sensitive: 大文字小文字を区別するか
+        regex: 検索文字列を正規表現として扱うか
+        fields: 検索対象のフィールド
+        context: プレビューに含める前後の文字数
+
+    Returns:
+        ヒットのリスト
+    """
+    path = Path(path_str)
+    raw = path.read_text(encoding='utf-8')
+    # 正規表現でない場合は、含まれないファイルのJSON解析を省略する
+    if not regex and not _may_contain(raw, needle, case_sensitive):
+        return []
+
+    data = Transcript.from_json(raw)
+    pattern = compile_pattern(needle, case_sensitive, regex)
+    hits = []
+    for field in fields:
+        text = getattr(data, field) or ""
+        for match in pattern.finditer(text):
+            if match.start() == match.end():
+                continue
+            hits.append(CorpusHit(
+                file_name=path.name,
+                field=field,
+                start=match.start(),
+                line=text.count('\n', 0, match.start()) + 1,
+                before=text[max(0, match.start() - context):match.start()],
+                match=match.group(0),
+                after=text[match.end():match.end() + context],
+            ))
+    return hits
+
+
+def _search_file_args(args: tuple) -> List[CorpusHit]:
+    """executor.map 用のラッパー"""
+    return search_file(*args)
+
+
+def search_corpus(
+    needle: str,
+    transcripts_dir: Path = TRANSCRIPTS_DIR,
+    case_sensitive: bool = False,
+    regex: bool = False,
+    fields: Sequence[str] = SEARCH_FIELDS,
+    context: int = CONTEXT_CHARS,
+    workers: int = 0
+) -> List[CorpusHit]:
+    """
+    書き起こしフォルダ全体を検索
+
+    Args:
+        needle: 検索文字列
+        transcripts_dir: 書き起こしJSONのフォルダ
+        case_sensitive: 大文字小文字を区別するか
+        regex: 検索文字列を正規表現として扱うか
+        fields: 検索対象のフィールド
+        context: プレビューに含める前後の文字数
+        workers: ワーカープロセス数（0の場合はCPU数、1の場合は並列処理なし）
+
+    Returns:
+        ヒットのリスト（ファイルの自然順）
+    """
+    if not needle:
+        return []
+    paths = sorted(transcripts_dir.glob("*.json"), key=lambda p: natural_sort_key(p.name))
+    tasks = [(str(p), needle, case_sensitive, regex, tuple(fields), context) for p in paths]
+
+    max_workers = workers or os.cpu_count() or 1
+    if len(tasks) >= PARALLEL_THRESHOLD and max_workers > 1:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(_search_file_args, tasks, chunksize=16))
+    else:
+        results = [_search_file_args(task) for task in tasks]
+
+    return [hit for hits in results for hit in hits]
+
+
+def replace_in_corpus(
+    hits: List[CorpusHit],
+    needle: str,
+    replacement: str,
+    transcripts_dir: Path = TRANSCRIPTS_DIR,
+    case_sensitive: bool = False,
+    regex: bool = False,
+    fields: Sequence[str] = SEARCH_FIELDS,
+    backup_dir: Optional[Path] = BACKUP_DIR
+) -> Dict[str, int]:
+    """
+    検索結果のファイルに置換を適用
+
+    変更後の内容をすべて一時ファイルに書き出してから、バックアップを作成して順に置き換える。
+    一時ファイルの書き出しで失敗した場合は、どのファイルも変更しない。
+
+    Args:
+        hits: search_corpus の結果
+        needle: 検索文字列
+        replacement: 置換文字列（正規表現の場合は \\1 などの後方参照を使える）
+        transcripts_dir: 書き起こしJSONのフォルダ
+        case_sensitive: 大文字小文字を区別するか
+        regex: 検索文字列を正規表現として扱うか
+        fields: 置換対象のフィールド
+        backup_dir: バックアップ先（Noneの場合はバックアップしない）
+
+    Returns:
+        ファイル名 → 置換件数
+    """
+    pattern = compile_pattern(needle, case_sensitive, regex)
+    file_names = sorted({hit.file_name for hit in hits}, key=natural_sort_key)
+    staged = []
+    counts: Dict[str, int] = {}
+
+    try:
+        for file_name in file_names:
+            path = transcripts_dir / file_name
+            data = Transcript.load(path)
+            total = 0
+            for field in fields:
+                text = getattr(data, field)
+                if not text:
+                    continue
+                if regex:
+                    new_text, count = pattern.subn(replacement, text)
+                else:
+                    new_text, count = pattern.subn(lambda m: replacement, text)
+                if count:
+                    setattr(data, field, new_text)
+                    total += count
+            if not total:
+                continue
+
+            tmp_path = path.with_name(f".{file_name}.tmp")
+            data.save(tmp_path)
+            staged.append((path, tmp_path))
+            counts[file_name] = total
+    except Exception:
+        for _, tmp_path in staged:
+            tmp_path.unlink(missing_ok=True)
+        raise
+
+    try:
+        if backup_dir is not None:
+            for path, _ in staged:
+                create_backup(path, backup_dir)
+    except Exception:
+        for _, tmp_path in staged:
+            tmp_path.unlink(missing_ok=True)
+        raise
+
+    for path, tmp_path in staged:
+        os.replace(tmp_path, path)
+
+    return counts
+
+
+def main() -> None:
+    """メイン処理"""
+    parser = argparse.ArgumentParser(description='書き起こし全体を検索し、一括置換')
+    parser.add_argument('pattern', type=str, help='検索文字列')
+    parser.add_argument('--replace', type=str, default=None,
+                        help='置換文字列（--apply を指定した場合のみ適用）')
+    parser.add_argument('--apply', action='store_true',
+                        help='置換を適用する（指定しない場合はプレビューのみ）')
+    parser.add_argument('--case-sensitive', action='store_true',
+                        help='大文字小文字を区別する')
+    parser.add_argument('--regex', action='store_true',
+                        help='検索文字列を正規表現として扱う')
+    parser.add_argument('--field', action='append', choices=SEARCH_FIELDS,
+                        help='検索対象のフィールド（複数指定可、デフォルト: すべて）')
+    parser.add_argument('--transcripts', type=str, default=str(TRANSCRIPTS_DIR),
+                        help=f'書き起こしJSONのフォルダ（デフォルト: {TRANSCRIPTS_DIR}）')
+    parser.add_argument('--backup-dir', type=str, default=str(BACKUP_DIR),
+                        help=f'バックアップ先のフォルダ（デフォルト: {BACKUP_DIR}）')
+    parser.add_argument('--context', type=int, default=CONTEXT_CHARS,
+                        help=f'プレビューに表示する前後の文字数（デフォルト: {CONTEXT_CHARS}）')
+    parser.add_argument('--workers', type=int, default=0,
+                        help='ワーカープロセス数（デフォルト: CPU数、1で並列処理なし）')
+    args = parser.parse_args()
+
+    if args.apply and args.replace is None:
+        parser.error('--apply には --replace の指定が必要です')
+
+    fields = args.field or SEARCH_FIELDS
+    transcripts_dir = Path(args.transcripts)
+    try:
+        hits = search_corpus(args.pattern, transcripts_dir, args.case_sensitive, args.regex,
+                             fields, args.context, args.workers)
+    except re.error as e:
+        print(f"[ERROR] 正規表現が不正です: {e}")
+        sys.exit(1)
+
+    for hit in hits:
+        print(f"{hit.file_name}:{hit.field}:{hit.line}: {hit.preview()}")
+
+    file_count = len({hit.file_name for hit in hits})
+    print(f"\n[INFO] {len(hits)}件のヒット（{file_count}ファイル）")
+
+    if not hits or args.replace is None:
+        return
+    if not args.apply:
+        print(f"[DRY-RUN] --apply を指定すると「{args.replace}」に置換します")
+        return
+
+    backup_dir = Path(args.backup_dir)
+    counts = replace_in_corpus(hits, args.pattern, args.replace, transcripts_dir,
+                               args.case_sensitive, args.regex, fields, backup_dir)
+    print(f"[OK] {len(counts)}ファイル・{sum(counts.values())}箇所を置換しました（バックアップ: {backup_dir}）")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,21 +6,303 @@
 data/transcripts/ フォルダ内のJSONファイルを選択して編集できるGUIエディタ
 """
 
-import json
+import queue
 import shutil
+import threading
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, scrolledtext
 from pathlib import Path
 from datetime import datetime
-from typing import Optional, Dict, Any
+from collections import OrderedDict
+from typing import List, Optional, Tuple, Union
 import re
 
 # 共通ユーティリティのインポート
 from utils import natural_sort_key, create_backup, TRANSCRIPTS_DIR, PROJECT_ROOT
+from models import Transcript, ModelValidationError
+from text_buffer import PieceTable
+from corpus_replace import CorpusHit, SEARCH_FIELDS, search_corpus, replace_in_corpus
 
 # バックアップディレクトリ
 BACKUP_DIR = PROJECT_ROOT / 'data' / 'transcripts_backup'
 
+# 読み込み済みの書き起こしを保持する件数
+TRANSCRIPT_CACHE_SIZE = 16
+
+# 先読みする前後のファイル数
+PREFETCH_NEIGHBORS = 3
+
+
+class TranscriptCache:
+    """
+    読み込み済みの書き起こしのLRUキャッシュ（前後のファイルをバックグラウンドで先読み）
+    
+    エントリはファイルの更新日時とサイズで検証するため、エディタの外で編集されたファイルは読み直す。
+    """
+    
+    def __init__(self, max_size: int = TRANSCRIPT_CACHE_SIZE) -> None:
+        """
+        初期化
+        
+        Args:
+            max_size: 保持する件数
+        """
+        self.max_size = max_size
+        self._entries: "OrderedDict[Path, Tuple[Tuple[int, int], Transcript]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._requests: "queue.Queue[Tuple[int, List[Path]]]" = queue.Queue()
+        self._generation = 0
+        threading.Thread(target=self._prefetch_worker, daemon=True).start()
+    
+    @staticmethod
+    def _stat_key(file_path: Path) -> Tuple[int, int]:
+        """キャッシュの検証に使う (更新日時, サイズ)"""
+        stat = file_path.stat()
+        return stat.st_mtime_ns, stat.st_size
+    
+    def _load(self, file_path: Path) -> Transcript:
+        """キャッシュが有効ならそれを、無効ならファイルを読み込んで返す"""
+        key = self._stat_key(file_path)
+        with self._lock:
+            entry = self._entries.get(file_path)
+            if entry and entry[0] == key:
+                self._entries.move_to_end(file_path)
+                return entry[1]
+        
+        data = Transcript.load(file_path)
+        with self._lock:
+            self._entries[file_path] = (key, data)
+            self._entries.move_to_end(file_path)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        return data
+    
+    def get(self, file_path: Path) -> Transcript:
+        """
+        書き起こしを取得（編集してもキャッシュに影響しないようにコピーを返す）
+        
+        Args:
+            file_path: 書き起こしJSONのパス
+        
+        Returns:
+            Transcript
+        """
+        return self._load(file_path).copy()
+    
+    def invalidate(self, file_path: Path) -> None:
+        """ファイルのキャッシュを破棄"""
+        with self._lock:
+            self._entries.pop(file_path, None)
+    
+    def prefetch(self, file_paths: List[Path]) -> None:
+        """
+        ファイルをバックグラウンドで読み込む（以前の先読み要求は打ち切る）
+        
+        Args:
+            file_paths: 読み込む順に並べたパス
+        """
+        with self._lock:
+            self._generation += 1
+            generation = self._generation
+        self._requests.put((generation, file_paths))
+    
+    def _prefetch_worker(self) -> None:
+        """先読みを処理するワーカースレッド"""
+        while True:
+            generation, file_paths = self._requests.get()
+            for file_path in file_paths:
+                if generation != self._generation:
+                    break
+                try:
+                    self._load(file_path)
+                except (OSError, ValueError):
+                    # 読み込めないファイルは、開いたときにエラーを表示する
+                    pass
+
+
+class WindowedText(ttk.Frame):
+    """
+    文書をピーステーブルに保持し、表示付近の行だけをTextウィジェットに描画するテキストビュー
+    
+    スクロールで描画範囲の端に近づくと、編集内容をモデルに書き戻してから範囲を移動する。
+    検索・一括置換はモデル上で行い、描画範囲だけを再描画する。
+    """
+    
+    # 一度に描画する行数
+    WINDOW_LINES = 400
+    
+    # 描画範囲の端からこの割合以内に来たら範囲を移動する
+    EDGE_FRACTION = 0.1
+    
+    def __init__(self, parent: tk.Misc, height: int) -> None:
+        """
+        初期化
+        
+        Args:
+            parent: 親ウィジェット
+            height: 表示する行数
+        """
+        super().__init__(parent)
+        self.text = tk.Text(self, width=80, height=height, wrap=tk.WORD)
+        self.scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self._on_scrollbar)
+        self.text.configure(yscrollcommand=self._on_text_scroll)
+        self.text.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        self.scrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
+        self.grid_rowconfigure(0, weight=1)
+        self.grid_columnconfigure(0, weight=1)
+        
+        self.buffer = PieceTable()
+        self.first_line = 0
+        self.window_start = 0
+        self.window_end = 0
+        self._shift_pending = False
+    
+    @property
+    def window_line_count(self) -> int:
+        """描画中の行数"""
+        return self.buffer.offset_to_line(max(self.window_start, self.window_end - 1)) - self.first_line + 1
+    
+    def set_text(self, content: str) -> None:
+        """文書を置き換えて先頭を表示"""
+        self.buffer = PieceTable(content)
+        self.window_start = self.window_end = 0
+        self.text.edit_modified(False)
+        self._render(0)
+        self.text.mark_set(tk.INSERT, "1.0")
+        self.text.yview_moveto(0)
+    
+    def get_text(self) -> str:
+        """編集内容を反映した文書全体を取得"""
+        self.commit()
+        return self.buffer.get_text()
+    
+    def commit(self) -> None:
+        """描画範囲の編集内容をモデルに書き戻す"""
+        if not self.text.edit_modified():
+            return
+        content = self.text.get("1.0", "end-1c")
+        self.buffer.replace_range(self.window_start, self.window_end, content)
+        self.window_end = self.window_start + len(content)
+        self.text.edit_modified(False)
+    
+    def _render(self, first_line: int) -> None:
+        """first_line 行目から WINDOW_LINES 行を描画"""
+        self.commit()
+        total = self.buffer.line_count()
+        first_line = max(0, min(first_line, total - self.WINDOW_LINES))
+        self.first_line = first_line
+        self.window_start = self.buffer.line_start(first_line)
+        self.window_end = self.buffer.line_start(first_line + self.WINDOW_LINES)
+        
+        self.text.delete("1.0", tk.END)
+        self.text.insert("1.0", self.buffer.get_range(self.window_start, self.window_end))
+        self.text.edit_modified(False)
+    
+    def _visible_line(self) -> int:
+        """表示中の先頭行の行番号（文書全体で0から）"""
+        return self.first_line + int(self.text.index("@0,0").split(".")[0]) - 1
+    
+    def _scroll_to_line(self, line: int) -> None:
+        """文書全体の line 行目が先頭に来るように表示（必要なら描画範囲を移動）"""
+        if not self.first_line <= line < self.first_line + self.window_line_count:
+            self._render(line - self.WINDOW_LINES // 2)
+        self.text.yview(f"{line - self.first_line + 1}.0")
+    
+    def _on_text_scroll(self, first: str, last: str) -> None:
+        """Textのスクロールに合わせてスクロールバーを更新し、端に近づいたら描画範囲を移動"""
+        total = max(1, self.buffer.line_count())
+        window = self.window_line_count
+        top = (self.first_line + float(first) * window) / total
+        bottom = (self.first_line + float(last) * window) / total
+        self.scrollbar.set(top, min(1.0, bottom))
+        
+        near_top = float(first) < self.EDGE_FRACTION and self.first_line > 0
+        near_bottom = float(last) > 1 - self.EDGE_FRACTION and self.first_line + window < total
+        if (near_top or near_bottom) and not self._shift_pending:
+            self._shift_pending = True
+            self.after_idle(self._shift_window)
+    
+    def _shift_window(self) -> None:
+        """表示位置を保ったまま、表示中の行が描画範囲の中央に来るように移動"""
+        self._shift_pending = False
+        line = self._visible_line()
+        insert_offset = self.index_to_offset(tk.INSERT)
+        self._render(line - self.WINDOW_LINES // 2)
+        self.text.yview(f"{line - self.first_line + 1}.0")
+        if self.window_start <= insert_offset <= self.window_end:
+            self.text.mark_set(tk.INSERT, self.offset_to_index(insert_offset))
+    
+    def _on_scrollbar(self, *args: str) -> None:
+        """スクロールバーの操作（moveto は文書全体の位置として扱う）"""
+        if args and args[0] == "moveto":
+            self._scroll_to_line(int(float(args[1]) * self.buffer.line_count()))
+        else:
+            self.text.yview(*args)
+    
+    def index_to_offset(self, index: str) -> int:
+        """Textのインデックスを文書全体の文字位置に変換"""
+        count = self.text.count("1.0", index, "chars")
+        return self.window_start + (count[0] if count else 0)
+    
+    def offset_to_index(self, offset: int) -> str:
+        """文書全体の文字位置をTextのインデックスに変換"""
+        return f"1.0+{offset - self.window_start}c"
+    
+    def select_range(self, start: int, end: int) -> None:
+        """文書全体の範囲を選択して表示（必要なら描画範囲を移動）"""
+        self.commit()
+        if not (self.window_start <= start and end <= self.window_end):
+            self._render(self.buffer.offset_to_line(start) - self.WINDOW_LINES // 2)
+        start_index = self.offset_to_index(start)
+        self.text.mark_set(tk.INSERT, start_index)
+        self.text.tag_remove(tk.SEL, "1.0", tk.END)
+        self.text.tag_add(tk.SEL, start_index, self.offset_to_index(end))
+        self.text.see(start_index)
+    
+    def find(self, needle: str, forward: bool = True, case_sensitive: bool = False) -> bool:
+        """
+        カーソル位置から次（または前）の一致を検索して選択（末尾・先頭で折り返す）
+        
+        Returns:
+            見つかった場合True
+        """
+        self.commit()
+        if forward:
+            anchor = tk.SEL_LAST if self.text.tag_ranges(tk.SEL) else tk.INSERT
+            pos = self.buffer.find(needle, self.index_to_offset(anchor), case_sensitive)
+            if pos < 0:
+                pos = self.buffer.find(needle, 0, case_sensitive)
+        else:
+            anchor = tk.SEL_FIRST if self.text.tag_ranges(tk.SEL) else tk.INSERT
+            pos = self.buffer.rfind(needle, self.index_to_offset(anchor), case_sensitive)
+            if pos < 0:
+                pos = self.buffer.rfind(needle, len(self.buffer), case_sensitive)
+        if pos < 0:
+            return False
+        self.select_range(pos, pos + len(needle))
+        return True
+    
+    def replace_all(self, needle: str, replacement: str, case_sensitive: bool = False) -> int:
+        """
+        モデル上で一括置換し、描画範囲だけを再描画
+        
+        Returns:
+            置換した件数
+        """
+        self.commit()
+        line = self._visible_line()
+        count = self.buffer.replace_all(needle, replacement, case_sensitive)
+        if count:
+            self._render(self.first_line)
+            self.text.yview(f"{max(1, line - self.first_line + 1)}.0")
+        return count
+    
+    def count_matches(self, needle: str, case_sensitive: bool = False) -> int:
+        """一致する箇所の数"""
+        self.commit()
+        flags = 0 if case_sensitive else re.IGNORECASE
+        return sum(1 for _ in re.finditer(re.escape(needle), self.buffer.get_text(), flags))
+
 
 class TranscriptEditor:
     """書き起こしJSONエディタGUIクラス"""
@@ -37,10 +319,11 @@ class TranscriptEditor:
         self.root.geometry("1000x800")
         
         self.current_file: Optional[Path] = None
-        self.data: Dict[str, Any] = {}
+        self.data: Optional[Transcript] = None
         self.file_list: list[Path] = []
         self.current_file_index: int = -1
         self.last_find_pos: str = "1.0"
+        self.transcript_cache = TranscriptCache()
         
         self.create_widgets()
         self.load_file_list()
@@ -117,10 +400,12 @@ class TranscriptEditor:
         ttk.Button(button_frame, text="前を検索", command=self.find_prev_inline).pack(side=tk.LEFT, padx=2)
         ttk.Button(button_frame, text="置換", command=self.replace_one_inline).pack(side=tk.LEFT, padx=2)
         ttk.Button(button_frame, text="すべて置換", command=self.replace_all_inline).pack(side=tk.LEFT, padx=2)
+        ttk.Button(button_frame, text="全ファイルで検索", command=self.open_corpus_panel).pack(side=tk.LEFT, padx=(12, 2))
     
     def _create_editor_tabs(self, parent: ttk.Frame) -> None:
         """エディタタブを作成"""
         notebook = ttk.Notebook(parent)
+        self.notebook = notebook
         notebook.grid(row=2, column=0, columnspan=2, sticky=(tk.W, tk.E, tk.N, tk.S))
         
         # 基本情報タブ
@@ -139,7 +424,7 @@ class TranscriptEditor:
         self.sub_title = self._create_text_tab(notebook, "サブタイトル", height=5)
         self.detailed_description = self._create_text_tab(notebook, "詳細説明", height=15)
         self.summary = self._create_text_tab(notebook, "要約", height=15)
-        self.transcript = self._create_text_tab(notebook, "全文書き起こし", height=25)
+        self.transcript = self._create_windowed_tab(notebook, "全文書き起こし", height=25)
     
     def _create_text_tab(self, notebook: ttk.Notebook, title: str, height: int) -> scrolledtext.ScrolledText:
         """テキストエリアタブを作成"""
@@ -153,6 +438,18 @@ class TranscriptEditor:
         
         return text_widget
     
+    def _create_windowed_tab(self, notebook: ttk.Notebook, title: str, height: int) -> WindowedText:
+        """表示付近だけを描画するテキストエリアのタブを作成（長い書き起こし用）"""
+        frame = ttk.Frame(notebook, padding="10")
+        notebook.add(frame, text=title)
+        
+        text_view = WindowedText(frame, height=height)
+        text_view.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        frame.grid_rowconfigure(0, weight=1)
+        frame.grid_columnconfigure(0, weight=1)
+        
+        return text_view
+    
     def _create_status_bar(self, parent: ttk.Frame) -> None:
         """ステータスバーを作成"""
         status_frame = ttk.Frame(parent)
@@ -186,7 +483,7 @@ class TranscriptEditor:
             self.load_next_file()
             return "break"
         
-        for text_widget in [self.sub_title, self.detailed_description, self.summary, self.transcript]:
+        for text_widget in [self.sub_title, self.detailed_description, self.summary, self.transcript.text]:
             text_widget.bind('<Control-s>', save_on_ctrl_s)
             text_widget.bind('<Control-Left>', load_prev_on_ctrl_left)
             text_widget.bind('<Control-Right>', load_next_on_ctrl_right)
@@ -315,34 +612,49 @@ class TranscriptEditor:
             file_path: 読み込むファイルのパス
         """
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                self.data = json.load(f)
+            self.data = self.transcript_cache.get(file_path)
             
             # 各フィールドをエディタに表示
             self.episode_number.delete(0, tk.END)
-            self.episode_number.insert(0, self.data.get('episode_number', ''))
+            self.episode_number.insert(0, self.data.episode_number)
             
             self.file_name.delete(0, tk.END)
-            self.file_name.insert(0, self.data.get('file_name', ''))
+            self.file_name.insert(0, self.data.file_name)
             
             # テキストエリアの更新
-            self._update_text_widget(self.sub_title, self.data.get('sub_title', ''))
-            self._update_text_widget(self.detailed_description, self.data.get('detailed_description', ''))
-            self._update_text_widget(self.summary, self.data.get('summary', ''))
-            self._update_text_widget(self.transcript, self.data.get('transcript', ''))
+            self._update_text_widget(self.sub_title, self.data.sub_title)
+            self._update_text_widget(self.detailed_description, self.data.detailed_description or '')
+            self._update_text_widget(self.summary, self.data.summary)
+            self._update_text_widget(self.transcript, self.data.transcript)
             
             self.root.title(f"書き起こしJSONエディタ - {file_path.name}")
             self.show_status(f"ファイルを読み込みました: {file_path.name}", "success")
             
         except Exception as e:
             self.show_status(f"エラー: ファイルの読み込みに失敗しました: {str(e)}", "error")
+        
+        self._prefetch_neighbors()
+    
+    def _prefetch_neighbors(self) -> None:
+        """現在のファイルの前後（自然順）を近い順に先読み"""
+        if not 0 <= self.current_file_index < len(self.file_list):
+            return
+        neighbors = []
+        for distance in range(1, PREFETCH_NEIGHBORS + 1):
+            for index in (self.current_file_index + distance, self.current_file_index - distance):
+                if 0 <= index < len(self.file_list):
+                    neighbors.append(self.file_list[index])
+        self.transcript_cache.prefetch(neighbors)
     
-    def _update_text_widget(self, widget: scrolledtext.ScrolledText, content: str) -> None:
+    def _update_text_widget(self, widget: Union[scrolledtext.ScrolledText, WindowedText], content: str) -> None:
         """テキストウィジェットの内容を更新"""
+        if isinstance(widget, WindowedText):
+            widget.set_text(content)
+            return
         widget.delete('1.0', tk.END)
         widget.insert('1.0', content)
     
-    def get_current_text_widget(self) -> Optional[scrolledtext.ScrolledText]:
+    def get_current_text_widget(self) -> Optional[Union[scrolledtext.ScrolledText, WindowedText]]:
         """現在選択されているテキストウィジェットを取得"""
         # ノートブックを取得
         notebook = None
@@ -386,6 +698,10 @@ class TranscriptEditor:
             self.show_status("警告: 編集可能なテキストフィールドを選択してください", "warning")
             return
         
+        if isinstance(text_widget, WindowedText):
+            self._show_find_result(text_widget.find(search_text, True, self.case_sensitive.get()))
+            return
+        
         # 現在のカーソル位置から検索
         start_pos = (text_widget.index(tk.SEL_LAST) if text_widget.tag_ranges(tk.SEL) 
                     else text_widget.index(tk.INSERT))
@@ -418,22 +734,20 @@ class TranscriptEditor:
             self.show_status("警告: 編集可能なテキストフィールドを選択してください", "warning")
             return
         
+        if isinstance(text_widget, WindowedText):
+            self._show_find_result(text_widget.find(search_text, False, self.case_sensitive.get()))
+            return
+        
         # 現在のカーソル位置より前を検索
         start_pos = (text_widget.index(tk.SEL_FIRST) if text_widget.tag_ranges(tk.SEL) 
                     else text_widget.index(tk.INSERT))
         
-        flags = ["nocase"] if not self.case_sensitive.get() else []
-        
-        # 最後に見つかった位置を探す
-        pos = None
-        current_pos = "1.0"
+        nocase = not self.case_sensitive.get()
         
-        while True:
-            found = text_widget.search(search_text, current_pos, start_pos, *flags)
-            if not found:
-                break
-            pos = found
-            current_pos = f"{found}+1c"
+        # カーソル位置から後ろ向きに検索（見つからない場合は末尾から再検索）
+        pos = text_widget.search(search_text, start_pos, "1.0", backwards=True, nocase=nocase)
+        if not pos:
+            pos = text_widget.search(search_text, tk.END, start_pos, backwards=True, nocase=nocase)
         
         if pos:
             self._highlight_search_result(text_widget, pos, len(search_text))
@@ -442,6 +756,13 @@ class TranscriptEditor:
             self.show_status("検索: 見つかりませんでした", "warning")
             self.last_find_pos = "1.0"
     
+    def _show_find_result(self, found: bool) -> None:
+        """検索結果をステータスバーに表示"""
+        if found:
+            self.show_status("検索結果が見つかりました", "success")
+        else:
+            self.show_status("検索: 見つかりませんでした", "warning")
+    
     def _highlight_search_result(self, widget: scrolledtext.ScrolledText, pos: str, length: int) -> None:
         """検索結果をハイライト"""
         end_pos = f"{pos}+{length}c"
@@ -464,7 +785,9 @@ class TranscriptEditor:
             self.show_status("警告: 編集可能なテキストフィールドを選択してください", "warning")
             return
         
-        # 選択されている範囲をチェック
+        # 選択されている範囲をチェック（分割表示の場合は描画中のTextウィジェットを編集）
+        if isinstance(text_widget, WindowedText):
+            text_widget = text_widget.text
         if text_widget.tag_ranges(tk.SEL):
             sel_text = text_widget.get(tk.SEL_FIRST, tk.SEL_LAST)
             # 大文字小文字の比較
@@ -473,7 +796,7 @@ class TranscriptEditor:
             
             if matches:
                 text_widget.delete(tk.SEL_FIRST, tk.SEL_LAST)
-                text_widget.insert(tk.SEL_FIRST, replace_text)
+                text_widget.insert(tk.INSERT, replace_text)
                 self.find_next_inline()
                 return
         
@@ -493,6 +816,18 @@ class TranscriptEditor:
             self.show_status("警告: 編集可能なテキストフィールドを選択してください", "warning")
             return
         
+        if isinstance(text_widget, WindowedText):
+            # モデル上で置換し、表示中の範囲だけを再描画
+            count = text_widget.count_matches(search_text, self.case_sensitive.get())
+            if count == 0:
+                self.show_status("置換: 置換する文字列が見つかりませんでした", "warning")
+                return
+            if not messagebox.askyesno("確認", f"{count}箇所を置換しますか？"):
+                return
+            text_widget.replace_all(search_text, replace_text, self.case_sensitive.get())
+            self.show_status(f"置換完了: {count}箇所を置換しました", "success")
+            return
+        
         content = text_widget.get("1.0", tk.END)
         
         # 置換実行
@@ -517,20 +852,178 @@ class TranscriptEditor:
         
         self.show_status(f"置換完了: {count}箇所を置換しました", "success")
     
-    def save_file(self) -> None:
-        """ファイルを保存"""
-        if not self.current_file:
+    def open_corpus_panel(self) -> None:
+        """全ファイル検索・置換パネルを開く"""
+        panel = tk.Toplevel(self.root)
+        panel.title("全ファイル検索・置換")
+        panel.geometry("900x500")
+        
+        form = ttk.Frame(panel, padding="10")
+        form.pack(fill=tk.X)
+        ttk.Label(form, text="検索:").grid(row=0, column=0, sticky=tk.W)
+        find_entry = ttk.Entry(form, width=30)
+        find_entry.grid(row=0, column=1, padx=5)
+        find_entry.insert(0, self.find_entry.get())
+        ttk.Label(form, text="置換:").grid(row=0, column=2, sticky=tk.W, padx=(10, 0))
+        replace_entry = ttk.Entry(form, width=30)
+        replace_entry.grid(row=0, column=3, padx=5)
+        replace_entry.insert(0, self.replace_entry.get())
+        
+        columns = ("file", "field", "line", "preview")
+        tree = ttk.Treeview(panel, columns=columns, show="headings")
+        for column, heading, width in zip(columns, ("ファイル", "フィールド", "行", "プレビュー"), (140, 130, 50, 560)):
+            tree.heading(column, text=heading)
+            tree.column(column, width=width, stretch=(column == "preview"))
+        tree.pack(fill=tk.BOTH, expand=True, padx=10)
+        summary_label = ttk.Label(panel, text="", padding="10")
+        summary_label.pack(fill=tk.X)
+        
+        hits: List[CorpusHit] = []
+        searched = {"needle": "", "case_sensitive": False}
+        
+        def on_results(needle: str, case_sensitive: bool, results: List[CorpusHit]) -> None:
+            hits[:] = results
+            searched.update(needle=needle, case_sensitive=case_sensitive)
+            tree.delete(*tree.get_children())
+            for index, hit in enumerate(results):
+                tree.insert("", tk.END, iid=str(index), values=(hit.file_name, hit.field, hit.line, hit.preview()))
+            file_count = len({hit.file_name for hit in results})
+            summary_label.config(text=f"「{needle}」: {len(results)}件のヒット（{file_count}ファイル）")
+        
+        def run_search() -> None:
+            needle = find_entry.get()
+            if not needle:
+                return
+            case_sensitive = self.case_sensitive.get()
+            summary_label.config(text="検索中...")
+            
+            # 検索はワーカースレッドで行い、結果の表示だけをメインスレッドに戻す
+            # （GUIプロセスをforkしないよう、ワーカープロセスは使わない）
+            def worker() -> None:
+                try:
+                    results = search_corpus(needle, case_sensitive=case_sensitive, workers=1)
+                except Exception as e:
+                    message = f"エラー: 検索に失敗しました: {e}"
+                    self.root.after(0, lambda: summary_label.config(text=message))
+                    return
+                self.root.after(0, lambda: on_results(needle, case_sensitive, results))
+            
+            threading.Thread(target=worker, daemon=True).start()
+        
+        def run_replace() -> None:
+            needle = find_entry.get()
+            if not hits or needle != searched["needle"] or self.case_sensitive.get() != searched["case_sensitive"]:
+                messagebox.showwarning("確認", "先に検索してください", parent=panel)
+                return
+            file_names = {hit.file_name for hit in hits}
+            # 置換はファイルを書き換えて読み直すため、開いているファイルの未保存の編集は先に保存する
+            if self.current_file and self.current_file.name in file_names and self.has_unsaved_changes():
+                if not messagebox.askyesno(
+                    "確認", f"{self.current_file.name} に未保存の変更があります。\n保存してから置換しますか？",
+                    parent=panel
+                ):
+                    return
+                if not self.save_file():
+                    return
+            if not messagebox.askyesno(
+                "確認", f"{len(file_names)}ファイル・{len(hits)}箇所を置換しますか？\n（各ファイルのバックアップを作成します）",
+                parent=panel
+            ):
+                return
+            try:
+                counts = replace_in_corpus(hits, needle, replace_entry.get(),
+                                           case_sensitive=searched["case_sensitive"])
+            except Exception as e:
+                self.show_status(f"エラー: 置換に失敗しました: {str(e)}", "error")
+                return
+            # 開いているファイルが変更された場合は読み直す
+            if self.current_file and self.current_file.name in counts:
+                self.load_file(self.current_file)
+            self.show_status(f"置換完了: {len(counts)}ファイル・{sum(counts.values())}箇所を置換しました", "success")
+            run_search()
+        
+        def open_hit(event=None) -> None:
+            selection = tree.selection()
+            if selection:
+                self.show_corpus_hit(hits[int(selection[0])])
+        
+        ttk.Button(form, text="検索", command=run_search).grid(row=0, column=4, padx=5)
+        ttk.Button(form, text="すべてのファイルで置換", command=run_replace).grid(row=0, column=5, padx=5)
+        find_entry.bind('<Return>', lambda e: run_search())
+        tree.bind('<Double-1>', open_hit)
+        tree.bind('<Return>', open_hit)
+        run_search()
+    
+    def show_corpus_hit(self, hit: CorpusHit) -> None:
+        """全ファイル検索のヒットを開いて選択"""
+        for i, f in enumerate(self.file_list):
+            if f.name == hit.file_name:
+                self.current_file_index = i
+                self.file_combo.current(i)
+                break
+        self.current_file = TRANSCRIPTS_DIR / hit.file_name
+        self.load_file(self.current_file)
+        
+        field_index = SEARCH_FIELDS.index(hit.field)
+        self.notebook.select(field_index + 1)
+        widget = [self.sub_title, self.detailed_description, self.summary, self.transcript][field_index]
+        end = hit.start + len(hit.match)
+        if isinstance(widget, WindowedText):
+            widget.select_range(hit.start, end)
+        else:
+            self._highlight_search_result(widget, f"1.0+{hit.start}c", len(hit.match))
+    
+    def has_unsaved_changes(self) -> bool:
+        """
+        エディタの内容が保存されているファイルから変更されているか
+        
+        保存に失敗した場合も self.data は書き換わるため、ファイルの内容（キャッシュ）と比べる。
+        
+        Returns:
+            未保存の変更がある場合は True
+        """
+        if not self.current_file or self.data is None:
+            return False
+        try:
+            saved = self.transcript_cache.get(self.current_file)
+        except Exception:
+            return True
+        fields = (
+            (self.episode_number.get(), saved.episode_number),
+            (self.file_name.get(), saved.file_name),
+            (self.sub_title.get('1.0', tk.END), saved.sub_title),
+            (self.detailed_description.get('1.0', tk.END), saved.detailed_description),
+            (self.summary.get('1.0', tk.END), saved.summary),
+            (self.transcript.get_text(), saved.transcript),
+        )
+        return any(current.rstrip('\n') != (loaded or '').rstrip('\n') for current, loaded in fields)
+    
+    def save_file(self) -> bool:
+        """
+        ファイルを保存
+        
+        Returns:
+            保存できた場合は True
+        """
+        if not self.current_file or self.data is None:
             self.show_status("警告: ファイルが選択されていません", "warning")
-            return
+            return False
         
         try:
             # エディタの内容をデータに反映
-            self.data['episode_number'] = self.episode_number.get()
-            self.data['file_name'] = self.file_name.get()
-            self.data['sub_title'] = self.sub_title.get('1.0', tk.END).rstrip('\n')
-            self.data['detailed_description'] = self.detailed_description.get('1.0', tk.END).rstrip('\n')
-            self.data['summary'] = self.summary.get('1.0', tk.END).rstrip('\n')
-            self.data['transcript'] = self.transcript.get('1.0', tk.END).rstrip('\n')
+            self.data.episode_number = self.episode_number.get()
+            self.data.file_name = self.file_name.get()
+            self.data.sub_title = self.sub_title.get('1.0', tk.END).rstrip('\n')
+            self.data.detailed_description = self.detailed_description.get('1.0', tk.END).rstrip('\n')
+            self.data.summary = self.summary.get('1.0', tk.END).rstrip('\n')
+            self.data.transcript = self.transcript.get_text()
+            
+            # エピソード番号の形式を確認
+            try:
+                self.data.validate()
+            except ModelValidationError as e:
+                self.show_status(f"エラー: {e}", "error")
+                return False
             
             # バックアップを作成
             if self.current_file.exists():
@@ -540,16 +1033,18 @@ class TranscriptEditor:
                 backup_name = "なし"
             
             # ファイルを保存
-            with open(self.current_file, 'w', encoding='utf-8') as f:
-                json.dump(self.data, f, ensure_ascii=False, indent=2)
+            self.data.save(self.current_file)
+            self.transcript_cache.invalidate(self.current_file)
             
             self.show_status(
                 f"保存完了: {self.current_file.name} (バックアップ: {backup_name})", 
                 "success"
             )
+            return True
             
         except Exception as e:
             self.show_status(f"エラー: ファイルの保存に失敗しました: {str(e)}", "error")
+            return False
 
 
 def main() -> None:
@@ -0,0 +1,427 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+エピソードの関連リンクを検証・補完するスクリプト
+
+episodes.json の links[].url を並列にチェックし、リンク切れの検出・恒久的なリダイレクト先への
+URL正規化・汎用タイトル（「関連リンク」）のページタイトルへの置き換えを行う。
+チェック結果はTTL付きでキャッシュし、新しいURLと期限切れのURLだけを再チェックする。
+
+リンク切れとみなすのは404・410だけ。接続できない・タイムアウトしたURLは一時的な障害の可能性があるため
+「接続不可」として別に表示し、--prune でも削除しない。
+"""
+
+import argparse
+import asyncio
+import html
+import json
+import re
+import sys
+import time
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+from urllib.parse import urlsplit
+
+import requests
+
+# 共通ユーティリティのインポート
+from utils import PROJECT_ROOT, EPISODES_JSON_PATH
+from http_session import create_session, request_with_retry
+import metrics
+
+# キャッシュファイル
+CACHE_PATH = PROJECT_ROOT / ".cache" / "link_check.json"
+
+# キャッシュの形式バージョン
+CACHE_VERSION = 1
+
+# キャッシュの有効期限（秒）: 到達できたURL / 失敗したURL
+CACHE_TTL_SECONDS = 7 * 24 * 3600
+FAILED_CACHE_TTL_SECONDS = 24 * 3600
+
+# 同時に実行するチェック数
+DEFAULT_CONCURRENCY = 8
+
+# 同じホストへのリクエスト間隔（秒）
+DEFAULT_HOST_INTERVAL = 1.0
+
+# 1リクエストのタイムアウト（秒）
+REQUEST_TIMEOUT = 10
+
+# タイトル取得のために読み込む最大バイト数
+MAX_HTML_BYTES = 64 * 1024
+
+# ページタイトルの最大文字数
+MAX_TITLE_LENGTH = 100
+
+# リンク切れとみなすステータスコード（それ以外の4xxはボット拒否などの可能性があるため判定しない）
+DEAD_STATUS_CODES = {404, 410}
+
+# 自動付与されるリンクタイトル
+GENERIC_LINK_TITLE = "関連リンク"
+
+TITLE_PATTERN = re.compile(rb'<title[^>]*>(.*?)</title\s*>', re.IGNORECASE | re.DOTALL)
+META_CHARSET_PATTERN = re.compile(rb'<meta[^>]+charset=["\']?([\w-]+)', re.IGNORECASE)
+
+
+@dataclass
+class LinkCheckResult:
+    """リンク1件のチェック結果"""
+
+    url: str
+    status: Optional[int] = None
+    final_url: Optional[str] = None
+    permanent_redirect: bool = False
+    title: Optional[str] = None
+    error: Optional[str] = None
+    checked_at: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        """到達できたかどうか"""
+        return self.status is not None and self.status < 400
+
+    @property
+    def dead(self) -> bool:
+        """リンク切れかどうか（404/410）"""
+        return self.status in DEAD_STATUS_CODES
+
+    @property
+    def unreachable(self) -> bool:
+        """接続できなかったかどうか（接続エラー・タイムアウトなど。一時的な障害の可能性がある）"""
+        return self.status is None
+
+    def is_fresh(self, now: float, ttl: float = CACHE_TTL_SECONDS) -> bool:
+        """キャッシュが有効期限内かどうか"""
+        limit = ttl if self.ok else min(ttl, FAILED_CACHE_TTL_SECONDS)
+        return now - self.checked_at < limit
+
+
+def load_cache(cache_path: Path) -> Dict[str, LinkCheckResult]:
+    """チェック結果のキャッシュを読み込む"""
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+        if cache.get("version") == CACHE_VERSION:
+            return {url: LinkCheckResult(**entry) for url, entry in cache.get("urls", {}).items()}
+    except (OSError, json.JSONDecodeError, TypeError):
+        pass
+    return {}
+
+
+def save_cache(cache_path: Path, results: Dict[str, LinkCheckResult]) -> None:
+    """チェック結果のキャッシュを保存"""
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = cache_path.with_suffix('.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(
+            {"version": CACHE_VERSION, "urls": {url: asdict(result) for url, result in results.items()}},
+            f, ensure_ascii=False
+        )
+    tmp_path.replace(cache_path)
+
+
+def extract_title(body: bytes, encoding: Optional[str]) -> Optional[str]:
+    """
+    HTMLの先頭部分からページタイトルを取り出す
+
+    Args:
+        body: HTMLの先頭部分
+        encoding: Content-Typeヘッダの文字コード
+
+    Returns:
+        タイトル（見つからない場合はNone）
+    """
+    match = TITLE_PATTERN.search(body)
+    if not match:
+        return None
+
+    if not encoding:
+        charset = META_CHARSET_PATTERN.search(body)
+        encoding = charset.group(1).decode('ascii') if charset else 'utf-8'
+    try:
+        title = match.group(1).decode(encoding, errors='replace')
+    except LookupError:
+        title = match.group(1).decode('utf-8', errors='replace')
+
+    title = re.sub(r'\s+', ' ', html.unescape(title)).strip()
+    if not title:
+        return None
+    if len(title) > MAX_TITLE_LENGTH:
+        title = title[:MAX_TITLE_LENGTH - 1] + "…"
+    return title
+
+
+def check_link(session: requests.Session, url: str, timeout: float = REQUEST_TIMEOUT) -> LinkCheckResult:
+    """
+    リンク1件をチェック（リダイレクトをたどり、HTMLならタイトルを取得）
+
+    Args:
+        session: 使用するHTTPセッション
+        url: チェックするURL
+        timeout: タイムアウト（秒）
+
+    Returns:
+        LinkCheckResult
+    """
+    result = LinkCheckResult(url=url, checked_at=time.time())
+    try:
+        response, _ = request_with_retry(
+            session, "GET", url, max_attempts=2, backoff=1.0, max_wait=30,
+            timeout=timeout, allow_redirects=True, stream=True
+        )
+    except requests.RequestException as e:
+        result.error = type(e).__name__
+        return result
+
+    with response:
+        result.status = response.status_code
+        result.final_url = response.url
+        # 恒久的なリダイレクトだけをURL正規化の対象にする
+        result.permanent_redirect = bool(response.history) and all(
+            r.status_code in (301, 308) for r in response.history
+        )
+
+        content_type = response.headers.get("Content-Type", "")
+        if result.ok and "html" in content_type:
+            body = b""
+            try:
+                for chunk in response.iter_content(8192):
+                    body += chunk
+                    if len(body) >= MAX_HTML_BYTES or b"</title" in body.lower():
+                        break
+            except requests.RequestException:
+                pass
+            metrics.count("html_bytes", len(body))
+            charset = re.search(r'charset=([\w-]+)', content_type, re.IGNORECASE)
+            result.title = extract_title(body, charset.group(1) if charset else None)
+
+    return result
+
+
+class HostRateLimiter:
+    """ホストごとにリクエスト間隔を空けるレートリミッター"""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._next_time: Dict[str, float] = {}
+
+    async def wait(self, url: str) -> None:
+        """同じホストへの前回のリクエストから interval 秒経つまで待つ"""
+        host = urlsplit(url).netloc.lower()
+        lock = self._locks.setdefault(host, asyncio.Lock())
+        async with lock:
+            loop = asyncio.get_running_loop()
+            delay = self._next_time.get(host, 0.0) - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self._next_time[host] = loop.time() + self.interval
+
+
+async def check_links(
+    urls: Iterable[str],
+    session: requests.Session,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    host_interval: float = DEFAULT_HOST_INTERVAL,
+    timeout: float = REQUEST_TIMEOUT
+) -> Dict[str, LinkCheckResult]:
+    """
+    複数のリンクを並列にチェック
+
+    同時実行数は concurrency、同じホストへのリクエストは host_interval 秒間隔に制限する。
+
+    Args:
+        urls: チェックするURL
+        session: 使用するHTTPセッション（接続プールを共有）
+        concurrency: 同時に実行するチェック数
+        host_interval: 同じホストへのリクエスト間隔（秒）
+        timeout: 1リクエストのタイムアウト（秒）
+
+    Returns:
+        URL → LinkCheckResult
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    limiter = HostRateLimiter(host_interval)
+
+    async def check(url: str) -> LinkCheckResult:
+        # 間隔はセマフォを取得してから計る（取得待ちの間に間隔が過ぎて、同じホストへ続けて送らないように）
+        async with semaphore:
+            await limiter.wait(url)
+            return await asyncio.to_thread(check_link, session, url, timeout)
+
+    unique_urls = list(dict.fromkeys(urls))
+    results = await asyncio.gather(*(check(url) for url in unique_urls))
+    return dict(zip(unique_urls, results))
+
+
+def apply_link_results(
+    episodes: List[Dict[str, Any]],
+    results: Dict[str, LinkCheckResult],
+    prune: bool = False
+) -> Dict[str, int]:
+    """
+    チェック結果をエピソードのリンクに反映
+
+    Args:
+        episodes: エピソードリスト（その場で更新）
+        results: URL → LinkCheckResult
+        prune: Trueの場合はリンク切れ（404/410）のリンクを削除（接続不可のリンクは削除しない）
+
+    Returns:
+        {"titled": タイトル補完数, "redirected": URL正規化数, "dead": リンク切れ数,
+         "unreachable": 接続不可数, "pruned": 削除数}
+    """
+    stats = {"titled": 0, "redirected": 0, "dead": 0, "unreachable": 0, "pruned": 0}
+
+    for ep in episodes:
+        kept = []
+        for link in ep.get('links', []):
+            result = results.get(link.get('url', ''))
+            if result is None:
+                kept.append(link)
+                continue
+
+            if result.unreachable:
+                stats["unreachable"] += 1
+                print(f"  [UNREACHABLE] {ep.get('number')}: {link['url']}（{result.error}）")
+            elif result.dead:
+                stats["dead"] += 1
+                print(f"  [DEAD] {ep.get('number')}: {link['url']}（{result.status}）")
+                if prune:
+                    stats["pruned"] += 1
+                    continue
+
+            if result.ok and result.permanent_redirect and result.final_url and result.final_url != link['url']:
+                print(f"  [REDIRECT] {ep.get('number')}: {link['url']} → {result.final_url}")
+                link['url'] = result.final_url
+                stats["redirected"] += 1
+
+            if result.title and link.get('title') == GENERIC_LINK_TITLE:
+                link['title'] = result.title
+                stats["titled"] += 1
+
+            kept.append(link)
+        if 'links' in ep:
+            ep['links'] = kept
+
+    return stats
+
+
+def enrich_episode_links(
+    episodes: List[Dict[str, Any]],
+    cache_path: Optional[Path] = CACHE_PATH,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    host_interval: float = DEFAULT_HOST_INTERVAL,
+    ttl: float = CACHE_TTL_SECONDS,
+    prune: bool = False,
+    session: Optional[requests.Session] = None
+) -> Dict[str, int]:
+    """
+    エピソードのリンクをチェックして反映（キャッシュが有効なURLはチェックしない）
+
+    Args:
+        episodes: エピソードリスト（その場で更新）
+        cache_path: キャッシュファイルのパス（Noneの場合はキャッシュを使わない）
+        concurrency: 同時に実行するチェック数
+        host_interval: 同じホストへのリクエスト間隔（秒）
+        ttl: キャッシュの有効期限（秒）
+        prune: Trueの場合はリンク切れ（404/410）のリンクを削除
+        session: 使用するHTTPセッション（省略時は新規作成）
+
+    Returns:
+        apply_link_results の集計に "checked"（チェックしたURL数）を加えたもの
+    """
+    cache = load_cache(cache_path) if cache_path else {}
+    now = time.time()
+    urls = {link['url'] for ep in episodes for link in ep.get('links', []) if link.get('url')}
+    pending = sorted(url for url in urls if url not in cache or not cache[url].is_fresh(now, ttl))
+    print(f"[INFO] リンク: {len(urls)}件（チェック対象: {len(pending)}件）")
+
+    if pending:
+        own_session = session is None
+        if own_session:
+            session = create_session(pool_maxsize=concurrency)
+        try:
+            with metrics.timer("check_links"):
+                cache.update(asyncio.run(check_links(pending, session, concurrency, host_interval)))
+        finally:
+            if own_session:
+                session.close()
+        if cache_path:
+            save_cache(cache_path, cache)
+
+    stats = apply_link_results(episodes, {url: cache[url] for url in urls}, prune=prune)
+    stats["checked"] = len(pending)
+    metrics.count("links", len(urls))
+    metrics.count("links_checked", len(pending))
+    metrics.count("links_dead", stats["dead"])
+    metrics.count("links_unreachable", stats["unreachable"])
+    return stats
+
+
+def run(args: argparse.Namespace) -> None:
+    """
+    episodes.json のリンクを検証して保存
+
+    Args:
+        args: コマンドライン引数
+    """
+    # update_episodes の保存処理を再利用（feedparserの読み込みを避けるため関数内でインポート）
+    from update_episodes import load_existing_episodes, save_episodes
+
+    json_path = Path(args.episodes)
+    episodes = load_existing_episodes(json_path)
+    if not episodes:
+        print("[ERROR] エピソードがありません")
+        sys.exit(1)
+
+    stats = enrich_episode_links(
+        episodes,
+        cache_path=None if args.no_cache else CACHE_PATH,
+        concurrency=args.concurrency,
+        host_interval=args.host_interval,
+        ttl=args.ttl_days * 86400,
+        prune=args.prune,
+    )
+
+    print(f"\n[INFO] チェック: {stats['checked']}件、タイトル補完: {stats['titled']}件、"
+          f"URL正規化: {stats['redirected']}件、リンク切れ: {stats['dead']}件（削除: {stats['pruned']}件）、"
+          f"接続不可: {stats['unreachable']}件")
+
+    if stats['titled'] or stats['redirected'] or stats['pruned']:
+        if args.dry_run:
+            print("[DRY-RUN] 実際には保存しません")
+        else:
+            save_episodes(episodes, json_path)
+    else:
+        print("[INFO] 更新する内容がないため、保存をスキップしました")
+
+
+def main() -> None:
+    """メイン処理"""
+    parser = argparse.ArgumentParser(description='episodes.json の関連リンクを検証し、ページタイトルとURLを補完')
+    parser.add_argument('--episodes', type=str, default=str(EPISODES_JSON_PATH),
+                        help=f'episodes.jsonのパス（デフォルト: {EPISODES_JSON_PATH}）')
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY,
+                        help=f'同時に実行するチェック数（デフォルト: {DEFAULT_CONCURRENCY}）')
+    parser.add_argument('--host-interval', type=float, default=DEFAULT_HOST_INTERVAL,
+                        help=f'同じホストへのリクエスト間隔（秒、デフォルト: {DEFAULT_HOST_INTERVAL}）')
+    parser.add_argument('--ttl-days', type=float, default=CACHE_TTL_SECONDS / 86400,
+                        help='チェック結果のキャッシュ有効期限（日、デフォルト: 7）')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='キャッシュを使わずに全URLをチェック')
+    parser.add_argument('--prune', action='store_true',
+                        help='リンク切れ（404・410）のリンクを削除（接続不可のリンクは削除しない）')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='episodes.jsonを更新せず、結果だけ表示')
+    metrics.add_metrics_argument(parser)
+    args = parser.parse_args()
+
+    with metrics.report_metrics(args.metrics_out, "enrich_links"):
+        run(args)
+
+
+if __name__ == "__main__":
+    main()
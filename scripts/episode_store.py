@@ -0,0 +1,654 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+エピソードカタログのSQLiteストア
+
+episodes.json と data/transcripts/ の内容をSQLiteデータベースで管理するためのモジュール。
+エピソード・タグ・関連リンク・書き起こしをテーブルに分けて保持し、
+変更のあった行だけをupsertで更新する。静的サイト用のJSONはエクスポータで再生成する。
+取り込んだJSONのキーの順序も保存し、エクスポート時に元の順序で出力する。
+最後に取り込み・エクスポートした episodes.json のハッシュと更新時刻を記録し、
+その後に episodes.json が直接編集されたかを判定できるようにする。
+"""
+
+import hashlib
+import json
+import shutil
+import sqlite3
+import sys
+import argparse
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Iterable
+
+# 共通ユーティリティのインポート
+from utils import natural_sort_key, DATA_DIR, TRANSCRIPTS_DIR, EPISODES_JSON_PATH
+from models import Episode, Transcript
+
+# デフォルトのデータベースパス
+DEFAULT_DB_PATH = DATA_DIR / "episodes.db"
+
+# episodes.json に出力するキーの順序（取り込み時の順序が無い場合）
+EPISODE_KEYS = [
+    "number", "title", "date", "duration", "description", "thumbnail",
+    "spotifyUrl", "tags", "transcript", "links", "id", "has_transcript"
+]
+
+# 書き起こしJSONに出力するキーの順序（取り込み時の順序が無い場合）
+TRANSCRIPT_KEYS = [
+    "episode_number", "file_name", "sub_title", "detailed_description", "summary", "transcript"
+]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS episodes (
+    number TEXT PRIMARY KEY,
+    id INTEGER,
+    title TEXT NOT NULL,
+    date TEXT,
+    duration TEXT,
+    description TEXT,
+    thumbnail TEXT,
+    spotify_url TEXT,
+    transcript TEXT,
+    has_transcript INTEGER,
+    extra TEXT,
+    key_order TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_episodes_date ON episodes(date);
+CREATE INDEX IF NOT EXISTS idx_episodes_id ON episodes(id);
+
+CREATE TABLE IF NOT EXISTS episode_tags (
+    number TEXT NOT NULL REFERENCES episodes(number) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    tag TEXT NOT NULL,
+    PRIMARY KEY (number, position)
+);
+CREATE INDEX IF NOT EXISTS idx_episode_tags_tag ON episode_tags(tag);
+
+CREATE TABLE IF NOT EXISTS episode_links (
+    number TEXT NOT NULL REFERENCES episodes(number) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    title TEXT,
+    url TEXT NOT NULL,
+    PRIMARY KEY (number, position)
+);
+CREATE INDEX IF NOT EXISTS idx_episode_links_url ON episode_links(url);
+
+CREATE TABLE IF NOT EXISTS transcripts (
+    episode_number TEXT PRIMARY KEY,
+    file_name TEXT,
+    sub_title TEXT,
+    detailed_description TEXT,
+    summary TEXT,
+    transcript TEXT,
+    extra TEXT,
+    key_order TEXT
+);
+
+CREATE TABLE IF NOT EXISTS sync_state (
+    name TEXT PRIMARY KEY,
+    sha256 TEXT NOT NULL,
+    mtime REAL NOT NULL
+);
+"""
+
+# sync_state に episodes.json の状態を記録する名前
+EPISODES_JSON_SYNC_NAME = "episodes_json"
+
+# 既存のデータベースに追加する列（テーブル名, 列名）
+ADDED_COLUMNS = [
+    ("episodes", "extra"),
+    ("episodes", "key_order"),
+    ("transcripts", "key_order"),
+]
+
+# FTS5テーブル（日本語は単語区切りがないため trigram トークナイザを優先）
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS transcripts_fts USING fts5(
+    episode_number UNINDEXED, sub_title, summary, transcript, tokenize='{tokenizer}'
+);
+"""
+
+
+class EpisodeStore:
+    """エピソードカタログを保持するSQLiteストア"""
+
+    def __init__(self, db_path: Path = DEFAULT_DB_PATH) -> None:
+        """
+        初期化（スキーマが無ければ作成）
+
+        Args:
+            db_path: データベースファイルのパス（":memory:" も可）
+        """
+        self.db_path = db_path
+        if str(db_path) != ":memory:":
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(db_path))
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self._create_schema()
+
+    def _create_schema(self) -> None:
+        """テーブル・インデックス・FTSテーブルを作成"""
+        self.conn.executescript(SCHEMA)
+        for table, column in ADDED_COLUMNS:
+            columns = {r["name"] for r in self.conn.execute(f"PRAGMA table_info({table})")}
+            if column not in columns:
+                self.conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} TEXT")
+        try:
+            self.conn.executescript(FTS_SCHEMA.format(tokenizer="trigram"))
+        except sqlite3.OperationalError:
+            # 古いSQLite（3.34未満）では trigram が使えない
+            self.conn.executescript(FTS_SCHEMA.format(tokenizer="unicode61"))
+        self.conn.commit()
+
+    def close(self) -> None:
+        """接続を閉じる"""
+        self.conn.close()
+
+    def __enter__(self) -> "EpisodeStore":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    # ------------------------------------------------------------
+    # エピソード
+    # ------------------------------------------------------------
+
+    def load_episode(self, number: str) -> Optional[Dict[str, Any]]:
+        """
+        エピソードを1件読み込む
+
+        Args:
+            number: エピソード番号
+
+        Returns:
+            episodes.json と同じ形式の辞書、存在しない場合はNone
+        """
+        row = self.conn.execute("SELECT * FROM episodes WHERE number = ?", (number,)).fetchone()
+        if row is None:
+            return None
+        tags = [r["tag"] for r in self.conn.execute(
+            "SELECT tag FROM episode_tags WHERE number = ? ORDER BY position", (number,)
+        )]
+        links = [{"title": r["title"], "url": r["url"]} for r in self.conn.execute(
+            "SELECT title, url FROM episode_links WHERE number = ? ORDER BY position", (number,)
+        )]
+        return self._row_to_episode(row, tags, links)
+
+    def load_episodes(self) -> List[Dict[str, Any]]:
+        """
+        全エピソードを配信日順（昇順）で読み込む
+
+        Returns:
+            episodes.json と同じ形式の辞書リスト
+        """
+        tags: Dict[str, List[str]] = {}
+        for r in self.conn.execute("SELECT number, tag FROM episode_tags ORDER BY number, position"):
+            tags.setdefault(r["number"], []).append(r["tag"])
+
+        links: Dict[str, List[Dict[str, str]]] = {}
+        for r in self.conn.execute("SELECT number, title, url FROM episode_links ORDER BY number, position"):
+            links.setdefault(r["number"], []).append({"title": r["title"], "url": r["url"]})
+
+        rows = self.conn.execute("SELECT * FROM episodes ORDER BY date, id")
+        return [
+            self._row_to_episode(row, tags.get(row["number"], []), links.get(row["number"], []))
+            for row in rows
+        ]
+
+    @staticmethod
+    def _row_to_episode(row: sqlite3.Row, tags: List[str], links: List[Dict[str, str]]) -> Dict[str, Any]:
+        """行データを episodes.json の辞書形式に変換"""
+        episode = {
+            "number": row["number"],
+            "title": row["title"],
+            "date": row["date"],
+            "duration": row["duration"],
+            "description": row["description"],
+            "thumbnail": row["thumbnail"],
+            "spotifyUrl": row["spotify_url"],
+            "tags": tags,
+            "transcript": row["transcript"],
+            "links": links,
+            "id": row["id"],
+            "has_transcript": None if row["has_transcript"] is None else bool(row["has_transcript"]),
+        }
+        # 未設定の項目は出力しない
+        data = {key: episode[key] for key in EPISODE_KEYS if episode[key] is not None}
+        if row["extra"]:
+            data.update(json.loads(row["extra"]))
+        return _restore_key_order(data, row["key_order"])
+
+    def upsert_episodes(self, episodes: Iterable[Dict[str, Any]]) -> int:
+        """
+        エピソードをupsertする（内容が変わっていない行は書き込まない）
+
+        Args:
+            episodes: episodes.json と同じ形式の辞書リスト
+
+        Returns:
+            挿入・更新した件数
+        """
+        changed = 0
+        with self.conn:
+            for episode in episodes:
+                if self._upsert_episode(episode):
+                    changed += 1
+        return changed
+
+    def _upsert_episode(self, episode: Dict[str, Any]) -> bool:
+        """エピソード1件をupsert（変更があればTrue）"""
+        number = episode["number"]
+        current = self.load_episode(number)
+        if (current is not None and Episode.from_dict(current) == Episode.from_dict(episode)
+                and _same_key_order(current, episode)):
+            return False
+
+        has_transcript = episode.get("has_transcript")
+        extra = {key: value for key, value in episode.items() if key not in EPISODE_KEYS}
+        self.conn.execute(
+            """
+            INSERT INTO episodes (number, id, title, date, duration, description,
+                                  thumbnail, spotify_url, transcript, has_transcript, extra, key_order)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(number) DO UPDATE SET
+                id = excluded.id,
+                title = excluded.title,
+                date = excluded.date,
+                duration = excluded.duration,
+                description = excluded.description,
+                thumbnail = excluded.thumbnail,
+                spotify_url = excluded.spotify_url,
+                transcript = excluded.transcript,
+                has_transcript = excluded.has_transcript,
+                extra = excluded.extra,
+                key_order = excluded.key_order
+            """,
+            (
+                number,
+                episode.get("id"),
+                episode.get("title", ""),
+                episode.get("date"),
+                episode.get("duration"),
+                episode.get("description"),
+                episode.get("thumbnail"),
+                episode.get("spotifyUrl"),
+                episode.get("transcript"),
+                None if has_transcript is None else int(has_transcript),
+                json.dumps(extra, ensure_ascii=False) if extra else None,
+                json.dumps(list(episode), ensure_ascii=False),
+            )
+        )
+
+        # タグ・リンクは変更があった場合のみ置き換える
+        if current is None or current.get("tags", []) != episode.get("tags", []):
+            self.conn.execute("DELETE FROM episode_tags WHERE number = ?", (number,))
+            self.conn.executemany(
+                "INSERT INTO episode_tags (number, position, tag) VALUES (?, ?, ?)",
+                [(number, i, tag) for i, tag in enumerate(episode.get("tags", []))]
+            )
+        if current is None or current.get("links", []) != episode.get("links", []):
+            self.conn.execute("DELETE FROM episode_links WHERE number = ?", (number,))
+            self.conn.executemany(
+                "INSERT INTO episode_links (number, position, title, url) VALUES (?, ?, ?, ?)",
+                [(number, i, link.get("title"), link["url"])
+                 for i, link in enumerate(episode.get("links", []))]
+            )
+        return True
+
+    # ------------------------------------------------------------
+    # 書き起こし
+    # ------------------------------------------------------------
+
+    def load_transcript(self, episode_number: str) -> Optional[Dict[str, Any]]:
+        """
+        書き起こしを1件読み込む
+
+        Args:
+            episode_number: エピソード番号
+
+        Returns:
+            書き起こしJSONと同じ形式の辞書、存在しない場合はNone
+        """
+        row = self.conn.execute(
+            "SELECT * FROM transcripts WHERE episode_number = ?", (episode_number,)
+        ).fetchone()
+        if row is None:
+            return None
+        return self._row_to_transcript(row)
+
+    @staticmethod
+    def _row_to_transcript(row: sqlite3.Row) -> Dict[str, Any]:
+        """行データを書き起こしJSONの辞書形式に変換"""
+        data = {key: row[key] for key in TRANSCRIPT_KEYS if row[key] is not None}
+        if row["extra"]:
+            data.update(json.loads(row["extra"]))
+        return _restore_key_order(data, row["key_order"])
+
+    def upsert_transcript(self, data: Dict[str, Any]) -> bool:
+        """
+        書き起こしを1件upsertし、全文検索インデックスも更新する
+
+        Args:
+            data: 書き起こしJSONの辞書
+
+        Returns:
+            挿入・更新があった場合True
+        """
+        with self.conn:
+            return self._upsert_transcript(data)
+
+    def _upsert_transcript(self, data: Dict[str, Any]) -> bool:
+        """書き起こし1件をupsert（コミットは呼び出し側で行う）"""
+        episode_number = data["episode_number"]
+        current = self.load_transcript(episode_number)
+        if (current is not None and Transcript.from_dict(current) == Transcript.from_dict(data)
+                and _same_key_order(current, data)):
+            return False
+
+        extra = {key: value for key, value in data.items() if key not in TRANSCRIPT_KEYS}
+        self.conn.execute(
+            """
+            INSERT INTO transcripts (episode_number, file_name, sub_title,
+                                     detailed_description, summary, transcript, extra, key_order)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(episode_number) DO UPDATE SET
+                file_name = excluded.file_name,
+                sub_title = excluded.sub_title,
+                detailed_description = excluded.detailed_description,
+                summary = excluded.summary,
+                transcript = excluded.transcript,
+                extra = excluded.extra,
+                key_order = excluded.key_order
+            """,
+            (
+                episode_number,
+                data.get("file_name"),
+                data.get("sub_title"),
+                data.get("detailed_description"),
+                data.get("summary"),
+                data.get("transcript"),
+                json.dumps(extra, ensure_ascii=False) if extra else None,
+                json.dumps(list(data), ensure_ascii=False),
+            )
+        )
+        # 全文検索インデックスは transcripts と同じrowidで管理する
+        rowid = self.conn.execute(
+            "SELECT rowid FROM transcripts WHERE episode_number = ?", (episode_number,)
+        ).fetchone()[0]
+        self.conn.execute("DELETE FROM transcripts_fts WHERE rowid = ?", (rowid,))
+        self.conn.execute(
+            "INSERT INTO transcripts_fts (rowid, episode_number, sub_title, summary, transcript) VALUES (?, ?, ?, ?, ?)",
+            (rowid, episode_number, data.get("sub_title", ""), data.get("summary", ""), data.get("transcript", ""))
+        )
+        return True
+
+    def search_transcripts(self, query: str, limit: int = 20) -> List[Dict[str, str]]:
+        """
+        書き起こしを全文検索
+
+        Args:
+            query: FTS5の検索クエリ（trigramの場合は3文字以上）
+            limit: 最大件数
+
+        Returns:
+            エピソード番号と抜粋の辞書リスト（関連度順）
+        """
+        rows = self.conn.execute(
+            """
+            SELECT episode_number, snippet(transcripts_fts, 3, '[', ']', '…', 16) AS snippet
+            FROM transcripts_fts
+            WHERE transcripts_fts MATCH ?
+            ORDER BY rank
+            LIMIT ?
+            """,
+            (query, limit)
+        )
+        return [{"episode_number": r["episode_number"], "snippet": r["snippet"]} for r in rows]
+
+    # ------------------------------------------------------------
+    # インポート・エクスポート
+    # ------------------------------------------------------------
+
+    def import_episodes_json(self, json_path: Path = EPISODES_JSON_PATH, prune: bool = False) -> int:
+        """
+        episodes.json を取り込み、取り込んだファイルの状態を記録する
+
+        Args:
+            json_path: episodes.json のパス
+            prune: Trueの場合は episodes.json に無いエピソードをデータベースから削除
+
+        Returns:
+            挿入・更新・削除した件数
+        """
+        with open(json_path, 'r', encoding='utf-8') as f:
+            episodes = json.load(f).get('episodes', [])
+        changed = self.upsert_episodes(episodes)
+        if prune:
+            numbers = {episode["number"] for episode in episodes}
+            removed = [
+                (r["number"],) for r in self.conn.execute("SELECT number FROM episodes")
+                if r["number"] not in numbers
+            ]
+            with self.conn:
+                # タグ・リンクは外部キーの ON DELETE CASCADE で削除される
+                self.conn.executemany("DELETE FROM episodes WHERE number = ?", removed)
+            changed += len(removed)
+        self.record_episodes_json(json_path)
+        return changed
+
+    def episodes_json_changed(self, json_path: Path = EPISODES_JSON_PATH) -> Optional[bool]:
+        """
+        最後の取り込み・エクスポートの後に episodes.json が変更されたか
+
+        更新時刻が記録と同じ場合はハッシュを計算しない。更新時刻だけが変わった場合は記録を更新する。
+
+        Args:
+            json_path: episodes.json のパス
+
+        Returns:
+            変更された場合True、変更が無い（ファイルが無い場合を含む）場合False、
+            記録が無い（記録を始める前に作ったデータベース）場合None
+        """
+        if not json_path.exists():
+            return False
+        row = self.conn.execute(
+            "SELECT sha256, mtime FROM sync_state WHERE name = ?", (EPISODES_JSON_SYNC_NAME,)
+        ).fetchone()
+        if row is None:
+            return None
+        if json_path.stat().st_mtime == row["mtime"]:
+            return False
+        if _file_sha256(json_path) != row["sha256"]:
+            return True
+        self.record_episodes_json(json_path)
+        return False
+
+    def matches_episodes_json(self, json_path: Path = EPISODES_JSON_PATH) -> bool:
+        """
+        episodes.json がデータベースからのエクスポートと同じ内容か
+
+        Args:
+            json_path: episodes.json のパス
+
+        Returns:
+            同じ内容の場合True
+        """
+        return json_path.exists() and json_path.read_text(encoding='utf-8') == self._episodes_json_content()
+
+    def record_episodes_json(self, json_path: Path = EPISODES_JSON_PATH) -> None:
+        """
+        episodes.json の現在のハッシュと更新時刻を、データベースと同期済みの状態として記録する
+
+        Args:
+            json_path: episodes.json のパス
+        """
+        with self.conn:
+            self.conn.execute(
+                """
+                INSERT INTO sync_state (name, sha256, mtime) VALUES (?, ?, ?)
+                ON CONFLICT(name) DO UPDATE SET sha256 = excluded.sha256, mtime = excluded.mtime
+                """,
+                (EPISODES_JSON_SYNC_NAME, _file_sha256(json_path), json_path.stat().st_mtime)
+            )
+
+    def import_transcripts(self, transcripts_dir: Path = TRANSCRIPTS_DIR) -> int:
+        """
+        書き起こしJSONフォルダを取り込む
+
+        Args:
+            transcripts_dir: 書き起こしJSONのフォルダ
+
+        Returns:
+            挿入・更新した件数
+        """
+        changed = 0
+        with self.conn:
+            for json_file in sorted(transcripts_dir.glob("*.json"), key=lambda f: natural_sort_key(f.name)):
+                try:
+                    with open(json_file, 'r', encoding='utf-8') as f:
+                        data = json.load(f)
+                except (OSError, json.JSONDecodeError) as e:
+                    print(f"[WARNING] {json_file.name} の読み込みに失敗: {e}")
+                    continue
+                if not data.get("episode_number"):
+                    print(f"[WARNING] {json_file.name} に episode_number がありません")
+                    continue
+                if self._upsert_transcript(data):
+                    changed += 1
+        return changed
+
+    def export_episodes_json(self, json_path: Path = EPISODES_JSON_PATH, backup: bool = False) -> bool:
+        """
+        episodes.json を再生成し、書き出したファイルの状態を記録する（内容が同じ場合は書き込まない）
+
+        Args:
+            json_path: 出力先のパス
+            backup: Trueの場合は書き込む前に既存のファイルを .json.backup にコピー
+
+        Returns:
+            書き込んだ場合True
+        """
+        backup_path = json_path.with_suffix('.json.backup') if backup else None
+        written = _write_if_changed(json_path, self._episodes_json_content(), backup_path=backup_path)
+        self.record_episodes_json(json_path)
+        return written
+
+    def _episodes_json_content(self) -> str:
+        """エクスポートする episodes.json の内容"""
+        return json.dumps({"episodes": self.load_episodes()}, indent=2, ensure_ascii=False)
+
+    def export_transcripts(self, transcripts_dir: Path = TRANSCRIPTS_DIR) -> int:
+        """
+        書き起こしJSONを再生成（内容が同じファイルは書き込まない）
+
+        Args:
+            transcripts_dir: 出力先フォルダ
+
+        Returns:
+            書き込んだファイル数
+        """
+        transcripts_dir.mkdir(parents=True, exist_ok=True)
+        written = 0
+        for row in self.conn.execute("SELECT * FROM transcripts"):
+            data = self._row_to_transcript(row)
+            content = json.dumps(data, ensure_ascii=False, indent=2)
+            if _write_if_changed(transcripts_dir / f"ep{data['episode_number']}.json", content):
+                written += 1
+        return written
+
+
+def _restore_key_order(data: Dict[str, Any], key_order: Optional[str]) -> Dict[str, Any]:
+    """
+    取り込み時のキーの順序に並べ直す
+
+    Args:
+        data: 行データから作った辞書
+        key_order: 取り込み時のキーの順序（JSON配列、古いデータベースではNone）
+
+    Returns:
+        取り込み時の順序に並べた辞書（順序に無いキーは元の順で末尾に置く）
+    """
+    if not key_order:
+        return data
+    ordered = {key: data[key] for key in json.loads(key_order) if key in data}
+    ordered.update(data)
+    return ordered
+
+
+def _same_key_order(current: Dict[str, Any], data: Dict[str, Any]) -> bool:
+    """保存済みの辞書と取り込む辞書で、共通するキーの順序が同じか（値がNoneで保存されないキーなどは除く）"""
+    return [key for key in current if key in data] == [key for key in data if key in current]
+
+
+def _file_sha256(path: Path) -> str:
+    """ファイルのSHA-256ハッシュ"""
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def _write_if_changed(path: Path, content: str, backup_path: Optional[Path] = None) -> bool:
+    """内容が異なる場合のみファイルを書き込む（backup_path を指定した場合は既存のファイルをコピーしてから）"""
+    if path.exists() and path.read_text(encoding='utf-8') == content:
+        return False
+    if backup_path and path.exists():
+        shutil.copy(path, backup_path)
+        print(f"[BACKUP] バックアップを作成: {backup_path}")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(path.suffix + '.tmp')
+    tmp_path.write_text(content, encoding='utf-8')
+    tmp_path.replace(path)
+    return True
+
+
+def main() -> None:
+    """メイン処理"""
+    parser = argparse.ArgumentParser(
+        description='エピソードカタログをSQLiteで管理（インポート・エクスポート・全文検索）'
+    )
+    parser.add_argument('--db', type=str, default=str(DEFAULT_DB_PATH),
+                        help=f'データベースファイルのパス（デフォルト: {DEFAULT_DB_PATH}）')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    subparsers.add_parser('import', help='episodes.json と書き起こしJSONをデータベースに取り込む')
+    subparsers.add_parser('export', help='データベースから episodes.json と書き起こしJSONを再生成')
+    search_parser = subparsers.add_parser('search', help='書き起こしを全文検索')
+    search_parser.add_argument('query', help='検索語（3文字以上）')
+    search_parser.add_argument('--limit', type=int, default=20, help='最大件数（デフォルト: 20）')
+
+    args = parser.parse_args()
+
+    with EpisodeStore(Path(args.db)) as store:
+        if args.command == 'import':
+            episode_count = store.import_episodes_json(EPISODES_JSON_PATH)
+            transcript_count = store.import_transcripts(TRANSCRIPTS_DIR)
+            print(f"[OK] エピソード: {episode_count}件、書き起こし: {transcript_count}件を取り込みました")
+        elif args.command == 'export':
+            changed = store.episodes_json_changed(EPISODES_JSON_PATH)
+            if changed is None and store.matches_episodes_json(EPISODES_JSON_PATH):
+                changed = False
+            if changed is not False:
+                # 直接編集された episodes.json をデータベースの内容で上書きしない
+                print(f"[WARNING] {EPISODES_JSON_PATH} はデータベースへの最後の取り込み・エクスポートの後に"
+                      f"変更されているため、書き出しません（先に import を実行してください）")
+            elif store.export_episodes_json(EPISODES_JSON_PATH, backup=True):
+                print(f"[OK] {EPISODES_JSON_PATH} を再生成しました")
+            else:
+                print(f"[INFO] {EPISODES_JSON_PATH} に変更はありません")
+            written = store.export_transcripts(TRANSCRIPTS_DIR)
+            print(f"[OK] 書き起こしJSON: {written}件を書き出しました")
+        elif args.command == 'search':
+            results = store.search_transcripts(args.query, limit=args.limit)
+            if not results:
+                print("[INFO] 見つかりませんでした")
+            for result in results:
+                print(f"ep{result['episode_number']}: {result['snippet']}")
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except sqlite3.Error as e:
+        print(f"[ERROR] データベースエラー: {e}")
+        sys.exit(1)
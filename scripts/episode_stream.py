@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+episodes.json のストリーミング読み書き
+
+episodes.json 全体をメモリに展開せず、"episodes" 配列の要素を1件ずつ読み書きするためのモジュール。
+大きなカタログでもマージ・ID振り直しのメモリ使用量を抑えられる。
+"""
+
+import json
+from pathlib import Path
+from typing import Dict, Any, Iterator, Iterable, Union
+
+from models import Episode
+
+# 読み込み時のチャンクサイズ
+CHUNK_SIZE = 64 * 1024
+
+
+def iter_episodes(json_path: Path, chunk_size: int = CHUNK_SIZE) -> Iterator[Dict[str, Any]]:
+    """
+    episodes.json の "episodes" 配列を1件ずつ読み込む
+
+    ファイルをチャンク単位で読み、配列の要素を逐次デコードする。
+    同時に保持するのは読み込み中のチャンクとデコード中の1件だけ。
+
+    Args:
+        json_path: episodes.json のパス
+        chunk_size: 1回に読み込む文字数
+
+    Yields:
+        エピソード情報の辞書
+
+    Raises:
+        ValueError: "episodes" 配列が見つからない、または形式が不正な場合
+    """
+    decoder = json.JSONDecoder()
+
+    with open(json_path, 'r', encoding='utf-8') as f:
+        buffer = ""
+        pos = 0
+        eof = False
+
+        def fill() -> bool:
+            """バッファに次のチャンクを追加（EOFならFalse）"""
+            nonlocal buffer, pos, eof
+            chunk = f.read(chunk_size)
+            if not chunk:
+                eof = True
+                return False
+            buffer = buffer[pos:] + chunk
+            pos = 0
+            return True
+
+        # "episodes": [ の位置まで読み進める
+        while True:
+            key_index = buffer.find('"episodes"')
+            if key_index >= 0:
+                bracket_index = buffer.find('[', key_index)
+                if bracket_index >= 0:
+                    pos = bracket_index + 1
+                    break
+            if not fill():
+                raise ValueError(f"{json_path} に \"episodes\" 配列が見つかりません")
+
+        while True:
+            # 空白とカンマを読み飛ばす
+            while True:
+                while pos < len(buffer) and buffer[pos] in ' \t\r\n,':
+                    pos += 1
+                if pos < len(buffer) or not fill():
+                    break
+
+            if pos >= len(buffer):
+                raise ValueError(f"{json_path} の \"episodes\" 配列が閉じられていません")
+            if buffer[pos] == ']':
+                return
+
+            # 1要素をデコード（途中で切れていれば追加で読み込む）
+            while True:
+                try:
+                    item, end = decoder.raw_decode(buffer, pos)
+                    break
+                except json.JSONDecodeError:
+                    if eof or not fill():
+                        raise ValueError(f"{json_path} のエピソードの形式が不正です")
+            pos = end
+            yield item
+
+
+def iter_episode_records(json_path: Path, chunk_size: int = CHUNK_SIZE) -> Iterator[Episode]:
+    """
+    episodes.json を Episode として1件ずつ読み込む
+
+    Args:
+        json_path: episodes.json のパス
+        chunk_size: 1回に読み込む文字数
+
+    Yields:
+        Episode
+    """
+    for data in iter_episodes(json_path, chunk_size):
+        yield Episode.from_dict(data)
+
+
+def write_episodes(
+    json_path: Path,
+    episodes: Iterable[Union[Dict[str, Any], Episode]]
+) -> int:
+    """
+    エピソードを1件ずつ episodes.json 形式で書き出す
+
+    json.dump({"episodes": ...}, indent=2, ensure_ascii=False) と同じ出力になる。
+
+    Args:
+        json_path: 出力先のパス
+        episodes: エピソード情報の辞書またはEpisodeのイテラブル
+
+    Returns:
+        書き出した件数
+    """
+    count = 0
+    with open(json_path, 'w', encoding='utf-8') as f:
+        f.write('{\n  "episodes": [')
+        for episode in episodes:
+            if isinstance(episode, Episode):
+                episode = episode.to_dict()
+            text = json.dumps(episode, indent=2, ensure_ascii=False)
+            f.write(',\n    ' if count else '\n    ')
+            f.write(text.replace('\n', '\n    '))
+            count += 1
+        f.write('\n  ]\n}' if count else ']\n}')
+    return count
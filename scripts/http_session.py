@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+HTTPセッションの共通処理
+
+接続プール付きの requests.Session の作成と、5xx・429 応答に対するバックオフ付きリトライを
+まとめたモジュール。429 応答ではレート制限（x-rate-limit-reset / Retry-After ヘッダ）に従う。
+"""
+
+import random
+import time
+from typing import Any, Callable, List, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import NewConnectionError
+
+import metrics
+from utils import USER_AGENT
+
+# リトライ対象のステータスコード
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+def create_session(pool_maxsize: int = 10, user_agent: str = USER_AGENT) -> requests.Session:
+    """
+    接続プール付きのセッションを作成
+
+    同じホストへのリクエストはKeep-Aliveで接続を再利用する。
+
+    Args:
+        pool_maxsize: ホストごとに保持する接続数の上限
+        user_agent: User-Agentヘッダ
+
+    Returns:
+        requests.Session
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_maxsize, pool_maxsize=pool_maxsize, max_retries=0)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers["User-Agent"] = user_agent
+    return session
+
+
+def compute_retry_delay(
+    response: Optional[requests.Response],
+    attempt: int,
+    backoff: float,
+    now: Optional[float] = None
+) -> float:
+    """
+    次のリトライまでの待機時間を計算
+
+    429 応答で x-rate-limit-reset（UNIX時刻）または Retry-After（秒）ヘッダがあればそれに従い、
+    それ以外（5xx・接続エラー）は指数バックオフ（ジッター付き）で待つ。
+    X は通常の応答にも x-rate-limit-reset を付けるため、5xx ではレート制限のヘッダを使わない。
+
+    Args:
+        response: 直前の応答（接続エラーの場合はNone）
+        attempt: 直前の試行回数（1から）
+        backoff: バックオフの基準秒数
+        now: 現在時刻（UNIX時刻、省略時は time.time()）
+
+    Returns:
+        待機秒数
+    """
+    if response is not None and response.status_code == 429:
+        reset = response.headers.get("x-rate-limit-reset")
+        if reset and reset.isdigit():
+            current = time.time() if now is None else now
+            return max(0.0, int(reset) - current) + 1.0
+        retry_after = response.headers.get("Retry-After")
+        if retry_after and retry_after.isdigit():
+            return float(retry_after)
+    return backoff * (2 ** (attempt - 1)) + random.uniform(0, backoff)
+
+
+def may_have_reached_server(error: requests.RequestException) -> bool:
+    """
+    失敗したリクエストがサーバーに届いた可能性があるか
+
+    名前解決・接続の段階の失敗（ConnectTimeout・NewConnectionError）はリクエストを送る前なので False。
+    それ以外（読み取りのタイムアウト、送信後の接続リセットなど）は、サーバー側で処理されている可能性がある。
+
+    Args:
+        error: session.request が送出した例外
+
+    Returns:
+        届いた可能性がある場合は True
+    """
+    if isinstance(error, requests.ConnectTimeout):
+        return False
+    # requests の ConnectionError は urllib3 の MaxRetryError（reason に原因）などを包んでいる
+    pending: List[Any] = [error]
+    seen = set()
+    while pending:
+        cause = pending.pop()
+        if cause is None or id(cause) in seen:
+            continue
+        seen.add(id(cause))
+        if isinstance(cause, NewConnectionError):
+            return False
+        pending.extend([getattr(cause, "reason", None), cause.__cause__, cause.__context__])
+        if isinstance(cause, BaseException):
+            pending.extend(arg for arg in cause.args if isinstance(arg, BaseException))
+    return True
+
+
+def request_with_retry(
+    session: requests.Session,
+    method: str,
+    url: str,
+    max_attempts: int = 4,
+    backoff: float = 2.0,
+    max_wait: float = 300.0,
+    sleep: Callable[[float], None] = time.sleep,
+    **kwargs: Any
+) -> Tuple[requests.Response, bool]:
+    """
+    5xx・429応答や接続エラーの場合にバックオフ付きでリトライするリクエスト
+
+    Args:
+        session: 使用するセッション
+        method: HTTPメソッド
+        url: リクエスト先URL
+        max_attempts: 最大試行回数
+        backoff: バックオフの基準秒数
+        max_wait: 1回の待機時間の上限（これを超える場合はリトライせずに直前の応答を返す）
+        sleep: 待機に使う関数
+        **kwargs: session.request に渡す引数
+
+    Returns:
+        (最後の応答, 途中でサーバーに届いた可能性のある失敗があったか)
+        後者は、サーバーに届いた可能性のある失敗（接続段階以外の接続エラー・タイムアウト、5xx）の後に
+        再送した場合にTrueになる（POSTの重複判定に使う）
+
+    Raises:
+        requests.RequestException: すべての試行が接続エラーで失敗した場合
+    """
+    ambiguous = False
+    for attempt in range(1, max_attempts + 1):
+        response: Optional[requests.Response] = None
+        try:
+            response = session.request(method, url, **kwargs)
+        except (requests.ConnectionError, requests.Timeout) as e:
+            if attempt == max_attempts:
+                raise
+            # 送信後のタイムアウト・接続リセットは、サーバー側で処理されている可能性がある
+            ambiguous = ambiguous or may_have_reached_server(e)
+            print(f"[WARNING] リクエストに失敗しました（{attempt}/{max_attempts}回目）: {e}")
+        else:
+            if response.status_code not in RETRY_STATUS_CODES or attempt == max_attempts:
+                return response, ambiguous
+            if response.status_code >= 500:
+                ambiguous = True
+            print(f"[WARNING] HTTP {response.status_code} のためリトライします（{attempt}/{max_attempts}回目）")
+
+        delay = compute_retry_delay(response, attempt, backoff)
+        if delay > max_wait:
+            if response is not None:
+                print(f"[WARNING] 待機時間（{delay:.0f}秒）が上限を超えるため、リトライを中止します")
+                return response, ambiguous
+            delay = max_wait
+        metrics.count("http_retries")
+        with metrics.timer("retry_wait"):
+            sleep(delay)
+
+    # max_attempts が0以下の場合のみ到達
+    raise ValueError("max_attempts は1以上を指定してください")
@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+入力フォルダの音声ファイルの取得（リース）
+
+複数のマシン・プロセスで transcribe_podcast.py を同じ入力フォルダ（同期フォルダ・共有フォルダ）に対して
+実行しても、同じ音声ファイルを二重に処理しないようにする。
+
+- 処理する前に、音声ファイルを processing/<ワーカーID>/ に移動して取得する（rename は1つのワーカーだけが成功する）
+- 取得している間、ワーカーは processing/<ワーカーID>/heartbeat を定期的に更新する
+- heartbeat が lease_seconds の間更新されていないワーカー（同じマシンでプロセスが終了しているものはすぐに）は
+  停止したとみなし、取得していた音声ファイルを入力フォルダに戻す。戻したファイルは他のワーカーが処理する
+- 処理に失敗したファイルは入力フォルダに戻す（他のワーカーも処理できる）。成功したファイルは
+  processing/<ワーカーID>/ からバックアップフォルダに移動する
+
+移動が原子的に行われるのは同じファイルシステム上（同じマシン、共有フォルダ）の場合。
+同期ツールで同期しているフォルダでは、同期の遅れの間に二重に取得される可能性は残る。
+"""
+
+import json
+import os
+import re
+import socket
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# 取得した音声ファイルを置くフォルダ名（入力フォルダの下）
+PROCESSING_DIR_NAME = "processing"
+
+# ワーカーが生きていることを示すファイル名
+HEARTBEAT_FILE_NAME = "heartbeat"
+
+# heartbeat がこの秒数更新されていなければ、ワーカーが停止したとみなす
+LEASE_SECONDS = 600
+
+# heartbeat を更新する間隔（lease_seconds に対する割合）
+HEARTBEAT_FRACTION = 0.25
+
+
+class LeaseLostError(Exception):
+    """取得していた音声ファイルを他のワーカーに回収された"""
+
+
+def default_worker_id() -> str:
+    """ワーカーID（ホスト名-プロセスID）"""
+    host = re.sub(r'[^A-Za-z0-9_.-]', '_', socket.gethostname()) or "host"
+    return f"{host}-{os.getpid()}"
+
+
+def process_alive(pid: int) -> bool:
+    """
+    同じマシンのプロセスが動いているか（POSIX のみ。それ以外は動いているとみなす）
+
+    Args:
+        pid: プロセスID
+
+    Returns:
+        動いている（または確かめられない）場合は True
+    """
+    if os.name != "posix":
+        # Windows の os.kill はプロセスを終了させるため使わない
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class InboxLeases:
+    """入力フォルダの音声ファイルを、このワーカーの processing/ に移動して取得する"""
+
+    def __init__(
+        self,
+        input_dir: Path,
+        worker_id: Optional[str] = None,
+        lease_seconds: float = LEASE_SECONDS
+    ) -> None:
+        """
+        初期化（heartbeat の更新を開始する）
+
+        Args:
+            input_dir: 入力ディレクトリのパス
+            worker_id: ワーカーID（省略時はホスト名-プロセスID）
+            lease_seconds: heartbeat がこの秒数更新されていないワーカーは停止したとみなす
+        """
+        self.input_dir = input_dir
+        self.worker_id = worker_id or default_worker_id()
+        self.lease_seconds = lease_seconds
+        self.processing_root = input_dir / PROCESSING_DIR_NAME
+        self.worker_dir = self.processing_root / self.worker_id
+        self.host = socket.gethostname()
+        self._stop = threading.Event()
+        self.heartbeat()
+        # 同じワーカーIDの前回の実行が停止したときに残したファイルは、入力フォルダに戻す
+        for path in self._claimed_files(self.worker_dir):
+            self.release(path)
+        self._thread = threading.Thread(target=self._beat, name="lease-heartbeat", daemon=True)
+        self._thread.start()
+
+    def heartbeat(self) -> None:
+        """heartbeat を更新（一時ファイルから置き換える）"""
+        self.worker_dir.mkdir(parents=True, exist_ok=True)
+        path = self.worker_dir / HEARTBEAT_FILE_NAME
+        tmp_path = path.with_name(f".{path.name}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"worker": self.worker_id, "host": self.host, "pid": os.getpid(),
+                       "updated_at": time.time()}, f)
+        os.replace(tmp_path, path)
+
+    def _beat(self) -> None:
+        """close されるまで heartbeat を更新し続ける（別スレッド）"""
+        while not self._stop.wait(self.lease_seconds * HEARTBEAT_FRACTION):
+            try:
+                self.heartbeat()
+            except OSError as e:
+                print(f"[WARNING] heartbeat を更新できませんでした: {e}")
+
+    def claim(self, audio_file: Path) -> Optional[Path]:
+        """
+        音声ファイルを取得（processing/<ワーカーID>/ に移動）
+
+        Args:
+            audio_file: 入力フォルダの音声ファイル
+
+        Returns:
+            移動先のパス（他のワーカーが先に取得した場合はNone）
+        """
+        self.worker_dir.mkdir(parents=True, exist_ok=True)
+        destination = self.worker_dir / audio_file.name
+        try:
+            os.rename(audio_file, destination)
+        except FileNotFoundError:
+            return None
+        return destination
+
+    def ensure_held(self, claimed: Path) -> None:
+        """
+        取得した音声ファイルがまだこのワーカーのものか確かめる（結果を保存する前に呼ぶ）
+
+        Raises:
+            LeaseLostError: 他のワーカーに回収された場合
+        """
+        if claimed.parent == self.worker_dir and not claimed.exists():
+            raise LeaseLostError(f"{claimed.name} は他のワーカーに回収されました（heartbeat が途切れた可能性があります）")
+
+    def release(self, claimed: Path) -> None:
+        """
+        取得した音声ファイルを入力フォルダに戻す（処理に失敗した場合）
+
+        Args:
+            claimed: claim で移動したパス
+        """
+        if claimed.parent != self.worker_dir:
+            return
+        try:
+            os.rename(claimed, self.input_dir / claimed.name)
+        except FileNotFoundError:
+            pass
+
+    def read_heartbeat(self, worker_dir: Path) -> Dict[str, Any]:
+        """
+        ワーカーの heartbeat を読む
+
+        Args:
+            worker_dir: processing/<ワーカーID>/
+
+        Returns:
+            heartbeat の内容（無い・読めない場合は空の辞書）と、更新時刻（"mtime"）
+        """
+        path = worker_dir / HEARTBEAT_FILE_NAME
+        try:
+            mtime = path.stat().st_mtime
+            with open(path, 'r', encoding='utf-8') as f:
+                return {**json.load(f), "mtime": mtime}
+        except (OSError, ValueError):
+            pass
+        try:
+            return {"mtime": worker_dir.stat().st_mtime}
+        except OSError:
+            return {}
+
+    def is_stale(self, worker_dir: Path) -> bool:
+        """
+        ワーカーが停止しているか
+
+        Args:
+            worker_dir: processing/<ワーカーID>/
+
+        Returns:
+            heartbeat が lease_seconds の間更新されていない、または同じマシンでプロセスが終了している場合は True
+        """
+        beat = self.read_heartbeat(worker_dir)
+        if not beat:
+            return False
+        if beat.get("host") == self.host and isinstance(beat.get("pid"), int) and not process_alive(beat["pid"]):
+            return True
+        return time.time() - beat["mtime"] > self.lease_seconds
+
+    def reclaim_stale(self) -> List[str]:
+        """
+        停止したワーカーが取得していた音声ファイルを入力フォルダに戻す
+
+        Returns:
+            戻した音声ファイル名のリスト
+        """
+        reclaimed = []
+        if not self.processing_root.is_dir():
+            return reclaimed
+        for worker_dir in sorted(self.processing_root.iterdir()):
+            if not worker_dir.is_dir() or worker_dir == self.worker_dir or not self.is_stale(worker_dir):
+                continue
+            for path in self._claimed_files(worker_dir):
+                try:
+                    os.rename(path, self.input_dir / path.name)
+                except FileNotFoundError:
+                    # 他のワーカーが先に戻した
+                    continue
+                reclaimed.append(path.name)
+                print(f"[INFO] 停止したワーカー {worker_dir.name} の {path.name} を入力フォルダに戻しました")
+            for path in (worker_dir / HEARTBEAT_FILE_NAME, worker_dir / f".{HEARTBEAT_FILE_NAME}.tmp"):
+                path.unlink(missing_ok=True)
+            try:
+                worker_dir.rmdir()
+            except OSError:
+                pass
+        return reclaimed
+
+    def leased_elsewhere(self) -> List[str]:
+        """他のワーカーが取得している音声ファイル名のリスト"""
+        names = []
+        if not self.processing_root.is_dir():
+            return names
+        for worker_dir in self.processing_root.iterdir():
+            if worker_dir.is_dir() and worker_dir != self.worker_dir:
+                names.extend(path.name for path in self._claimed_files(worker_dir))
+        return sorted(names)
+
+    @staticmethod
+    def _claimed_files(worker_dir: Path) -> List[Path]:
+        """ワーカーが取得している音声ファイル（heartbeat などを除く。フォルダが無い場合は空）"""
+        try:
+            paths = list(worker_dir.iterdir())
+        except OSError:
+            return []
+        return sorted(path for path in paths if path.name != HEARTBEAT_FILE_NAME and not path.name.startswith("."))
+
+    def close(self) -> None:
+        """
+        heartbeat の更新を止め、取得したまま残っている音声ファイルを入力フォルダに戻して processing/ を片付ける
+        """
+        self._stop.set()
+        self._thread.join()
+        if not self.worker_dir.is_dir():
+            return
+        for path in self._claimed_files(self.worker_dir):
+            self.release(path)
+        (self.worker_dir / HEARTBEAT_FILE_NAME).unlink(missing_ok=True)
+        # 他のワーカーが使用中の場合は空ではないため、processing/ は残る
+        for directory in (self.worker_dir, self.processing_root):
+            try:
+                directory.rmdir()
+            except OSError:
+                pass
+
+    def __enter__(self) -> "InboxLeases":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
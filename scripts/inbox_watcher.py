@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+入力フォルダの音声ファイルの監視
+
+transcribe_podcast.py --watch が、入力フォルダに置かれた音声ファイルを書き込みが終わりしだい処理するために使う。
+
+- Linux では inotify（ctypes で libc を呼び出す）でファイルの作成・書き込み・移動を待つ
+- inotify が使えない環境（Windows・macOS・監視数の上限など）では、一定間隔でフォルダを調べる（ポーリング）
+
+どちらの場合も、ファイルのサイズと更新時刻が settle_seconds の間変わらなければ書き込みが終わったとみなす。
+inotify で書き込みのクローズ（IN_CLOSE_WRITE）または移動（IN_MOVED_TO）を受け取った場合は、
+その後に変化が無ければすぐに処理できるものとする。
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# inotify のイベント（<sys/inotify.h>）
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+
+# struct inotify_event の固定長部分（wd, mask, cookie, len）
+EVENT_HEADER = struct.Struct("iIII")
+
+# ファイルの状態（サイズ, 更新時刻）
+Signature = Tuple[int, int]
+
+
+class Inotify:
+    """1つのディレクトリを監視する inotify（Linux のみ）"""
+
+    def __init__(self, directory: Path) -> None:
+        """
+        監視を開始
+
+        Args:
+            directory: 監視するディレクトリ
+
+        Raises:
+            OSError: inotify が使えない場合
+        """
+        if not sys.platform.startswith("linux"):
+            raise OSError("inotify は Linux でのみ使えます")
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or None, use_errno=True)
+        fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+        if libc.inotify_add_watch(fd, os.fsencode(str(directory)), WATCH_MASK) < 0:
+            errno = ctypes.get_errno()
+            os.close(fd)
+            raise OSError(errno, os.strerror(errno))
+        self.fd = fd
+
+    def read_events(self) -> List[Tuple[int, str]]:
+        """
+        届いているイベントをすべて読む
+
+        Returns:
+            (イベントのマスク, ファイル名) のリスト
+        """
+        events = []
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                return events
+            offset = 0
+            while offset + EVENT_HEADER.size <= len(data):
+                _, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+                offset += EVENT_HEADER.size
+                name = os.fsdecode(data[offset:offset + length].rstrip(b"\0"))
+                offset += length
+                if name:
+                    events.append((mask, name))
+
+    def close(self) -> None:
+        """監視を終了"""
+        os.close(self.fd)
+
+
+class InboxWatcher:
+    """入力フォルダの音声ファイルを監視し、書き込みが終わったものを返す"""
+
+    def __init__(
+        self,
+        directory: Path,
+        extensions: Iterable[str],
+        settle_seconds: float,
+        poll_interval: float,
+        use_inotify: bool = True
+    ) -> None:
+        """
+        初期化（inotify が使えない場合はポーリングにする）
+
+        Args:
+            directory: 監視するディレクトリ
+            extensions: 対象の拡張子（".wav" など）
+            settle_seconds: サイズと更新時刻がこの秒数変わらなければ書き込みが終わったとみなす
+            poll_interval: フォルダを調べる間隔（秒、inotify の場合も取りこぼし防止にこの間隔で調べる）
+            use_inotify: False の場合は常にポーリングにする
+        """
+        self.directory = directory
+        self.extensions = {ext.lower() for ext in extensions}
+        self.settle_seconds = settle_seconds
+        self.poll_interval = poll_interval
+        self._observed: Dict[str, Tuple[Signature, float]] = {}
+        self._closed: Dict[str, Optional[Signature]] = {}
+        self._wake = threading.Event()
+        self.inotify: Optional[Inotify] = None
+        self._wake_pipe: Optional[Tuple[int, int]] = None
+        if use_inotify:
+            try:
+                self.inotify = Inotify(directory)
+                self._wake_pipe = os.pipe()
+                os.set_blocking(self._wake_pipe[1], False)
+            except (OSError, AttributeError) as e:
+                print(f"[INFO] inotify を使えないため、{poll_interval:g}秒ごとにフォルダを調べます（{e}）")
+
+    @property
+    def mode(self) -> str:
+        """監視の方法（inotify / polling）"""
+        return "inotify" if self.inotify is not None else "polling"
+
+    def wake(self) -> None:
+        """wait を待たずに戻す（処理の完了・停止の合図。シグナルハンドラーや他のスレッドから呼べる）"""
+        self._wake.set()
+        if self._wake_pipe is not None:
+            try:
+                os.write(self._wake_pipe[1], b"\0")
+            except OSError:
+                pass
+
+    def wait(self, timeout: Optional[float] = None) -> None:
+        """
+        イベント・wake・timeout（省略時は poll_interval）のいずれかまで待つ
+
+        Args:
+            timeout: 待つ最大の秒数
+        """
+        timeout = self.poll_interval if timeout is None else timeout
+        if self.inotify is None:
+            self._wake.wait(timeout)
+            self._wake.clear()
+            return
+        readable, _, _ = select.select([self.inotify.fd, self._wake_pipe[0]], [], [], timeout)
+        if self._wake_pipe[0] in readable:
+            os.read(self._wake_pipe[0], 4096)
+        self._wake.clear()
+        if self.inotify.fd in readable:
+            for mask, name in self.inotify.read_events():
+                if mask & (IN_CLOSE_WRITE | IN_MOVED_TO):
+                    # 書き込みが閉じられた時点の状態（scan で現在の状態と比べる）
+                    self._closed[name] = self._signature(self.directory / name)
+                elif mask & (IN_MODIFY | IN_CREATE | IN_MOVED_FROM | IN_DELETE):
+                    self._closed.pop(name, None)
+
+    def next_wait(self, pending: bool) -> float:
+        """
+        次に wait する秒数
+
+        Args:
+            pending: 書き込みが終わるのを待っているファイルがあるか
+
+        Returns:
+            秒数（待っているファイルがあれば、落ち着いたかを早めに確かめる）
+        """
+        if pending:
+            return min(self.poll_interval, max(self.settle_seconds / 2, 0.1))
+        return self.poll_interval
+
+    @staticmethod
+    def _signature(path: Path) -> Optional[Signature]:
+        """ファイルの状態（存在しない場合はNone）"""
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        return stat.st_size, stat.st_mtime_ns
+
+    def scan(self) -> Tuple[List[Path], List[Path]]:
+        """
+        フォルダを調べ、書き込みが終わった音声ファイルと、まだ書き込み中の音声ファイルに分ける
+
+        Returns:
+            (書き込みが終わったファイル, 書き込み中のファイル)
+        """
+        ready = []
+        settling = []
+        now = time.monotonic()
+        present = set()
+        for path in sorted(self.directory.iterdir()):
+            if path.name.startswith(".") or path.suffix.lower() not in self.extensions or not path.is_file():
+                continue
+            signature = self._signature(path)
+            if signature is None:
+                continue
+            present.add(path.name)
+            previous = self._observed.get(path.name)
+            if previous is None or previous[0] != signature:
+                # 変化した（初めて見た）時点から数える。更新時刻が古ければ、その分は既に落ち着いているとみなす
+                age = max(0.0, time.time() - signature[1] / 1e9)
+                self._observed[path.name] = (signature, now - age)
+            since = self._observed[path.name][1]
+            closed = self._closed.get(path.name) == signature
+            if signature[0] > 0 and (closed or now - since >= self.settle_seconds):
+                ready.append(path)
+            else:
+                settling.append(path)
+        for name in set(self._observed) - present:
+            del self._observed[name]
+            self._closed.pop(name, None)
+        return ready, settling
+
+    def close(self) -> None:
+        """監視を終了"""
+        if self.inotify is not None:
+            self.inotify.close()
+            self.inotify = None
+        if self._wake_pipe is not None:
+            for fd in self._wake_pipe:
+                os.close(fd)
+            self._wake_pipe = None
+
+    def __enter__(self) -> "InboxWatcher":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+処理段階ごとの計測（タイマー・カウンター）
+
+各スクリプトの処理段階（RSS取得・解析・マージ・保存、音声アップロード・文字起こしなど）の
+所要時間と、バイト数・トークン数などのカウンターを記録し、実行の最後にまとめて出力する。
+
+出力先は --metrics-out で指定する:
+- *.prom: Prometheus の textfile 形式（node_exporter の textfile collector 向け、毎回上書き）
+- -: 標準出力に JSON Lines 形式で1行出力（GitHub Actions のログ向け）
+- それ以外: JSON Lines 形式で1実行1行を追記（ローカルのダッシュボード向け）
+
+使い方:
+    from metrics import timer, count
+
+    with timer("fetch"):
+        content = download()
+    count("feed_bytes", len(content))
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional
+
+# Prometheus のメトリクス名の接頭辞
+PROMETHEUS_PREFIX = "idobata"
+
+
+class Metrics:
+    """処理段階ごとの所要時間とカウンターを集計する（スレッドセーフ）"""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.reset()
+
+    def reset(self) -> None:
+        """記録をすべて消去して計測を開始し直す"""
+        with self._lock:
+            self.started_at = time.time()
+            self._start = time.perf_counter()
+            self.stages: Dict[str, Dict[str, float]] = {}
+            self.counters: Dict[str, float] = {}
+
+    def add_time(self, stage: str, seconds: float) -> None:
+        """
+        処理段階の所要時間を加算
+
+        Args:
+            stage: 処理段階の名前
+            seconds: 所要時間（秒）
+        """
+        with self._lock:
+            entry = self.stages.setdefault(stage, {"seconds": 0.0, "calls": 0})
+            entry["seconds"] += seconds
+            entry["calls"] += 1
+
+    @contextmanager
+    def timer(self, stage: str) -> Iterator[None]:
+        """
+        with ブロックの所要時間を処理段階として記録（例外で抜けた場合も記録する）
+
+        Args:
+            stage: 処理段階の名前
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(stage, time.perf_counter() - start)
+
+    def count(self, name: str, value: float = 1) -> None:
+        """
+        カウンターを加算
+
+        Args:
+            name: カウンター名（例: feed_bytes, prompt_tokens）
+            value: 加算する値
+        """
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+        local = self._local_counters()
+        local[name] = local.get(name, 0) + value
+
+    def _local_counters(self) -> Dict[str, float]:
+        """このスレッドで加算したカウンター（reset しても消えない。差分を取る用途に使う）"""
+        if not hasattr(self._local, "counters"):
+            self._local.counters = {}
+        return self._local.counters
+
+    def thread_counters(self) -> Dict[str, float]:
+        """
+        このスレッドで加算したカウンターのコピー
+
+        同時に複数の音声ファイルを処理する場合に、1件分の使用量を他のスレッドの分と混ぜずに数えるために使う。
+
+        Returns:
+            カウンター名 → 値
+        """
+        return dict(self._local_counters())
+
+    def snapshot(self, script: str) -> Dict[str, Any]:
+        """
+        現在の記録を1実行分のレコードとして取得
+
+        Args:
+            script: スクリプト名
+
+        Returns:
+            {"timestamp", "script", "duration_seconds", "stages", "counters"} の辞書
+        """
+        with self._lock:
+            return {
+                "timestamp": datetime.fromtimestamp(self.started_at, timezone.utc).isoformat(timespec="seconds"),
+                "script": script,
+                "duration_seconds": round(time.perf_counter() - self._start, 6),
+                "stages": {
+                    name: {"seconds": round(entry["seconds"], 6), "calls": int(entry["calls"])}
+                    for name, entry in self.stages.items()
+                },
+                "counters": dict(self.counters),
+            }
+
+
+# スクリプト全体で共有するデフォルトの記録先
+_default = Metrics()
+
+
+def get_metrics() -> Metrics:
+    """デフォルトの記録先を取得"""
+    return _default
+
+
+def timer(stage: str):
+    """デフォルトの記録先で処理段階の所要時間を計測（Metrics.timer を参照）"""
+    return _default.timer(stage)
+
+
+def count(name: str, value: float = 1) -> None:
+    """デフォルトの記録先のカウンターを加算（Metrics.count を参照）"""
+    _default.count(name, value)
+
+
+def _prometheus_name(name: str) -> str:
+    """Prometheus のメトリクス名として使えない文字を _ に置き換える"""
+    return re.sub(r'[^a-zA-Z0-9_]', '_', name)
+
+
+def format_prometheus(record: Dict[str, Any]) -> str:
+    """
+    1実行分のレコードを Prometheus の textfile 形式に変換
+
+    Args:
+        record: Metrics.snapshot の結果
+
+    Returns:
+        textfile 形式の文字列
+    """
+    script = record["script"]
+    label = f'script="{script}"'
+    lines = [
+        f"# HELP {PROMETHEUS_PREFIX}_run_timestamp_seconds 最後に実行した時刻（UNIX時間）",
+        f"# TYPE {PROMETHEUS_PREFIX}_run_timestamp_seconds gauge",
+        f"{PROMETHEUS_PREFIX}_run_timestamp_seconds{{{label}}} "
+        f"{datetime.fromisoformat(record['timestamp']).timestamp():.0f}",
+        f"# HELP {PROMETHEUS_PREFIX}_run_duration_seconds 実行全体の所要時間",
+        f"# TYPE {PROMETHEUS_PREFIX}_run_duration_seconds gauge",
+        f"{PROMETHEUS_PREFIX}_run_duration_seconds{{{label}}} {record['duration_seconds']}",
+    ]
+
+    if record["stages"]:
+        lines.append(f"# HELP {PROMETHEUS_PREFIX}_stage_seconds 処理段階ごとの所要時間")
+        lines.append(f"# TYPE {PROMETHEUS_PREFIX}_stage_seconds gauge")
+        for stage, entry in record["stages"].items():
+            lines.append(f'{PROMETHEUS_PREFIX}_stage_seconds{{{label},stage="{stage}"}} {entry["seconds"]}')
+        lines.append(f"# HELP {PROMETHEUS_PREFIX}_stage_calls 処理段階ごとの実行回数")
+        lines.append(f"# TYPE {PROMETHEUS_PREFIX}_stage_calls gauge")
+        for stage, entry in record["stages"].items():
+            lines.append(f'{PROMETHEUS_PREFIX}_stage_calls{{{label},stage="{stage}"}} {entry["calls"]}')
+
+    for name, value in record["counters"].items():
+        metric = f"{PROMETHEUS_PREFIX}_{_prometheus_name(name)}"
+        lines.append(f"# TYPE {metric} gauge")
+        lines.append(f"{metric}{{{label}}} {value}")
+
+    return "\n".join(lines) + "\n"
+
+
+def format_summary(record: Dict[str, Any]) -> str:
+    """
+    1実行分のレコードをログ用の1行にまとめる
+
+    Args:
+        record: Metrics.snapshot の結果
+
+    Returns:
+        例: "[METRICS] update_episodes 1.23s | fetch=0.81s parse=0.20s | feed_bytes=123456"
+    """
+    stages = " ".join(f"{name}={entry['seconds']:.2f}s" for name, entry in record["stages"].items())
+    counters = " ".join(f"{name}={value:g}" for name, value in record["counters"].items())
+    parts = [f"[METRICS] {record['script']} {record['duration_seconds']:.2f}s"]
+    parts.extend(part for part in (stages, counters) if part)
+    return " | ".join(parts)
+
+
+def write_metrics(output: str, script: str, metrics: Optional[Metrics] = None) -> Dict[str, Any]:
+    """
+    記録を出力先に書き出し、ログに要約を表示
+
+    Args:
+        output: 出力先（*.prom、-、またはJSON Linesファイルのパス）
+        script: スクリプト名
+        metrics: 記録（省略時はデフォルトの記録先）
+
+    Returns:
+        書き出したレコード
+    """
+    record = (metrics or _default).snapshot(script)
+    print(format_summary(record))
+
+    if output == "-":
+        print(json.dumps(record, ensure_ascii=False))
+        return record
+
+    path = Path(output)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if path.suffix == ".prom":
+        # textfile collector が書きかけのファイルを読まないよう、一時ファイルから置き換える
+        tmp_path = path.with_name(f".{path.name}.tmp")
+        tmp_path.write_text(format_prometheus(record), encoding='utf-8')
+        os.replace(tmp_path, path)
+    else:
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+    return record
+
+
+def add_metrics_argument(parser: argparse.ArgumentParser) -> None:
+    """
+    --metrics-out オプションを追加
+
+    Args:
+        parser: 引数パーサー
+    """
+    parser.add_argument('--metrics-out', type=str, default=os.environ.get("METRICS_OUT"),
+                        help='処理段階ごとの計測結果の出力先（*.prom: Prometheus textfile、'
+                             '-: 標準出力、それ以外: JSON Linesに追記。環境変数 METRICS_OUT でも指定可）')
+
+
+@contextmanager
+def report_metrics(output: Optional[str], script: str) -> Iterator[None]:
+    """
+    with ブロック全体を1実行として計測し、終了時（異常終了を含む）に出力する
+
+    Args:
+        output: 出力先（Noneの場合は出力しない）
+        script: スクリプト名
+    """
+    _default.reset()
+    try:
+        yield
+    finally:
+        if output:
+            try:
+                write_metrics(output, script)
+            except OSError as e:
+                print(f"[WARNING] 計測結果の書き出しに失敗しました: {e}", file=sys.stderr)
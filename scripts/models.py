@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+エピソード・書き起こしのデータモデル
+
+各スクリプトで共有する Episode（episodes.json の1件）と Transcript（書き起こしJSON）の
+__slots__ 付きデータクラス、およびJSONとの相互変換・検証をまとめたモジュール
+"""
+
+import copy
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+# 共通ユーティリティのインポート
+from utils import validate_episode_number
+
+
+class ModelValidationError(ValueError):
+    """データモデルの検証エラー"""
+
+
+@dataclass(slots=True)
+class Episode:
+    """episodes.json のエピソード1件"""
+
+    number: str
+    title: str
+    date: Optional[str] = None
+    duration: Optional[str] = None
+    description: Optional[str] = None
+    thumbnail: Optional[str] = None
+    spotify_url: Optional[str] = None
+    tags: List[str] = field(default_factory=list)
+    transcript: Optional[str] = None
+    links: List[Dict[str, str]] = field(default_factory=list)
+    id: Optional[int] = None
+    has_transcript: Optional[bool] = None
+    extra: Optional[Dict[str, Any]] = None
+    # 読み込んだJSONのキーの順序（to_dict はこの順序で出力する。新規作成時はNone）
+    key_order: Optional[Tuple[str, ...]] = field(default=None, compare=False, repr=False)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Episode":
+        """
+        episodes.json の辞書からエピソードを作成
+
+        Args:
+            data: エピソード情報の辞書
+
+        Returns:
+            Episode
+        """
+        extra = {key: value for key, value in data.items() if key not in _EPISODE_JSON_KEYS}
+        return cls(
+            number=data.get("number", ""),
+            title=data.get("title", ""),
+            date=data.get("date"),
+            duration=data.get("duration"),
+            description=data.get("description"),
+            thumbnail=data.get("thumbnail"),
+            spotify_url=data.get("spotifyUrl"),
+            tags=data.get("tags", []),
+            transcript=data.get("transcript"),
+            links=data.get("links", []),
+            id=data.get("id"),
+            has_transcript=data.get("has_transcript"),
+            extra=extra or None,
+            key_order=tuple(data),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        episodes.json の辞書形式に変換（未設定の項目は出力しない）
+
+        読み込んだJSONから作成した場合は元のキーの順序で出力する（元に無かったキーは末尾に追加）。
+
+        Returns:
+            エピソード情報の辞書
+        """
+        data: Dict[str, Any] = {"number": self.number, "title": self.title}
+        if self.date is not None:
+            data["date"] = self.date
+        if self.duration is not None:
+            data["duration"] = self.duration
+        if self.description is not None:
+            data["description"] = self.description
+        if self.thumbnail is not None:
+            data["thumbnail"] = self.thumbnail
+        if self.spotify_url is not None:
+            data["spotifyUrl"] = self.spotify_url
+        data["tags"] = self.tags
+        if self.transcript is not None:
+            data["transcript"] = self.transcript
+        data["links"] = self.links
+        if self.id is not None:
+            data["id"] = self.id
+        if self.has_transcript is not None:
+            data["has_transcript"] = self.has_transcript
+        if self.extra:
+            data.update(self.extra)
+        if self.key_order is None:
+            return data
+        ordered = {key: data[key] for key in self.key_order if key in data}
+        ordered.update(data)
+        return ordered
+
+    @classmethod
+    def from_json(cls, text: str) -> "Episode":
+        """JSON文字列からエピソードを作成"""
+        return cls.from_dict(json.loads(text))
+
+    def to_json(self) -> str:
+        """episodes.json と同じ書式（indent=2）のJSON文字列に変換"""
+        return json.dumps(self.to_dict(), indent=2, ensure_ascii=False)
+
+    def copy(self) -> "Episode":
+        """タグ・リンクのリストも複製したコピーを作成"""
+        return Episode(
+            self.number, self.title, self.date, self.duration, self.description,
+            self.thumbnail, self.spotify_url, list(self.tags), self.transcript,
+            [dict(link) for link in self.links], self.id, self.has_transcript,
+            dict(self.extra) if self.extra else None, self.key_order,
+        )
+
+    def validate(self) -> None:
+        """
+        エピソードの内容を検証
+
+        Raises:
+            ModelValidationError: エピソード番号やタイトルが不正な場合
+        """
+        if not validate_episode_number(self.number):
+            raise ModelValidationError(f"エピソード番号の形式が不正です: {self.number!r}")
+        if not self.title:
+            raise ModelValidationError(f"{self.number}: タイトルがありません")
+        if not isinstance(self.tags, list) or not isinstance(self.links, list):
+            raise ModelValidationError(f"{self.number}: tags・links はリストである必要があります")
+
+
+_EPISODE_JSON_KEYS = {
+    "number", "title", "date", "duration", "description", "thumbnail",
+    "spotifyUrl", "tags", "transcript", "links", "id", "has_transcript",
+}
+
+
+@dataclass(slots=True)
+class Transcript:
+    """data/transcripts/ の書き起こしJSON"""
+
+    episode_number: str
+    file_name: str = ""
+    sub_title: str = ""
+    detailed_description: Optional[str] = None
+    summary: str = ""
+    transcript: str = ""
+    # 生成したフィールドごとの記録（フィールド名 → プロンプト・モデル・入力・出力のハッシュ）
+    artifacts: Optional[Dict[str, Dict[str, str]]] = None
+    extra: Optional[Dict[str, Any]] = None
+    # 読み込んだJSONのキーの順序（to_dict はこの順序で、あったキーだけを出力する。新規作成時はNone）
+    key_order: Optional[Tuple[str, ...]] = field(default=None, compare=False, repr=False)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Transcript":
+        """
+        書き起こしJSONの辞書から作成
+
+        Args:
+            data: 書き起こしJSONの辞書
+
+        Returns:
+            Transcript
+        """
+        extra = {key: value for key, value in data.items() if key not in _TRANSCRIPT_JSON_KEYS}
+        return cls(
+            episode_number=data.get("episode_number", ""),
+            file_name=data.get("file_name", ""),
+            sub_title=data.get("sub_title", ""),
+            detailed_description=data.get("detailed_description"),
+            summary=data.get("summary", ""),
+            transcript=data.get("transcript", ""),
+            artifacts=data.get("artifacts"),
+            extra=extra or None,
+            key_order=tuple(data),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        書き起こしJSONの辞書形式に変換
+
+        読み込んだJSONから作成した場合は、元のキーの順序で、元にあったキーと値を設定したキーだけを出力する
+        （新しく設定したキーは末尾に追加）。
+
+        Returns:
+            書き起こしJSONの辞書
+        """
+        present = set(self.key_order) if self.key_order is not None else set(_TRANSCRIPT_REQUIRED_KEYS)
+        values = {
+            "episode_number": self.episode_number,
+            "file_name": self.file_name,
+            "sub_title": self.sub_title,
+            "detailed_description": self.detailed_description,
+            "summary": self.summary,
+            "transcript": self.transcript,
+            "artifacts": self.artifacts,
+        }
+        # 値を設定したキー（詳細説明は空文字列でも設定したものとする）も出力する
+        known = {
+            key: value for key, value in values.items()
+            if key in present or value or (key == "detailed_description" and value is not None)
+        }
+        extra = self.extra or {}
+
+        data: Dict[str, Any] = {}
+        for key in self.key_order or ():
+            if key in known:
+                data[key] = known[key]
+            elif key in extra:
+                data[key] = extra[key]
+        for key, value in known.items():
+            data.setdefault(key, value)
+        for key, value in extra.items():
+            data.setdefault(key, value)
+        return data
+
+    @classmethod
+    def from_json(cls, text: str) -> "Transcript":
+        """JSON文字列から作成"""
+        return cls.from_dict(json.loads(text))
+
+    def to_json(self) -> str:
+        """書き起こしJSONと同じ書式（indent=2）のJSON文字列に変換"""
+        return json.dumps(self.to_dict(), ensure_ascii=False, indent=2)
+
+    @classmethod
+    def load(cls, json_path: Path) -> "Transcript":
+        """
+        書き起こしJSONファイルを読み込む
+
+        Args:
+            json_path: 書き起こしJSONのパス
+
+        Returns:
+            Transcript
+        """
+        with open(json_path, 'r', encoding='utf-8') as f:
+            return cls.from_dict(json.load(f))
+
+    def copy(self) -> "Transcript":
+        """生成の記録（artifacts）・未知のキー（extra）も複製したコピーを作成"""
+        return Transcript(
+            self.episode_number, self.file_name, self.sub_title, self.detailed_description,
+            self.summary, self.transcript,
+            {field: dict(record) for field, record in self.artifacts.items()} if self.artifacts is not None else None,
+            copy.deepcopy(self.extra) if self.extra else None,
+            self.key_order,
+        )
+
+    def save(self, json_path: Path) -> None:
+        """
+        書き起こしJSONファイルに保存
+
+        Args:
+            json_path: 保存先のパス
+        """
+        with open(json_path, 'w', encoding='utf-8') as f:
+            f.write(self.to_json())
+
+    def validate(self) -> None:
+        """
+        書き起こしの内容を検証
+
+        Raises:
+            ModelValidationError: エピソード番号が不正な場合
+        """
+        if not validate_episode_number(self.episode_number):
+            raise ModelValidationError(f"エピソード番号の形式が不正です: {self.episode_number!r}")
+
+
+_TRANSCRIPT_JSON_KEYS = {
+    "episode_number", "file_name", "sub_title", "detailed_description", "summary", "transcript", "artifacts",
+}
+
+# 新規作成した書き起こしで常に出力するキー
+_TRANSCRIPT_REQUIRED_KEYS = ("episode_number", "file_name", "sub_title", "summary", "transcript")
@@ -4,26 +4,37 @@
 RSSフィードをチェックして新しいエピソードがあればX（Twitter）にポストするスクリプト
 """
 
+import argparse
 import feedparser
 import json
 import os
 import sys
 import re
+import time
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Set
 from datetime import datetime
 import requests
 from requests_oauthlib import OAuth1
 
 # 共通ユーティリティのインポート
-from utils import extract_episode_number, PROJECT_ROOT
+from utils import extract_episode_number, natural_sort_key, parse_date, PROJECT_ROOT
+from models import Episode, ModelValidationError
+from http_session import create_session, request_with_retry
+import metrics
 
 # RSSフィードURL
 RSS_FEED_URL = "https://anchor.fm/s/6981b208/podcast/rss"
 
-# 状態ファイルのパス（前回の最新エピソード番号を保存）
+# 状態ファイルのパス（投稿済みエピソード番号・投稿キュー・送信中のツイートを保存）
 STATE_FILE = PROJECT_ROOT / ".github" / "last_episode_state.json"
 
+# 1回の実行で投稿する最大件数（残りは次回の実行で投稿）
+MAX_POSTS_PER_RUN = 3
+
+# 連続投稿する場合の間隔（秒）
+POST_INTERVAL_SECONDS = 60
+
 # X API設定（環境変数から取得）
 # 注意: X API v2の投稿エンドポイントはOAuth 1.0a User Contextが必要です
 # Bearer Token（Application-Only）は投稿には使用できません
@@ -35,79 +46,225 @@ X_ACCESS_TOKEN_SECRET = os.environ.get("X_ACCESS_TOKEN_SECRET")
 # X API v2 エンドポイント
 X_API_V2_POST_URL = "https://api.twitter.com/2/tweets"
 
+# 投稿リクエストの最大試行回数
+POST_MAX_ATTEMPTS = 4
+
+# レート制限の解除を待つ最大秒数（これより長い場合は次回の実行に回す）
+RATE_LIMIT_MAX_WAIT_SECONDS = 300
+
+# 実行中に共有するHTTPセッション（連続投稿でTLS接続を再利用する）
+_http_session: Optional[requests.Session] = None
+
+# この実行で投稿に成功したツイート文（再送による二重投稿の防止）
+_posted_texts: Set[str] = set()
+
+
+def get_http_session() -> requests.Session:
+    """
+    共有HTTPセッションを取得（初回呼び出し時に作成）
+    
+    Returns:
+        requests.Session
+    """
+    global _http_session
+    if _http_session is None:
+        _http_session = create_session(pool_maxsize=2)
+    return _http_session
+
+
+def is_duplicate_content_error(response: requests.Response) -> bool:
+    """
+    X APIの「同じ内容のツイート」エラーかどうかを判定
+    
+    Args:
+        response: X APIの応答
+        
+    Returns:
+        重複投稿エラーの場合True
+    """
+    if response.status_code != 403:
+        return False
+    try:
+        detail = json.dumps(response.json()).lower()
+    except ValueError:
+        detail = response.text.lower()
+    return "duplicate" in detail
+
 
-def load_last_episode_state() -> Optional[str]:
+def load_post_state() -> Dict[str, Any]:
     """
-    前回の最新エピソード番号を読み込む
+    投稿状態を読み込む
     
     Returns:
-        前回の最新エピソード番号、存在しない場合はNone
+        {"posted_episodes": 投稿済みエピソード番号の集合またはNone,
+         "queue": 投稿待ちエピソードのリスト,
+         "last_episode_number": 旧形式の最新エピソード番号またはNone,
+         "in_flight": 送信を始めて結果を記録できていないツイート（{"number", "text"}）またはNone}
     """
+    state: Dict[str, Any] = {'posted_episodes': None, 'queue': [], 'last_episode_number': None, 'in_flight': None}
     if not STATE_FILE.exists():
-        return None
+        return state
     
     try:
         with open(STATE_FILE, 'r', encoding='utf-8') as f:
             data = json.load(f)
-            return data.get('last_episode_number')
     except Exception as e:
         print(f"[WARNING] 状態ファイルの読み込みに失敗: {e}")
-        return None
+        return state
+    
+    if 'posted_episodes' in data:
+        state['posted_episodes'] = set(data['posted_episodes'])
+    state['queue'] = [Episode.from_dict(item) for item in data.get('queue', [])]
+    state['last_episode_number'] = data.get('last_episode_number')
+    state['in_flight'] = data.get('in_flight')
+    return state
 
 
-def save_last_episode_state(episode_number: str) -> None:
+def save_post_state(
+    posted_episodes: Set[str],
+    queue: List[Episode],
+    last_episode_number: Optional[str],
+    in_flight: Optional[Dict[str, str]] = None
+) -> None:
     """
-    最新エピソード番号を保存
+    投稿状態を保存
     
     Args:
-        episode_number: エピソード番号
+        posted_episodes: 投稿済みエピソード番号の集合
+        queue: 投稿待ちエピソードのリスト
+        last_episode_number: 最後に投稿したエピソード番号
+        in_flight: 送信を始めたツイート（{"number", "text"}）。結果を記録したらNoneで保存し直す
     """
     STATE_FILE.parent.mkdir(parents=True, exist_ok=True)
     
     data = {
-        'last_episode_number': episode_number,
+        'last_episode_number': last_episode_number,
+        'posted_episodes': sorted(posted_episodes, key=lambda n: natural_sort_key(f"ep{n}")),
+        'queue': [episode.to_dict() for episode in queue],
+        'in_flight': in_flight,
         'updated_at': datetime.now().isoformat()
     }
     
-    with open(STATE_FILE, 'w', encoding='utf-8') as f:
+    tmp_path = STATE_FILE.with_suffix('.json.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
         json.dump(data, f, indent=2, ensure_ascii=False)
+    tmp_path.replace(STATE_FILE)
 
 
-def get_latest_episode_from_rss() -> Optional[Dict[str, Any]]:
+def get_episodes_from_rss(feed_url: str = RSS_FEED_URL) -> List[Episode]:
     """
-    RSSフィードから最新のエピソードを取得
+    RSSフィードからエピソードを取得し、配信日時の古い順に並べる
+    
+    フィード内の並び順には依存しない。
     
+    Args:
+        feed_url: RSSフィードのURLまたはローカルファイルのパス
+        
     Returns:
-        最新エピソードの情報、取得できない場合はNone
+        エピソードのリスト（古い順、エピソード番号で重複除去済み）
     """
-    print(f"[INFO] RSSフィードを取得中: {RSS_FEED_URL}")
-    feed = feedparser.parse(RSS_FEED_URL)
+    print(f"[INFO] RSSフィードを取得中: {feed_url}")
+    with metrics.timer("fetch_feed"):
+        feed = feedparser.parse(feed_url)
+    metrics.count("feed_entries", len(feed.entries))
     
     if feed.bozo:
         print(f"[WARNING] RSSフィードの解析にエラーがあります: {feed.bozo_exception}")
     
     if not feed.entries:
         print("[ERROR] RSSフィードにエントリーが見つかりません")
-        return None
-    
-    # 最新のエントリー（最初のエントリー）を取得
-    entry = feed.entries[0]
-    
-    # エピソード番号を抽出
-    episode_number = extract_episode_number(entry.title)
-    if not episode_number:
-        print(f"[WARNING] エピソード番号が取得できませんでした: {entry.title}")
-        return None
-    
-    return {
-        'number': episode_number,
-        'title': entry.title,
-        'link': entry.get('link', ''),
-        'published': entry.get('published', '')
-    }
+        return []
+    
+    dated_episodes = {}
+    for entry in feed.entries:
+        # エピソード番号を抽出
+        episode_number = extract_episode_number(entry.get('title', ''))
+        if not episode_number:
+            print(f"[WARNING] エピソード番号が取得できませんでした: {entry.get('title', '')}")
+            continue
+        
+        episode = Episode(
+            number=episode_number,
+            title=entry.title,
+            date=parse_date(entry.get('published', '')),
+            spotify_url=entry.get('link', '')
+        )
+        
+        try:
+            episode.validate()
+        except ModelValidationError as e:
+            print(f"[WARNING] エピソード情報が不正です: {e}")
+            continue
+        
+        published = tuple(entry.published_parsed) if entry.get('published_parsed') else ()
+        sort_key = (episode.date, published, natural_sort_key(f"ep{episode_number}"))
+        if episode_number not in dated_episodes or sort_key < dated_episodes[episode_number][0]:
+            dated_episodes[episode_number] = (sort_key, episode)
+    
+    return [episode for _, episode in sorted(dated_episodes.values(), key=lambda item: item[0])]
+
+
+def initial_posted_episodes(episodes: List[Episode], last_episode_number: Optional[str]) -> Set[str]:
+    """
+    投稿済みエピソードの集合を初期化（旧形式の状態ファイルからの移行）
+    
+    旧形式の last_episode_number がある場合は、それ以前に配信されたエピソードを投稿済みとみなす。
+    状態ファイルがない場合は、最新エピソードだけを未投稿とみなす（過去分を一斉に投稿しない）。
+    
+    Args:
+        episodes: フィードのエピソードリスト（古い順）
+        last_episode_number: 旧形式の最新エピソード番号
+        
+    Returns:
+        投稿済みエピソード番号の集合
+    """
+    if not episodes:
+        return set()
+    
+    if last_episode_number:
+        for index, episode in enumerate(episodes):
+            if episode.number == last_episode_number:
+                return {ep.number for ep in episodes[:index + 1]}
+        # フィードに見つからない場合はエピソード番号の順序で判定
+        last_key = natural_sort_key(f"ep{last_episode_number}")
+        return {ep.number for ep in episodes if natural_sort_key(f"ep{ep.number}") <= last_key}
+    
+    return {ep.number for ep in episodes[:-1]}
 
 
-def create_tweet_text(episode: Dict[str, Any]) -> str:
+def enqueue_new_episodes(
+    episodes: List[Episode],
+    posted_episodes: Set[str],
+    queue: List[Episode]
+) -> List[Episode]:
+    """
+    未投稿のエピソードを投稿キューに追加（重複除去・配信日順）
+    
+    Args:
+        episodes: フィードのエピソードリスト（古い順）
+        posted_episodes: 投稿済みエピソード番号の集合
+        queue: 既存の投稿キュー
+        
+    Returns:
+        更新後の投稿キュー（配信日の古い順）
+    """
+    queued = {}
+    for episode in queue:
+        if episode.number not in posted_episodes:
+            queued[episode.number] = episode
+    
+    for episode in episodes:
+        if episode.number not in posted_episodes and episode.number not in queued:
+            print(f"[INFO] 新しいエピソードを検出: {episode.number}")
+            queued[episode.number] = episode
+    
+    return sorted(
+        queued.values(),
+        key=lambda ep: (ep.date or '', natural_sort_key(f"ep{ep.number}"))
+    )
+
+
+def create_tweet_text(episode: Episode) -> str:
     """
     ツイート文を作成
     
@@ -118,14 +275,14 @@ def create_tweet_text(episode: Dict[str, Any]) -> str:
         ツイート文
     """
     # エピソード番号とタイトルを取得
-    episode_number = episode['number']
-    title = episode['title']
+    episode_number = episode.number
+    title = episode.title
     
     # タイトルから「epX.X.X」の部分を除去（重複を避ける）
     title_clean = re.sub(r'^ep\d+\.\d+\.\d+\s+', '', title, flags=re.IGNORECASE).strip()
     
     # Spotify URLを取得（可能であれば）
-    spotify_url = episode.get('link', '')
+    spotify_url = episode.spotify_url or ''
     if not spotify_url or 'spotify.com' not in spotify_url:
         spotify_url = "https://open.spotify.com/show/31JfR2D72gENOfOwq3AcKw"
     
@@ -146,12 +303,18 @@ def create_tweet_text(episode: Dict[str, Any]) -> str:
     return tweet
 
 
-def post_to_x_v2_oauth1(tweet_text: str) -> bool:
+def post_to_x_v2_oauth1(tweet_text: str, previously_sent: bool = False) -> bool:
     """
     OAuth 1.0aを使用してXにポスト（X API v2）
     
+    共有セッションで接続を再利用し、5xx・429応答や接続エラーはバックオフ付きでリトライする。
+    タイムアウト・送信後の切断・5xxの後に再送して「重複したツイート」エラーになった場合は、
+    最初のリクエストで投稿済みとみなす（二重投稿はしない）。
+    前回の実行で送信したまま結果を記録できなかったツイート（previously_sent）も同様に扱う。
+    
     Args:
         tweet_text: ツイート文
+        previously_sent: 前回までの実行で送信した可能性がある場合True
         
     Returns:
         成功した場合True
@@ -160,6 +323,10 @@ def post_to_x_v2_oauth1(tweet_text: str) -> bool:
         print("[ERROR] X API認証情報が不足しています（OAuth 1.0a）")
         return False
     
+    if tweet_text in _posted_texts:
+        print("[INFO] このツイートはこの実行で投稿済みのため、スキップします")
+        return True
+    
     auth = OAuth1(
         X_API_KEY,
         X_API_SECRET,
@@ -172,17 +339,31 @@ def post_to_x_v2_oauth1(tweet_text: str) -> bool:
     }
     
     try:
-        response = requests.post(
-            X_API_V2_POST_URL,
-            json=payload,
-            auth=auth,
-            timeout=10
-        )
+        with metrics.timer("post"):
+            response, retried_after_ambiguous = request_with_retry(
+                get_http_session(),
+                "POST",
+                X_API_V2_POST_URL,
+                max_attempts=POST_MAX_ATTEMPTS,
+                max_wait=RATE_LIMIT_MAX_WAIT_SECONDS,
+                json=payload,
+                auth=auth,
+                timeout=10
+            )
         
         if response.status_code == 201:
             result = response.json()
+            _posted_texts.add(tweet_text)
             print(f"[OK] Xにポストしました: {result.get('data', {}).get('id', 'N/A')}")
             return True
+        elif retried_after_ambiguous and is_duplicate_content_error(response):
+            _posted_texts.add(tweet_text)
+            print("[OK] 再送前のリクエストで投稿済みでした（重複投稿はしていません）")
+            return True
+        elif previously_sent and is_duplicate_content_error(response):
+            _posted_texts.add(tweet_text)
+            print("[OK] 前回の実行で投稿済みでした（重複投稿はしていません）")
+            return True
         else:
             print(f"[ERROR] Xへのポストに失敗しました: {response.status_code}")
             print(f"レスポンス: {response.text}")
@@ -193,7 +374,7 @@ def post_to_x_v2_oauth1(tweet_text: str) -> bool:
         return False
 
 
-def post_to_x(tweet_text: str) -> bool:
+def post_to_x(tweet_text: str, previously_sent: bool = False) -> bool:
     """
     Xにポスト（OAuth 1.0a User Contextを使用）
     
@@ -203,13 +384,14 @@ def post_to_x(tweet_text: str) -> bool:
     
     Args:
         tweet_text: ツイート文
+        previously_sent: 前回までの実行で送信した可能性がある場合True
         
     Returns:
         成功した場合True
     """
     # OAuth 1.0a方式のみ使用
     if all([X_API_KEY, X_API_SECRET, X_ACCESS_TOKEN, X_ACCESS_TOKEN_SECRET]):
-        return post_to_x_v2_oauth1(tweet_text)
+        return post_to_x_v2_oauth1(tweet_text, previously_sent=previously_sent)
     else:
         print("[ERROR] X API認証情報が設定されていません")
         print("[INFO] 以下の環境変数を設定してください（OAuth 1.0a方式）:")
@@ -222,48 +404,121 @@ def post_to_x(tweet_text: str) -> bool:
         return False
 
 
-def main() -> None:
-    """メイン処理"""
+def run(args: argparse.Namespace) -> None:
+    """
+    未投稿エピソードをキューに追加し、古い順に投稿
+    
+    Args:
+        args: コマンドライン引数
+    """
     print("[PODCAST] シビックテック井戸端キャスト - X投稿スクリプト")
     print("=" * 60)
     
-    # 前回の最新エピソード番号を読み込む
-    last_episode_number = load_last_episode_state()
-    print(f"[INFO] 前回の最新エピソード: {last_episode_number or 'なし'}")
+    # 投稿状態を読み込む
+    state = load_post_state()
     
-    # RSSフィードから最新エピソードを取得
-    latest_episode = get_latest_episode_from_rss()
-    
-    if not latest_episode:
-        print("[ERROR] 最新エピソードの取得に失敗しました")
+    # RSSフィードからエピソードを取得
+    episodes = get_episodes_from_rss(args.feed)
+    if not episodes:
+        print("[ERROR] エピソードの取得に失敗しました")
         sys.exit(1)
     
-    current_episode_number = latest_episode['number']
-    print(f"[INFO] 現在の最新エピソード: {current_episode_number}")
+    posted_episodes = state['posted_episodes']
+    if posted_episodes is None:
+        posted_episodes = initial_posted_episodes(episodes, state['last_episode_number'])
+        print(f"[INFO] 状態ファイルを移行: 投稿済み{len(posted_episodes)}件")
+    print(f"[INFO] 投稿済みエピソード: {len(posted_episodes)}件")
+    
+    # 未投稿エピソードをキューに追加
+    queue = enqueue_new_episodes(episodes, posted_episodes, state['queue'])
+    last_episode_number = state['last_episode_number']
+    # 前回の実行で送信したまま結果を記録できなかったツイート
+    in_flight = state['in_flight']
+    if in_flight:
+        print(f"[INFO] 前回の実行で結果を記録できなかった投稿があります: {in_flight.get('number')}")
     
-    # 新しいエピソードかチェック
-    if last_episode_number == current_episode_number:
+    if not queue:
         print("[INFO] 新しいエピソードはありません")
+        if state['posted_episodes'] is None and not args.dry_run:
+            save_post_state(posted_episodes, queue, last_episode_number)
         sys.exit(0)
     
-    print(f"[INFO] 新しいエピソードを検出: {current_episode_number}")
+    print(f"[INFO] 投稿キュー: {len(queue)}件（{', '.join(ep.number for ep in queue)}）")
     
-    # ツイート文を作成
-    tweet_text = create_tweet_text(latest_episode)
-    print(f"\n[INFO] ツイート内容:\n{tweet_text}\n")
+    # キューを古い順に投稿
+    posted_count = 0
+    failed = False
+    while queue and posted_count < args.max_posts:
+        episode = queue[0]
+        
+        if posted_count > 0 and not args.dry_run:
+            print(f"[INFO] {args.interval:.0f}秒待機します")
+            time.sleep(args.interval)
+        
+        tweet_text = create_tweet_text(episode)
+        print(f"\n[INFO] ツイート内容（{episode.number}）:\n{tweet_text}\n")
+        
+        if args.dry_run:
+            print("[DRY-RUN] 実際には投稿しません")
+        else:
+            previously_sent = bool(in_flight) and in_flight == {"number": episode.number, "text": tweet_text}
+            # 送信する前に記録する（応答を受け取る前に終了しても、次回の重複エラーを投稿済みと判断できる）
+            in_flight = {"number": episode.number, "text": tweet_text}
+            save_post_state(posted_episodes, queue, last_episode_number, in_flight)
+            if not post_to_x(tweet_text, previously_sent=previously_sent):
+                failed = True
+                metrics.count("posts_failed")
+                break
+            in_flight = None
+        
+        queue.pop(0)
+        posted_episodes.add(episode.number)
+        last_episode_number = episode.number
+        posted_count += 1
+        metrics.count("posts_dry_run" if args.dry_run else "posts")
+        
+        # 1件ごとに状態を保存（途中で失敗しても二重投稿しない）
+        if not args.dry_run:
+            save_post_state(posted_episodes, queue, last_episode_number)
     
-    # Xにポスト
-    if post_to_x(tweet_text):
-        # 成功したら最新エピソード番号を保存
-        save_last_episode_state(current_episode_number)
-        print("\n" + "=" * 60)
-        print("[SUCCESS] Xへの投稿が完了しました！")
-        print("=" * 60)
-    else:
-        print("\n" + "=" * 60)
+    if failed and not args.dry_run:
+        # 失敗したエピソードはキューに残して次回再試行（送信した可能性があるため in_flight も残す）
+        save_post_state(posted_episodes, queue, last_episode_number, in_flight)
+    
+    print("\n" + "=" * 60)
+    if failed:
         print("[ERROR] Xへの投稿に失敗しました")
+        print(f"  投稿済み: {posted_count}件、キューに残り: {len(queue)}件")
         print("=" * 60)
         sys.exit(1)
+    
+    if args.dry_run:
+        print("[DRY-RUN] 投稿内容の確認が完了しました（状態ファイルは更新していません）")
+        print(f"  投稿予定: {posted_count}件、次回以降: {len(queue)}件")
+    else:
+        print("[SUCCESS] Xへの投稿が完了しました！")
+        print(f"  投稿: {posted_count}件、キューに残り: {len(queue)}件")
+    print("=" * 60)
+
+
+def main() -> None:
+    """メイン処理"""
+    parser = argparse.ArgumentParser(
+        description='RSSフィードの未投稿エピソードをXに投稿'
+    )
+    parser.add_argument('--dry-run', action='store_true',
+                        help='実際には投稿せず、状態ファイルも更新しない')
+    parser.add_argument('--feed', type=str, default=RSS_FEED_URL,
+                        help='RSSフィードのURLまたはローカルファイルのパス')
+    parser.add_argument('--max-posts', type=int, default=MAX_POSTS_PER_RUN,
+                        help=f'1回の実行で投稿する最大件数（デフォルト: {MAX_POSTS_PER_RUN}）')
+    parser.add_argument('--interval', type=float, default=POST_INTERVAL_SECONDS,
+                        help=f'連続投稿の間隔（秒、デフォルト: {POST_INTERVAL_SECONDS}）')
+    metrics.add_metrics_argument(parser)
+    args = parser.parse_args()
+    
+    with metrics.report_metrics(args.metrics_out, "post_to_x"):
+        run(args)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+エディタ用のテキストバッファ（ピーステーブル）
+
+長い書き起こしをGUIウィジェットに丸ごと入れずに編集するためのモデル。
+元のテキストと追加されたテキストの断片（ピース）の列として文書を保持し、
+挿入・削除は断片の付け替えだけで行う。行単位の範囲取得・検索・一括置換もここで行う。
+"""
+
+import re
+from bisect import bisect_right
+from typing import List, Optional, Tuple
+
+# ピース: (参照する文字列, 開始位置, 長さ)
+Piece = Tuple[str, int, int]
+
+
+class PieceTable:
+    """ピーステーブルによるテキストバッファ"""
+
+    def __init__(self, text: str = "") -> None:
+        """
+        初期化
+
+        Args:
+            text: 初期テキスト
+        """
+        self._reset(text)
+
+    def _reset(self, text: str) -> None:
+        """バッファを指定のテキストだけの状態にする"""
+        self._pieces: List[Piece] = [(text, 0, len(text))] if text else []
+        self._length = len(text)
+        self._text_cache: Optional[str] = text
+        self._lower_cache: Optional[str] = None
+        self._line_starts: Optional[List[int]] = None
+
+    def _invalidate(self) -> None:
+        """編集後にキャッシュを破棄"""
+        self._text_cache = None
+        self._lower_cache = None
+        self._line_starts = None
+
+    def __len__(self) -> int:
+        return self._length
+
+    def get_text(self) -> str:
+        """文書全体のテキストを取得（次の編集までキャッシュ）"""
+        if self._text_cache is None:
+            self._text_cache = "".join(source[start:start + length] for source, start, length in self._pieces)
+            # 以降は1つのピースとして扱う（断片が増え続けないように）
+            self._pieces = [(self._text_cache, 0, self._length)] if self._length else []
+        return self._text_cache
+
+    def get_range(self, start: int, end: int) -> str:
+        """
+        指定範囲のテキストを取得
+
+        Args:
+            start: 開始位置（文字数）
+            end: 終了位置（文字数、この位置は含まない）
+
+        Returns:
+            範囲内のテキスト
+        """
+        if self._text_cache is not None:
+            return self._text_cache[start:end]
+
+        parts = []
+        offset = 0
+        for source, piece_start, length in self._pieces:
+            piece_end = offset + length
+            if piece_end > start and offset < end:
+                lo = max(start, offset) - offset
+                hi = min(end, piece_end) - offset
+                parts.append(source[piece_start + lo:piece_start + hi])
+            if piece_end >= end:
+                break
+            offset = piece_end
+        return "".join(parts)
+
+    def replace_range(self, start: int, end: int, text: str) -> None:
+        """
+        指定範囲を置き換える（挿入・削除を兼ねる）
+
+        Args:
+            start: 開始位置
+            end: 終了位置（start と同じなら挿入）
+            text: 置き換えるテキスト（空なら削除）
+        """
+        if not 0 <= start <= end <= self._length:
+            raise IndexError(f"範囲が不正です: {start}-{end}（長さ {self._length}）")
+        if start == end and not text:
+            return
+
+        new_pieces: List[Piece] = []
+        offset = 0
+        inserted = False
+        for source, piece_start, length in self._pieces:
+            piece_end = offset + length
+            # 範囲より前の部分
+            if offset < start:
+                keep = min(length, start - offset)
+                new_pieces.append((source, piece_start, keep))
+            # 置き換えるテキスト
+            if not inserted and piece_end >= start:
+                if text:
+                    new_pieces.append((text, 0, len(text)))
+                inserted = True
+            # 範囲より後の部分
+            if piece_end > end:
+                skip = max(0, end - offset)
+                new_pieces.append((source, piece_start + skip, length - skip))
+            offset = piece_end
+        if not inserted and text:
+            new_pieces.append((text, 0, len(text)))
+
+        self._pieces = new_pieces
+        self._length += len(text) - (end - start)
+        self._invalidate()
+
+    def insert(self, offset: int, text: str) -> None:
+        """指定位置にテキストを挿入"""
+        self.replace_range(offset, offset, text)
+
+    def delete(self, start: int, end: int) -> None:
+        """指定範囲を削除"""
+        self.replace_range(start, end, "")
+
+    def _line_index(self) -> List[int]:
+        """各行の開始位置のリスト"""
+        if self._line_starts is None:
+            text = self.get_text()
+            self._line_starts = [0] + [m.end() for m in re.finditer('\n', text)]
+        return self._line_starts
+
+    def line_count(self) -> int:
+        """行数"""
+        return len(self._line_index())
+
+    def line_start(self, line: int) -> int:
+        """
+        行の開始位置を取得
+
+        Args:
+            line: 行番号（0から、行数以上なら文書の末尾）
+
+        Returns:
+            文字位置
+        """
+        starts = self._line_index()
+        if line >= len(starts):
+            return self._length
+        return starts[max(0, line)]
+
+    def offset_to_line(self, offset: int) -> int:
+        """文字位置を含む行の行番号（0から）"""
+        return bisect_right(self._line_index(), offset) - 1
+
+    def _search_text(self, case_sensitive: bool) -> str:
+        """検索対象のテキスト（大文字小文字を区別しない場合は小文字化したもの）"""
+        text = self.get_text()
+        if case_sensitive:
+            return text
+        if self._lower_cache is None:
+            lower = text.lower()
+            # 小文字化で長さが変わる文字がある場合は位置がずれるため、正規表現で検索する
+            self._lower_cache = lower if len(lower) == len(text) else ""
+        return self._lower_cache
+
+    def find(self, needle: str, start: int = 0, case_sensitive: bool = True) -> int:
+        """
+        start 以降で最初に一致する位置を検索
+
+        Returns:
+            一致した位置（見つからない場合は-1）
+        """
+        haystack = self._search_text(case_sensitive)
+        if case_sensitive or haystack:
+            return haystack.find(needle if case_sensitive else needle.lower(), start)
+        match = re.compile(re.escape(needle), re.IGNORECASE).search(self.get_text(), start)
+        return match.start() if match else -1
+
+    def rfind(self, needle: str, end: int, case_sensitive: bool = True) -> int:
+        """
+        end より前（一致全体が end 以前に収まるもの）で最後に一致する位置を検索
+
+        Returns:
+            一致した位置（見つからない場合は-1）
+        """
+        haystack = self._search_text(case_sensitive)
+        if case_sensitive or haystack:
+            return haystack.rfind(needle if case_sensitive else needle.lower(), 0, end)
+        last = -1
+        for match in re.compile(re.escape(needle), re.IGNORECASE).finditer(self.get_text(), 0, end):
+            last = match.start()
+        return last
+
+    def replace_all(self, needle: str, replacement: str, case_sensitive: bool = True) -> int:
+        """
+        一致する箇所をすべて置換
+
+        Args:
+            needle: 検索文字列
+            replacement: 置換文字列
+            case_sensitive: 大文字小文字を区別するか
+
+        Returns:
+            置換した件数
+        """
+        if not needle:
+            return 0
+        pattern = re.compile(re.escape(needle), 0 if case_sensitive else re.IGNORECASE)
+        new_text, count = pattern.subn(lambda m: replacement, self.get_text())
+        if count:
+            self._reset(new_text)
+        return count
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+プロンプトに含める文字起こしのトークン予算
+
+要約などのプロンプトに文字起こしを含めるとき、先頭から決まった文字数で切る代わりに、
+トークン数の予算に収まるように情報量の多い行を選んで詰める。
+
+- 予算に収まる短いエピソードは全文をそのまま使う
+- 長いエピソードは全体をいくつかの区間に分け、区間ごとに情報量の多い行を選ぶ
+  （冒頭だけでなく最後まで話題を拾う）。選んだ行は元の順序で並べ、省略した箇所には … を入れる
+
+行の情報量は、エピソードの中で繰り返し出てくる語（話題の語）を含む割合で見積もる。
+全体の半分以上の行に出てくる語（話者名など）と、1回しか出てこない語は数えない。
+"""
+
+import math
+import re
+from collections import Counter
+from typing import Callable, List
+
+from transcription_backends import estimate_tokens
+
+# 省略した箇所に入れる行
+GAP_MARKER = "…"
+
+# 行を選ぶ区間の数（全体に散らばるように、区間ごとに予算を割り当てる）
+SECTIONS = 8
+
+# 文の区切り（1行が長すぎる場合に分割する）
+SENTENCE_END_PATTERN = re.compile(r'(?<=[。！？!?])')
+
+# 行頭のタイムスタンプと話者名（話題の語に数えない）
+SPEAKER_PATTERN = re.compile(r'^\[[\d:]+\]\s*(?:[^\s：:]{1,20}[：:])?')
+
+# 話題の語（漢字・カタカナの2文字以上の並び、英数字の語）
+TERM_PATTERN = re.compile(r'[一-龥々]{2,}|[ァ-ヴー]{2,}|[A-Za-z][A-Za-z0-9]+')
+
+
+def split_units(text: str, max_tokens: int, count_tokens: Callable[[str], int]) -> List[str]:
+    """
+    文字起こしを選択の単位に分割
+
+    1行を1単位とする。長すぎる行は文の区切りで max_tokens 以下にまとめ直し、
+    それでも長い文は文字数で切る。
+
+    Args:
+        text: 文字起こしテキスト
+        max_tokens: 1単位のトークン数の上限
+        count_tokens: トークン数を数える関数
+
+    Returns:
+        単位のリスト（空行は含まない）
+    """
+    units = []
+    for line in text.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        if count_tokens(line) <= max_tokens:
+            units.append(line)
+            continue
+        current = ""
+        for sentence in SENTENCE_END_PATTERN.split(line):
+            if current and count_tokens(current + sentence) > max_tokens:
+                units.append(current)
+                current = ""
+            current += sentence
+            tokens = count_tokens(current)
+            if tokens > max_tokens:
+                # 句点の無い長い文は、トークン数の比率から文字数を求めて切る
+                chars = max(1, len(current) * max_tokens // tokens)
+                pieces = [current[start:start + chars] for start in range(0, len(current), chars)]
+                units.extend(pieces[:-1])
+                current = pieces[-1]
+        if current.strip():
+            units.append(current)
+    return units
+
+
+def score_units(units: List[str]) -> List[float]:
+    """
+    各単位の情報量を見積もる
+
+    Args:
+        units: 単位のリスト
+
+    Returns:
+        単位ごとのスコア（話題の語の重みの合計を長さの平方根で割ったもの。話題の語が無ければ 0）
+    """
+    terms_per_unit = [set(TERM_PATTERN.findall(SPEAKER_PATTERN.sub("", unit))) for unit in units]
+    frequency = Counter(term for terms in terms_per_unit for term in terms)
+    common = len(units) / 2
+    scores = []
+    for unit, terms in zip(units, terms_per_unit):
+        weight = sum(math.log1p(frequency[term]) for term in terms if 1 < frequency[term] <= common)
+        scores.append(weight / math.sqrt(len(unit)))
+    return scores
+
+
+def pack_transcript(
+    text: str,
+    budget_tokens: int,
+    count_tokens: Callable[[str], int] = estimate_tokens
+) -> str:
+    """
+    文字起こしをトークン予算に収まるように詰める
+
+    Args:
+        text: 文字起こしテキスト
+        budget_tokens: トークン数の予算
+        count_tokens: トークン数を数える関数（バックエンドの count_tokens）
+
+    Returns:
+        予算に収まる文字起こし（収まる場合は全文、収まらない場合は選んだ行を … でつないだもの）
+    """
+    if budget_tokens <= 0 or not text:
+        return ""
+    if count_tokens(text) <= budget_tokens:
+        return text
+
+    # 省略記号と改行の分を、1単位ごとに見込んでおく
+    overhead = count_tokens(GAP_MARKER + "\n") + 1
+    units = split_units(text, max(budget_tokens // SECTIONS, 16), count_tokens)
+    costs = [count_tokens(unit) + overhead for unit in units]
+    scores = score_units(units)
+
+    count = len(units)
+    sections = min(SECTIONS, count)
+    selected = [False] * count
+    used = 0
+    for section in range(sections):
+        start, end = section * count // sections, (section + 1) * count // sections
+        section_budget = budget_tokens // sections
+        spent = 0
+        for index in sorted(range(start, end), key=lambda i: (-scores[i], i)):
+            if scores[index] > 0 and spent + costs[index] <= section_budget:
+                selected[index] = True
+                spent += costs[index]
+        used += spent
+
+    # 区間ごとの割り当てで余った予算は、全体で情報量の多い順に使う
+    # （話題の語が無い単位は、それしか無い場合を除いて選ばない）
+    informative = any(score > 0 for score in scores)
+    for index in sorted(range(count), key=lambda i: (-scores[i], i)):
+        if informative and scores[index] <= 0:
+            break
+        if not selected[index] and used + costs[index] <= budget_tokens:
+            selected[index] = True
+            used += costs[index]
+
+    lines = []
+    previous = -1
+    for index in range(count):
+        if not selected[index]:
+            continue
+        if index != previous + 1:
+            lines.append(GAP_MARKER)
+        lines.append(units[index])
+        previous = index
+    if previous != count - 1:
+        lines.append(GAP_MARKER)
+    return "\n".join(lines)
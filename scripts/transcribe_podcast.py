@@ -3,106 +3,161 @@
 """
 ポッドキャスト文字起こしスクリプト
 
-Gemini APIを使用して音声ファイルを文字起こしし、
-要約、サブタイトル、詳細説明を自動生成する
+音声ファイルを文字起こしし、要約、サブタイトル、詳細説明を自動生成する。
+文字起こしとテキスト生成のバックエンドは選択できる（Gemini API・ローカルのwhisper・テスト用のfake）。
 """
 
+import argparse
+import functools
+import hashlib
 import os
-import json
-import time
+import queue
 import shutil
 import re
+import signal
+import threading
+import time
 import traceback
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Any, List, Optional
-from dotenv import load_dotenv
-from google import genai
-from google.genai import types
+from typing import Any, Callable, Dict, List, Optional, TextIO, Tuple
 
 # 共通ユーティリティのインポート
-from utils import extract_episode_number, PROJECT_ROOT
-
-# 環境変数の読み込み
-load_dotenv(PROJECT_ROOT / '.env')
-
-# Gemini APIキーを設定
-GEMINI_API_KEY = os.environ.get("GEMINI_API_KEY")
-if not GEMINI_API_KEY:
-    raise ValueError(
-        "Gemini APIキーが設定されていません。\n"
-        ".envファイルを作成し、GEMINI_API_KEY=your-api-key の形式で設定してください。"
-    )
-
-client = genai.Client(api_key=GEMINI_API_KEY)
+from utils import extract_episode_number, natural_sort_key, PROJECT_ROOT
+from models import Transcript
+import metrics
+from transcription_backends import (
+    AUDIO_TOKENS_PER_SECOND, BACKENDS, CONTEXT_CACHE_TTL_SECONDS, WHISPER_MODEL_SIZE, BackendError, ContextCache,
+    TranscriptionBackend, audio_duration_seconds, create_backend, estimate_tokens
+)
+from token_budget import pack_transcript
+from usage_ledger import (
+    LEDGER_PATH, DailyBudget, UsageLedger, add_usage, billed_tokens, scale_projection, track_usage
+)
+from transcription_jobs import (
+    DEFAULT_JOBS_PATH, DEFAULT_MAX_ATTEMPTS, PRIORITY_NAMES, JobStore, classify_priority, job_fields, stage_index
+)
+from inbox_watcher import InboxWatcher
+from inbox_leases import LEASE_SECONDS, InboxLeases
 
 # デフォルトパス設定
 DEFAULT_INPUT_DIR = PROJECT_ROOT / 'data_voice'
 DEFAULT_OUTPUT_DIR = PROJECT_ROOT / 'data' / 'transcripts'
 DEFAULT_BACKUP_DIR = PROJECT_ROOT / 'data_voice' / 'backup'
 
-# 環境変数からパスを取得
-PODCAST_INPUT_DIR = Path(os.getenv('PODCAST_INPUT_DIR', str(DEFAULT_INPUT_DIR)))
-PODCAST_OUTPUT_DIR = Path(os.getenv('PODCAST_OUTPUT_DIR', str(DEFAULT_OUTPUT_DIR)))
-PODCAST_BACKUP_DIR = Path(os.getenv('PODCAST_BACKUP_DIR', str(DEFAULT_BACKUP_DIR)))
-
 # 音声ファイル設定
 AUDIO_EXTENSIONS = [".m4a", ".mp3", ".wav", ".mp4"]
-MIME_TYPE_MAP = {
-    ".m4a": "audio/mp4",
-    ".mp3": "audio/mpeg",
-    ".wav": "audio/wav",
-    ".mp4": "video/mp4"
+
+# デフォルトのバックエンド（環境変数 TRANSCRIBE_BACKEND で変更可能）
+DEFAULT_BACKEND = 'gemini'
+
+# 途中経過を保存するフォルダ（出力フォルダ内、--stream 指定時）
+PARTIAL_DIR_NAME = '.partial'
+
+# 文字起こしの行頭のタイムスタンプ（[分:秒] または [時:分:秒]）
+TIMESTAMP_PATTERN = re.compile(r'^\[(\d+):(\d{2})(?::(\d{2}))?\]')
+
+# clean_ai_output で空にする行（Markdown見出し・=== ・---。複数行のテキストにも sub で使う）
+HEADING_LINE_PATTERN = re.compile(r'^#{1,6}\s+.*$', re.MULTILINE)
+RULE_LINE_PATTERNS = {"=": re.compile(r'^=+\s*$', re.MULTILINE), "-": re.compile(r'^-+\s*$', re.MULTILINE)}
+
+# プロンプトに含める文字起こしのトークン予算のデフォルト（要約・サブタイトル・構造化出力）
+TRANSCRIPT_TOKEN_BUDGET = 6000
+
+# 詳細説明文のプロンプトでは要約とサブタイトルも渡すため、文字起こしはこの割合に減らす（予算 // この値）
+DESCRIPTION_BUDGET_DIVISOR = 8
+
+# 使用量の見積もりに使う値
+# 文字起こし結果の音声1秒あたりのトークン数（既存の書き起こしは estimate_tokens で約4.6）
+TRANSCRIPT_TOKENS_PER_SECOND = 5
+# 要約などの生成1回あたりの出力トークン数
+GENERATED_FIELD_TOKENS = 400
+
+# --watch のデフォルト（同時処理数、書き込みが終わったとみなすまでの秒数、フォルダを調べる間隔）
+DEFAULT_WATCH_CONCURRENCY = 2
+SETTLE_SECONDS = 10.0
+POLL_INTERVAL_SECONDS = 5.0
+
+# --watch で失敗したファイルを処理し直すまでの秒数（試行ごとに倍にする）
+WATCH_RETRY_SECONDS = 60
+
+# コンテキストキャッシュを参照するとき、プロンプトで文字起こしの代わりに示す文（キャッシュした内容 → 文）
+CACHED_SOURCE_NOTES = {
+    "transcript": "文字起こし: キャッシュした文字起こしの全文を参照してください",
+    "audio": "音声: キャッシュしたポッドキャストの音声全体を参照してください",
 }
 
-# Gemini モデル
-MODEL_NAME = "gemini-3-flash-preview"
+# 生成されたテキストから取り除く前置き（フィールド名 → 前置きのリスト）
+FIELD_PREFIXES = {
+    "summary": ['要約', 'まとめ', 'サマリー', 'Summary'],
+    "sub_title": ['サブタイトル', 'タイトル', 'Title', 'Subtitle'],
+    "detailed_description": ['説明', '詳細説明', 'Description'],
+}
 
+# 要約・サブタイトル・詳細説明を1回で生成するときの応答スキーマ（--structured）
+EPISODE_FIELDS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "summary": {
+            "type": "string",
+            "description": "300〜500文字程度の要約。主要なトピックと重要なポイントをまとめる。段落の区切りは1〜2箇所程度",
+        },
+        "sub_title": {
+            "type": "string",
+            "description": "20〜40文字程度のサブタイトル。内容を的確に表現し、聞きたくなるようなもの",
+        },
+        "detailed_description": {
+            "type": "string",
+            "description": "150〜250文字程度の詳細説明文。リスナーが興味を持つような内容で、改行は1箇所程度",
+        },
+    },
+    "required": ["summary", "sub_title", "detailed_description"],
+}
 
-def get_mime_type(file_path: Path) -> str:
-    """
-    ファイル拡張子からMIMEタイプを取得
-    
-    Args:
-        file_path: 音声ファイルのパス
-        
-    Returns:
-        MIMEタイプ
-    """
-    ext = file_path.suffix.lower()
-    return MIME_TYPE_MAP.get(ext, "audio/mp4")
+# 文字起こしの指示
+TRANSCRIBE_PROMPT = """
+この音声ファイルの内容を詳細に文字起こししてください。
 
+【出力形式の指示】
+- 話者が複数いる場合は、「話者名：」の形式で話者を明確に区別してください
+- 各発言の前に、その発言が始まる時間を [分:秒] の形式で記載してください（例：[1:23]）
+- 時間は話者が変わるときに必ず入れてください
+- 同じ話者が続けて話す場合は、重要な区切り（約1分ごと、またはトピックが変わるとき）に時間を入れてください
+- 見出しや装飾、記号（===、---、**など）は一切使用しないでください
+- 音声の内容のみを、そのまま文字起こししてください
+- 改行は自然な会話の流れに沿って入れてください
+- 日本語で出力してください
+
+【出力例】
+[0:00] 石井：今日はよろしくお願いします。
+[0:15] 小俣：こちらこそ、よろしくお願いします。
+[0:30] 石井：それでは、今日のトピックについて話していきましょう。
+[1:45] 小俣：そのトピックについて、私はこう考えています。
+
+上記の形式で、音声の内容をそのまま文字起こししてください。
+"""
+
+
+@functools.lru_cache(maxsize=None)
+def load_environment() -> None:
+    """.env を読み込む（初回の呼び出し時だけ）"""
+    from dotenv import load_dotenv
+    load_dotenv(PROJECT_ROOT / '.env')
 
-def upload_audio_file(file_path: Path) -> Any:
+
+def resolve_dir(env_name: str, default: Path) -> Path:
     """
-    音声ファイルをGemini APIにアップロード
+    環境変数からフォルダのパスを取得（相対パスはプロジェクトルートからのパスとして扱う）
     
     Args:
-        file_path: 音声ファイルのパス
+        env_name: 環境変数名
+        default: 環境変数が無い場合のパス
         
     Returns:
-        アップロードされたファイルオブジェクト
-        
-    Raises:
-        ValueError: アップロードに失敗した場合
+        絶対パス
     """
-    print(f"音声ファイルをアップロード中: {file_path.name}")
-    
-    mime_type = get_mime_type(file_path)
-    
-    with open(file_path, 'rb') as f:
-        audio_file = client.files.upload(file=f, config={"mime_type": mime_type})
-    
-    # ファイルの処理が完了するまで待機
-    while audio_file.state.name == "PROCESSING":
-        print("処理中...", end="\r")
-        time.sleep(2)
-        audio_file = client.files.get(name=audio_file.name)
-    
-    if audio_file.state.name == "FAILED":
-        raise ValueError(f"ファイルのアップロードに失敗しました: {audio_file.state.name}")
-    
-    print(f"アップロード完了: {audio_file.uri}")
-    return audio_file
+    path = Path(os.getenv(env_name, str(default)))
+    return path if path.is_absolute() else PROJECT_ROOT / path
 
 
 def clean_ai_output(text: str, remove_prefixes: Optional[List[str]] = None) -> str:
@@ -119,9 +174,9 @@ def clean_ai_output(text: str, remove_prefixes: Optional[List[str]] = None) -> s
     text = text.strip()
     
     # 見出しや装飾記号を削除
-    text = re.sub(r'^#{1,6}\s+.*$', '', text, flags=re.MULTILINE)  # Markdown見出し
-    text = re.sub(r'^=+\s*$', '', text, flags=re.MULTILINE)  # ===
-    text = re.sub(r'^-+\s*$', '', text, flags=re.MULTILINE)  # ---
+    text = HEADING_LINE_PATTERN.sub('', text)  # Markdown見出し
+    for pattern in RULE_LINE_PATTERNS.values():  # === と ---
+        text = pattern.sub('', text)
     text = re.sub(r'\*\*([^*]+)\*\*', r'\1', text)  # **太字**
     text = re.sub(r'\*([^*]+)\*', r'\1', text)  # *強調*
     
@@ -136,62 +191,314 @@ def clean_ai_output(text: str, remove_prefixes: Optional[List[str]] = None) -> s
     return text.strip()
 
 
-def transcribe_audio(audio_file: Any) -> str:
+def transcribe_audio(audio_path: Path, backend: TranscriptionBackend) -> str:
     """
     音声ファイルを文字起こし
     
     Args:
-        audio_file: アップロード済みの音声ファイルオブジェクト
+        audio_path: 音声ファイルのパス
+        backend: 文字起こしに使うバックエンド
         
     Returns:
         文字起こしテキスト
     """
     print("文字起こし中...")
     
-    prompt = """
-この音声ファイルの内容を詳細に文字起こししてください。
+    with metrics.timer("transcribe"):
+        transcript = clean_ai_output(backend.transcribe(audio_path, TRANSCRIBE_PROMPT))
+    metrics.count("transcript_chars", len(transcript))
+    return transcript
 
-【出力形式の指示】
-- 話者が複数いる場合は、「話者名：」の形式で話者を明確に区別してください
-- 各発言の前に、その発言が始まる時間を [分:秒] の形式で記載してください（例：[1:23]）
-- 時間は話者が変わるときに必ず入れてください
-- 同じ話者が続けて話す場合は、重要な区切り（約1分ごと、またはトピックが変わるとき）に時間を入れてください
-- 見出しや装飾、記号（===、---、**など）は一切使用しないでください
-- 音声の内容のみを、そのまま文字起こししてください
-- 改行は自然な会話の流れに沿って入れてください
-- 日本語で出力してください
 
-【出力例】
-[0:00] 石井：今日はよろしくお願いします。
-[0:15] 小俣：こちらこそ、よろしくお願いします。
-[0:30] 石井：それでは、今日のトピックについて話していきましょう。
-[1:45] 小俣：そのトピックについて、私はこう考えています。
+def parse_timestamp(line: str) -> Optional[int]:
+    """
+    行頭の [分:秒] / [時:分:秒] タイムスタンプを秒数に変換
+    
+    Args:
+        line: 文字起こしの1行
+        
+    Returns:
+        秒数（タイムスタンプがない場合はNone）
+    """
+    match = TIMESTAMP_PATTERN.match(line)
+    if not match:
+        return None
+    first, second, third = match.groups()
+    if third is None:
+        return int(first) * 60 + int(second)
+    return int(first) * 3600 + int(second) * 60 + int(third)
 
-上記の形式で、音声の内容をそのまま文字起こししてください。
-"""
+
+class IncrementalCleaner:
+    """
+    clean_ai_output を行単位で逐次適用するフィルタ（文字起こしのストリーミング用）
     
-    response = client.models.generate_content(
-        model=MODEL_NAME,
-        contents=[prompt, audio_file]
-    )
+    届いた断片を改行まで溜め、完成した行ごとに見出し・区切り線・太字などの装飾を取り除く。
+    先頭の空行は捨て、途中の空行は次の行が届くまで保留する（末尾の空行は出力しない）。
+    clean_ai_output と異なり、複数行にまたがる **太字** や *強調* は取り除けない。
+    """
+    
+    # 区切り線の行が、続く空行とともに取り除く行の種類（clean_ai_output の \s*$ が改行にも一致するため）
+    _ABSORBED_KINDS = {"=": ("blank", "heading"), "-": ("blank", "heading", "=")}
+    
+    def __init__(self) -> None:
+        self._buffer = ""
+        self._started = False
+        self._pending_blank_lines = 0
+        self._absorbing: Optional[str] = None
     
-    return clean_ai_output(response.text)
+    def feed(self, chunk: str) -> List[str]:
+        """
+        断片を追加し、完成した行を返す
+        
+        Args:
+            chunk: 文字起こしテキストの断片
+            
+        Returns:
+            クリーンアップ済みの行のリスト（改行なし）
+        """
+        self._buffer += chunk
+        *lines, self._buffer = self._buffer.split('\n')
+        return self._clean_lines(lines)
+    
+    def finish(self) -> List[str]:
+        """
+        残りのテキストを最後の行として返す
+        
+        Returns:
+            クリーンアップ済みの行のリスト（改行なし）
+        """
+        lines = [self._buffer] if self._buffer else []
+        self._buffer = ""
+        return self._clean_lines(lines)
+    
+    @staticmethod
+    def _line_kind(line: str) -> str:
+        if HEADING_LINE_PATTERN.match(line):
+            return "heading"
+        for kind, pattern in RULE_LINE_PATTERNS.items():
+            if pattern.match(line):
+                return kind
+        return "text" if line.strip() else "blank"
+    
+    def _clean_lines(self, lines: List[str]) -> List[str]:
+        cleaned = []
+        for line in lines:
+            kind = self._line_kind(line)
+            if self._absorbing and kind in self._ABSORBED_KINDS[self._absorbing]:
+                continue
+            self._absorbing = kind if kind in RULE_LINE_PATTERNS else None
+            line = clean_ai_output_line(line)
+            if not line:
+                if self._started:
+                    self._pending_blank_lines += 1
+                continue
+            if not self._started:
+                line = line.lstrip()
+                self._started = True
+            cleaned.extend([""] * self._pending_blank_lines)
+            self._pending_blank_lines = 0
+            cleaned.append(line)
+        return cleaned
 
 
-def generate_summary(transcript: str, max_length: int = 8000) -> str:
+def clean_ai_output_line(line: str) -> str:
     """
-    文字起こしから要約を生成
+    clean_ai_output の装飾の除去を1行に適用（行末の空白も削除）
+    
+    Args:
+        line: AI出力の1行
+        
+    Returns:
+        クリーンアップされた行（見出し・区切り線の行は空文字列）
+    """
+    if HEADING_LINE_PATTERN.match(line) or any(pattern.match(line) for pattern in RULE_LINE_PATTERNS.values()):
+        return ""
+    line = re.sub(r'\*\*([^*]+)\*\*', r'\1', line)  # **太字**
+    line = re.sub(r'\*([^*]+)\*', r'\1', line)  # *強調*
+    return line.rstrip()
+
+
+def partial_transcript_paths(audio_path: Path, partial_dir: Path) -> Tuple[Path, Path]:
+    """
+    ストリーミング文字起こしの途中経過・完了ファイルのパス
+    
+    Args:
+        audio_path: 音声ファイルのパス
+        partial_dir: 途中経過を保存するフォルダ
+        
+    Returns:
+        (書き込み中のファイル, 文字起こし完了後のファイル)
+    """
+    return partial_dir / f"{audio_path.stem}.part", partial_dir / f"{audio_path.stem}.txt"
+
+
+def prepare_resume(part_path: Path) -> int:
+    """
+    途中で止まった文字起こしを再開できるように整える
+    
+    最後のタイムスタンプの行は発言の途中で止まっている可能性があるため、
+    その行以降を削除し、そのタイムスタンプから再開する。
+    
+    Args:
+        part_path: 書き込み中のファイル
+        
+    Returns:
+        再開する時刻（秒）。再開できない場合は0（ファイルも削除する）
+    """
+    if not part_path.exists():
+        return 0
+    lines = part_path.read_text(encoding='utf-8').splitlines()
+    for index in range(len(lines) - 1, -1, -1):
+        seconds = parse_timestamp(lines[index])
+        if seconds is not None and seconds > 0:
+            tmp_path = part_path.with_name(part_path.name + ".tmp")
+            tmp_path.write_text("".join(line + "\n" for line in lines[:index]), encoding='utf-8')
+            os.replace(tmp_path, part_path)
+            return seconds
+    part_path.unlink()
+    return 0
+
+
+def transcribe_audio_streaming(
+    audio_path: Path,
+    backend: TranscriptionBackend,
+    partial_dir: Path
+) -> str:
+    """
+    音声ファイルをストリーミングで文字起こし
+    
+    届いた断片を行単位でクリーンアップし、完成した行から順に途中経過ファイルに追記する。
+    途中で失敗した場合は次回の実行で最後のタイムスタンプから再開し、
+    文字起こしが完了していれば（要約などの生成で失敗した場合）結果を再利用する。
+    
+    Args:
+        audio_path: 音声ファイルのパス
+        backend: 文字起こしに使うバックエンド
+        partial_dir: 途中経過を保存するフォルダ
+        
+    Returns:
+        文字起こしテキスト
+    """
+    part_path, done_path = partial_transcript_paths(audio_path, partial_dir)
+    if done_path.exists():
+        print(f"[INFO] 完了済みの文字起こしを再利用します: {done_path}")
+        return done_path.read_text(encoding='utf-8').rstrip('\n')
+    
+    partial_dir.mkdir(parents=True, exist_ok=True)
+    start_seconds = prepare_resume(part_path)
+    if start_seconds:
+        print(f"[INFO] 途中まで文字起こし済みのため、[{start_seconds // 60}:{start_seconds % 60:02d}] から再開します")
+        metrics.count("resumed_from_seconds", start_seconds)
+    print("文字起こし中（ストリーミング）...")
+    
+    cleaner = IncrementalCleaner()
+    skipping = start_seconds > 0
+    written_lines = 0
+    covered_minutes = -1
+    start = time.perf_counter()
+    
+    def write_lines(f: TextIO, lines: List[str]) -> None:
+        nonlocal skipping, written_lines, covered_minutes
+        for line in lines:
+            seconds = parse_timestamp(line)
+            # 再開時は、再開位置より前の行（バックエンドが無視した場合）を捨てる
+            if skipping:
+                if seconds is None or seconds < start_seconds:
+                    continue
+                skipping = False
+            f.write(line + "\n")
+            written_lines += 1
+            if written_lines == 1:
+                metrics.get_metrics().add_time("first_output", time.perf_counter() - start)
+            if seconds is not None and seconds // 60 > covered_minutes:
+                covered_minutes = seconds // 60
+                print(f"\r  音声 {covered_minutes}分まで文字起こし済み（{written_lines}行）", end="", flush=True)
+        f.flush()
+    
+    try:
+        with metrics.timer("transcribe"), open(part_path, 'a', encoding='utf-8') as f:
+            for chunk in backend.transcribe_stream(audio_path, TRANSCRIBE_PROMPT, start_seconds):
+                write_lines(f, cleaner.feed(chunk))
+            write_lines(f, cleaner.finish())
+            os.fsync(f.fileno())
+    finally:
+        # 進捗表示（\r で上書きしている行）を改行で終える
+        print()
+    
+    os.replace(part_path, done_path)
+    transcript = done_path.read_text(encoding='utf-8').rstrip('\n')
+    metrics.count("transcript_chars", len(transcript))
+    return transcript
+
+
+def transcript_excerpt(
+    transcript: str,
+    budget_tokens: int,
+    context: Optional[ContextCache] = None,
+    count_tokens: Callable[[str], int] = estimate_tokens
+) -> str:
+    """
+    プロンプトに含める文字起こしの部分を作成
     
     Args:
         transcript: 文字起こしテキスト
-        max_length: プロンプトに含める文字起こしの最大長
+        budget_tokens: プロンプトに含める文字起こしのトークン予算
+        context: コンテキストキャッシュ（指定した場合は文字起こしを含めず、キャッシュを参照させる）
+        count_tokens: トークン数を数える関数（バックエンドの count_tokens）
         
     Returns:
-        要約テキスト
+        プロンプトの末尾に置く文字起こしの部分
     """
-    print("要約を生成中...")
+    if context is not None:
+        return CACHED_SOURCE_NOTES[context.source]
+    return f"文字起こし:\n{pack_transcript(transcript, budget_tokens, count_tokens)}"
+
+
+def description_budget(budget_tokens: int) -> int:
+    """要約・サブタイトルの予算から、詳細説明文のプロンプトに含める文字起こしの予算を求める"""
+    return budget_tokens // DESCRIPTION_BUDGET_DIVISOR
+
+
+def record_prompt_usage(stage: str, backend: TranscriptionBackend, prompt: str) -> None:
+    """
+    1回の生成で使ったトークン数を、生成の種類ごとのカウンターに記録して表示
     
-    prompt = f"""
+    使用量を返さないバックエンドでは、プロンプトの見積もりを記録する。
+    
+    Args:
+        stage: 生成の種類（メトリクスのタイマー名と同じ generate_summary など）
+        backend: 生成に使ったバックエンド
+        prompt: 送信したプロンプト
+    """
+    estimated = backend.count_tokens(prompt)
+    usage = backend.last_usage or {}
+    prompt_tokens = usage.get("prompt_tokens", estimated)
+    output_tokens = usage.get("output_tokens", 0)
+    metrics.count(f"{stage}_prompt_tokens", prompt_tokens)
+    metrics.count(f"{stage}_output_tokens", output_tokens)
+    print(f"[INFO] トークン数: 入力 {prompt_tokens:,}（見積もり {estimated:,}）、出力 {output_tokens:,}")
+
+
+def build_summary_prompt(
+    transcript: str,
+    budget_tokens: int = TRANSCRIPT_TOKEN_BUDGET,
+    context: Optional[ContextCache] = None,
+    count_tokens: Callable[[str], int] = estimate_tokens
+) -> str:
+    """
+    要約を生成するプロンプトを作成
+    
+    Args:
+        transcript: 文字起こしテキスト
+        budget_tokens: プロンプトに含める文字起こしのトークン予算
+        context: 参照するコンテキストキャッシュ（指定した場合は文字起こしをプロンプトに含めない）
+        count_tokens: トークン数を数える関数（バックエンドの count_tokens）
+        
+    Returns:
+        プロンプト
+    """
+    return f"""
 以下のポッドキャストの文字起こしから、要約を作成してください。
 
 【出力形式の指示】
@@ -204,35 +511,29 @@ def generate_summary(transcript: str, max_length: int = 8000) -> str:
 【出力例】
 本ポッドキャストでは、3名のゲストが「生成AIの活用」について語り合っています。主要なトピックとして、生成AIを使ったハッカソンの成功事例が挙げられ、非エンジニアでも短期間でプロトタイプを作成できるようになったことが話題となりました。
 
-文字起こし:
-{transcript[:max_length]}
+{transcript_excerpt(transcript, budget_tokens, context, count_tokens)}
 """
-    
-    response = client.models.generate_content(
-        model=MODEL_NAME,
-        contents=prompt
-    )
-    
-    return clean_ai_output(
-        response.text,
-        remove_prefixes=['要約', 'まとめ', 'サマリー', 'Summary']
-    )
 
 
-def generate_title(transcript: str, max_length: int = 8000) -> str:
+def build_title_prompt(
+    transcript: str,
+    budget_tokens: int = TRANSCRIPT_TOKEN_BUDGET,
+    context: Optional[ContextCache] = None,
+    count_tokens: Callable[[str], int] = estimate_tokens
+) -> str:
     """
-    文字起こしからサブタイトルを生成
+    サブタイトルを生成するプロンプトを作成
     
     Args:
         transcript: 文字起こしテキスト
-        max_length: プロンプトに含める文字起こしの最大長
+        budget_tokens: プロンプトに含める文字起こしのトークン予算
+        context: 参照するコンテキストキャッシュ（指定した場合は文字起こしをプロンプトに含めない）
+        count_tokens: トークン数を数える関数（バックエンドの count_tokens）
         
     Returns:
-        サブタイトル
+        プロンプト
     """
-    print("サブタイトルを生成中...")
-    
-    prompt = f"""
+    return f"""
 以下のポッドキャストの文字起こしから、魅力的なサブタイトルを1つ提案してください。
 
 【出力形式の指示】
@@ -244,42 +545,37 @@ def generate_title(transcript: str, max_length: int = 8000) -> str:
 【出力例】
 生成AIが拓くシビックテックの未来
 
-文字起こし:
-{transcript[:max_length]}
+{transcript_excerpt(transcript, budget_tokens, context, count_tokens)}
 """
-    
-    response = client.models.generate_content(
-        model=MODEL_NAME,
-        contents=prompt
-    )
-    
-    return clean_ai_output(
-        response.text,
-        remove_prefixes=['サブタイトル', 'タイトル', 'Title', 'Subtitle']
-    )
 
 
-def generate_detailed_description(
+def build_detailed_description_prompt(
     transcript: str,
     sub_title: str,
     summary: str,
-    max_length: int = 1000
+    budget_tokens: int = description_budget(TRANSCRIPT_TOKEN_BUDGET),
+    context: Optional[ContextCache] = None,
+    count_tokens: Callable[[str], int] = estimate_tokens
 ) -> str:
     """
-    文字起こしから詳細説明文を生成
+    詳細説明文を生成するプロンプトを作成
     
     Args:
         transcript: 文字起こしテキスト
         sub_title: サブタイトル
         summary: 要約
-        max_length: プロンプトに含める文字起こしの最大長
+        budget_tokens: プロンプトに含める文字起こしのトークン予算
+        context: 参照するコンテキストキャッシュ（指定した場合は文字起こしをプロンプトに含めない）
+        count_tokens: トークン数を数える関数（バックエンドの count_tokens）
         
     Returns:
-        詳細説明文
+        プロンプト
     """
-    print("詳細説明文を生成中...")
-    
-    prompt = f"""
+    if context is None:
+        source = f"文字起こし（抜粋）: {pack_transcript(transcript, budget_tokens, count_tokens)}..."
+    else:
+        source = CACHED_SOURCE_NOTES[context.source]
+    return f"""
 以下のポッドキャストの情報から、魅力的な詳細説明文を作成してください。
 
 【出力形式の指示】
@@ -294,88 +590,583 @@ def generate_detailed_description(
 
 サブタイトル: {sub_title}
 要約: {summary}
-文字起こし（抜粋）: {transcript[:max_length]}...
+{source}
 """
+
+
+def clean_generated_field(field: str, text: str) -> str:
+    """
+    生成されたテキストから、フィールドごとの前置き・装飾を除去
     
-    response = client.models.generate_content(
-        model=MODEL_NAME,
-        contents=prompt
+    Args:
+        field: フィールド名（summary, sub_title, detailed_description）
+        text: 生成されたテキスト
+        
+    Returns:
+        クリーンアップされたテキスト
+    """
+    return clean_ai_output(text, remove_prefixes=FIELD_PREFIXES[field])
+
+
+def generate_summary(
+    transcript: str,
+    backend: TranscriptionBackend,
+    budget_tokens: int = TRANSCRIPT_TOKEN_BUDGET,
+    context: Optional[ContextCache] = None
+) -> str:
+    """
+    文字起こしから要約を生成
+    
+    Args:
+        transcript: 文字起こしテキスト
+        backend: テキスト生成に使うバックエンド
+        budget_tokens: プロンプトに含める文字起こしのトークン予算
+        context: 参照するコンテキストキャッシュ（指定した場合は文字起こしをプロンプトに含めない）
+        
+    Returns:
+        要約テキスト
+    """
+    print("要約を生成中...")
+    
+    prompt = build_summary_prompt(transcript, budget_tokens, context, backend.count_tokens)
+    with metrics.timer("generate_summary"):
+        text = backend.generate_text(prompt, context)
+    record_prompt_usage("generate_summary", backend, prompt)
+    return clean_generated_field("summary", text)
+
+
+def generate_title(
+    transcript: str,
+    backend: TranscriptionBackend,
+    budget_tokens: int = TRANSCRIPT_TOKEN_BUDGET,
+    context: Optional[ContextCache] = None
+) -> str:
+    """
+    文字起こしからサブタイトルを生成
+    
+    Args:
+        transcript: 文字起こしテキスト
+        backend: テキスト生成に使うバックエンド
+        budget_tokens: プロンプトに含める文字起こしのトークン予算
+        context: 参照するコンテキストキャッシュ（指定した場合は文字起こしをプロンプトに含めない）
+        
+    Returns:
+        サブタイトル
+    """
+    print("サブタイトルを生成中...")
+    
+    prompt = build_title_prompt(transcript, budget_tokens, context, backend.count_tokens)
+    with metrics.timer("generate_title"):
+        text = backend.generate_text(prompt, context)
+    record_prompt_usage("generate_title", backend, prompt)
+    return clean_generated_field("sub_title", text)
+
+
+def generate_detailed_description(
+    transcript: str,
+    sub_title: str,
+    summary: str,
+    backend: TranscriptionBackend,
+    budget_tokens: int = description_budget(TRANSCRIPT_TOKEN_BUDGET),
+    context: Optional[ContextCache] = None
+) -> str:
+    """
+    文字起こしから詳細説明文を生成
+    
+    Args:
+        transcript: 文字起こしテキスト
+        sub_title: サブタイトル
+        summary: 要約
+        backend: テキスト生成に使うバックエンド
+        budget_tokens: プロンプトに含める文字起こしのトークン予算
+        context: 参照するコンテキストキャッシュ（指定した場合は文字起こしをプロンプトに含めない）
+        
+    Returns:
+        詳細説明文
+    """
+    print("詳細説明文を生成中...")
+    
+    prompt = build_detailed_description_prompt(
+        transcript, sub_title, summary, budget_tokens, context, backend.count_tokens
     )
+    with metrics.timer("generate_detailed_description"):
+        text = backend.generate_text(prompt, context)
+    record_prompt_usage("generate_detailed_description", backend, prompt)
+    return clean_generated_field("detailed_description", text)
+
+
+def validate_generated_fields(data: Dict[str, Any], schema: Dict[str, Any] = EPISODE_FIELDS_SCHEMA) -> Dict[str, str]:
+    """
+    構造化出力のうち、スキーマに合うフィールドだけを取り出す
+    
+    Args:
+        data: 生成されたJSONオブジェクト
+        schema: 応答スキーマ（string 型のプロパティのみ対応）
+        
+    Returns:
+        フィールド名 → 値（文字列でない・空のフィールドは含まない）
+    """
+    fields = {}
+    for name, prop in schema["properties"].items():
+        value = data.get(name)
+        if prop.get("type") == "string" and isinstance(value, str) and value.strip():
+            fields[name] = value.strip()
+    return fields
+
+
+def generate_episode_fields(
+    transcript: str,
+    backend: TranscriptionBackend,
+    budget_tokens: int = TRANSCRIPT_TOKEN_BUDGET,
+    context: Optional[ContextCache] = None
+) -> Tuple[str, str, str, Dict[str, str]]:
+    """
+    要約・サブタイトル・詳細説明文を1回の構造化出力で生成
+    
+    応答スキーマで出力形式を指定するため、前置きや装飾の除去（clean_ai_output）は不要。
+    スキーマに合わなかったフィールドだけを、個別の生成（generate_summary など）で補う。
+    
+    Args:
+        transcript: 文字起こしテキスト
+        backend: テキスト生成に使うバックエンド
+        budget_tokens: プロンプトに含める文字起こしのトークン予算
+        context: 参照するコンテキストキャッシュ（指定した場合は文字起こしをプロンプトに含めない）
+        
+    Returns:
+        (要約, サブタイトル, 詳細説明文, フィールド名 → 生成に使ったプロンプトの種類)
+        プロンプトの種類は構造化出力なら "structured"、個別に補った場合はフィールド名
+    """
+    print("要約・サブタイトル・詳細説明文を生成中（構造化出力）...")
+    
+    prompt = build_episode_fields_prompt(transcript, budget_tokens, context, backend.count_tokens)
+    try:
+        with metrics.timer("generate_structured"):
+            fields = validate_generated_fields(backend.generate_json(prompt, EPISODE_FIELDS_SCHEMA, context))
+        record_prompt_usage("generate_structured", backend, prompt)
+    except (BackendError, ValueError) as e:
+        print(f"[WARNING] 構造化出力を取得できませんでした: {e}")
+        fields = {}
+    
+    missing = [name for name in EPISODE_FIELDS_SCHEMA["required"] if name not in fields]
+    if missing:
+        print(f"[WARNING] 構造化出力に不足しているフィールドを個別に生成します: {', '.join(missing)}")
+        metrics.count("structured_fallback_fields", len(missing))
     
-    return clean_ai_output(
-        response.text,
-        remove_prefixes=['説明', '詳細説明', 'Description']
+    summary = fields.get("summary") or generate_summary(transcript, backend, budget_tokens, context)
+    sub_title = fields.get("sub_title") or generate_title(transcript, backend, budget_tokens, context)
+    detailed_description = fields.get("detailed_description") or generate_detailed_description(
+        transcript, sub_title, summary, backend, description_budget(budget_tokens), context
     )
+    recipes = {name: "structured" if name in fields else name for name in EPISODE_FIELDS_SCHEMA["required"]}
+    return summary, sub_title, detailed_description, recipes
 
 
-def process_audio_file(audio_path: Path) -> Dict[str, Any]:
+def build_episode_fields_prompt(
+    transcript: str,
+    budget_tokens: int = TRANSCRIPT_TOKEN_BUDGET,
+    context: Optional[ContextCache] = None,
+    count_tokens: Callable[[str], int] = estimate_tokens
+) -> str:
+    """
+    要約・サブタイトル・詳細説明文を1回で生成するプロンプトを作成（構造化出力用）
+    
+    Args:
+        transcript: 文字起こしテキスト
+        budget_tokens: プロンプトに含める文字起こしのトークン予算
+        context: 参照するコンテキストキャッシュ（指定した場合は文字起こしをプロンプトに含めない）
+        count_tokens: トークン数を数える関数（バックエンドの count_tokens）
+        
+    Returns:
+        プロンプト
+    """
+    return f"""
+以下のポッドキャストの文字起こしから、要約（summary）、サブタイトル（sub_title）、
+詳細説明文（detailed_description）を作成し、指定されたJSON形式で出力してください。
+
+【出力形式の指示】
+- 各項目の文字数と内容は、スキーマの説明に従ってください
+- 見出しや装飾、記号（===、---、**など）や「要約：」などの前置きは一切使用しないでください
+- 日本語で出力してください
+
+{transcript_excerpt(transcript, budget_tokens, context, count_tokens)}
+"""
+
+
+# プロンプトの種類 → 入力を空にしたプロンプトを作る関数（プロンプトのバージョンの計算用）
+PROMPT_TEMPLATES: Dict[str, Callable[[], str]] = {
+    "transcript": lambda: TRANSCRIBE_PROMPT,
+    "summary": lambda: build_summary_prompt(""),
+    "sub_title": lambda: build_title_prompt(""),
+    "detailed_description": lambda: build_detailed_description_prompt("", "", ""),
+    "structured": lambda: build_episode_fields_prompt(""),
+}
+
+
+def content_digest(*parts: str) -> str:
+    """
+    文字列のハッシュ（生成結果の記録用、16桁）
+    
+    Args:
+        *parts: ハッシュする文字列（区切りを含めてハッシュする）
+        
+    Returns:
+        ハッシュの16進文字列
+    """
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()[:16]
+
+
+def file_digest(path: Path) -> str:
+    """ファイル内容のハッシュ（音声ファイルを文字起こしの入力として記録する）"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()[:16]
+
+
+@functools.lru_cache(maxsize=None)
+def prompt_version(recipe: str) -> str:
+    """
+    プロンプトのバージョン（入力を空にしたプロンプトのハッシュ）
+    
+    プロンプトの文面を変更するとバージョンが変わり、そのプロンプトで生成したフィールドが古くなる。
+    
+    Args:
+        recipe: プロンプトの種類（PROMPT_TEMPLATES のキー）
+        
+    Returns:
+        バージョン
+    """
+    return content_digest(PROMPT_TEMPLATES[recipe]())
+
+
+def field_inputs_digest(data: Transcript, field: str) -> str:
+    """
+    フィールドの生成に使う入力のハッシュ
+    
+    要約・サブタイトルは文字起こし、詳細説明文は文字起こし・サブタイトル・要約を入力とする。
+    
+    Args:
+        data: 書き起こしデータ
+        field: フィールド名
+        
+    Returns:
+        入力のハッシュ
+    """
+    if field == "detailed_description":
+        return content_digest(data.transcript, data.sub_title, data.summary)
+    return content_digest(data.transcript)
+
+
+def record_artifact(
+    data: Transcript,
+    field: str,
+    model: str,
+    recipe: Optional[str] = None,
+    inputs: Optional[str] = None
+) -> None:
+    """
+    生成したフィールドのプロンプト・モデル・入力・出力のハッシュを書き起こしデータに記録
+    
+    Args:
+        data: 書き起こしデータ（依存するフィールドは設定済みであること）
+        field: フィールド名（transcript, summary, sub_title, detailed_description）
+        model: 生成に使ったモデル
+        recipe: 生成に使ったプロンプトの種類（省略時はフィールド名）
+        inputs: 入力のハッシュ（省略時は field_inputs_digest。文字起こしは音声ファイルのハッシュ）
+    """
+    recipe = recipe or field
+    if data.artifacts is None:
+        data.artifacts = {}
+    data.artifacts[field] = {
+        "recipe": recipe,
+        "prompt": prompt_version(recipe),
+        "model": model,
+        "inputs": inputs or field_inputs_digest(data, field),
+        "output": content_digest(getattr(data, field) or ""),
+    }
+
+
+def create_episode_context(
+    audio_path: Path,
+    transcript: str,
+    backend: TranscriptionBackend,
+    text_backend: TranscriptionBackend,
+    source: str,
+    ttl_seconds: int = CONTEXT_CACHE_TTL_SECONDS
+) -> Optional[ContextCache]:
+    """
+    要約などの生成で参照するコンテキストキャッシュを作成
+    
+    音声をキャッシュできるのは、文字起こしとテキスト生成が同じバックエンドの場合のみ
+    （異なる場合は文字起こし全文をキャッシュする）。
+    
+    Args:
+        audio_path: 音声ファイルのパス
+        transcript: 文字起こしテキスト
+        backend: 文字起こしに使ったバックエンド
+        text_backend: テキスト生成に使うバックエンド
+        source: キャッシュする内容（"audio" または "transcript"）
+        ttl_seconds: キャッシュの有効期限（秒）
+        
+    Returns:
+        作成したキャッシュ（作成できなかった場合はNone。その場合は文字起こしの抜粋をプロンプトに含める）
+    """
+    if not text_backend.supports_context_cache:
+        print(f"[WARNING] {text_backend.name} バックエンドはコンテキストキャッシュに対応していません")
+        return None
+    if source == "audio" and text_backend is not backend:
+        print("[WARNING] 文字起こしとテキスト生成のバックエンドが異なるため、文字起こし全文をキャッシュします")
+        source = "transcript"
+    
+    try:
+        if source == "audio":
+            return text_backend.create_context_cache(audio_path=audio_path, ttl_seconds=ttl_seconds)
+        return text_backend.create_context_cache(text=transcript, ttl_seconds=ttl_seconds)
+    except BackendError as e:
+        print(f"[WARNING] {e}（文字起こしの抜粋をプロンプトに含めて生成します）")
+        return None
+
+
+def process_audio_file(
+    audio_path: Path,
+    backend: TranscriptionBackend,
+    text_backend: Optional[TranscriptionBackend] = None,
+    partial_dir: Optional[Path] = None,
+    structured: bool = False,
+    context_cache: Optional[str] = None,
+    cache_ttl: int = CONTEXT_CACHE_TTL_SECONDS,
+    token_budget: int = TRANSCRIPT_TOKEN_BUDGET,
+    ledger: Optional[UsageLedger] = None,
+    jobs: Optional[JobStore] = None
+) -> Transcript:
     """
     音声ファイルを処理して全ての情報を生成
     
     Args:
         audio_path: 音声ファイルのパス
+        backend: 文字起こしに使うバックエンド
+        text_backend: 要約などのテキスト生成に使うバックエンド（省略時は backend）
+        partial_dir: 指定した場合はストリーミングで文字起こしし、途中経過をこのフォルダに保存する
+        structured: Trueの場合は要約・サブタイトル・詳細説明文を1回の構造化出力で生成する
+        context_cache: 指定した場合は音声（"audio"）または文字起こし全文（"transcript"）を
+            プロバイダー側にキャッシュし、要約などの生成で参照する
+        cache_ttl: コンテキストキャッシュの有効期限（秒）
+        token_budget: 要約などのプロンプトに含める文字起こしのトークン予算
+            （詳細説明文はこの 1/DESCRIPTION_BUDGET_DIVISOR）
+        ledger: 指定した場合は処理段階ごとのAPIの使用量を記録する台帳
+        jobs: 指定した場合は段階（アップロード・文字起こし・生成）ごとの結果をジョブに保存し、
+            前回の実行で終わった段階は保存した結果を使う（ジョブは登録済みであること）
         
     Returns:
-        処理結果の辞書
+        処理結果の書き起こしデータ
     """
     print(f"\n{'='*60}")
     print(f"処理開始: {audio_path.name}")
     print(f"{'='*60}\n")
     
-    # 音声ファイルをアップロード
-    audio_file = upload_audio_file(audio_path)
+    text_backend = text_backend or backend
     
-    try:
-        # 文字起こし
-        transcript = transcribe_audio(audio_file)
-        
-        # 要約、タイトル、詳細説明文を生成
-        summary = generate_summary(transcript)
-        sub_title = generate_title(transcript)
-        detailed_description = generate_detailed_description(transcript, sub_title, summary)
-        
-        # エピソード番号を抽出
-        episode_number = extract_episode_number(audio_path.name)
-        if not episode_number:
-            print(f"[WARNING] エピソード番号が取得できませんでした: {audio_path.name}")
-            episode_number = "0.0.0"
-        
-        # 結果を辞書にまとめる
-        result = {
-            "episode_number": episode_number,
-            "file_name": audio_path.name,
-            "sub_title": sub_title,
-            "detailed_description": detailed_description,
-            "summary": summary,
-            "transcript": transcript
-        }
-        
-        return result
-        
-    finally:
-        # アップロードしたファイルを削除（クォータの節約）
+    job = jobs.get(audio_path.name) if jobs is not None else None
+    completed = stage_index(job["stage"]) if job is not None else 0
+    
+    # 文字起こし
+    audio_digest = file_digest(audio_path)
+    if completed >= stage_index("transcribed"):
+        print(f"[INFO] 文字起こしは前回の実行で完了しています（ジョブの段階: {job['stage']}）")
+        transcript = job["transcript"]
+    else:
+        with track_usage(ledger, audio_path.name, "transcribe", backend.name):
+            if job is not None:
+                prepare_upload(audio_path, backend, jobs, job)
+            if partial_dir is not None:
+                transcript = transcribe_audio_streaming(audio_path, backend, partial_dir)
+            else:
+                transcript = transcribe_audio(audio_path, backend)
+        if jobs is not None:
+            jobs.advance(audio_path.name, "transcribed", transcript=transcript)
+    
+    # 要約、タイトル、詳細説明文を生成
+    if completed >= stage_index("summarized"):
+        print("[INFO] 要約・サブタイトル・詳細説明文は前回の実行で生成済みです")
+        fields = job_fields(job)
+        summary, sub_title, detailed_description = fields["summary"], fields["sub_title"], fields["detailed_description"]
+        recipes = fields.get("recipes", {})
+    else:
+        recipes = {}
+        context = None
+        if context_cache:
+            with track_usage(ledger, audio_path.name, "cache", text_backend.name):
+                context = create_episode_context(
+                    audio_path, transcript, backend, text_backend, context_cache, cache_ttl
+                )
         try:
-            client.files.delete(name=audio_file.name)
-            print(f"アップロードファイルを削除: {audio_file.name}")
-        except Exception as e:
-            print(f"[WARNING] アップロードファイルの削除に失敗: {e}")
+            with track_usage(ledger, audio_path.name, "generate", text_backend.name):
+                if structured:
+                    summary, sub_title, detailed_description, recipes = generate_episode_fields(
+                        transcript, text_backend, token_budget, context
+                    )
+                else:
+                    summary = generate_summary(transcript, text_backend, token_budget, context)
+                    sub_title = generate_title(transcript, text_backend, token_budget, context)
+                    detailed_description = generate_detailed_description(
+                        transcript, sub_title, summary, text_backend, description_budget(token_budget), context
+                    )
+        finally:
+            if context is not None:
+                text_backend.delete_context_cache(context)
+        if jobs is not None:
+            jobs.advance(audio_path.name, "summarized", fields={
+                "summary": summary, "sub_title": sub_title, "detailed_description": detailed_description,
+                "recipes": recipes,
+            })
+    
+    # エピソード番号を抽出
+    episode_number = extract_episode_number(audio_path.name)
+    if not episode_number:
+        print(f"[WARNING] エピソード番号が取得できませんでした: {audio_path.name}")
+        episode_number = "0.0.0"
+    
+    # 結果をまとめる
+    result = Transcript(
+        episode_number=episode_number,
+        file_name=audio_path.name,
+        sub_title=sub_title,
+        detailed_description=detailed_description,
+        summary=summary,
+        transcript=transcript
+    )
+    result.validate()
+    
+    # 生成したフィールドの記録（transcript_metadata.py status で古いフィールドを判定する）
+    record_artifact(result, "transcript", backend.model_id, inputs=audio_digest)
+    for field in ("summary", "sub_title", "detailed_description"):
+        record_artifact(result, field, text_backend.model_id, recipe=recipes.get(field))
+    
+    return result
+
+
+def prepare_upload(audio_path: Path, backend: TranscriptionBackend, jobs: JobStore, job: Any) -> None:
+    """
+    文字起こしの前に音声をアップロードし、アップロード名をジョブに保存
+    
+    前回の実行でアップロード済み（段階が uploaded）なら、それを再利用する。
+    
+    Args:
+        audio_path: 音声ファイルのパス
+        backend: 文字起こしに使うバックエンド
+        jobs: ジョブのストア
+        job: ジョブの行
+    """
+    if job["stage"] == "uploaded" and job["upload_name"] and backend.resume_upload(audio_path, job["upload_name"]):
+        return
+    upload_name = backend.upload(audio_path)
+    if upload_name:
+        jobs.advance(audio_path.name, "uploaded", upload_name=upload_name)
+
+
+def estimate_episode_usage(
+    audio_path: Path,
+    backend: TranscriptionBackend,
+    text_backend: TranscriptionBackend,
+    structured: bool = False,
+    context_cache: Optional[str] = None,
+    token_budget: int = TRANSCRIPT_TOKEN_BUDGET,
+    stage: str = "queued"
+) -> Dict[str, int]:
+    """
+    音声ファイル1件の処理で使うAPIの使用量を、音声の長さから見積もる
+    
+    Args:
+        audio_path: 音声ファイルのパス
+        backend: 文字起こしに使うバックエンド
+        text_backend: テキスト生成に使うバックエンド
+        structured: 構造化出力で1回にまとめて生成するか
+        context_cache: コンテキストキャッシュの内容（"audio" / "transcript"、使わない場合はNone）
+        token_budget: 要約などのプロンプトに含める文字起こしのトークン予算
+        stage: ジョブの段階（終わった段階の分は見積もりに含めない）
+        
+    Returns:
+        使用量の見積もり（usage_ledger.USAGE_FIELDS）
+    """
+    seconds = audio_duration_seconds(audio_path)
+    transcript_tokens = int(seconds * TRANSCRIPT_TOKENS_PER_SECOND)
+    usage = {"requests": 0, "prompt_tokens": 0, "output_tokens": 0, "cache_write_tokens": 0}
+    if stage_index(stage) >= stage_index("summarized"):
+        return add_usage({}, usage)
+    if not backend.local and stage_index(stage) < stage_index("transcribed"):
+        usage["requests"] += 1
+        usage["prompt_tokens"] += estimate_tokens(TRANSCRIBE_PROMPT) + int(seconds * AUDIO_TOKENS_PER_SECOND)
+        usage["output_tokens"] += transcript_tokens
+    if text_backend.local:
+        return add_usage({}, usage)
+    
+    template_tokens = estimate_tokens(PROMPT_TEMPLATES["summary"]())
+    if context_cache:
+        # キャッシュした内容は、参照するたびに入力トークンに含まれる
+        cached = int(seconds * AUDIO_TOKENS_PER_SECOND) if context_cache == "audio" else transcript_tokens
+        usage["requests"] += 1
+        usage["cache_write_tokens"] += cached
+        excerpts = [cached] if structured else [cached] * 3
+    elif structured:
+        excerpts = [min(transcript_tokens, token_budget)]
+    else:
+        excerpts = [
+            min(transcript_tokens, token_budget),
+            min(transcript_tokens, token_budget),
+            min(transcript_tokens, description_budget(token_budget)) + GENERATED_FIELD_TOKENS * 2,
+        ]
+    usage["requests"] += len(excerpts)
+    usage["prompt_tokens"] += sum(template_tokens + tokens for tokens in excerpts)
+    usage["output_tokens"] += GENERATED_FIELD_TOKENS * 3
+    return add_usage({}, usage)
+
+
+def create_backends(args: argparse.Namespace) -> Tuple[TranscriptionBackend, TranscriptionBackend]:
+    """
+    コマンドライン引数から文字起こし・テキスト生成のバックエンドを作成
+    
+    Args:
+        args: コマンドライン引数
+        
+    Returns:
+        (文字起こしのバックエンド, テキスト生成のバックエンド)
+        
+    Raises:
+        BackendError: バックエンドを作成できない場合
+    """
+    options = {"model_size": args.whisper_model} if args.backend == "whisper" else {}
+    backend = create_backend(args.backend, **options)
+    
+    text_backend_name = args.text_backend
+    if text_backend_name is None:
+        # テキスト生成に対応していないバックエンド（whisper）は Gemini で要約などを生成
+        text_backend_name = args.backend if backend.supports_text_generation else "gemini"
+    if text_backend_name == args.backend:
+        return backend, backend
+    
+    text_backend = create_backend(text_backend_name)
+    if not text_backend.supports_text_generation:
+        raise BackendError(f"{text_backend_name} バックエンドはテキスト生成に対応していません")
+    return backend, text_backend
 
 
-def save_results(result: Dict[str, Any], output_dir: Path) -> None:
+def save_results(result: Transcript, output_dir: Path) -> None:
     """
     結果をJSONファイルに保存
     
     Args:
-        result: 処理結果の辞書
+        result: 処理結果の書き起こしデータ
         output_dir: 出力ディレクトリのパス
     """
     output_dir.mkdir(parents=True, exist_ok=True)
     
-    episode_number = result["episode_number"]
-    json_path = output_dir / f"ep{episode_number}.json"
-    
-    with open(json_path, "w", encoding="utf-8") as f:
-        json.dump(result, f, ensure_ascii=False, indent=2)
+    json_path = output_dir / f"ep{result.episode_number}.json"
+    result.save(json_path)
     
     print(f"JSONファイルを保存: {json_path}")
 
@@ -395,6 +1186,78 @@ def move_to_backup(audio_file: Path, backup_dir: Path) -> None:
     print(f"音声ファイルをバックアップに移動: {destination}")
 
 
+def latest_transcript_number(output_dir: Path) -> Optional[str]:
+    """
+    出力フォルダにある書き起こしのうち、最新のエピソード番号を取得
+    
+    Args:
+        output_dir: 出力ディレクトリのパス
+        
+    Returns:
+        エピソード番号（書き起こしが無い場合はNone）
+    """
+    numbers = [extract_episode_number(path.name) for path in output_dir.glob("ep*.json")]
+    numbers = [number for number in numbers if number]
+    return max(numbers, key=natural_sort_key) if numbers else None
+
+
+def queue_audio_files(
+    audio_files: List[Path],
+    jobs: JobStore,
+    output_dir: Path,
+    backup_dir: Path,
+    max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+    leased: Optional[List[str]] = None
+) -> List[Path]:
+    """
+    入力フォルダの音声ファイルをジョブに登録し、処理する順に並べる
+    
+    新しいエピソード（出力フォルダの最新の書き起こしより後の番号）を先に、過去分の補完を後にする。
+    試行回数が上限に達したジョブは含めない。音声ファイルがバックアップに移動済みなのに
+    完了になっていないジョブ（移動の直後に停止した場合）は完了にする。
+    
+    Args:
+        audio_files: 入力フォルダの音声ファイル
+        jobs: ジョブのストア
+        output_dir: 出力ディレクトリのパス
+        backup_dir: バックアップディレクトリのパス
+        max_attempts: 試行回数の上限
+        leased: 他のワーカーが取得している音声ファイル名（入力フォルダに無くても警告しない）
+        
+    Returns:
+        処理する音声ファイルのリスト
+    """
+    latest = latest_transcript_number(output_dir)
+    by_name = {audio_file.name: audio_file for audio_file in audio_files}
+    for audio_file in audio_files:
+        number = extract_episode_number(audio_file.name)
+        jobs.enqueue(audio_file.name, number, classify_priority(number, latest))
+    
+    print("\n処理する順:")
+    queue = []
+    stopped = []
+    for job in jobs.pending():
+        name = job["file_name"]
+        if name not in by_name:
+            if (backup_dir / name).exists():
+                jobs.advance(name, "archived")
+            elif name in (leased or []):
+                print(f"  （{name} は他のワーカーが処理中）")
+            else:
+                print(f"[WARNING] ジョブ {name}（段階: {job['stage']}）の音声ファイルが入力フォルダにありません")
+            continue
+        if job["attempts"] >= max_attempts:
+            stopped.append(name)
+            continue
+        queue.append(by_name[name])
+        resumed = f"、{job['stage']} から再開" if job["stage"] != "queued" else ""
+        print(f"  {len(queue):3d}. {name}（{PRIORITY_NAMES[job['priority']]}{resumed}）")
+    if stopped:
+        print(f"[WARNING] 試行回数が上限（{max_attempts}回）に達したため処理しません: {', '.join(stopped)}")
+        print("[INFO] python scripts/transcription_jobs.py --retry で再び処理できるようにします")
+    return queue
+
+
 def get_audio_files(input_dir: Path) -> List[Path]:
     """
     入力ディレクトリから音声ファイルを取得
@@ -436,17 +1299,134 @@ def ensure_input_dir(input_dir: Path) -> bool:
         return False
 
 
-def main() -> None:
-    """メイン処理"""
-    # パスの正規化（絶対パスに変換）
-    input_dir = PODCAST_INPUT_DIR if PODCAST_INPUT_DIR.is_absolute() else PROJECT_ROOT / PODCAST_INPUT_DIR
-    output_dir = PODCAST_OUTPUT_DIR if PODCAST_OUTPUT_DIR.is_absolute() else PROJECT_ROOT / PODCAST_OUTPUT_DIR
-    backup_dir = PODCAST_BACKUP_DIR if PODCAST_BACKUP_DIR.is_absolute() else PROJECT_ROOT / PODCAST_BACKUP_DIR
+def process_job(
+    audio_file: Path,
+    args: argparse.Namespace,
+    backend: TranscriptionBackend,
+    text_backend: TranscriptionBackend,
+    jobs: JobStore,
+    ledger: UsageLedger,
+    projected: Dict[str, int],
+    backends_key: str,
+    input_dir: Path,
+    output_dir: Path,
+    backup_dir: Path,
+    partial_dir: Optional[Path],
+    leases: Optional[InboxLeases] = None
+) -> bool:
+    """
+    音声ファイル1件をジョブの段階の続きから処理し、書き起こしを保存して音声をバックアップに移動
+    
+    失敗した場合はジョブに試行回数とエラーを記録し、音声は入力フォルダに残す（取得した音声は戻す）。
+    いずれの場合も、見積もりと実績を台帳に記録する。
     
-    # 入力ディレクトリの確認
-    if not ensure_input_dir(input_dir):
+    Args:
+        audio_file: 音声ファイルのパス（ジョブは登録済みであること。leases を指定した場合は取得したパス）
+        args: コマンドライン引数
+        backend: 文字起こしに使うバックエンド
+        text_backend: テキスト生成に使うバックエンド
+        jobs: ジョブのストア
+        ledger: 使用量の台帳
+        projected: 使用量の見積もり
+        backends_key: 台帳に記録するバックエンドの組み合わせ
+        input_dir: 入力ディレクトリのパス
+        output_dir: 出力ディレクトリのパス
+        backup_dir: バックアップディレクトリのパス
+        partial_dir: ストリーミングの途中経過の保存先（--stream でない場合はNone）
+        leases: 音声ファイルを取得したリース（保存・移動の前に、他のワーカーに回収されていないか確かめる）
+        
+    Returns:
+        成功した場合は True
+    """
+    episode_start = len(ledger.records)
+    status = "failed"
+    try:
+        if stage_index(jobs.get(audio_file.name)["stage"]) < stage_index("saved"):
+            result = process_audio_file(
+                audio_file, backend, text_backend, partial_dir, args.structured,
+                args.context_cache, args.cache_ttl, args.token_budget, ledger, jobs
+            )
+            if leases is not None:
+                leases.ensure_held(audio_file)
+            with metrics.timer("save"):
+                save_results(result, output_dir)
+            jobs.advance(audio_file.name, "saved")
+        if leases is not None:
+            leases.ensure_held(audio_file)
+        with metrics.timer("save"):
+            move_to_backup(audio_file, backup_dir)
+        jobs.advance(audio_file.name, "archived")
+        if partial_dir is not None:
+            partial_transcript_paths(audio_file, partial_dir)[1].unlink(missing_ok=True)
+        
+        print(f"\n[OK] {audio_file.name} の処理が完了しました\n")
+        status = "succeeded"
+        metrics.count("files_succeeded")
+        
+    except Exception as e:
+        attempts = jobs.record_failure(audio_file.name, f"{type(e).__name__}: {e}")
+        print(f"\n[ERROR] {audio_file.name} の処理中にエラーが発生しました（試行 {attempts}/{args.max_attempts}）: {e}\n")
+        print(f"[INFO] {audio_file.name} は移動せずに {input_dir} に残します"
+              f"（次の実行では段階 {jobs.get(audio_file.name)['stage']} の続きから再開します）\n")
+        traceback.print_exc()
+        metrics.count("files_failed")
+        if leases is not None:
+            leases.release(audio_file)
+    
+    actual = ledger.usage(episode=audio_file.name, start=episode_start)
+    ledger.append({
+        "type": "episode", "episode": audio_file.name, "backends": backends_key, "status": status,
+        "projected": projected, "actual": actual,
+    })
+    print(f"[INFO] 使用量: トークン {billed_tokens(actual):,}（見積もり {billed_tokens(projected):,}）、"
+          f"リクエスト {actual['requests']}（見積もり {projected['requests']}）")
+    return status == "succeeded"
+
+
+def run(args: argparse.Namespace) -> None:
+    """
+    入力フォルダの音声ファイルをすべて処理
+    
+    Args:
+        args: コマンドライン引数
+    """
+    # 環境変数の読み込みとパスの正規化（絶対パスに変換）
+    load_environment()
+    args.backend = args.backend or os.getenv('TRANSCRIBE_BACKEND', DEFAULT_BACKEND)
+    input_dir = resolve_dir('PODCAST_INPUT_DIR', DEFAULT_INPUT_DIR)
+    output_dir = resolve_dir('PODCAST_OUTPUT_DIR', DEFAULT_OUTPUT_DIR)
+    backup_dir = resolve_dir('PODCAST_BACKUP_DIR', DEFAULT_BACKUP_DIR)
+    
+    # 入力ディレクトリの確認（--watch の場合は作成した空のフォルダを監視する）
+    if not ensure_input_dir(input_dir) and not (args.watch and input_dir.exists()):
         return
     
+    # 音声ファイルは processing/<ワーカーID>/ に移動して取得する（他のワーカーと同じファイルを処理しない）
+    with InboxLeases(input_dir, args.worker_id, args.lease_seconds) as leases:
+        leases.reclaim_stale()
+        if args.watch:
+            watch(args, input_dir, output_dir, backup_dir, leases)
+        else:
+            run_batch(args, input_dir, output_dir, backup_dir, leases)
+
+
+def run_batch(
+    args: argparse.Namespace,
+    input_dir: Path,
+    output_dir: Path,
+    backup_dir: Path,
+    leases: InboxLeases
+) -> None:
+    """
+    入力フォルダにある音声ファイルを処理する順に1件ずつ処理
+    
+    Args:
+        args: コマンドライン引数
+        input_dir: 入力ディレクトリのパス
+        output_dir: 出力ディレクトリのパス
+        backup_dir: バックアップディレクトリのパス
+        leases: 音声ファイルを取得するリース
+    """
     # 音声ファイルの取得
     audio_files = get_audio_files(input_dir)
     
@@ -458,39 +1438,369 @@ def main() -> None:
     # 処理情報の表示
     print(f"\n[INFO] 入力フォルダ: {input_dir}")
     print(f"[INFO] 出力フォルダ: {output_dir}")
-    print(f"[INFO] バックアップフォルダ: {backup_dir}\n")
+    print(f"[INFO] バックアップフォルダ: {backup_dir}")
+    print(f"[INFO] ワーカーID: {leases.worker_id}\n")
     print(f"見つかった音声ファイル: {len(audio_files)}個")
     for audio_file in audio_files:
         print(f"  - {audio_file.name}")
     
+    # バックエンドの作成
+    try:
+        backend, text_backend = create_backends(args)
+    except BackendError as e:
+        print(f"エラー: {e}")
+        return
+    print(f"[INFO] バックエンド: 文字起こし={backend.name}、テキスト生成={text_backend.name}")
+    if args.context_cache == "audio" and text_backend is backend:
+        # 文字起こしでアップロードした音声をそのままキャッシュする（アップロードは1回）
+        backend.retain_uploads = True
+    
+    # ストリーミングの途中経過の保存先
+    partial_dir = output_dir / PARTIAL_DIR_NAME if args.stream else None
+    if partial_dir is not None and args.restart:
+        for audio_file in audio_files:
+            for path in partial_transcript_paths(audio_file, partial_dir):
+                path.unlink(missing_ok=True)
+    
+    # ジョブの登録（新しいエピソードを過去分の補完より先に処理する）
+    jobs = JobStore(Path(args.jobs))
+    if args.retry_failed:
+        jobs.retry_failed(args.max_attempts)
+    audio_files = queue_audio_files(
+        audio_files, jobs, output_dir, backup_dir, args.max_attempts, leases.leased_elsewhere()
+    )
+    
+    # 使用量の見積もり（過去の実績との比で補正）と1日の予算
+    ledger = UsageLedger(Path(args.ledger))
+    budget = DailyBudget(args.daily_tokens, args.daily_requests)
+    backends_key = f"{backend.name}/{text_backend.name}"
+    ratio = ledger.calibration(backends_key)
+    projections = {}
+    for audio_file in audio_files:
+        try:
+            projections[audio_file] = scale_projection(estimate_episode_usage(
+                audio_file, backend, text_backend, args.structured, args.context_cache, args.token_budget,
+                jobs.get(audio_file.name)["stage"]
+            ), ratio)
+        except FileNotFoundError:
+            # 一覧を取得した後に他のワーカーが取得した
+            continue
+    audio_files = [audio_file for audio_file in audio_files if audio_file in projections]
+    projected_total = add_usage({}, {})
+    for projected in projections.values():
+        add_usage(projected_total, projected)
+    print(f"[INFO] 使用量の見積もり: トークン {billed_tokens(projected_total):,}、"
+          f"リクエスト {projected_total['requests']:,}（過去の実績による補正 x{ratio:.2f}）")
+    print(f"[INFO] 1日の予算（今日の使用量/上限）: {budget.describe(ledger.today())}")
+    
     # 各音声ファイルを処理
     success_count = 0
     error_count = 0
+    deferred_count = 0
+    skipped_count = 0
+    run_start = len(ledger.records)
+    run_projected = add_usage({}, {})
     
     for audio_file in audio_files:
-        try:
-            result = process_audio_file(audio_file)
-            save_results(result, output_dir)
-            move_to_backup(audio_file, backup_dir)
-            
-            print(f"\n[OK] {audio_file.name} の処理が完了しました\n")
+        projected = projections[audio_file]
+        if not budget.fits(ledger.today(), projected):
+            # 予算に収まらないファイルは入力フォルダに残し、後ろの小さいファイルは続けて試す
+            print(f"[WARNING] {audio_file.name} は今日の予算に収まらないため次回に回します"
+                  f"（見積もり {billed_tokens(projected):,}トークン、{projected['requests']}リクエスト）")
+            deferred_count += 1
+            metrics.count("files_deferred")
+            continue
+        
+        claimed = leases.claim(audio_file)
+        if claimed is None:
+            print(f"[INFO] {audio_file.name} は他のワーカーが取得したため飛ばします")
+            skipped_count += 1
+            metrics.count("files_claimed_elsewhere")
+            continue
+        
+        add_usage(run_projected, projected)
+        if process_job(
+            claimed, args, backend, text_backend, jobs, ledger, projected, backends_key,
+            input_dir, output_dir, backup_dir, partial_dir, leases
+        ):
             success_count += 1
-            
-        except Exception as e:
-            print(f"\n[ERROR] {audio_file.name} の処理中にエラーが発生しました: {e}\n")
-            print(f"[INFO] {audio_file.name} は移動せずに {input_dir} に残します\n")
-            traceback.print_exc()
+        else:
             error_count += 1
     
+    backend.close()
+    if text_backend is not backend:
+        text_backend.close()
+    jobs.close()
+    
     # 処理結果のサマリー
     print(f"\n{'='*60}")
     print("処理完了")
     print(f"  成功: {success_count}件")
     print(f"  失敗: {error_count}件")
+    if deferred_count:
+        print(f"  予算超過で次回に回した: {deferred_count}件")
+    if skipped_count:
+        print(f"  他のワーカーが処理した: {skipped_count}件")
+    run_actual = ledger.usage(start=run_start)
+    print(f"  使用量: トークン {billed_tokens(run_actual):,}（見積もり {billed_tokens(run_projected):,}）、"
+          f"リクエスト {run_actual['requests']:,}（見積もり {run_projected['requests']:,}）")
+    print(f"  1日の予算（今日の使用量/上限）: {budget.describe(ledger.today())}")
     print(f"結果は '{output_dir}' フォルダに保存されています")
     print(f"処理済み音声ファイルは '{backup_dir}' に移動されました")
     print(f"{'='*60}\n")
 
 
+def watch(
+    args: argparse.Namespace,
+    input_dir: Path,
+    output_dir: Path,
+    backup_dir: Path,
+    leases: InboxLeases
+) -> None:
+    """
+    入力フォルダを監視し、書き込みが終わった音声ファイルを届いた順に処理し続ける（--watch）
+    
+    同時に処理するのは args.concurrency 件まで（ワーカーごとにバックエンドを作成する）。
+    SIGINT / SIGTERM を受け取ると新しいファイルの処理を始めずに、処理中のファイルが終わってから終了する
+    （もう一度受け取るとすぐに終了する。途中の段階はジョブに記録されているため、次の実行で続きから再開する）。
+    失敗したファイルは、試行回数に応じて間隔を空けて --max-attempts 回まで処理し直す。
+    停止したワーカーが取得していたファイルは、監視の間に入力フォルダに戻して処理する。
+    
+    Args:
+        args: コマンドライン引数
+        input_dir: 入力ディレクトリのパス
+        output_dir: 出力ディレクトリのパス
+        backup_dir: バックアップディレクトリのパス
+        leases: 音声ファイルを取得するリース
+    """
+    concurrency = max(1, args.concurrency)
+    try:
+        pairs = [create_backends(args) for _ in range(concurrency)]
+    except BackendError as e:
+        print(f"エラー: {e}")
+        return
+    backend, text_backend = pairs[0]
+    if args.context_cache == "audio" and text_backend is backend:
+        # 文字起こしでアップロードした音声をそのままキャッシュする（アップロードは1回）
+        for pair_backend, _ in pairs:
+            pair_backend.retain_uploads = True
+    idle_pairs: "queue.Queue[Tuple[TranscriptionBackend, TranscriptionBackend]]" = queue.Queue()
+    for pair in pairs:
+        idle_pairs.put(pair)
+    
+    partial_dir = output_dir / PARTIAL_DIR_NAME if args.stream else None
+    if partial_dir is not None and args.restart:
+        for audio_file in get_audio_files(input_dir):
+            for path in partial_transcript_paths(audio_file, partial_dir):
+                path.unlink(missing_ok=True)
+    
+    jobs = JobStore(Path(args.jobs))
+    if args.retry_failed:
+        jobs.retry_failed(args.max_attempts)
+    ledger = UsageLedger(Path(args.ledger))
+    budget = DailyBudget(args.daily_tokens, args.daily_requests)
+    backends_key = f"{backend.name}/{text_backend.name}"
+    watcher = InboxWatcher(input_dir, AUDIO_EXTENSIONS, args.settle_seconds, args.poll_interval)
+    
+    print(f"\n[INFO] 入力フォルダを監視します: {input_dir}（{watcher.mode}、同時処理 {concurrency}件）")
+    print(f"[INFO] 出力フォルダ: {output_dir}")
+    print(f"[INFO] バックアップフォルダ: {backup_dir}")
+    print(f"[INFO] ワーカーID: {leases.worker_id}")
+    print(f"[INFO] バックエンド: 文字起こし={backend.name}、テキスト生成={text_backend.name}")
+    print(f"[INFO] 1日の予算（今日の使用量/上限）: {budget.describe(ledger.today())}")
+    print("[INFO] Ctrl+C（SIGINT）または SIGTERM で、処理中のファイルが終わってから終了します\n")
+    
+    # 停止の合図（1回目は処理中のファイルを待って終了、2回目は既定の動作ですぐに終了）
+    stop = threading.Event()
+    
+    def request_stop(signum: int, frame: Any) -> None:
+        stop.set()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(sig, signal.SIG_DFL)
+        watcher.wake()
+    
+    previous_handlers = {sig: signal.signal(sig, request_stop) for sig in (signal.SIGINT, signal.SIGTERM)}
+    
+    def work(audio_file: Path, projected: Dict[str, int]) -> bool:
+        pair_backend, pair_text_backend = idle_pairs.get()
+        try:
+            with JobStore(Path(args.jobs)) as worker_jobs:
+                return process_job(
+                    audio_file, args, pair_backend, pair_text_backend, worker_jobs, ledger, projected,
+                    backends_key, input_dir, output_dir, backup_dir, partial_dir, leases
+                )
+        finally:
+            idle_pairs.put((pair_backend, pair_text_backend))
+            watcher.wake()
+    
+    executor = ThreadPoolExecutor(max_workers=concurrency)
+    running: Dict[Future, Tuple[Path, Dict[str, int]]] = {}
+    retry_at: Dict[str, float] = {}
+    warned = set()
+    success_count = 0
+    error_count = 0
+    
+    def collect(future: Future) -> None:
+        nonlocal success_count, error_count
+        audio_file, _ = running.pop(future)
+        try:
+            succeeded = future.result()
+        except Exception as e:
+            print(f"[ERROR] {audio_file.name} の処理を記録できませんでした: {e}")
+            succeeded = False
+        if succeeded:
+            success_count += 1
+            retry_at.pop(audio_file.name, None)
+            warned.discard(audio_file.name)
+            return
+        error_count += 1
+        job = jobs.get(audio_file.name)
+        if job["attempts"] < args.max_attempts:
+            delay = WATCH_RETRY_SECONDS * 2 ** (job["attempts"] - 1)
+            retry_at[audio_file.name] = time.monotonic() + delay
+            print(f"[INFO] {audio_file.name} は {delay}秒後に処理し直します")
+    
+    try:
+        while not stop.is_set():
+            for future in [future for future in running if future.done()]:
+                collect(future)
+            
+            leases.reclaim_stale()
+            ready, settling = watcher.scan()
+            busy = {audio_file.name for audio_file, _ in running.values()}
+            now = time.monotonic()
+            candidates = {
+                audio_file.name: audio_file for audio_file in ready
+                if audio_file.name not in busy and retry_at.get(audio_file.name, 0) <= now
+            }
+            if candidates and len(running) < concurrency:
+                latest = latest_transcript_number(output_dir)
+                for audio_file in candidates.values():
+                    number = extract_episode_number(audio_file.name)
+                    jobs.enqueue(audio_file.name, number, classify_priority(number, latest))
+                in_flight = add_usage({}, {})
+                for _, running_projected in running.values():
+                    add_usage(in_flight, running_projected)
+                ratio = ledger.calibration(backends_key)
+                
+                # 新しいエピソードを過去分の補完より先に
+                for job in jobs.pending():
+                    name = job["file_name"]
+                    if name not in candidates or len(running) >= concurrency:
+                        continue
+                    if job["attempts"] >= args.max_attempts:
+                        if name not in warned:
+                            print(f"[WARNING] 試行回数が上限（{args.max_attempts}回）に達したため処理しません: {name}")
+                            warned.add(name)
+                        continue
+                    audio_file = candidates[name]
+                    try:
+                        projected = scale_projection(estimate_episode_usage(
+                            audio_file, backend, text_backend, args.structured, args.context_cache,
+                            args.token_budget, job["stage"]
+                        ), ratio)
+                    except FileNotFoundError:
+                        # 他のワーカーが先に取得した
+                        continue
+                    # 処理中のファイルの分は見積もりで見込む
+                    if not budget.fits(add_usage(ledger.today(), in_flight), projected):
+                        if name not in warned:
+                            print(f"[WARNING] {name} は今日の予算に収まらないため、予算に空きができるまで待ちます"
+                                  f"（見積もり {billed_tokens(projected):,}トークン、{projected['requests']}リクエスト）")
+                            warned.add(name)
+                            metrics.count("files_deferred")
+                        continue
+                    warned.discard(name)
+                    claimed = leases.claim(audio_file)
+                    if claimed is None:
+                        # 他のワーカーが先に取得した
+                        metrics.count("files_claimed_elsewhere")
+                        continue
+                    add_usage(in_flight, projected)
+                    print(f"[INFO] 処理を開始します: {name}（{PRIORITY_NAMES[job['priority']]}）")
+                    running[executor.submit(work, claimed, projected)] = (claimed, projected)
+            
+            watcher.wait(watcher.next_wait(bool(settling)))
+        
+        if running:
+            print(f"\n[INFO] 停止します。処理中の {len(running)}件が終わるまで待ちます（もう一度でただちに終了）")
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+        for future in list(running):
+            collect(future)
+        for sig, handler in previous_handlers.items():
+            signal.signal(sig, handler)
+        watcher.close()
+        jobs.close()
+        for pair_backend, pair_text_backend in pairs:
+            pair_backend.close()
+            if pair_text_backend is not pair_backend:
+                pair_text_backend.close()
+    
+    print(f"\n{'='*60}")
+    print("監視を終了しました")
+    print(f"  成功: {success_count}件")
+    print(f"  失敗: {error_count}件")
+    print(f"  1日の予算（今日の使用量/上限）: {budget.describe(ledger.today())}")
+    print(f"{'='*60}\n")
+
+
+def main() -> None:
+    """メイン処理"""
+    parser = argparse.ArgumentParser(description='音声ファイルを文字起こしし、要約・サブタイトル・詳細説明を生成')
+    parser.add_argument('--backend', choices=list(BACKENDS), default=None,
+                        help=f'文字起こしのバックエンド（デフォルト: 環境変数 TRANSCRIBE_BACKEND、未設定なら {DEFAULT_BACKEND}）')
+    parser.add_argument('--text-backend', choices=list(BACKENDS), default=None,
+                        help='要約などのテキスト生成のバックエンド（デフォルト: --backend と同じ。whisperの場合はgemini）')
+    parser.add_argument('--whisper-model', type=str, default=WHISPER_MODEL_SIZE,
+                        help=f'whisperバックエンドのモデルサイズまたはパス（デフォルト: {WHISPER_MODEL_SIZE}）')
+    parser.add_argument('--stream', action='store_true',
+                        help='文字起こしをストリーミングで受け取り、途中経過を保存する（失敗した場合は次回途中から再開）')
+    parser.add_argument('--restart', action='store_true',
+                        help='--stream の途中経過を破棄して最初から文字起こしする')
+    parser.add_argument('--structured', action='store_true',
+                        help='要約・サブタイトル・詳細説明文を1回の構造化出力（JSONスキーマ指定）で生成する')
+    parser.add_argument('--context-cache', choices=['audio', 'transcript'], default=None,
+                        help='音声または文字起こし全文をプロバイダー側にキャッシュし、要約などの生成で再送せずに参照する')
+    parser.add_argument('--cache-ttl', type=int, default=CONTEXT_CACHE_TTL_SECONDS,
+                        help=f'--context-cache のキャッシュの有効期限（秒、デフォルト: {CONTEXT_CACHE_TTL_SECONDS}）')
+    parser.add_argument('--token-budget', type=int, default=TRANSCRIPT_TOKEN_BUDGET,
+                        help='要約などのプロンプトに含める文字起こしのトークン予算'
+                             f'（デフォルト: {TRANSCRIPT_TOKEN_BUDGET}、詳細説明文はこの 1/{DESCRIPTION_BUDGET_DIVISOR}）')
+    parser.add_argument('--daily-tokens', type=int, default=None,
+                        help='1日に使うトークン数（入力・出力・キャッシュ作成の合計）の上限。'
+                             '収まらない音声ファイルは次回に回す（デフォルト: 無制限）')
+    parser.add_argument('--daily-requests', type=int, default=None,
+                        help='1日に送るリクエスト数の上限（デフォルト: 無制限）')
+    parser.add_argument('--ledger', type=str, default=str(LEDGER_PATH),
+                        help=f'APIの使用量を記録する台帳（デフォルト: {LEDGER_PATH}）')
+    parser.add_argument('--jobs', type=str, default=str(DEFAULT_JOBS_PATH),
+                        help=f'段階ごとの進捗を記録するジョブのデータベース（デフォルト: {DEFAULT_JOBS_PATH}）')
+    parser.add_argument('--max-attempts', type=int, default=DEFAULT_MAX_ATTEMPTS,
+                        help=f'1つの音声ファイルの試行回数の上限（デフォルト: {DEFAULT_MAX_ATTEMPTS}）')
+    parser.add_argument('--retry-failed', action='store_true',
+                        help='試行回数が上限に達した音声ファイルも、もう一度処理する')
+    parser.add_argument('--watch', action='store_true',
+                        help='入力フォルダを監視し、書き込みが終わった音声ファイルをすぐに処理し続ける（Ctrl+C で終了）')
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_WATCH_CONCURRENCY,
+                        help=f'--watch で同時に処理する音声ファイルの数（デフォルト: {DEFAULT_WATCH_CONCURRENCY}）')
+    parser.add_argument('--settle-seconds', type=float, default=SETTLE_SECONDS,
+                        help=f'--watch でサイズと更新時刻がこの秒数変わらなければ書き込みが終わったとみなす'
+                             f'（デフォルト: {SETTLE_SECONDS:g}）')
+    parser.add_argument('--worker-id', type=str, default=None,
+                        help='複数のマシン・プロセスで同じ入力フォルダを処理するときのワーカーID'
+                             '（デフォルト: ホスト名-プロセスID。同時に動かすワーカーで重複しないこと）')
+    parser.add_argument('--lease-seconds', type=float, default=LEASE_SECONDS,
+                        help='ワーカーの heartbeat がこの秒数更新されていなければ停止したとみなし、'
+                             f'取得していた音声ファイルを入力フォルダに戻す（デフォルト: {LEASE_SECONDS}）')
+    parser.add_argument('--poll-interval', type=float, default=POLL_INTERVAL_SECONDS,
+                        help=f'--watch でフォルダを調べる間隔（秒、デフォルト: {POLL_INTERVAL_SECONDS:g}）')
+    metrics.add_metrics_argument(parser)
+    args = parser.parse_args()
+    
+    with metrics.report_metrics(args.metrics_out, "transcribe_podcast"):
+        run(args)
+
+
 if __name__ == "__main__":
     main()
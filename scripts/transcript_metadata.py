@@ -0,0 +1,678 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+書き起こしのメタデータ（要約・サブタイトル・詳細説明文）の一括再生成
+
+data/transcripts/ の書き起こしJSONを読み込み、音声なしで summary / sub_title / detailed_description を
+作り直す。プロンプトは transcribe_podcast.py と同じものを使う。
+
+生成リクエストはプロバイダーの非同期バッチ処理（gemini のバッチAPI）でまとめて送信し、完了するまで
+ポーリングする。バッチに対応していないバックエンドでは、同時実行数を制限したスレッドプールで呼び出す。
+詳細説明文は要約とサブタイトルを使うため、それらの生成が終わってから2段階目として送信する。
+
+進捗（送信したバッチジョブ・受け取った結果・書き込んだファイル）は状態ファイルに保存するため、
+中断しても同じコマンドを再実行すれば続きから再開できる。書き起こしJSONは一時ファイルから置き換える。
+
+生成したフィールドには、プロンプト・モデル・入力・出力のハッシュを書き起こしJSONの artifacts に記録する
+（transcribe_podcast.py も同じ記録を残す）。make と同じ考え方で、プロンプトの変更などで古くなった
+フィールドを status で一覧し、rebuild でそれだけを（依存する詳細説明文も含めて）再生成できる。
+
+使い方:
+    python scripts/transcript_metadata.py regenerate
+    python scripts/transcript_metadata.py regenerate --fields summary,sub_title --episodes 1.0.1,1.0.2
+    python scripts/transcript_metadata.py regenerate --backend fake --mode pool --concurrency 8
+    python scripts/transcript_metadata.py status
+    python scripts/transcript_metadata.py rebuild
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+# 共通ユーティリティのインポート
+from utils import display_width, natural_sort_key, pad_display, PROJECT_ROOT, TRANSCRIPTS_DIR
+from models import Transcript
+import metrics
+from transcribe_podcast import (
+    DEFAULT_BACKEND, DESCRIPTION_BUDGET_DIVISOR, TRANSCRIPT_TOKEN_BUDGET, build_detailed_description_prompt,
+    build_summary_prompt, build_title_prompt, clean_generated_field, content_digest, description_budget,
+    field_inputs_digest, load_environment, prompt_version, record_artifact
+)
+from transcription_backends import BACKENDS, BackendError, TranscriptionBackend, create_backend
+
+# 再生成できるフィールド
+METADATA_FIELDS = ["summary", "sub_title", "detailed_description"]
+
+# 生成の段階（前の段階の結果を後の段階のプロンプトで使う）
+GENERATION_PHASES = [["summary", "sub_title"], ["detailed_description"]]
+
+# フィールドが依存するフィールド（依存先を再生成したら、そのフィールドも再生成する）
+FIELD_DEPENDENCIES = {"detailed_description": ["summary", "sub_title"]}
+
+# フィールドが古いと判定した理由 → 表示名
+STALE_REASONS = {
+    "missing": "記録なし",
+    "prompt": "プロンプト変更",
+    "model": "モデル変更",
+    "inputs": "入力変更",
+}
+
+# 進捗を保存する状態ファイル
+STATE_PATH = PROJECT_ROOT / ".cache" / "regenerate_state.json"
+
+# 状態ファイルの形式バージョン（形式を変えたら上げる）
+STATE_VERSION = 2
+
+# バッチジョブの完了を確認する間隔（秒）
+POLL_INTERVAL_SECONDS = 30
+
+# スレッドプールの同時実行数のデフォルト
+DEFAULT_CONCURRENCY = 4
+
+# スレッドプールで何件受け取るごとに状態ファイルを保存するか
+SAVE_EVERY = 10
+
+
+def result_key(episode_number: str, field: str) -> str:
+    """状態ファイルの結果のキー（例: "1.0.1/summary"）"""
+    return f"{episode_number}/{field}"
+
+
+def load_transcripts(transcripts_dir: Path, episodes: Optional[List[str]] = None) -> Dict[str, Tuple[Path, Transcript]]:
+    """
+    再生成の対象の書き起こしJSONを読み込む
+
+    Args:
+        transcripts_dir: 書き起こしJSONのフォルダ
+        episodes: 対象のエピソード番号（省略時はすべて）
+
+    Returns:
+        エピソード番号 → (パス, 書き起こし)（エピソード番号の自然順）
+    """
+    transcripts: Dict[str, Tuple[Path, Transcript]] = {}
+    for path in sorted(transcripts_dir.glob("*.json"), key=lambda p: natural_sort_key(p.name)):
+        data = Transcript.load(path)
+        if not data.transcript:
+            continue
+        if episodes is not None and data.episode_number not in episodes:
+            continue
+        transcripts[data.episode_number] = (path, data)
+    return transcripts
+
+
+def backend_model_id(name: str) -> str:
+    """バックエンドを作成せずに、そのデフォルトのモデルの識別子を取得（status 用、APIキー不要）"""
+    return BACKENDS[name].default_model_id or name
+
+
+def field_status(data: Transcript, field: str, model: str) -> Optional[str]:
+    """
+    フィールドが古いかどうかを判定
+
+    文字起こし（transcript）は音声が無いと作り直せないため、記録がある場合のプロンプトの変更だけを判定する。
+
+    Args:
+        data: 書き起こしデータ
+        field: フィールド名
+        model: 現在使うモデル
+
+    Returns:
+        古い理由（STALE_REASONS のキー）。最新の場合はNone
+    """
+    artifact = (data.artifacts or {}).get(field)
+    if artifact is None:
+        return None if field == "transcript" else "missing"
+    if artifact.get("prompt") != prompt_version(artifact.get("recipe") or field):
+        return "prompt"
+    if field == "transcript":
+        return None
+    if artifact.get("model") != model:
+        return "model"
+    if artifact.get("inputs") != field_inputs_digest(data, field):
+        return "inputs"
+    return None
+
+
+def is_edited(data: Transcript, field: str) -> bool:
+    """生成した後にフィールドが手動で編集されているか（記録した出力のハッシュと異なるか）"""
+    artifact = (data.artifacts or {}).get(field)
+    return artifact is not None and artifact.get("output") != content_digest(getattr(data, field) or "")
+
+
+def load_state(state_path: Path, plan: Dict[str, List[str]]) -> Dict[str, Any]:
+    """
+    状態ファイルを読み込む（対象が異なる場合は新しいジョブとして始める）
+
+    Args:
+        state_path: 状態ファイルのパス
+        plan: エピソード番号 → 再生成するフィールド
+
+    Returns:
+        {"version", "plan", "batches", "results", "written"} の辞書
+    """
+    new_state = {"version": STATE_VERSION, "plan": plan, "batches": {}, "results": {}, "written": []}
+    try:
+        with open(state_path, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return new_state
+
+    if state.get("version") != STATE_VERSION or state.get("plan") != plan:
+        print("[WARNING] 前回の再生成とは対象が異なるため、途中経過を破棄して最初から始めます")
+        return new_state
+    print(f"[INFO] 前回の途中から再開します（生成済み: {len(state['results'])}件、"
+          f"書き込み済み: {len(state['written'])}件）")
+    return state
+
+
+def save_state(state_path: Path, state: Dict[str, Any]) -> None:
+    """状態ファイルを保存（一時ファイルから置き換える）"""
+    state_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = state_path.with_suffix('.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(state, f, ensure_ascii=False)
+    tmp_path.replace(state_path)
+
+
+def current_value(state: Dict[str, Any], data: Transcript, field: str) -> str:
+    """再生成した値（まだ無ければ書き起こしJSONの現在の値）を取得"""
+    value = state["results"].get(result_key(data.episode_number, field))
+    if value is None:
+        value = getattr(data, field) or ""
+    return value
+
+
+def build_phase_prompts(
+    transcripts: Dict[str, Tuple[Path, Transcript]],
+    state: Dict[str, Any],
+    fields: List[str],
+    backend: TranscriptionBackend,
+    token_budget: int = TRANSCRIPT_TOKEN_BUDGET
+) -> Dict[str, str]:
+    """
+    1段階分の、まだ結果の無いリクエストのプロンプトを作成
+
+    Args:
+        transcripts: エピソード番号 → (パス, 書き起こし)
+        state: 状態
+        fields: この段階で生成するフィールド
+        backend: 生成に使うバックエンド（文字起こしを予算に詰めるときのトークン数の数え方）
+        token_budget: プロンプトに含める文字起こしのトークン予算
+
+    Returns:
+        結果のキー → プロンプト
+    """
+    prompts = {}
+    written = set(state["written"])
+    for number, planned in state["plan"].items():
+        if number in written:
+            continue
+        data = transcripts[number][1]
+        for field in fields:
+            key = result_key(number, field)
+            if field not in planned or key in state["results"]:
+                continue
+            # 依存するフィールドも再生成する場合、その結果が揃うまで作れない
+            dependencies = [name for name in FIELD_DEPENDENCIES.get(field, []) if name in planned]
+            if any(result_key(number, name) not in state["results"] for name in dependencies):
+                continue
+            if field == "summary":
+                prompts[key] = build_summary_prompt(data.transcript, token_budget, None, backend.count_tokens)
+            elif field == "sub_title":
+                prompts[key] = build_title_prompt(data.transcript, token_budget, None, backend.count_tokens)
+            else:
+                prompts[key] = build_detailed_description_prompt(
+                    data.transcript, current_value(state, data, "sub_title"), current_value(state, data, "summary"),
+                    description_budget(token_budget), None, backend.count_tokens
+                )
+    return prompts
+
+
+def store_result(state: Dict[str, Any], key: str, text: Optional[str]) -> bool:
+    """生成結果をクリーンアップして状態に記録（空の結果は記録せず、次回に再生成する）"""
+    field = key.rsplit("/", 1)[1]
+    cleaned = clean_generated_field(field, text) if text else ""
+    if not cleaned:
+        metrics.count("fields_failed")
+        return False
+    state["results"][key] = cleaned
+    metrics.count("fields_regenerated")
+    return True
+
+
+def run_batch_phase(
+    backend: TranscriptionBackend,
+    state: Dict[str, Any],
+    state_path: Path,
+    phase: str,
+    prompts: Dict[str, str],
+    poll_interval: float
+) -> int:
+    """
+    1段階分のリクエストをバッチジョブとして送信し、完了を待って結果を記録
+
+    前回送信したジョブが状態ファイルに残っていれば、送信し直さずにその完了を待つ。
+
+    Args:
+        backend: テキスト生成に使うバックエンド
+        state: 状態
+        state_path: 状態ファイルのパス
+        phase: 段階の番号（状態ファイルのキー）
+        prompts: 結果のキー → プロンプト
+        poll_interval: 完了を確認する間隔（秒）
+
+    Returns:
+        記録できた結果の件数
+
+    Raises:
+        BackendError: ジョブが見つからない・失敗した場合（次回の実行で送信し直す）
+    """
+    job_name = state["batches"].get(phase)
+    if job_name is None:
+        job_name = backend.submit_batch(prompts)
+        metrics.count("batch_jobs")
+        state["batches"][phase] = job_name
+        save_state(state_path, state)
+    else:
+        print(f"[INFO] 送信済みのバッチジョブの完了を待ちます: {job_name}")
+
+    try:
+        with metrics.timer("batch_wait"):
+            while True:
+                results = backend.poll_batch(job_name)
+                if results is not None:
+                    break
+                print(f"バッチジョブの完了を待機中: {job_name}", end="\r")
+                time.sleep(poll_interval)
+    except BackendError:
+        del state["batches"][phase]
+        save_state(state_path, state)
+        raise
+
+    stored = sum(store_result(state, key, text) for key, text in results.items() if key in prompts)
+    del state["batches"][phase]
+    save_state(state_path, state)
+    return stored
+
+
+def run_pool_phase(
+    backend: TranscriptionBackend,
+    state: Dict[str, Any],
+    state_path: Path,
+    prompts: Dict[str, str],
+    concurrency: int
+) -> int:
+    """
+    1段階分のリクエストを同時実行数を制限したスレッドプールで生成して結果を記録
+
+    Args:
+        backend: テキスト生成に使うバックエンド
+        state: 状態
+        state_path: 状態ファイルのパス
+        prompts: 結果のキー → プロンプト
+        concurrency: 同時実行数
+
+    Returns:
+        記録できた結果の件数
+    """
+    stored = 0
+    executor = ThreadPoolExecutor(max_workers=concurrency)
+    try:
+        with metrics.timer("generate_pool"):
+            futures = {executor.submit(backend.generate_text, prompt): key for key, prompt in prompts.items()}
+            for done, future in enumerate(as_completed(futures), 1):
+                key = futures[future]
+                try:
+                    stored += store_result(state, key, future.result())
+                except Exception as e:
+                    print(f"[WARNING] {key} の生成に失敗しました: {e}")
+                    metrics.count("fields_failed")
+                print(f"生成中: {done}/{len(prompts)}", end="\r")
+                if done % SAVE_EVERY == 0:
+                    save_state(state_path, state)
+            print()
+    finally:
+        # 中断された場合も、受け取った結果は保存して未着手のリクエストは取り消す
+        executor.shutdown(wait=True, cancel_futures=True)
+        save_state(state_path, state)
+    return stored
+
+
+def write_transcript(path: Path, data: Transcript) -> None:
+    """書き起こしJSONを一時ファイルから置き換えて保存"""
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    data.save(tmp_path)
+    os.replace(tmp_path, path)
+
+
+def write_results(
+    transcripts: Dict[str, Tuple[Path, Transcript]],
+    state: Dict[str, Any],
+    state_path: Path,
+    model: str
+) -> int:
+    """
+    すべてのフィールドが揃ったエピソードの書き起こしJSONを更新し、生成の記録を残す
+
+    Args:
+        transcripts: エピソード番号 → (パス, 書き起こし)
+        state: 状態
+        state_path: 状態ファイルのパス
+        model: 生成に使ったモデル
+
+    Returns:
+        更新したファイル数
+    """
+    written = set(state["written"])
+    count = 0
+    with metrics.timer("write"):
+        for number, planned in state["plan"].items():
+            if number in written:
+                continue
+            if any(result_key(number, field) not in state["results"] for field in planned):
+                continue
+            path, data = transcripts[number]
+            for field in planned:
+                setattr(data, field, state["results"][result_key(number, field)])
+            # 詳細説明文の入力には新しい要約・サブタイトルを使うため、値をすべて設定してから記録する
+            for field in planned:
+                record_artifact(data, field, model)
+            write_transcript(path, data)
+            state["written"].append(number)
+            count += 1
+    metrics.count("episodes_written", count)
+    save_state(state_path, state)
+    return count
+
+
+def run_plan(
+    transcripts: Dict[str, Tuple[Path, Transcript]],
+    plan: Dict[str, List[str]],
+    args: argparse.Namespace
+) -> int:
+    """
+    計画したフィールドを生成して書き起こしJSONに書き戻す（regenerate と rebuild の共通処理）
+
+    Args:
+        transcripts: エピソード番号 → (パス, 書き起こし)
+        plan: エピソード番号 → 再生成するフィールド
+        args: コマンドライン引数（backend, mode, concurrency, poll_interval, state, restart）
+
+    Returns:
+        終了コード
+    """
+    state_path = Path(args.state)
+    if args.restart:
+        state_path.unlink(missing_ok=True)
+    state = load_state(state_path, plan)
+
+    load_environment()
+    backend_name = args.backend or os.getenv('TRANSCRIBE_BACKEND', DEFAULT_BACKEND)
+    try:
+        backend = create_backend(backend_name)
+    except BackendError as e:
+        print(f"[ERROR] {e}")
+        return 1
+    if not backend.supports_text_generation:
+        print(f"[ERROR] {backend.name} バックエンドはテキスト生成に対応していません")
+        return 1
+    mode = args.mode
+    if mode == "auto":
+        mode = "batch" if backend.supports_batch else "pool"
+    elif mode == "batch" and not backend.supports_batch:
+        print(f"[ERROR] {backend.name} バックエンドはバッチ処理に対応していません（--mode pool を指定してください）")
+        return 1
+    requested = sum(len(fields) for fields in plan.values())
+    print(f"[INFO] 対象: {len(plan)}件（{requested}フィールド）、バックエンド: {backend.name}（{mode}）")
+
+    try:
+        for index, phase_fields in enumerate(GENERATION_PHASES):
+            prompts = build_phase_prompts(transcripts, state, phase_fields, backend, args.token_budget)
+            if not prompts and str(index) not in state["batches"]:
+                continue
+            print(f"\n[INFO] {', '.join(phase_fields)} を生成します（{len(prompts)}件）")
+            if mode == "batch":
+                stored = run_batch_phase(backend, state, state_path, str(index), prompts, args.poll_interval)
+            else:
+                stored = run_pool_phase(backend, state, state_path, prompts, args.concurrency)
+            print(f"[OK] {stored}/{len(prompts)}件を生成しました")
+    except BackendError as e:
+        print(f"[ERROR] {e}")
+        print("[INFO] 同じコマンドを再実行すると、生成済みの結果を残したまま続きから再開します")
+        return 1
+    except KeyboardInterrupt:
+        print("\n[INFO] 中断しました。同じコマンドを再実行すると続きから再開します")
+        return 1
+    finally:
+        backend.close()
+
+    written = write_results(transcripts, state, state_path, backend.model_id)
+    remaining = len(plan) - len(state["written"])
+    print(f"\n[OK] {written}件の書き起こしJSONを更新しました")
+    if remaining:
+        print(f"[WARNING] {remaining}件は生成に失敗したフィールドがあるため未更新です（再実行すると再生成します）")
+        return 1
+    state_path.unlink(missing_ok=True)
+    return 0
+
+
+def regenerate(args: argparse.Namespace) -> int:
+    """
+    regenerate コマンド（指定したフィールドを古いかどうかに関係なく再生成）
+
+    Args:
+        args: コマンドライン引数
+
+    Returns:
+        終了コード
+    """
+    fields = [field for field in METADATA_FIELDS if field in args.fields.split(',')]
+    unknown = set(args.fields.split(',')) - set(METADATA_FIELDS)
+    if unknown or not fields:
+        print(f"[ERROR] 未知のフィールドです: {', '.join(sorted(unknown))}（{', '.join(METADATA_FIELDS)} から選択）")
+        return 1
+
+    episodes = args.episodes.split(',') if args.episodes else None
+    transcripts = load_transcripts(Path(args.dir), episodes)
+    if not transcripts:
+        print("[INFO] 再生成する書き起こしがありません")
+        return 0
+    return run_plan(transcripts, {number: fields for number in transcripts}, args)
+
+
+def status(args: argparse.Namespace) -> int:
+    """
+    status コマンド（古いフィールドの一覧）
+
+    Args:
+        args: コマンドライン引数
+
+    Returns:
+        終了コード（--check を指定し、古いフィールドがある場合は1）
+    """
+    episodes = args.episodes.split(',') if args.episodes else None
+    transcripts = load_transcripts(Path(args.dir), episodes)
+    model = backend_model_id(args.backend or os.getenv('TRANSCRIBE_BACKEND', DEFAULT_BACKEND))
+    fields = ["transcript"] + METADATA_FIELDS
+    counts = {field: {reason: 0 for reason in list(STALE_REASONS) + ["edited"]} for field in fields}
+    stale_episodes = 0
+
+    for number, (_, data) in transcripts.items():
+        stale = []
+        for field in fields:
+            reason = field_status(data, field, model)
+            edited = is_edited(data, field)
+            if reason:
+                counts[field][reason] += 1
+                stale.append(f"{field}（{STALE_REASONS[reason]}{'・手動編集あり' if edited else ''}）")
+            if edited:
+                counts[field]["edited"] += 1
+        if stale:
+            stale_episodes += 1
+            if args.verbose:
+                print(f"  ep{number}: {', '.join(stale)}")
+
+    print(f"\n[INFO] 対象: {len(transcripts)}件（モデル: {model}）\n")
+    labels = list(STALE_REASONS.values()) + ["手動編集"]
+    # 全角の見出しと数値の列が揃うよう、表示幅で埋める
+    width = max(12, max(display_width(label) for label in labels) + 2)
+    print("  " + pad_display("フィールド", 22) + "".join(pad_display(label, width, '>') for label in labels))
+    for field in fields:
+        cells = "".join(pad_display(str(value), width, '>') for value in counts[field].values())
+        print("  " + pad_display(field, 22) + cells)
+    print()
+    if not stale_episodes:
+        print("[OK] すべてのフィールドが最新です")
+        return 0
+    print(f"[INFO] 古いフィールドがあるエピソード: {stale_episodes}件"
+          f"（rebuild で再生成。文字起こしは音声からの再実行が必要です）")
+    return 1 if args.check else 0
+
+
+def plan_rebuild(
+    transcripts: Dict[str, Tuple[Path, Transcript]],
+    model: str,
+    force: bool = False
+) -> Tuple[Dict[str, List[str]], List[str]]:
+    """
+    古いフィールドと、それに依存するフィールドの再生成を計画
+
+    Args:
+        transcripts: エピソード番号 → (パス, 書き起こし)
+        model: 生成に使うモデル
+        force: 手動で編集されたフィールドも再生成するか
+
+    Returns:
+        (エピソード番号 → 再生成するフィールド, 手動編集のため再生成しないフィールドの一覧)
+    """
+    plan: Dict[str, List[str]] = {}
+    skipped = []
+    for number, (_, data) in transcripts.items():
+        fields: List[str] = []
+        for field in METADATA_FIELDS:
+            upstream_rebuilt = any(name in fields for name in FIELD_DEPENDENCIES.get(field, []))
+            if field_status(data, field, model) is None and not upstream_rebuilt:
+                continue
+            if is_edited(data, field) and not force:
+                skipped.append(f"ep{number}/{field}")
+                continue
+            fields.append(field)
+        if fields:
+            plan[number] = fields
+    return plan, skipped
+
+
+def rebuild(args: argparse.Namespace) -> int:
+    """
+    rebuild コマンド（古いフィールドだけを依存関係の順に再生成）
+
+    Args:
+        args: コマンドライン引数
+
+    Returns:
+        終了コード
+    """
+    episodes = args.episodes.split(',') if args.episodes else None
+    transcripts = load_transcripts(Path(args.dir), episodes)
+    model = backend_model_id(args.backend or os.getenv('TRANSCRIBE_BACKEND', DEFAULT_BACKEND))
+    plan, skipped = plan_rebuild(transcripts, model, args.force)
+    if skipped:
+        print(f"[WARNING] 手動で編集されているため再生成しません（--force で再生成）: {', '.join(skipped)}")
+    if not plan:
+        print("[OK] 再生成が必要なフィールドはありません")
+        return 0
+
+    if args.touch:
+        # 再生成せずに、現在の値を現在のプロンプト・モデルで生成したものとして記録する（make -t と同じ）
+        for number, fields in plan.items():
+            path, data = transcripts[number]
+            for field in fields:
+                record_artifact(data, field, model)
+            write_transcript(path, data)
+        print(f"[OK] {len(plan)}件の書き起こしJSONを最新として記録しました")
+        return 0
+    return run_plan(transcripts, plan, args)
+
+
+def add_target_arguments(parser: argparse.ArgumentParser) -> None:
+    """
+    対象の書き起こしとバックエンドを指定するオプションを追加
+
+    Args:
+        parser: サブコマンドの引数パーサー
+    """
+    parser.add_argument('--episodes', type=str, default=None,
+                        help='対象のエピソード番号（カンマ区切り、デフォルト: すべて）')
+    parser.add_argument('--dir', type=str, default=str(TRANSCRIPTS_DIR),
+                        help=f'書き起こしJSONのフォルダ（デフォルト: {TRANSCRIPTS_DIR}）')
+    parser.add_argument('--backend', choices=list(BACKENDS), default=None,
+                        help=f'テキスト生成のバックエンド（デフォルト: 環境変数 TRANSCRIBE_BACKEND、'
+                             f'未設定なら {DEFAULT_BACKEND}）')
+
+
+def add_generation_arguments(parser: argparse.ArgumentParser) -> None:
+    """
+    生成の方法と進捗の保存先を指定するオプションを追加
+
+    Args:
+        parser: サブコマンドの引数パーサー
+    """
+    parser.add_argument('--mode', choices=['auto', 'batch', 'pool'], default='auto',
+                        help='batch: バッチAPIで送信、pool: スレッドプールで1件ずつ呼び出す'
+                             '（デフォルト: auto = バッチに対応していれば batch）')
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY,
+                        help=f'pool の同時実行数（デフォルト: {DEFAULT_CONCURRENCY}）')
+    parser.add_argument('--poll-interval', type=float, default=POLL_INTERVAL_SECONDS,
+                        help=f'バッチジョブの完了を確認する間隔（秒、デフォルト: {POLL_INTERVAL_SECONDS}）')
+    parser.add_argument('--state', type=str, default=str(STATE_PATH),
+                        help=f'進捗を保存する状態ファイル（デフォルト: {STATE_PATH}）')
+    parser.add_argument('--restart', action='store_true',
+                        help='前回の途中経過を破棄して最初から生成する')
+    parser.add_argument('--token-budget', type=int, default=TRANSCRIPT_TOKEN_BUDGET,
+                        help='プロンプトに含める文字起こしのトークン予算'
+                             f'（デフォルト: {TRANSCRIPT_TOKEN_BUDGET}、詳細説明文はこの 1/{DESCRIPTION_BUDGET_DIVISOR}）')
+
+
+def main() -> None:
+    """メイン処理"""
+    parser = argparse.ArgumentParser(description='書き起こしのメタデータ（要約・サブタイトル・詳細説明文）の一括再生成')
+    metrics.add_metrics_argument(parser)
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    regenerate_parser = subparsers.add_parser('regenerate', help='既存の書き起こしから要約などを再生成')
+    regenerate_parser.add_argument('--fields', type=str, default=','.join(METADATA_FIELDS),
+                                   help=f'再生成するフィールド（カンマ区切り、デフォルト: {",".join(METADATA_FIELDS)}）')
+    add_target_arguments(regenerate_parser)
+    add_generation_arguments(regenerate_parser)
+
+    status_parser = subparsers.add_parser('status', help='プロンプト・モデル・入力が変わって古くなったフィールドを一覧')
+    add_target_arguments(status_parser)
+    status_parser.add_argument('--verbose', action='store_true', help='古いフィールドをエピソードごとに表示')
+    status_parser.add_argument('--check', action='store_true', help='古いフィールドがあれば終了コード1で終了')
+
+    rebuild_parser = subparsers.add_parser('rebuild', help='古いフィールドだけを依存関係の順に再生成')
+    add_target_arguments(rebuild_parser)
+    add_generation_arguments(rebuild_parser)
+    rebuild_parser.add_argument('--force', action='store_true', help='手動で編集されたフィールドも再生成する')
+    rebuild_parser.add_argument('--touch', action='store_true',
+                                help='再生成せずに、現在の値を最新として記録する（記録の無い既存の書き起こし向け）')
+
+    args = parser.parse_args()
+
+    with metrics.report_metrics(args.metrics_out, "transcript_metadata"):
+        if args.command == 'regenerate':
+            exit_code = regenerate(args)
+        elif args.command == 'status':
+            exit_code = status(args)
+        else:
+            exit_code = rebuild(args)
+    sys.exit(exit_code)
+
+
+if __name__ == "__main__":
+    main()
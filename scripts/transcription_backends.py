@@ -0,0 +1,892 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+文字起こし・テキスト生成のバックエンド
+
+transcribe_podcast.py から使うバックエンドの共通インターフェースと実装をまとめたモジュール。
+
+- gemini: Gemini API（文字起こし・テキスト生成）
+- whisper: faster-whisper によるローカルCPUでの文字起こし（オフライン、テキスト生成は不可）
+- fake: 決定的な結果を返すテスト用バックエンド（ネットワーク・APIキー不要）
+"""
+
+import functools
+import hashlib
+import io
+import json
+import os
+import time
+import wave
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Type
+
+import metrics
+
+# Gemini モデル
+GEMINI_MODEL_NAME = "gemini-3-flash-preview"
+
+# 音声ファイルのMIMEタイプ
+MIME_TYPE_MAP = {
+    ".m4a": "audio/mp4",
+    ".mp3": "audio/mpeg",
+    ".wav": "audio/wav",
+    ".mp4": "video/mp4"
+}
+
+# whisper のデフォルトモデル
+WHISPER_MODEL_SIZE = "small"
+
+# コンテキストキャッシュの有効期限のデフォルト（秒）
+CONTEXT_CACHE_TTL_SECONDS = 3600
+
+# Gemini のバッチジョブが終了したことを示す状態
+GEMINI_BATCH_DONE_STATES = {
+    "JOB_STATE_SUCCEEDED", "JOB_STATE_FAILED", "JOB_STATE_CANCELLED", "JOB_STATE_EXPIRED",
+}
+
+# 音声1秒あたりの入力トークン数（Gemini の音声の扱い。使用量の見積もりと fake バックエンドで使う）
+AUDIO_TOKENS_PER_SECOND = 32
+
+# 長さを読み取れない音声（wav 以外）の長さを、ファイルサイズから見積もるときのビットレート（128kbps）
+ASSUMED_AUDIO_BYTES_PER_SECOND = 16000
+
+# Gemini の count_tokens の補正（1回の応答で比を近づける割合と、補正に使うプロンプトの最小トークン数）
+TOKEN_RATIO_WEIGHT = 0.2
+TOKEN_RATIO_MIN_TOKENS = 200
+
+
+class BackendError(RuntimeError):
+    """バックエンドの初期化・実行エラー"""
+
+
+@dataclass
+class ContextCache:
+    """プロバイダー側にキャッシュしたコンテキスト（音声または文字起こし全文）"""
+
+    # キャッシュの名前（プロバイダーのID）
+    name: str
+    # キャッシュした内容（"audio" または "transcript"）
+    source: str
+    # キャッシュした内容のトークン数（分かる場合）
+    tokens: int = 0
+    # バックエンド固有の付随リソース（キャッシュのためにアップロードしたファイルなど）
+    resource: Any = None
+
+
+class TranscriptionBackend(ABC):
+    """文字起こし・テキスト生成バックエンドの基底クラス"""
+
+    # バックエンド名（--backend で指定する名前）
+    name = ""
+
+    # デフォルトのモデルの識別子（生成したフィールドの記録に使う。空ならバックエンド名）
+    default_model_id = ""
+
+    # テキスト生成（要約・サブタイトルなど）に対応しているか
+    supports_text_generation = True
+
+    # コンテキストキャッシュに対応しているか
+    supports_context_cache = False
+
+    # プロバイダーの非同期バッチ処理（submit_batch / poll_batch）に対応しているか
+    supports_batch = False
+
+    # True の場合、文字起こしでアップロードした音声を音声のコンテキストキャッシュで再利用するために残す
+    # （アップロードを伴うバックエンドのみ意味を持つ）
+    retain_uploads = False
+
+    # ローカルで実行し、APIの使用量（トークン・リクエスト）がかからないか
+    local = False
+
+    # 直前の呼び出しで実際に使ったトークン数（prompt_tokens, output_tokens, cached_tokens）
+    # 使用量を返さないバックエンド・まだ呼び出していない場合は None
+    last_usage: Optional[Dict[str, int]] = None
+
+    @property
+    def model_id(self) -> str:
+        """実際に使うモデルの識別子"""
+        return self.default_model_id or self.name
+
+    def count_tokens(self, text: str) -> int:
+        """
+        テキストのトークン数を見積もる（プロンプトに含める文字起こしの量を予算に合わせるために使う）
+
+        Args:
+            text: テキスト
+
+        Returns:
+            見積もったトークン数
+        """
+        return estimate_tokens(text)
+
+    @abstractmethod
+    def transcribe(self, audio_path: Path, prompt: str) -> str:
+        """
+        音声ファイルを文字起こし
+
+        Args:
+            audio_path: 音声ファイルのパス
+            prompt: 文字起こしの指示（対応していないバックエンドでは無視される）
+
+        Returns:
+            文字起こしテキスト（[分:秒] 形式のタイムスタンプ付き）
+        """
+
+    def transcribe_stream(self, audio_path: Path, prompt: str, start_seconds: float = 0.0) -> Iterator[str]:
+        """
+        音声ファイルを文字起こしし、結果を届いた順に少しずつ返す
+
+        ストリーミングに対応していないバックエンドでは、transcribe の結果をまとめて1回で返す。
+
+        Args:
+            audio_path: 音声ファイルのパス
+            prompt: 文字起こしの指示
+            start_seconds: この時刻（秒）以降だけを文字起こしする（途中からの再開用、対応していない
+                バックエンドでは無視される。呼び出し側でそれより前の行を捨てること）
+
+        Yields:
+            文字起こしテキストの断片（行の途中で区切られることがある）
+        """
+        yield self.transcribe(audio_path, prompt)
+
+    def upload(self, audio_path: Path) -> Optional[str]:
+        """
+        文字起こしの前に音声をアップロード（次の transcribe / transcribe_stream で使う）
+
+        アップロードを伴わないバックエンドでは何もしない。
+
+        Args:
+            audio_path: 音声ファイルのパス
+
+        Returns:
+            アップロード名（中断後の再開で resume_upload に渡す）。アップロードしない場合はNone
+        """
+        return None
+
+    def resume_upload(self, audio_path: Path, upload_name: str) -> bool:
+        """
+        以前の実行でアップロードした音声を、次の transcribe / transcribe_stream で使う
+
+        Args:
+            audio_path: 音声ファイルのパス
+            upload_name: upload が返したアップロード名
+
+        Returns:
+            再利用できる場合は True（期限切れ・削除済みなどの場合は False。その場合は改めてアップロードする）
+        """
+        return False
+
+    def generate_text(self, prompt: str, context: Optional[ContextCache] = None) -> str:
+        """
+        プロンプトからテキストを生成
+
+        Args:
+            prompt: プロンプト
+            context: 参照するコンテキストキャッシュ（キャッシュした内容はプロンプトに含めなくてよい）
+
+        Returns:
+            生成されたテキスト
+        """
+        raise BackendError(f"{self.name} バックエンドはテキスト生成に対応していません")
+
+    def generate_json(
+        self,
+        prompt: str,
+        schema: Dict[str, Any],
+        context: Optional[ContextCache] = None
+    ) -> Dict[str, Any]:
+        """
+        JSONスキーマに沿った構造化出力を生成
+
+        Args:
+            prompt: プロンプト
+            schema: 応答のJSONスキーマ（type / properties / required）
+            context: 参照するコンテキストキャッシュ
+
+        Returns:
+            生成されたJSONオブジェクト（スキーマに合っているかは呼び出し側で検証する）
+
+        Raises:
+            BackendError: 構造化出力に対応していない場合
+            ValueError: 応答がJSONオブジェクトとして解析できない場合
+        """
+        raise BackendError(f"{self.name} バックエンドは構造化出力に対応していません")
+
+    def create_context_cache(
+        self,
+        text: Optional[str] = None,
+        audio_path: Optional[Path] = None,
+        ttl_seconds: int = CONTEXT_CACHE_TTL_SECONDS
+    ) -> ContextCache:
+        """
+        文字起こし全文または音声をプロバイダー側にキャッシュ
+
+        以降の generate_text / generate_json に context として渡すと、内容を再送せずに参照できる。
+
+        Args:
+            text: キャッシュするテキスト（文字起こし全文）
+            audio_path: キャッシュする音声ファイル（text と同時には指定しない）
+            ttl_seconds: キャッシュの有効期限（秒）
+
+        Returns:
+            作成したキャッシュ
+
+        Raises:
+            BackendError: キャッシュに対応していない・作成できない場合
+        """
+        raise BackendError(f"{self.name} バックエンドはコンテキストキャッシュに対応していません")
+
+    def delete_context_cache(self, context: ContextCache) -> None:
+        """
+        キャッシュを削除（有効期限を待たずに課金を止める）
+
+        Args:
+            context: create_context_cache で作成したキャッシュ
+        """
+
+    def submit_batch(self, prompts: Dict[str, str]) -> str:
+        """
+        テキスト生成のリクエストをまとめて非同期のバッチとして送信
+
+        Args:
+            prompts: キー → プロンプト
+
+        Returns:
+            バッチジョブの名前（poll_batch に渡す。プロセスをまたいで再開できるよう保存しておく）
+        """
+        raise BackendError(f"{self.name} バックエンドはバッチ処理に対応していません")
+
+    def poll_batch(self, job_name: str) -> Optional[Dict[str, Optional[str]]]:
+        """
+        バッチジョブの状態を確認し、完了していれば結果を取得
+
+        Args:
+            job_name: submit_batch が返したバッチジョブの名前
+
+        Returns:
+            完了していない場合はNone。完了した場合はキー → 生成テキスト（失敗したリクエストはNone）
+
+        Raises:
+            BackendError: ジョブが見つからない・ジョブ全体が失敗した場合
+        """
+        raise BackendError(f"{self.name} バックエンドはバッチ処理に対応していません")
+
+    def close(self) -> None:
+        """バックエンドが保持するリソースを解放"""
+
+
+def get_mime_type(file_path: Path) -> str:
+    """
+    ファイル拡張子からMIMEタイプを取得
+
+    Args:
+        file_path: 音声ファイルのパス
+
+    Returns:
+        MIMEタイプ
+    """
+    return MIME_TYPE_MAP.get(file_path.suffix.lower(), "audio/mp4")
+
+
+def parse_json_object(text: Optional[str]) -> Dict[str, Any]:
+    """
+    構造化出力の応答をJSONオブジェクトとして解析
+
+    Args:
+        text: 応答のテキスト
+
+    Returns:
+        解析したオブジェクト
+
+    Raises:
+        ValueError: JSONオブジェクトでない場合
+    """
+    data = json.loads(text or "")
+    if not isinstance(data, dict):
+        raise ValueError(f"JSONオブジェクトではありません: {type(data).__name__}")
+    return data
+
+
+def format_timestamp(seconds: float) -> str:
+    """
+    秒数を [分:秒] 形式のタイムスタンプに変換
+
+    Args:
+        seconds: 秒数
+
+    Returns:
+        タイムスタンプ（例: "[1:23]"）
+    """
+    total = int(seconds)
+    return f"[{total // 60}:{total % 60:02d}]"
+
+
+def audio_duration_seconds(audio_path: Path) -> float:
+    """
+    音声ファイルの長さ（秒）を取得
+
+    wav はヘッダーから読み取り、それ以外（追加の依存なしでは読めない形式）はファイルサイズから見積もる。
+
+    Args:
+        audio_path: 音声ファイルのパス
+
+    Returns:
+        長さ（秒）
+    """
+    if audio_path.suffix.lower() == ".wav":
+        try:
+            with wave.open(str(audio_path), 'rb') as f:
+                return f.getnframes() / f.getframerate()
+        except (wave.Error, EOFError):
+            pass
+    return audio_path.stat().st_size / ASSUMED_AUDIO_BYTES_PER_SECOND
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    テキストのトークン数を概算（UTF-8で4バイトを1トークンとみなす）
+
+    Args:
+        text: テキスト
+
+    Returns:
+        概算のトークン数
+    """
+    return (len(text.encode('utf-8')) + 3) // 4
+
+
+@functools.lru_cache(maxsize=None)
+def get_gemini_client(api_key: str) -> Any:
+    """
+    Gemini APIクライアントを取得（APIキーごとに1回だけ作成）
+
+    google.genai の読み込みは重いため、最初に必要になったときに行う。
+
+    Args:
+        api_key: Gemini APIキー
+
+    Returns:
+        genai.Client
+    """
+    from google import genai
+    return genai.Client(api_key=api_key)
+
+
+class GeminiBackend(TranscriptionBackend):
+    """Gemini API を使うバックエンド"""
+
+    name = "gemini"
+    default_model_id = GEMINI_MODEL_NAME
+    supports_context_cache = True
+    supports_batch = True
+
+    def __init__(self, api_key: Optional[str] = None, model_name: str = GEMINI_MODEL_NAME) -> None:
+        """
+        初期化
+
+        Args:
+            api_key: Gemini APIキー（省略時は環境変数 GEMINI_API_KEY）
+            model_name: 使用するモデル名
+
+        Raises:
+            BackendError: APIキーが設定されていない場合
+        """
+        api_key = api_key or os.environ.get("GEMINI_API_KEY")
+        if not api_key:
+            raise BackendError(
+                "Gemini APIキーが設定されていません。\n"
+                ".envファイルを作成し、GEMINI_API_KEY=your-api-key の形式で設定してください。"
+            )
+        self.client = get_gemini_client(api_key)
+        self.model_name = model_name
+        # 実際のトークン数 / estimate_tokens の比（応答の使用量から更新し、count_tokens の見積もりに使う）
+        self.token_ratio = 1.0
+        # retain_uploads で残したアップロード（音声ファイルのパス → ファイル）
+        self._retained_uploads: Dict[str, Any] = {}
+        # upload / resume_upload で用意した、次の文字起こしで使うアップロード（音声ファイルのパス → ファイル）
+        self._prepared_uploads: Dict[str, Any] = {}
+
+    def upload_audio_file(self, file_path: Path) -> Any:
+        """
+        音声ファイルをGemini APIにアップロード
+
+        Args:
+            file_path: 音声ファイルのパス
+
+        Returns:
+            アップロードされたファイルオブジェクト
+
+        Raises:
+            ValueError: アップロードに失敗した場合
+        """
+        print(f"音声ファイルをアップロード中: {file_path.name}")
+
+        with metrics.timer("upload"):
+            with open(file_path, 'rb') as f:
+                audio_file = self.client.files.upload(file=f, config={"mime_type": get_mime_type(file_path)})
+        metrics.count("upload_bytes", file_path.stat().st_size)
+
+        # ファイルの処理が完了するまで待機
+        with metrics.timer("processing_wait"):
+            while audio_file.state.name == "PROCESSING":
+                print("処理中...", end="\r")
+                time.sleep(2)
+                audio_file = self.client.files.get(name=audio_file.name)
+
+        if audio_file.state.name == "FAILED":
+            raise ValueError(f"ファイルのアップロードに失敗しました: {audio_file.state.name}")
+
+        print(f"アップロード完了: {audio_file.uri}")
+        return audio_file
+
+    def delete_uploaded_file(self, audio_file: Any) -> None:
+        """アップロードしたファイルを削除（クォータの節約、失敗しても処理は続ける）"""
+        try:
+            self.client.files.delete(name=audio_file.name)
+            print(f"アップロードファイルを削除: {audio_file.name}")
+        except Exception as e:
+            print(f"[WARNING] アップロードファイルの削除に失敗: {e}")
+
+    @property
+    def model_id(self) -> str:
+        return self.model_name
+
+    def upload(self, audio_path: Path) -> Optional[str]:
+        audio_file = self.upload_audio_file(audio_path)
+        self._prepared_uploads[str(audio_path)] = audio_file
+        return audio_file.name
+
+    def resume_upload(self, audio_path: Path, upload_name: str) -> bool:
+        try:
+            audio_file = self.client.files.get(name=upload_name)
+        except Exception as e:
+            print(f"[INFO] 以前のアップロードを再利用できません（{e}）")
+            return False
+        if audio_file.state.name != "ACTIVE":
+            return False
+        print(f"以前のアップロードを再利用: {upload_name}")
+        self._prepared_uploads[str(audio_path)] = audio_file
+        return True
+
+    def _take_upload(self, audio_path: Path) -> Any:
+        """用意済みのアップロードがあればそれを、無ければアップロードして返す"""
+        return self._prepared_uploads.pop(str(audio_path), None) or self.upload_audio_file(audio_path)
+
+    def _release_upload(self, audio_path: Path, audio_file: Any) -> None:
+        """文字起こしが終わったアップロードを削除（retain_uploads の場合は再利用のために残す）"""
+        if self.retain_uploads:
+            self._retained_uploads[str(audio_path)] = audio_file
+        else:
+            self.delete_uploaded_file(audio_file)
+
+    def count_tokens(self, text: str) -> int:
+        # countTokens API は1回ごとに通信が必要なため、概算を実際の使用量との比で補正する
+        return int(estimate_tokens(text) * self.token_ratio)
+
+    def _record_usage(self, response: Any, prompt: Optional[str] = None) -> None:
+        """
+        レスポンスのトークン数をカウンターと last_usage に記録
+
+        Args:
+            response: generate_content のレスポンス
+            prompt: 送信したプロンプト（指定した場合、count_tokens の補正に使う）
+        """
+        metrics.count("requests")
+        usage = getattr(response, "usage_metadata", None)
+        if usage is None:
+            return
+        cached = getattr(usage, "cached_content_token_count", None) or 0
+        self.last_usage = {
+            "prompt_tokens": usage.prompt_token_count or 0,
+            "output_tokens": usage.candidates_token_count or 0,
+            "cached_tokens": cached,
+        }
+        metrics.count("prompt_tokens", self.last_usage["prompt_tokens"])
+        metrics.count("output_tokens", self.last_usage["output_tokens"])
+        metrics.count("cached_tokens", cached)
+        estimated = estimate_tokens(prompt) if prompt else 0
+        # 短いプロンプトは比がぶれやすいため補正に使わない
+        if estimated >= TOKEN_RATIO_MIN_TOKENS:
+            actual = self.last_usage["prompt_tokens"] - cached
+            self.token_ratio += TOKEN_RATIO_WEIGHT * (actual / estimated - self.token_ratio)
+
+    @staticmethod
+    def _context_config(context: Optional[ContextCache], **config: Any) -> Dict[str, Any]:
+        """generate_content の config にキャッシュの参照を加える"""
+        if context is not None:
+            config["cached_content"] = context.name
+        return config
+
+    def transcribe(self, audio_path: Path, prompt: str) -> str:
+        audio_file = self._take_upload(audio_path)
+        try:
+            with metrics.timer("model_transcribe"):
+                response = self.client.models.generate_content(
+                    model=self.model_name,
+                    contents=[prompt, audio_file]
+                )
+            self._record_usage(response)
+            return response.text
+        finally:
+            self._release_upload(audio_path, audio_file)
+
+    def transcribe_stream(self, audio_path: Path, prompt: str, start_seconds: float = 0.0) -> Iterator[str]:
+        if start_seconds > 0:
+            prompt += (
+                f"\n\n【再開の指示】音声の {format_timestamp(start_seconds)} より前の部分はすでに文字起こし済みです。"
+                f"{format_timestamp(start_seconds)} 以降の部分だけを、同じ形式で文字起こししてください。"
+            )
+        audio_file = self._take_upload(audio_path)
+        try:
+            last_chunk = None
+            for chunk in self.client.models.generate_content_stream(
+                model=self.model_name,
+                contents=[prompt, audio_file]
+            ):
+                last_chunk = chunk
+                if chunk.text:
+                    yield chunk.text
+            # トークン数は最後の断片に累計が入る
+            if last_chunk is not None:
+                self._record_usage(last_chunk)
+        finally:
+            self._release_upload(audio_path, audio_file)
+
+    def generate_text(self, prompt: str, context: Optional[ContextCache] = None) -> str:
+        response = self.client.models.generate_content(
+            model=self.model_name,
+            contents=prompt,
+            config=self._context_config(context)
+        )
+        self._record_usage(response, prompt)
+        return response.text
+
+    def generate_json(
+        self,
+        prompt: str,
+        schema: Dict[str, Any],
+        context: Optional[ContextCache] = None
+    ) -> Dict[str, Any]:
+        response = self.client.models.generate_content(
+            model=self.model_name,
+            contents=prompt,
+            config=self._context_config(
+                context, response_mime_type="application/json", response_schema=schema
+            )
+        )
+        self._record_usage(response, prompt)
+        return parse_json_object(response.text)
+
+    def create_context_cache(
+        self,
+        text: Optional[str] = None,
+        audio_path: Optional[Path] = None,
+        ttl_seconds: int = CONTEXT_CACHE_TTL_SECONDS
+    ) -> ContextCache:
+        audio_file = None
+        if audio_path is not None:
+            # 文字起こしで残したアップロードがあれば、アップロードし直さずに使う
+            audio_file = self._retained_uploads.pop(str(audio_path), None) or self.upload_audio_file(audio_path)
+            contents: Any = [audio_file]
+        else:
+            contents = [text or ""]
+
+        try:
+            with metrics.timer("cache_create"):
+                cache = self.client.caches.create(
+                    model=self.model_name,
+                    config={"contents": contents, "ttl": f"{int(ttl_seconds)}s"}
+                )
+        except Exception as e:
+            # キャッシュの最小トークン数に満たない場合などはキャッシュできない
+            if audio_file is not None:
+                self.delete_uploaded_file(audio_file)
+            raise BackendError(f"コンテキストキャッシュを作成できませんでした: {e}") from e
+
+        usage = getattr(cache, "usage_metadata", None)
+        tokens = getattr(usage, "total_token_count", None) or 0
+        metrics.count("requests")
+        metrics.count("cache_write_tokens", tokens)
+        print(f"コンテキストキャッシュを作成: {cache.name}（{tokens}トークン、有効期限 {int(ttl_seconds)}秒）")
+        return ContextCache(
+            name=cache.name,
+            source="audio" if audio_path is not None else "transcript",
+            tokens=tokens,
+            resource=audio_file,
+        )
+
+    def delete_context_cache(self, context: ContextCache) -> None:
+        try:
+            self.client.caches.delete(name=context.name)
+            print(f"コンテキストキャッシュを削除: {context.name}")
+        except Exception as e:
+            print(f"[WARNING] コンテキストキャッシュの削除に失敗: {e}")
+        if context.resource is not None:
+            self.delete_uploaded_file(context.resource)
+
+    def submit_batch(self, prompts: Dict[str, str]) -> str:
+        # 数百件のプロンプトはインラインの上限を超えるため、JSON Lines のファイルとしてアップロードする
+        lines = [
+            json.dumps({"key": key, "request": {"contents": [{"role": "user", "parts": [{"text": prompt}]}]}},
+                       ensure_ascii=False)
+            for key, prompt in prompts.items()
+        ]
+        data = ("\n".join(lines) + "\n").encode('utf-8')
+        with metrics.timer("batch_submit"):
+            src = self.client.files.upload(file=io.BytesIO(data), config={"mime_type": "jsonl"})
+            job = self.client.batches.create(model=self.model_name, src=src.name)
+        metrics.count("upload_bytes", len(data))
+        print(f"バッチジョブを送信: {job.name}（{len(prompts)}件）")
+        return job.name
+
+    def poll_batch(self, job_name: str) -> Optional[Dict[str, Optional[str]]]:
+        try:
+            job = self.client.batches.get(name=job_name)
+        except Exception as e:
+            raise BackendError(f"バッチジョブを取得できませんでした: {job_name}: {e}") from e
+        state = job.state.name
+        if state not in GEMINI_BATCH_DONE_STATES:
+            return None
+        if state != "JOB_STATE_SUCCEEDED":
+            raise BackendError(f"バッチジョブが完了しませんでした: {job_name}（{state}）")
+
+        content = self.client.files.download(file=job.dest.file_name)
+        results: Dict[str, Optional[str]] = {}
+        for line in content.decode('utf-8').splitlines():
+            if not line.strip():
+                continue
+            item = json.loads(line)
+            response = item.get("response") or {}
+            candidates = response.get("candidates") or [{}]
+            parts = (candidates[0].get("content") or {}).get("parts") or []
+            results[item.get("key")] = "".join(part.get("text", "") for part in parts) or None
+            usage = response.get("usageMetadata") or {}
+            metrics.count("prompt_tokens", usage.get("promptTokenCount") or 0)
+            metrics.count("output_tokens", usage.get("candidatesTokenCount") or 0)
+        return results
+
+    def close(self) -> None:
+        # 文字起こしで使われなかった用意済みのアップロード（途中経過から再開した場合など）も削除する
+        for audio_file in [*self._retained_uploads.values(), *self._prepared_uploads.values()]:
+            self.delete_uploaded_file(audio_file)
+        self._retained_uploads.clear()
+        self._prepared_uploads.clear()
+
+
+class WhisperBackend(TranscriptionBackend):
+    """faster-whisper によるローカルCPUでの文字起こし（オフライン）"""
+
+    name = "whisper"
+    default_model_id = f"whisper-{WHISPER_MODEL_SIZE}"
+    supports_text_generation = False
+    local = True
+
+    def __init__(
+        self,
+        model_size: str = WHISPER_MODEL_SIZE,
+        device: str = "cpu",
+        compute_type: str = "int8",
+        language: str = "ja"
+    ) -> None:
+        """
+        初期化（初回はモデルのダウンロードが必要。以降はオフラインで動作）
+
+        Args:
+            model_size: モデルサイズ（tiny, base, small, medium, large-v3 など）またはモデルのパス
+            device: 実行デバイス
+            compute_type: 量子化の種類（CPUでは int8 が高速）
+            language: 音声の言語
+
+        Raises:
+            BackendError: faster-whisper がインストールされていない場合
+        """
+        try:
+            from faster_whisper import WhisperModel
+        except ImportError as e:
+            raise BackendError(
+                "whisper バックエンドには faster-whisper が必要です。\n"
+                "pip install faster-whisper でインストールしてください。"
+            ) from e
+        print(f"whisperモデルを読み込み中: {model_size}（{device}, {compute_type}）")
+        self.model = WhisperModel(model_size, device=device, compute_type=compute_type)
+        self.model_size = model_size
+        self.language = language
+
+    @property
+    def model_id(self) -> str:
+        return f"whisper-{self.model_size}"
+
+    def transcribe(self, audio_path: Path, prompt: str) -> str:
+        return "".join(self.transcribe_stream(audio_path, prompt)).rstrip("\n")
+
+    def transcribe_stream(self, audio_path: Path, prompt: str, start_seconds: float = 0.0) -> Iterator[str]:
+        # whisper は話者を区別しないため、区間ごとにタイムスタンプだけを付ける
+        # segments は遅延評価されるため、区間を認識するたびに1行ずつ返せる
+        segments, info = self.model.transcribe(str(audio_path), language=self.language, vad_filter=True)
+        metrics.count("audio_seconds", info.duration)
+        for segment in segments:
+            text = segment.text.strip()
+            if text and segment.start >= start_seconds:
+                yield f"{format_timestamp(segment.start)} {text}\n"
+
+
+class FakeBackend(TranscriptionBackend):
+    """
+    テスト用のバックエンド
+
+    音声ファイルの内容とプロンプトのハッシュから決定的な結果を返す。
+    ネットワークやAPIキーを使わずにパイプライン全体を動かせる。
+    """
+
+    name = "fake"
+    supports_context_cache = True
+    supports_batch = True
+
+    def __init__(self, lines: int = 5) -> None:
+        """
+        初期化
+
+        Args:
+            lines: 文字起こし結果の行数
+        """
+        self.lines = lines
+        # 送信したトークン数の概算（estimate_tokens）。キャッシュの効果の確認に使う
+        # prompt: プロンプトとして送った分、cache_write: キャッシュ作成時に送った分、
+        # cached: キャッシュから参照された分（送信はしない）
+        self.sent_tokens = {"prompt": 0, "cache_write": 0, "cached": 0}
+        self._caches: Dict[str, ContextCache] = {}
+        # バッチジョブの結果（プロセス内だけで保持する。別のプロセスからは見つからない）
+        self._batches: Dict[str, Dict[str, Optional[str]]] = {}
+
+    @staticmethod
+    def _digest(data: bytes) -> str:
+        return hashlib.blake2b(data, digest_size=4).hexdigest()
+
+    def upload(self, audio_path: Path) -> Optional[str]:
+        # アップロードを伴うバックエンドと同じ段階を踏めるように、内容から決まる名前を返す
+        return f"files/fake-{self._digest(audio_path.read_bytes())}"
+
+    def resume_upload(self, audio_path: Path, upload_name: str) -> bool:
+        return upload_name == self.upload(audio_path)
+
+    def _transcript_text(self, audio_path: Path) -> str:
+        digest = self._digest(audio_path.read_bytes())
+        speakers = ["話者A", "話者B"]
+        return "\n".join(
+            f"{format_timestamp(i * 30)} {speakers[i % 2]}：{audio_path.stem} の発言{i + 1}（{digest}）"
+            for i in range(self.lines)
+        )
+
+    def transcribe(self, audio_path: Path, prompt: str) -> str:
+        text = self._transcript_text(audio_path)
+        # Gemini と同じく、音声の長さに応じた入力トークンを使ったものとして記録する
+        self.last_usage = {
+            "prompt_tokens": estimate_tokens(prompt) + int(audio_duration_seconds(audio_path) * AUDIO_TOKENS_PER_SECOND),
+            "output_tokens": estimate_tokens(text),
+            "cached_tokens": 0,
+        }
+        metrics.count("requests")
+        metrics.count("prompt_tokens", self.last_usage["prompt_tokens"])
+        metrics.count("output_tokens", self.last_usage["output_tokens"])
+        return text
+
+    def transcribe_stream(self, audio_path: Path, prompt: str, start_seconds: float = 0.0) -> Iterator[str]:
+        # 実際のAPIと同じく、行の途中で区切った断片を返す
+        text = self.transcribe(audio_path, prompt)
+        for start in range(0, len(text), 16):
+            yield text[start:start + 16]
+
+    def _send(self, prompt: str, context: Optional[ContextCache]) -> str:
+        """送信したトークン数を記録し、結果の元になるダイジェストを返す"""
+        tokens = estimate_tokens(prompt)
+        self.sent_tokens["prompt"] += tokens
+        metrics.count("requests")
+        metrics.count("prompt_tokens", tokens)
+        self.last_usage = {"prompt_tokens": tokens, "output_tokens": 0, "cached_tokens": 0}
+        if context is None:
+            return self._digest(prompt.encode('utf-8'))
+        if context.name not in self._caches:
+            raise BackendError(f"コンテキストキャッシュが見つかりません: {context.name}")
+        self.sent_tokens["cached"] += context.tokens
+        self.last_usage["prompt_tokens"] += context.tokens
+        self.last_usage["cached_tokens"] = context.tokens
+        metrics.count("cached_tokens", context.tokens)
+        return self._digest(f"{context.name}\n{prompt}".encode('utf-8'))
+
+    def generate_text(self, prompt: str, context: Optional[ContextCache] = None) -> str:
+        text = f"テスト用の生成テキスト（{self._send(prompt, context)}）"
+        self.last_usage["output_tokens"] = estimate_tokens(text)
+        metrics.count("output_tokens", self.last_usage["output_tokens"])
+        return text
+
+    def generate_json(
+        self,
+        prompt: str,
+        schema: Dict[str, Any],
+        context: Optional[ContextCache] = None
+    ) -> Dict[str, Any]:
+        digest = self._send(prompt, context)
+        fields = {name: f"テスト用の{name}（{digest}）" for name in schema.get("properties", {})}
+        self.last_usage["output_tokens"] = estimate_tokens(json.dumps(fields, ensure_ascii=False))
+        metrics.count("output_tokens", self.last_usage["output_tokens"])
+        return fields
+
+    def create_context_cache(
+        self,
+        text: Optional[str] = None,
+        audio_path: Optional[Path] = None,
+        ttl_seconds: int = CONTEXT_CACHE_TTL_SECONDS
+    ) -> ContextCache:
+        # 音声の場合は、その文字起こし結果をキャッシュした内容とみなす
+        content = self._transcript_text(audio_path) if audio_path is not None else (text or "")
+        tokens = estimate_tokens(content)
+        context = ContextCache(
+            name=f"cachedContents/fake-{self._digest(content.encode('utf-8'))}",
+            source="audio" if audio_path is not None else "transcript",
+            tokens=tokens,
+        )
+        self._caches[context.name] = context
+        self.sent_tokens["cache_write"] += tokens
+        metrics.count("requests")
+        metrics.count("cache_write_tokens", tokens)
+        return context
+
+    def delete_context_cache(self, context: ContextCache) -> None:
+        self._caches.pop(context.name, None)
+
+    def submit_batch(self, prompts: Dict[str, str]) -> str:
+        # 送信した時点で結果を作っておき、最初の poll_batch で返す
+        job_name = f"batches/fake-{self._digest(json.dumps(prompts, ensure_ascii=False).encode('utf-8'))}"
+        self._batches[job_name] = {key: self.generate_text(prompt) for key, prompt in prompts.items()}
+        return job_name
+
+    def poll_batch(self, job_name: str) -> Optional[Dict[str, Optional[str]]]:
+        if job_name not in self._batches:
+            raise BackendError(f"バッチジョブが見つかりません: {job_name}")
+        return self._batches.pop(job_name)
+
+
+BACKENDS: Dict[str, Type[TranscriptionBackend]] = {
+    backend.name: backend for backend in (GeminiBackend, WhisperBackend, FakeBackend)
+}
+
+
+def create_backend(name: str, **options: Any) -> TranscriptionBackend:
+    """
+    名前からバックエンドを作成
+
+    Args:
+        name: バックエンド名（gemini, whisper, fake）
+        **options: バックエンドのコンストラクタに渡す引数
+
+    Returns:
+        バックエンド
+
+    Raises:
+        BackendError: 未知のバックエンド名の場合
+    """
+    if name not in BACKENDS:
+        raise BackendError(f"未知のバックエンドです: {name}（{', '.join(BACKENDS)} から選択）")
+    return BACKENDS[name](**options)
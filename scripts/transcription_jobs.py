@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+文字起こしジョブのSQLiteストア
+
+transcribe_podcast.py が処理する音声ファイルごとに、どの段階まで終わったか・試行回数・エラーを記録する。
+段階ごとの結果（アップロード名・文字起こし・生成したフィールド）も保存するため、途中で停止・クラッシュしても
+次の実行では終わった段階を飛ばして続きから再開する。
+
+段階: queued → uploaded → transcribed → summarized → saved → archived
+
+- uploaded: 音声をアップロードした（gemini のみ。アップロード名を保存し、再開時に再利用する）
+- transcribed: 文字起こしが終わった（文字起こしを保存）
+- summarized: 要約・サブタイトル・詳細説明文を生成した（生成結果を保存）
+- saved: 書き起こしJSONを保存した
+- archived: 音声ファイルをバックアップフォルダに移動した（完了）
+
+新しいエピソード（出力フォルダの最新の書き起こしより後の番号）は、過去分の補完（backfill）より先に処理する。
+
+使い方:
+    python scripts/transcription_jobs.py                 # ジョブの一覧（完了したものを除く）
+    python scripts/transcription_jobs.py --all
+    python scripts/transcription_jobs.py --retry         # 試行回数の上限で止まったジョブを再開できるようにする
+"""
+
+import argparse
+import json
+import sqlite3
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# 共通ユーティリティのインポート
+from utils import natural_sort_key, PROJECT_ROOT
+
+# デフォルトのデータベースパス
+DEFAULT_JOBS_PATH = PROJECT_ROOT / ".cache" / "transcription_jobs.db"
+
+# 段階（この順に進む）
+STAGES = ["queued", "uploaded", "transcribed", "summarized", "saved", "archived"]
+
+# 優先度（小さいほど先に処理する）
+PRIORITY_NEW = 0
+PRIORITY_BACKFILL = 1
+PRIORITY_NAMES = {PRIORITY_NEW: "new", PRIORITY_BACKFILL: "backfill"}
+
+# 試行回数の上限のデフォルト（超えたジョブは --retry するまで処理しない）
+DEFAULT_MAX_ATTEMPTS = 3
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    file_name TEXT PRIMARY KEY,
+    episode_number TEXT,
+    priority INTEGER NOT NULL,
+    stage TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT,
+    upload_name TEXT,
+    transcript TEXT,
+    fields TEXT,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_queue ON jobs(stage, priority);
+
+CREATE TABLE IF NOT EXISTS job_errors (
+    file_name TEXT NOT NULL REFERENCES jobs(file_name) ON DELETE CASCADE,
+    attempt INTEGER NOT NULL,
+    stage TEXT NOT NULL,
+    error TEXT NOT NULL,
+    occurred_at TEXT NOT NULL
+);
+"""
+
+
+def stage_index(stage: str) -> int:
+    """段階の順序（STAGES の位置）"""
+    return STAGES.index(stage)
+
+
+def now() -> str:
+    """記録用の現在時刻"""
+    return datetime.now().astimezone().isoformat(timespec="seconds")
+
+
+class JobStore:
+    """文字起こしジョブを保持するSQLiteストア"""
+
+    def __init__(self, db_path: Path = DEFAULT_JOBS_PATH) -> None:
+        """
+        初期化（スキーマが無ければ作成）
+
+        Args:
+            db_path: データベースファイルのパス（":memory:" も可）
+        """
+        self.db_path = db_path
+        if str(db_path) != ":memory:":
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(db_path))
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.executescript(SCHEMA)
+        self.conn.commit()
+
+    def close(self) -> None:
+        """接続を閉じる"""
+        self.conn.close()
+
+    def __enter__(self) -> "JobStore":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def get(self, file_name: str) -> Optional[sqlite3.Row]:
+        """
+        ジョブを1件取得
+
+        Args:
+            file_name: 音声ファイル名
+
+        Returns:
+            ジョブの行、存在しない場合はNone
+        """
+        return self.conn.execute("SELECT * FROM jobs WHERE file_name = ?", (file_name,)).fetchone()
+
+    def enqueue(self, file_name: str, episode_number: Optional[str], priority: int) -> sqlite3.Row:
+        """
+        ジョブを登録（登録済みの場合はそのまま。完了済みの場合は同名のファイルが再び置かれたとみなしてやり直す）
+
+        Args:
+            file_name: 音声ファイル名
+            episode_number: エピソード番号
+            priority: 優先度（PRIORITY_NEW / PRIORITY_BACKFILL）
+
+        Returns:
+            ジョブの行
+        """
+        job = self.get(file_name)
+        timestamp = now()
+        with self.conn:
+            if job is None:
+                self.conn.execute(
+                    "INSERT INTO jobs (file_name, episode_number, priority, stage, created_at, updated_at)"
+                    " VALUES (?, ?, ?, 'queued', ?, ?)",
+                    (file_name, episode_number, priority, timestamp, timestamp)
+                )
+            elif job["stage"] == "archived":
+                self.conn.execute("DELETE FROM job_errors WHERE file_name = ?", (file_name,))
+                self.conn.execute(
+                    "UPDATE jobs SET priority = ?, stage = 'queued', attempts = 0, last_error = NULL, upload_name = NULL,"
+                    " transcript = NULL, fields = NULL, updated_at = ? WHERE file_name = ?",
+                    (priority, timestamp, file_name)
+                )
+        return self.get(file_name)
+
+    def pending(self, max_attempts: Optional[int] = None) -> List[sqlite3.Row]:
+        """
+        完了していないジョブを処理する順（優先度 → エピソード番号）に取得
+
+        Args:
+            max_attempts: 指定した場合、試行回数がこの値に達したジョブを除く
+
+        Returns:
+            ジョブの行のリスト
+        """
+        rows = self.conn.execute("SELECT * FROM jobs WHERE stage != 'archived'").fetchall()
+        if max_attempts is not None:
+            rows = [row for row in rows if row["attempts"] < max_attempts]
+        return sorted(rows, key=lambda row: (row["priority"], natural_sort_key(row["file_name"])))
+
+    def advance(self, file_name: str, stage: str, **values: Any) -> None:
+        """
+        ジョブを次の段階に進め、その段階の結果を保存
+
+        Args:
+            file_name: 音声ファイル名
+            stage: 終わった段階
+            **values: 保存する列（upload_name, transcript, fields）
+        """
+        if "fields" in values and values["fields"] is not None:
+            values["fields"] = json.dumps(values["fields"], ensure_ascii=False)
+        assignments = "".join(f", {column} = ?" for column in values)
+        with self.conn:
+            self.conn.execute(
+                f"UPDATE jobs SET stage = ?, last_error = NULL, updated_at = ?{assignments} WHERE file_name = ?",
+                (stage, now(), *values.values(), file_name)
+            )
+
+    def record_failure(self, file_name: str, error: str) -> int:
+        """
+        失敗を記録して試行回数を増やす（段階はそのまま。次の実行でその段階からやり直す）
+
+        Args:
+            file_name: 音声ファイル名
+            error: エラーの内容
+
+        Returns:
+            増やした後の試行回数
+        """
+        job = self.get(file_name)
+        attempts = job["attempts"] + 1
+        timestamp = now()
+        with self.conn:
+            self.conn.execute(
+                "UPDATE jobs SET attempts = ?, last_error = ?, updated_at = ? WHERE file_name = ?",
+                (attempts, error, timestamp, file_name)
+            )
+            self.conn.execute(
+                "INSERT INTO job_errors (file_name, attempt, stage, error, occurred_at) VALUES (?, ?, ?, ?, ?)",
+                (file_name, attempts, job["stage"], error, timestamp)
+            )
+        return attempts
+
+    def retry_failed(self, max_attempts: int) -> int:
+        """
+        試行回数の上限に達したジョブの試行回数を0に戻す
+
+        Args:
+            max_attempts: 試行回数の上限
+
+        Returns:
+            戻したジョブの件数
+        """
+        with self.conn:
+            cursor = self.conn.execute(
+                "UPDATE jobs SET attempts = 0, updated_at = ? WHERE stage != 'archived' AND attempts >= ?",
+                (now(), max_attempts)
+            )
+        return cursor.rowcount
+
+    def list_jobs(self, include_archived: bool = False) -> List[sqlite3.Row]:
+        """ジョブの一覧（処理する順）"""
+        query = "SELECT * FROM jobs" if include_archived else "SELECT * FROM jobs WHERE stage != 'archived'"
+        rows = self.conn.execute(query).fetchall()
+        return sorted(rows, key=lambda row: (row["stage"] == "archived", row["priority"],
+                                             natural_sort_key(row["file_name"])))
+
+
+def job_fields(job: sqlite3.Row) -> Dict[str, Any]:
+    """summarized で保存した生成結果（無い場合は空の辞書）"""
+    return json.loads(job["fields"]) if job["fields"] else {}
+
+
+def classify_priority(episode_number: Optional[str], latest_number: Optional[str]) -> int:
+    """
+    エピソード番号から優先度を決める
+
+    Args:
+        episode_number: 音声ファイルのエピソード番号
+        latest_number: 出力フォルダにある最新の書き起こしのエピソード番号
+
+    Returns:
+        最新より後の番号（または番号が分からない・書き起こしがまだ無い）なら PRIORITY_NEW、それ以外は PRIORITY_BACKFILL
+    """
+    if not episode_number or not latest_number:
+        return PRIORITY_NEW
+    if natural_sort_key(episode_number) > natural_sort_key(latest_number):
+        return PRIORITY_NEW
+    return PRIORITY_BACKFILL
+
+
+def main() -> None:
+    """メイン処理"""
+    parser = argparse.ArgumentParser(description='文字起こしジョブの一覧・再開')
+    parser.add_argument('--jobs', type=str, default=str(DEFAULT_JOBS_PATH),
+                        help=f'ジョブのデータベース（デフォルト: {DEFAULT_JOBS_PATH}）')
+    parser.add_argument('--all', action='store_true', help='完了した（archived）ジョブも表示する')
+    parser.add_argument('--retry', action='store_true',
+                        help='試行回数の上限（--max-attempts）に達したジョブを、次の実行で再び処理する')
+    parser.add_argument('--max-attempts', type=int, default=DEFAULT_MAX_ATTEMPTS,
+                        help=f'試行回数の上限（デフォルト: {DEFAULT_MAX_ATTEMPTS}）')
+    args = parser.parse_args()
+
+    if not Path(args.jobs).exists():
+        print(f"[INFO] ジョブのデータベースがありません: {args.jobs}")
+        sys.exit(0)
+
+    with JobStore(Path(args.jobs)) as store:
+        if args.retry:
+            count = store.retry_failed(args.max_attempts)
+            print(f"[OK] {count}件のジョブを再び処理できるようにしました")
+        jobs = store.list_jobs(args.all)
+        if not jobs:
+            print("[INFO] 未完了のジョブはありません")
+            return
+        print(f"\n  {'ファイル':<24} {'優先度':<9} {'段階':<12} {'試行':>4}  最後のエラー")
+        for job in jobs:
+            stopped = " (上限)" if job["stage"] != "archived" and job["attempts"] >= args.max_attempts else ""
+            error = (job["last_error"] or "").splitlines()[0][:60] if job["last_error"] else ""
+            print(f"  {job['file_name']:<24} {PRIORITY_NAMES[job['priority']]:<9} {job['stage']:<12} "
+                  f"{job['attempts']:4d}{stopped}  {error}")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,14 +4,14 @@
 ポッドキャストRSSフィードからエピソード情報を取得して episodes.json を更新するスクリプト
 """
 
-import feedparser
 import json
 import re
 import sys
 import shutil
 import argparse
+from collections import deque
 from pathlib import Path
-from typing import List, Dict, Tuple, Optional, Any
+from typing import List, Dict, Tuple, Optional, Any, Set, Iterable
 from datetime import datetime
 
 # 共通ユーティリティのインポート
@@ -20,13 +20,19 @@ from utils import (
     format_duration,
     parse_date,
     EPISODES_JSON_PATH,
-    TRANSCRIPTS_DIR
+    TRANSCRIPTS_DIR,
+    USER_AGENT
 )
+from episode_store import EpisodeStore
+from episode_stream import iter_episodes, iter_episode_records, write_episodes
+from models import Episode, ModelValidationError
+import metrics
 
 # 設定
 RSS_FEED_URL = "https://anchor.fm/s/6981b208/podcast/rss"
 SPOTIFY_SHOW_URL = "https://open.spotify.com/show/31JfR2D72gENOfOwq3AcKw"
 DEFAULT_THUMBNAIL = "img/logo.png"
+FEED_TIMEOUT_SECONDS = 30
 
 # タグシステムの定義
 TAG_KEYWORDS_MAP = {
@@ -174,128 +180,259 @@ def create_episode_links(urls: List[str]) -> List[Dict[str, str]]:
     return links
 
 
-def fetch_episodes_from_rss(rss_url: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+def parse_feed_entry(entry: Any) -> Optional[Dict[str, Any]]:
+    """
+    RSSフィードのエントリ1件をエピソード情報に変換
+    
+    Args:
+        entry: feedparserのエントリ
+        
+    Returns:
+        エピソード情報の辞書、エピソード番号が取得できない場合などはNone
+    """
+    # エピソード番号を抽出
+    episode_number = extract_episode_number(entry.title)
+    if not episode_number:
+        # より詳細な情報を出力
+        published_date = entry.get('published', '日付不明')
+        print(f"[WARNING] エピソード番号が取得できませんでした:")
+        print(f"  タイトル: {entry.title}")
+        print(f"  配信日: {published_date}")
+        print(f"  リンク: {entry.get('link', 'N/A')}")
+        # タイトルに数字.数字.数字のパターンがあるかチェック
+        number_pattern = re.search(r'\d+\.\d+\.\d+', entry.title)
+        if number_pattern:
+            print(f"  注意: タイトルに数字パターン '{number_pattern.group()}' が見つかりましたが、抽出できませんでした")
+        return None
+    
+    # 基本情報を取得
+    duration = format_duration(entry.get('itunes_duration', '0:00'))
+    pub_date = parse_date(entry.published)
+    raw_description = clean_description(entry.get('description', entry.get('summary', '')))
+    
+    # 説明文からURLを抽出
+    description, extracted_urls = extract_urls_from_text(raw_description)
+    
+    # タグを生成
+    tags = generate_tags(entry.title, description)
+    
+    # Spotify URLを取得
+    spotify_url = ""
+    if hasattr(entry, 'links'):
+        for link in entry.links:
+            link_href = link.get('href', '')
+            if 'spotify.com/episode' in link_href or 'podcasters.spotify.com/pod/show' in link_href:
+                spotify_url = extract_spotify_url(link_href)
+                break
+    
+    # linksから見つからない場合はentry.linkをチェック
+    if not spotify_url and hasattr(entry, 'link'):
+        spotify_url = extract_spotify_url(entry.link)
+    
+    # それでも見つからない場合はデフォルトの番組URLを使用
+    if not spotify_url:
+        print(f"  [WARNING] {episode_number}: 個別エピソードURLが見つかりません。番組URLを使用します。")
+        spotify_url = SPOTIFY_SHOW_URL
+    
+    # リンクリストを作成
+    links = create_episode_links(extracted_urls)
+    
+    if extracted_urls:
+        print(f"  → {episode_number}: 説明文から{len(extracted_urls)}個のURLを抽出（関連リンク: {len(links)}個）")
+    
+    # 書き起こしファイルの存在チェック
+    has_transcript = check_transcript_exists(episode_number)
+    
+    episode = Episode(
+        number=episode_number,
+        title=entry.title,
+        date=pub_date,
+        duration=duration,
+        description=description,
+        thumbnail=DEFAULT_THUMBNAIL,
+        spotify_url=spotify_url,
+        tags=tags,
+        transcript="",
+        links=links,
+        has_transcript=has_transcript
+    )
+    
+    try:
+        episode.validate()
+    except ModelValidationError as e:
+        print(f"[WARNING] エピソード情報が不正なためスキップします: {e}")
+        return None
+    
+    return episode.to_dict()
+
+
+def get_entry_date(entry: Any) -> tuple:
+    """
+    エントリの日付を取得（ソート用）
+    
+    Args:
+        entry: feedparserのエントリ
+        
+    Returns:
+        日付のタイムタプル（取得できない場合は1970年1月1日）
+    """
+    # feedparserがパース済みの日付を使用（最も確実）
+    if hasattr(entry, 'published_parsed') and entry.published_parsed:
+        return tuple(entry.published_parsed)
+    # フォールバック: published文字列をパース
+    try:
+        published_str = entry.get('published', '')
+        if published_str:
+            parsed_date = parse_date(published_str)
+            dt = datetime.strptime(parsed_date, "%Y-%m-%d")
+            return tuple(dt.timetuple())
+    except (ValueError, AttributeError):
+        pass
+    # 日付が取得できない場合は古いものとして扱う
+    return (1970, 1, 1, 0, 0, 0, 0, 0, 0)
+
+
+def sort_entries_by_date(entries: List[Any]) -> List[Any]:
+    """
+    エントリを日付の新しい順に並べる（すでに並んでいる場合はソートしない）
+    
+    Args:
+        entries: feedparserのエントリリスト
+        
+    Returns:
+        日付の新しい順に並んだエントリリスト
+    """
+    dates = [get_entry_date(entry) for entry in entries]
+    if all(dates[i] >= dates[i + 1] for i in range(len(dates) - 1)):
+        return list(entries)
+    
+    print("[INFO] RSSフィードが日付順ではないため、ソートします")
+    order = sorted(range(len(entries)), key=lambda i: dates[i], reverse=True)
+    return [entries[i] for i in order]
+
+
+def fetch_feed(rss_url: str) -> Tuple[bytes, Dict[str, str]]:
+    """
+    RSSフィードの本体を取得（解析は行わない）
+    
+    Args:
+        rss_url: RSSフィードのURL（http(s)以外はローカルファイルのパスとして扱う）
+        
+    Returns:
+        (本体のバイト列, レスポンスヘッダー): ヘッダーは文字コードの判定のため feedparser に渡す
+    """
+    if not rss_url.startswith(('http://', 'https://')):
+        return Path(rss_url).read_bytes(), {}
+    
+    import urllib.request
+    request = urllib.request.Request(rss_url, headers={"User-Agent": USER_AGENT})
+    with urllib.request.urlopen(request, timeout=FEED_TIMEOUT_SECONDS) as response:
+        return response.read(), {key.lower(): value for key, value in response.headers.items()}
+
+
+def fetch_episodes_from_rss(
+    rss_url: str,
+    limit: Optional[int] = None,
+    known_numbers: Optional[Set[str]] = None,
+    newest_date: Optional[str] = None
+) -> List[Dict[str, Any]]:
     """
     RSSフィードからエピソード情報を取得
     
+    known_numbers を指定した場合（インクリメンタルモード）は、新しい順にエントリをたどり、
+    既知のエピソード番号または newest_date より古い配信日に達した時点で打ち切る。
+    
     Args:
         rss_url: RSSフィードのURL
         limit: 取得するエピソード数の上限（Noneの場合は全件取得）
+        known_numbers: 既存のエピソード番号の集合（インクリメンタルモード）
+        newest_date: 既存エピソードの最新の配信日（YYYY-MM-DD）
         
     Returns:
         エピソード情報の辞書リスト
     """
     print(f"[INFO] RSSフィードを取得中: {rss_url}")
-    feed = feedparser.parse(rss_url)
+    with metrics.timer("fetch"):
+        content, headers = fetch_feed(rss_url)
+    metrics.count("feed_bytes", len(content))
+    
+    # feedparser の読み込みは重いため、RSSを取得するときだけ行う
+    with metrics.timer("parse"):
+        import feedparser
+        feed = feedparser.parse(content, response_headers=headers)
+    metrics.count("feed_entries", len(feed.entries))
     
     if feed.bozo:
         print(f"[WARNING] RSSフィードの解析にエラーがあります: {feed.bozo_exception}")
     
-    # エントリを日付順にソート（最新のものが先頭に）
-    # published_parsedが利用可能な場合はそれを使用、なければpublishedをパース
-    def get_entry_date(entry):
-        """エントリの日付を取得（ソート用）"""
-        # feedparserがパース済みの日付を使用（最も確実）
-        if hasattr(entry, 'published_parsed') and entry.published_parsed:
-            return entry.published_parsed
-        # フォールバック: published文字列をパース
-        try:
-            published_str = entry.get('published', '')
-            if published_str:
-                parsed_date = parse_date(published_str)
-                dt = datetime.strptime(parsed_date, "%Y-%m-%d")
-                return dt.timetuple()
-        except (ValueError, AttributeError) as e:
-            # 日付が取得できない場合は古いものとして扱う
-            pass
-        # 日付が取得できない場合は古いものとして扱う
-        return (1970, 1, 1, 0, 0, 0, 0, 0, 0)
-    
-    sorted_entries = sorted(feed.entries, key=get_entry_date, reverse=True)
+    # エントリを日付順に並べる（最新のものが先頭に）
+    sorted_entries = sort_entries_by_date(feed.entries)
     
     entries_to_process = sorted_entries if limit is None else sorted_entries[:limit]
     
-    if limit:
+    if known_numbers is not None:
+        print(f"[INFO] 最新の既存エピソード（{newest_date or 'なし'}）より新しいエピソードをチェックします")
+    elif limit:
         print(f"[INFO] 最新{limit}件のエピソードをチェックします（日付順にソート済み）")
     else:
         print(f"[INFO] 全{len(feed.entries)}件のエピソードをチェックします（日付順にソート済み）")
     
     episodes = []
     
-    for entry in entries_to_process:
-        # エピソード番号を抽出
-        episode_number = extract_episode_number(entry.title)
-        if not episode_number:
-            # より詳細な情報を出力
-            published_date = entry.get('published', '日付不明')
-            print(f"[WARNING] エピソード番号が取得できませんでした:")
-            print(f"  タイトル: {entry.title}")
-            print(f"  配信日: {published_date}")
-            print(f"  リンク: {entry.get('link', 'N/A')}")
-            # タイトルに数字.数字.数字のパターンがあるかチェック
-            number_pattern = re.search(r'\d+\.\d+\.\d+', entry.title)
-            if number_pattern:
-                print(f"  注意: タイトルに数字パターン '{number_pattern.group()}' が見つかりましたが、抽出できませんでした")
-            continue
-        
-        # 基本情報を取得
-        duration = format_duration(entry.get('itunes_duration', '0:00'))
-        pub_date = parse_date(entry.published)
-        raw_description = clean_description(entry.get('description', entry.get('summary', '')))
-        
-        # 説明文からURLを抽出
-        description, extracted_urls = extract_urls_from_text(raw_description)
-        
-        # タグを生成
-        tags = generate_tags(entry.title, description)
-        
-        # Spotify URLを取得
-        spotify_url = ""
-        if hasattr(entry, 'links'):
-            for link in entry.links:
-                link_href = link.get('href', '')
-                if 'spotify.com/episode' in link_href or 'podcasters.spotify.com/pod/show' in link_href:
-                    spotify_url = extract_spotify_url(link_href)
-                    break
-        
-        # linksから見つからない場合はentry.linkをチェック
-        if not spotify_url and hasattr(entry, 'link'):
-            spotify_url = extract_spotify_url(entry.link)
-        
-        # それでも見つからない場合はデフォルトの番組URLを使用
-        if not spotify_url:
-            print(f"  [WARNING] {episode_number}: 個別エピソードURLが見つかりません。番組URLを使用します。")
-            spotify_url = SPOTIFY_SHOW_URL
-        
-        # リンクリストを作成
-        links = create_episode_links(extracted_urls)
-        
-        if extracted_urls:
-            print(f"  → {episode_number}: 説明文から{len(extracted_urls)}個のURLを抽出（関連リンク: {len(links)}個）")
-        
-        # 書き起こしファイルの存在チェック
-        has_transcript = check_transcript_exists(episode_number)
-        
-        episode_data = {
-            "number": episode_number,
-            "title": entry.title,
-            "date": pub_date,
-            "duration": duration,
-            "description": description,
-            "thumbnail": DEFAULT_THUMBNAIL,
-            "spotifyUrl": spotify_url,
-            "tags": tags,
-            "transcript": "",
-            "links": links,
-            "has_transcript": has_transcript
-        }
-        
-        episodes.append(episode_data)
+    with metrics.timer("parse_entries"):
+        for entry in entries_to_process:
+            if known_numbers is not None and reached_known_entry(entry, known_numbers, newest_date):
+                break
+            
+            episode = parse_feed_entry(entry)
+            if episode:
+                episodes.append(episode)
+    metrics.count("episodes_fetched", len(episodes))
     
     print(f"[OK] {len(episodes)}件のエピソードを取得しました")
     return episodes
 
 
+def reached_known_entry(entry: Any, known_numbers: Set[str], newest_date: Optional[str]) -> bool:
+    """
+    インクリメンタルモードで、既存のエピソードに達したかを判定
+    
+    Args:
+        entry: feedparserのエントリ
+        known_numbers: 既存のエピソード番号の集合
+        newest_date: 既存エピソードの最新の配信日（YYYY-MM-DD）
+        
+    Returns:
+        既存のエピソード番号、または最新の配信日より古いエントリの場合True
+    """
+    episode_number = extract_episode_number(entry.get('title', ''))
+    if episode_number and episode_number in known_numbers:
+        return True
+    if newest_date and entry.get('published'):
+        return parse_date(entry.published) < newest_date
+    return False
+
+
+def find_newest_known_episode(episodes: Iterable[Dict[str, Any]]) -> Tuple[Set[str], Optional[str]]:
+    """
+    既存エピソードの番号の集合と最新の配信日を取得
+    
+    Args:
+        episodes: 既存のエピソード（リストまたはイテレータ）
+        
+    Returns:
+        (エピソード番号の集合, 最新の配信日)
+    """
+    known_numbers = set()
+    newest_date = None
+    for ep in episodes:
+        known_numbers.add(ep['number'])
+        date = ep.get('date')
+        if date and (newest_date is None or date > newest_date):
+            newest_date = date
+    return known_numbers, newest_date
+
+
 def load_existing_episodes(json_path: Path) -> List[Dict[str, Any]]:
     """
     既存のepisodes.jsonを読み込む
@@ -315,6 +452,70 @@ def load_existing_episodes(json_path: Path) -> List[Dict[str, Any]]:
         return data.get('episodes', [])
 
 
+def load_episodes_from_store(db_path: Path, json_path: Path) -> List[Dict[str, Any]]:
+    """
+    SQLiteストアからエピソードを読み込む
+    
+    データベースが空の場合と、最後の取り込み・エクスポートの後にepisodes.jsonが変更された場合
+    （直接のコミットなど）は、episodes.jsonを取り込み直してから読み込む。
+    変更の記録が無い古いデータベースでepisodes.jsonと内容が異なる場合は、どちらが新しいか
+    判定できないため、episodes.jsonを上書きしないように終了する。
+    
+    Args:
+        db_path: データベースファイルのパス
+        json_path: 取り込みに使うJSONファイルのパス
+        
+    Returns:
+        既存のエピソードリスト
+    """
+    with EpisodeStore(db_path) as store:
+        episodes = store.load_episodes()
+        if not json_path.exists():
+            return episodes
+        changed = store.episodes_json_changed(json_path)
+        if changed is None and episodes and not store.matches_episodes_json(json_path):
+            print(f"[ERROR] {json_path} の内容がデータベース（{db_path}）と異なりますが、"
+                  f"どちらが新しいか判定できないため、{json_path} を上書きせずに終了します")
+            print("  episodes.json を正とする場合: python scripts/episode_store.py "
+                  f"--db {db_path} import を実行してから再実行してください")
+            sys.exit(1)
+        if not episodes or changed:
+            imported = store.import_episodes_json(json_path, prune=True)
+            print(f"[INFO] {json_path} から{imported}件をデータベースに取り込みました")
+            episodes = store.load_episodes()
+        elif changed is None:
+            store.record_episodes_json(json_path)
+    return episodes
+
+
+def save_episodes_to_store(
+    episodes: List[Dict[str, Any]],
+    db_path: Path,
+    json_path: Path,
+    dry_run: bool = False
+) -> None:
+    """
+    SQLiteストアに変更分だけupsertし、episodes.jsonを再生成（書き換える場合はバックアップを作成）
+    
+    Args:
+        episodes: エピソードリスト
+        db_path: データベースファイルのパス
+        json_path: 再生成するJSONファイルのパス
+        dry_run: Trueの場合は実際には保存しない
+    """
+    if dry_run:
+        save_episodes(episodes, json_path, dry_run=True)
+        return
+    
+    with EpisodeStore(db_path) as store:
+        changed = store.upsert_episodes(episodes)
+        print(f"[OK] データベースを更新しました: {changed}件（{db_path}）")
+        if store.export_episodes_json(json_path, backup=True):
+            print(f"[OK] {json_path} を再生成しました")
+        else:
+            print(f"[INFO] {json_path} に変更はありません")
+
+
 def update_episode_transcript_flag(episode: Dict[str, Any]) -> bool:
     """
     エピソードの書き起こしフラグを更新
@@ -341,6 +542,42 @@ def update_episode_transcript_flag(episode: Dict[str, Any]) -> bool:
     return False
 
 
+def update_existing_episode(existing_ep: Dict[str, Any], new_ep: Dict[str, Any]) -> bool:
+    """
+    既存エピソードをRSSフィードの情報で更新（Spotify URL・関連リンク・書き起こしフラグ）
+    
+    Args:
+        existing_ep: 既存のエピソード情報の辞書（直接更新される）
+        new_ep: RSSフィードから取得したエピソード情報の辞書
+        
+    Returns:
+        更新があった場合True
+    """
+    old_url = existing_ep.get('spotifyUrl', '')
+    new_url = new_ep.get('spotifyUrl', '')
+    updated = False
+    
+    # Spotify URLの更新チェック
+    if old_url == SPOTIFY_SHOW_URL and new_url != SPOTIFY_SHOW_URL and 'episode' in new_url:
+        existing_ep['spotifyUrl'] = new_url
+        updated = True
+        print(f"  [UPDATE] {new_ep['number']}: Spotify URL更新")
+    
+    # linksの更新チェック
+    existing_links = existing_ep.get('links', [])
+    new_links = new_ep.get('links', [])
+    if not existing_links and new_links:
+        existing_ep['links'] = new_links
+        updated = True
+        print(f"  [UPDATE] {new_ep['number']}: 関連リンク追加（{len(new_links)}件）")
+    
+    # 書き起こしファイルの存在チェック
+    if update_episode_transcript_flag(existing_ep):
+        updated = True
+    
+    return updated
+
+
 def merge_episodes(
     existing_episodes: List[Dict[str, Any]], 
     new_episodes: List[Dict[str, Any]]
@@ -371,29 +608,7 @@ def merge_episodes(
         else:
             # 既存エピソードの場合、Spotify URLとlinksをチェック
             existing_ep = existing_dict[new_ep['number']]
-            old_url = existing_ep.get('spotifyUrl', '')
-            new_url = new_ep.get('spotifyUrl', '')
-            updated = False
-            
-            # Spotify URLの更新チェック
-            if old_url == SPOTIFY_SHOW_URL and new_url != SPOTIFY_SHOW_URL and 'episode' in new_url:
-                existing_ep['spotifyUrl'] = new_url
-                updated = True
-                print(f"  [UPDATE] {new_ep['number']}: Spotify URL更新")
-            
-            # linksの更新チェック
-            existing_links = existing_ep.get('links', [])
-            new_links = new_ep.get('links', [])
-            if not existing_links and new_links:
-                existing_ep['links'] = new_links
-                updated = True
-                print(f"  [UPDATE] {new_ep['number']}: 関連リンク追加（{len(new_links)}件）")
-            
-            # 書き起こしファイルの存在チェック
-            if update_episode_transcript_flag(existing_ep):
-                updated = True
-            
-            if updated:
+            if update_existing_episode(existing_ep, new_ep):
                 updated_count += 1
             else:
                 skipped_count += 1
@@ -459,6 +674,7 @@ def save_episodes(episodes: List[Dict[str, Any]], json_path: Path, dry_run: bool
     with open(json_path, 'w', encoding='utf-8') as f:
         json.dump({"episodes": episodes}, f, indent=2, ensure_ascii=False)
     
+    metrics.count("output_bytes", json_path.stat().st_size)
     print(f"[OK] {json_path} に保存しました")
 
 
@@ -484,6 +700,261 @@ def reindex_episodes(episodes: List[Dict[str, Any]], sort_by_date: bool = True)
     return episodes
 
 
+class UnsortedCatalogError(Exception):
+    """episodes.json が配信日順に並んでいない場合の例外（ストリーミング処理できない）"""
+
+
+def _episode_date(ep: Dict[str, Any]) -> str:
+    """ソート用の配信日を取得"""
+    return ep.get('date', '9999-99-99')
+
+
+def merge_episodes_streaming(
+    json_path: Path,
+    new_episodes: List[Dict[str, Any]],
+    output_path: Path
+) -> Tuple[int, int, int, int]:
+    """
+    episodes.json を1件ずつ読みながら新エピソードをマージして書き出す
+    
+    既存エピソードが配信日順に並んでいることを前提に、新規エピソードを配信日の位置へ
+    差し込みながらIDを振り直す。メモリに保持するのはRSSから取得した分だけ。
+    
+    Args:
+        json_path: 既存のepisodes.jsonのパス
+        new_episodes: 新規エピソードリスト
+        output_path: マージ結果の出力先パス
+        
+    Returns:
+        (added_count, updated_count, skipped_count, transcript_updated_count)
+        
+    Raises:
+        UnsortedCatalogError: 既存エピソードが配信日順に並んでいない場合
+    """
+    new_dict = {ep['number']: ep for ep in new_episodes}
+    
+    # 1パス目: 取得したエピソードのうち既存のものだけを調べる
+    known_numbers = {ep['number'] for ep in iter_episodes(json_path) if ep['number'] in new_dict}
+    
+    added_episodes = [ep for ep in new_episodes if ep['number'] not in known_numbers]
+    for ep in added_episodes:
+        ep['has_transcript'] = check_transcript_exists(ep['number'])
+    added_episodes.sort(key=_episode_date)
+    
+    counts = {'updated': 0, 'skipped': 0, 'transcript': 0}
+    
+    def merged_stream():
+        """既存エピソードと新規エピソードを配信日順に流す"""
+        pending = deque(added_episodes)
+        previous_date = ''
+        next_id = 1
+        for ep in iter_episodes(json_path):
+            date = _episode_date(ep)
+            if date < previous_date:
+                raise UnsortedCatalogError(f"{ep['number']} が配信日順に並んでいません")
+            previous_date = date
+            
+            # 同じ配信日の場合は新規エピソードを先に置く（merge_episodesと同じ順序）
+            while pending and _episode_date(pending[0]) <= date:
+                added = pending.popleft()
+                added['id'] = next_id
+                next_id += 1
+                yield added
+            
+            if ep['number'] in new_dict:
+                if update_existing_episode(ep, new_dict[ep['number']]):
+                    counts['updated'] += 1
+                else:
+                    counts['skipped'] += 1
+            elif update_episode_transcript_flag(ep):
+                counts['transcript'] += 1
+            
+            ep['id'] = next_id
+            next_id += 1
+            yield ep
+        
+        for added in pending:
+            added['id'] = next_id
+            next_id += 1
+            yield added
+    
+    write_episodes(output_path, merged_stream())
+    
+    print(f"[INFO] 新規エピソード: {len(added_episodes)}件")
+    print(f"[INFO] Spotify URL更新: {counts['updated']}件")
+    if counts['transcript'] > 0:
+        print(f"[INFO] 書き起こしフラグ更新: {counts['transcript']}件")
+    print(f"[INFO] 既存エピソード（変更なし）: {counts['skipped']}件")
+    
+    return len(added_episodes), counts['updated'], counts['skipped'], counts['transcript']
+
+
+def reindex_episodes_streaming(json_path: Path, output_path: Path) -> Tuple[int, int]:
+    """
+    episodes.json を1件ずつ読みながらIDを振り直して書き出す
+    
+    配信日順に並んでいない場合は、コンパクトなEpisodeに読み込んでソートする。
+    
+    Args:
+        json_path: 既存のepisodes.jsonのパス
+        output_path: 出力先パス
+        
+    Returns:
+        (episode_count, transcript_updated_count)
+    """
+    transcript_updated = 0
+    
+    def reindexed_stream():
+        nonlocal transcript_updated
+        previous_date = ''
+        for i, ep in enumerate(iter_episodes(json_path), start=1):
+            date = _episode_date(ep)
+            if date < previous_date:
+                raise UnsortedCatalogError(f"{ep['number']} が配信日順に並んでいません")
+            previous_date = date
+            if update_episode_transcript_flag(ep):
+                transcript_updated += 1
+            ep['id'] = i
+            yield ep
+    
+    try:
+        count = write_episodes(output_path, reindexed_stream())
+    except UnsortedCatalogError:
+        print("[INFO] 配信日順に並んでいないため、レコードに読み込んでソートします")
+        transcript_updated = 0
+        records = []
+        for record in iter_episode_records(json_path):
+            current = check_transcript_exists(record.number)
+            if record.has_transcript != current:
+                record.has_transcript = current
+                transcript_updated += 1
+            records.append(record)
+        records.sort(key=lambda record: record.date or '9999-99-99')
+        for i, record in enumerate(records, start=1):
+            record.id = i
+        count = write_episodes(output_path, records)
+    
+    print(f"[INFO] 配信日順（昇順、古いものが先頭）にIDを振り直しました")
+    return count, transcript_updated
+
+
+def replace_episodes_file(tmp_path: Path, json_path: Path) -> None:
+    """
+    書き出した一時ファイルでepisodes.jsonを置き換える（バックアップ付き）
+    
+    Args:
+        tmp_path: 一時ファイルのパス
+        json_path: 置き換え先のJSONファイルパス
+    """
+    if json_path.exists():
+        backup_path = json_path.with_suffix('.json.backup')
+        shutil.copy(json_path, backup_path)
+        print(f"[BACKUP] バックアップを作成: {backup_path}")
+    
+    tmp_path.replace(json_path)
+    metrics.count("output_bytes", json_path.stat().st_size)
+    print(f"[OK] {json_path} に保存しました")
+
+
+def handle_reindex_streaming(args: argparse.Namespace) -> None:
+    """
+    既存episodes.jsonのIDをストリーミングで振り直す処理
+    
+    Args:
+        args: コマンドライン引数
+    """
+    print("[PODCAST] シビックテック井戸端キャスト - ID振り直しスクリプト（ストリーミング）")
+    print("=" * 60)
+    
+    json_path = Path(args.output)
+    if not json_path.exists():
+        print("[ERROR] エピソードが見つかりません")
+        return
+    
+    tmp_path = json_path.with_suffix('.json.tmp')
+    with metrics.timer("reindex"):
+        count, transcript_updated_count = reindex_episodes_streaming(json_path, tmp_path)
+    
+    if transcript_updated_count > 0:
+        print(f"[INFO] 書き起こしファイル存在チェック更新: {transcript_updated_count}件")
+    
+    if args.dry_run:
+        tmp_path.unlink()
+        print("\n[DRY-RUN] 実際には保存しません")
+    else:
+        with metrics.timer("save"):
+            replace_episodes_file(tmp_path, json_path)
+    
+    print("\n" + "=" * 60)
+    print("[SUCCESS] IDの振り直しが完了しました！")
+    print(f"  合計エピソード数: {count}件")
+    print("=" * 60)
+
+
+def handle_update_streaming(args: argparse.Namespace) -> None:
+    """
+    RSSフィードから新規エピソードを取得し、episodes.jsonにストリーミングでマージする処理
+    
+    episodes.jsonが配信日順に並んでいない場合は通常の処理（handle_update）に切り替える。
+    
+    Args:
+        args: コマンドライン引数
+    """
+    json_path = Path(args.output)
+    if not json_path.exists():
+        handle_update(args)
+        return
+    
+    print("[PODCAST] シビックテック井戸端キャスト - エピソード更新スクリプト（ストリーミング）")
+    print("=" * 60)
+    
+    # RSSフィードから取得
+    if args.incremental:
+        known_numbers, newest_date = find_newest_known_episode(iter_episodes(json_path))
+        new_episodes = fetch_episodes_from_rss(RSS_FEED_URL, known_numbers=known_numbers, newest_date=newest_date)
+    else:
+        limit = None if args.limit == 0 else args.limit
+        new_episodes = fetch_episodes_from_rss(RSS_FEED_URL, limit=limit)
+    
+    # マージ
+    tmp_path = json_path.with_suffix('.json.tmp')
+    try:
+        with metrics.timer("merge"):
+            added_count, updated_count, skipped_count, transcript_updated_count = merge_episodes_streaming(
+                json_path, new_episodes, tmp_path
+            )
+    except UnsortedCatalogError as e:
+        tmp_path.unlink(missing_ok=True)
+        print(f"[WARNING] ストリーミングでマージできません: {e}")
+        print("[INFO] 通常のマージ処理に切り替えます（RSSフィードは取得済みのものを使います）")
+        handle_update(args, new_episodes=new_episodes)
+        return
+    
+    # 更新がない場合は保存をスキップ
+    if added_count == 0 and updated_count == 0 and transcript_updated_count == 0:
+        tmp_path.unlink()
+        print("\n" + "=" * 60)
+        print("[INFO] 更新する内容がないため、保存をスキップしました")
+        print("=" * 60)
+        return
+    
+    if args.dry_run:
+        tmp_path.unlink()
+        print("\n[DRY-RUN] 実際には保存しません")
+    else:
+        with metrics.timer("save"):
+            replace_episodes_file(tmp_path, json_path)
+    
+    print("\n" + "=" * 60)
+    print("[SUCCESS] 完了しました！")
+    print(f"  新規追加: {added_count}件")
+    print(f"  URL更新: {updated_count}件")
+    if transcript_updated_count > 0:
+        print(f"  書き起こしフラグ更新: {transcript_updated_count}件")
+    print(f"  既存スキップ: {skipped_count}件")
+    print("=" * 60)
+
+
 def handle_reindex(args: argparse.Namespace) -> None:
     """
     既存episodes.jsonのIDを振り直す処理
@@ -496,7 +967,11 @@ def handle_reindex(args: argparse.Namespace) -> None:
     
     # 既存エピソードを読み込み
     json_path = Path(args.output)
-    existing_episodes = load_existing_episodes(json_path)
+    with metrics.timer("load"):
+        if args.db:
+            existing_episodes = load_episodes_from_store(Path(args.db), json_path)
+        else:
+            existing_episodes = load_existing_episodes(json_path)
     print(f"[INFO] 既存エピソード: {len(existing_episodes)}件")
     
     if not existing_episodes:
@@ -512,10 +987,15 @@ def handle_reindex(args: argparse.Namespace) -> None:
         print(f"[INFO] 書き起こしファイル存在チェック更新: {transcript_updated_count}件")
     
     # IDを振り直す
-    reindexed_episodes = reindex_episodes(existing_episodes, sort_by_date=True)
+    with metrics.timer("reindex"):
+        reindexed_episodes = reindex_episodes(existing_episodes, sort_by_date=True)
     
     # 保存
-    save_episodes(reindexed_episodes, json_path, dry_run=args.dry_run)
+    with metrics.timer("save"):
+        if args.db:
+            save_episodes_to_store(reindexed_episodes, Path(args.db), json_path, dry_run=args.dry_run)
+        else:
+            save_episodes(reindexed_episodes, json_path, dry_run=args.dry_run)
     
     print("\n" + "=" * 60)
     print("[SUCCESS] IDの振り直しが完了しました！")
@@ -523,49 +1003,76 @@ def handle_reindex(args: argparse.Namespace) -> None:
     print("=" * 60)
 
 
-def handle_update(args: argparse.Namespace) -> None:
+def handle_update(args: argparse.Namespace, new_episodes: Optional[List[Dict[str, Any]]] = None) -> None:
     """
     RSSフィードから新規エピソードを取得して更新する処理
     
     Args:
         args: コマンドライン引数
+        new_episodes: 取得済みのRSSのエピソード（省略時はRSSフィードから取得）
     """
     print("[PODCAST] シビックテック井戸端キャスト - エピソード更新スクリプト")
     print("=" * 60)
     
-    # RSSフィードから取得
-    limit = None if args.limit == 0 else args.limit
-    new_episodes = fetch_episodes_from_rss(RSS_FEED_URL, limit=limit)
-    
     # 既存エピソードを読み込み
     json_path = Path(args.output)
-    existing_episodes = load_existing_episodes(json_path)
+    with metrics.timer("load"):
+        if args.db:
+            existing_episodes = load_episodes_from_store(Path(args.db), json_path)
+        else:
+            existing_episodes = load_existing_episodes(json_path)
     print(f"[INFO] 既存エピソード: {len(existing_episodes)}件")
     
+    # RSSフィードから取得（ストリーミングから切り替えた場合は取得済み）
+    if new_episodes is None and args.incremental:
+        known_numbers, newest_date = find_newest_known_episode(existing_episodes)
+        new_episodes = fetch_episodes_from_rss(RSS_FEED_URL, known_numbers=known_numbers, newest_date=newest_date)
+    elif new_episodes is None:
+        limit = None if args.limit == 0 else args.limit
+        new_episodes = fetch_episodes_from_rss(RSS_FEED_URL, limit=limit)
+    
     # マージ
-    merged_episodes, added_count, updated_count, skipped_count, transcript_updated_from_merge = merge_episodes(
-        existing_episodes, new_episodes
-    )
+    with metrics.timer("merge"):
+        merged_episodes, added_count, updated_count, skipped_count, transcript_updated_from_merge = merge_episodes(
+            existing_episodes, new_episodes
+        )
+    metrics.count("episodes_added", added_count)
+    metrics.count("episodes_updated", updated_count)
     
     # 全エピソードの書き起こしフラグを最終確認
-    transcript_check_count = sum(
-        update_episode_transcript_flag(ep) for ep in merged_episodes
-    )
+    with metrics.timer("transcript_check"):
+        transcript_check_count = sum(
+            update_episode_transcript_flag(ep) for ep in merged_episodes
+        )
     
     total_transcript_updates = transcript_updated_from_merge + transcript_check_count
     
     if total_transcript_updates > 0:
         print(f"[INFO] 全エピソードの書き起こしファイル存在チェック完了: {total_transcript_updates}件を更新")
     
+    # 関連リンクの検証・補完
+    link_updates = 0
+    if args.enrich_links:
+        from enrich_links import enrich_episode_links
+        with metrics.timer("enrich_links"):
+            link_stats = enrich_episode_links(merged_episodes)
+        link_updates = link_stats['titled'] + link_stats['redirected']
+        print(f"[INFO] 関連リンク: タイトル補完{link_stats['titled']}件、URL正規化{link_stats['redirected']}件、"
+              f"リンク切れ{link_stats['dead']}件、接続不可{link_stats['unreachable']}件")
+    
     # 更新がない場合は保存をスキップ
-    if added_count == 0 and updated_count == 0 and total_transcript_updates == 0 and not args.dry_run:
+    if added_count == 0 and updated_count == 0 and total_transcript_updates == 0 and link_updates == 0 and not args.dry_run:
         print("\n" + "=" * 60)
         print("[INFO] 更新する内容がないため、保存をスキップしました")
         print("=" * 60)
         return
     
     # 保存
-    save_episodes(merged_episodes, json_path, dry_run=args.dry_run)
+    with metrics.timer("save"):
+        if args.db:
+            save_episodes_to_store(merged_episodes, Path(args.db), json_path, dry_run=args.dry_run)
+        else:
+            save_episodes(merged_episodes, json_path, dry_run=args.dry_run)
     
     print("\n" + "=" * 60)
     print("[SUCCESS] 完了しました！")
@@ -573,6 +1080,8 @@ def handle_update(args: argparse.Namespace) -> None:
     print(f"  URL更新: {updated_count}件")
     if total_transcript_updates > 0:
         print(f"  書き起こしフラグ更新: {total_transcript_updates}件")
+    if link_updates > 0:
+        print(f"  関連リンク更新: {link_updates}件")
     print(f"  既存スキップ: {skipped_count}件")
     print(f"  合計エピソード数: {len(merged_episodes)}件")
     print("=" * 60)
@@ -593,6 +1102,16 @@ def main() -> None:
                         help='全エピソードを取得（--limit 0 と同じ）')
     parser.add_argument('--reindex', action='store_true',
                         help='既存のepisodes.jsonのIDを振り直す（RSSフィードの取得は行わない）')
+    parser.add_argument('--db', type=str, default=None,
+                        help='SQLiteストアを使用する（変更分だけupsertし、episodes.jsonを再生成）')
+    parser.add_argument('--incremental', action='store_true',
+                        help='最新の既存エピソードより新しいエントリだけを処理する（--limit は無視）')
+    parser.add_argument('--stream', action='store_true',
+                        help='episodes.jsonを1件ずつ読み書きしてメモリ使用量を抑える（--dbとは併用不可）')
+    
+    parser.add_argument('--enrich-links', action='store_true',
+                        help='関連リンクを検証し、ページタイトルとリダイレクト先URLを補完する（--streamとは併用不可）')
+    metrics.add_metrics_argument(parser)
     
     args = parser.parse_args()
     
@@ -600,11 +1119,22 @@ def main() -> None:
     if args.all:
         args.limit = 0
     
+    if args.stream and args.db:
+        parser.error('--stream と --db は同時に指定できません')
+    if args.stream and args.enrich_links:
+        parser.error('--stream と --enrich-links は同時に指定できません')
+    
     try:
-        if args.reindex:
-            handle_reindex(args)
-        else:
-            handle_update(args)
+        with metrics.report_metrics(args.metrics_out, "update_episodes"):
+            if args.reindex:
+                if args.stream:
+                    handle_reindex_streaming(args)
+                else:
+                    handle_reindex(args)
+            elif args.stream:
+                handle_update_streaming(args)
+            else:
+                handle_update(args)
             
     except Exception as e:
         print(f"\n[ERROR] エラーが発生しました: {e}")
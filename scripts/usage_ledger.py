@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+APIの使用量の台帳と1日の予算
+
+transcribe_podcast.py が文字起こし・要約などでAPIを呼び出すたびに、使ったリクエスト数・トークン数・
+アップロード量を JSON Lines の台帳（.cache/usage_ledger.jsonl）に追記する。
+
+- call: 処理段階（文字起こし・キャッシュ作成・テキスト生成）ごとの使用量
+- episode: 音声ファイル1件分の見積もりと実績
+
+台帳から日ごと・エピソードごとの使用量を集計し、transcribe_podcast.py は1日の予算
+（--daily-tokens / --daily-requests）の残りに収まる音声ファイルだけを処理する。
+見積もりは過去のエピソードの実績との比で補正する。
+
+使い方:
+    python scripts/usage_ledger.py                 # 直近7日の使用量と、エピソードごとの見積もりと実績
+    python scripts/usage_ledger.py --days 30 --ledger /tmp/usage_ledger.jsonl
+"""
+
+import argparse
+import json
+import sys
+import threading
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, ContextManager, Dict, Iterator, List, Optional
+
+# 共通ユーティリティのインポート
+from utils import PROJECT_ROOT
+import metrics
+
+# 台帳のデフォルトの保存先
+LEDGER_PATH = PROJECT_ROOT / ".cache" / "usage_ledger.jsonl"
+
+# 台帳に記録する使用量（metrics のカウンター名と同じ）
+USAGE_FIELDS = ["requests", "prompt_tokens", "output_tokens", "cached_tokens", "cache_write_tokens", "upload_bytes"]
+
+# 見積もりの補正に使う、直近のエピソードの件数
+CALIBRATION_EPISODES = 20
+
+
+def billed_tokens(usage: Dict[str, int]) -> int:
+    """
+    予算の対象とするトークン数（入力・出力・キャッシュ作成の合計）
+
+    Args:
+        usage: 使用量
+
+    Returns:
+        トークン数
+    """
+    return usage.get("prompt_tokens", 0) + usage.get("output_tokens", 0) + usage.get("cache_write_tokens", 0)
+
+
+def add_usage(total: Dict[str, int], usage: Dict[str, Any]) -> Dict[str, int]:
+    """使用量を total に加算して total を返す"""
+    for field in USAGE_FIELDS:
+        total[field] = total.get(field, 0) + int(usage.get(field, 0) or 0)
+    return total
+
+
+@dataclass
+class DailyBudget:
+    """1日の予算（None の項目は無制限）"""
+
+    tokens: Optional[int] = None
+    requests: Optional[int] = None
+
+    @property
+    def limited(self) -> bool:
+        """いずれかの項目に上限があるか"""
+        return self.tokens is not None or self.requests is not None
+
+    def fits(self, used: Dict[str, int], projected: Dict[str, int]) -> bool:
+        """
+        今日の使用量に見積もりを加えても予算に収まるか
+
+        Args:
+            used: 今日の使用量
+            projected: これから処理する分の見積もり
+
+        Returns:
+            収まる場合は True
+        """
+        if self.tokens is not None and billed_tokens(used) + billed_tokens(projected) > self.tokens:
+            return False
+        if self.requests is not None and used.get("requests", 0) + projected.get("requests", 0) > self.requests:
+            return False
+        return True
+
+    def describe(self, used: Dict[str, int]) -> str:
+        """予算と今日の使用量の表示用の文字列"""
+        parts = []
+        if self.tokens is not None:
+            parts.append(f"トークン {billed_tokens(used):,}/{self.tokens:,}")
+        if self.requests is not None:
+            parts.append(f"リクエスト {used.get('requests', 0):,}/{self.requests:,}")
+        return "、".join(parts) if parts else "無制限"
+
+
+class UsageLedger:
+    """JSON Lines の使用量の台帳（追記のみ）"""
+
+    def __init__(self, path: Path = LEDGER_PATH) -> None:
+        """
+        初期化（既存の台帳を読み込む）
+
+        Args:
+            path: 台帳のパス
+        """
+        self.path = Path(path)
+        self.records: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        if not self.path.exists():
+            return
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line_number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    self.records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    # 書き込み中に中断した行は読み飛ばす
+                    print(f"[WARNING] 台帳の {line_number} 行目を読み込めないため無視します: {self.path}")
+
+    def append(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        記録を台帳に追記（日時を付ける）
+
+        Args:
+            record: 記録（type, episode など）
+
+        Returns:
+            追記した記録
+        """
+        now = datetime.now().astimezone()
+        record = {"timestamp": now.isoformat(timespec="seconds"), "date": now.date().isoformat(), **record}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            self.records.append(record)
+        return record
+
+    @contextmanager
+    def track(self, episode: str, stage: str, backend: str) -> Iterator[Dict[str, int]]:
+        """
+        with ブロックで増えた使用量のカウンターを、1回の呼び出しとして台帳に記録
+        （例外で抜けた場合も、使った分は記録する。数えるのはこのスレッドで増えた分だけ）
+
+        Args:
+            episode: 音声ファイル名
+            stage: 処理段階（transcribe, cache, generate）
+            backend: バックエンド名
+
+        Yields:
+            ブロックを抜けた後に使用量が入る辞書
+        """
+        before = metrics.get_metrics().thread_counters()
+        usage: Dict[str, int] = {}
+        try:
+            yield usage
+        finally:
+            after = metrics.get_metrics().thread_counters()
+            for field in USAGE_FIELDS:
+                usage[field] = int(after.get(field, 0) - before.get(field, 0))
+            if any(usage.values()):
+                self.append({"type": "call", "episode": episode, "stage": stage, "backend": backend, **usage})
+
+    def usage(self, day: Optional[str] = None, episode: Optional[str] = None, start: int = 0) -> Dict[str, int]:
+        """
+        call の記録を集計
+
+        Args:
+            day: この日（YYYY-MM-DD）の分だけ
+            episode: この音声ファイルの分だけ
+            start: この位置以降の記録だけ（len(records) で実行中の区切りを取る）
+
+        Returns:
+            使用量の合計
+        """
+        total: Dict[str, int] = {}
+        for record in self.records[start:]:
+            if record.get("type") != "call":
+                continue
+            if (day and record.get("date") != day) or (episode and record.get("episode") != episode):
+                continue
+            add_usage(total, record)
+        return add_usage(total, {})
+
+    def today(self) -> Dict[str, int]:
+        """今日の使用量"""
+        return self.usage(day=date.today().isoformat())
+
+    def calibration(self, backends: str) -> float:
+        """
+        直近のエピソードの実績 / 見積もり の比（トークン数、見積もりの補正に使う）
+
+        Args:
+            backends: バックエンドの組み合わせ（episode 記録の backends）
+
+        Returns:
+            比（実績が無い場合は 1.0）
+        """
+        episodes = [
+            record for record in self.records
+            if record.get("type") == "episode" and record.get("backends") == backends
+            and record.get("status") == "succeeded" and billed_tokens(record.get("projected", {})) > 0
+        ][-CALIBRATION_EPISODES:]
+        projected = sum(billed_tokens(record["projected"]) for record in episodes)
+        actual = sum(billed_tokens(record.get("actual", {})) for record in episodes)
+        return actual / projected if projected and actual else 1.0
+
+
+def track_usage(ledger: Optional[UsageLedger], episode: str, stage: str, backend: str) -> ContextManager[Dict[str, int]]:
+    """台帳がある場合は UsageLedger.track、無い場合は何もしないコンテキスト"""
+    if ledger is None:
+        return nullcontext({})
+    return ledger.track(episode, stage, backend)
+
+
+def scale_projection(projected: Dict[str, int], ratio: float) -> Dict[str, int]:
+    """
+    見積もりのトークン数を補正（リクエスト数・アップロード量はそのまま）
+
+    Args:
+        projected: 見積もり
+        ratio: 補正の比（UsageLedger.calibration）
+
+    Returns:
+        補正した見積もり
+    """
+    return {
+        field: int(value * ratio) if field.endswith("_tokens") else value
+        for field, value in projected.items()
+    }
+
+
+def print_report(ledger: UsageLedger, days: int) -> None:
+    """
+    日ごとの使用量と、エピソードごとの見積もりと実績を表示
+
+    Args:
+        ledger: 台帳
+        days: 表示する日数（今日を含む）
+    """
+    first = (date.today() - timedelta(days=days - 1)).isoformat()
+    dates = sorted({record["date"] for record in ledger.records if record.get("date", "") >= first})
+    print(f"\n  {'日付':<12} {'リクエスト':>10} {'入力':>12} {'出力':>10} {'キャッシュ':>12} {'アップロード':>14}")
+    for day in dates:
+        used = ledger.usage(day=day)
+        print(f"  {day:<12} {used['requests']:10,d} {used['prompt_tokens']:12,d} {used['output_tokens']:10,d} "
+              f"{used['cached_tokens']:12,d} {used['upload_bytes'] / 1024 / 1024:12.1f}MB")
+
+    episodes = [
+        record for record in ledger.records
+        if record.get("type") == "episode" and record.get("date", "") >= first
+    ]
+    if not episodes:
+        return
+    print(f"\n  {'エピソード':<24} {'状態':<10} {'見積もり':>12} {'実績':>12} {'比':>6}")
+    for record in episodes:
+        projected = billed_tokens(record.get("projected", {}))
+        actual = billed_tokens(record.get("actual", {}))
+        ratio = f"{actual / projected:.2f}" if projected else "-"
+        print(f"  {record['episode']:<24} {record.get('status', ''):<10} {projected:12,d} {actual:12,d} {ratio:>6}")
+
+
+def main() -> None:
+    """メイン処理"""
+    parser = argparse.ArgumentParser(description='APIの使用量の台帳の集計')
+    parser.add_argument('--days', type=int, default=7, help='表示する日数（デフォルト: 7）')
+    parser.add_argument('--ledger', type=str, default=str(LEDGER_PATH),
+                        help=f'台帳のパス（デフォルト: {LEDGER_PATH}）')
+    args = parser.parse_args()
+
+    ledger = UsageLedger(Path(args.ledger))
+    if not ledger.records:
+        print(f"[INFO] 台帳に記録がありません: {ledger.path}")
+        sys.exit(0)
+    print(f"[INFO] 台帳: {ledger.path}（{len(ledger.records)}件）")
+    print_report(ledger, args.days)
+
+
+if __name__ == "__main__":
+    main()
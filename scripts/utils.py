@@ -7,6 +7,7 @@
 """
 
 import re
+import unicodedata
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
@@ -150,6 +151,35 @@ def natural_sort_key(text: str) -> tuple:
     return tuple(convert(c) for c in re.split(r'(\d+)', text))
 
 
+def display_width(text: str) -> int:
+    """
+    端末での表示幅（全角文字を2、それ以外を1として数える）
+    
+    Args:
+        text: 対象のテキスト
+        
+    Returns:
+        表示幅
+    """
+    return sum(2 if unicodedata.east_asian_width(char) in ('F', 'W') else 1 for char in text)
+
+
+def pad_display(text: str, width: int, align: str = '<') -> str:
+    """
+    全角文字を考慮して表示幅 width になるよう空白で埋める（表の列揃え用）
+    
+    Args:
+        text: 対象のテキスト
+        width: 表示幅
+        align: '<' は左寄せ、'>' は右寄せ
+        
+    Returns:
+        空白で埋めたテキスト（width を超える場合はそのまま）
+    """
+    padding = ' ' * max(0, width - display_width(text))
+    return text + padding if align == '<' else padding + text
+
+
 def validate_episode_number(episode_number: str) -> bool:
     """
     エピソード番号の形式が正しいかを検証
@@ -186,3 +216,6 @@ PROJECT_ROOT = get_project_root()
 DATA_DIR = PROJECT_ROOT / "data"
 TRANSCRIPTS_DIR = DATA_DIR / "transcripts"
 EPISODES_JSON_PATH = DATA_DIR / "episodes.json"
+
+# HTTPリクエストで使うUser-Agent
+USER_AGENT = "civictech-idobata-cast-scripts/1.0 (+https://github.com/tetsuji1122/civictech-idobata-cast)"